@@ -3,7 +3,8 @@
 `python -m combat_runner.gui.app` or `make combat-gui`:
   - Boots QApplication
   - Applies qt-material dark_blue theme
-  - Shows the encounter picker
+  - Shows the encounter picker (warming the SRD cache for the selected
+    encounter in the background — see srd_prefetch.py)
   - On Launch → builds EncounterState + MainWindow
   - On Encounter→Switch menu → re-opens the picker
 
@@ -39,9 +40,12 @@ except ImportError:
 
 from .encounter_picker import DiscoveredEncounter, EncounterPicker, load_party_config
 from .main_window import MainWindow
+from .srd_prefetch import SrdPrefetcher
 from .state import EncounterState, NPCState, assign_combatant_ids
 
 _REPO_ROOT = Path(__file__).resolve().parents[2]
+# Per-encounter session logs and auto-saves (gitignored).
+_MEMORY_DIR = _REPO_ROOT / "combat-runner" / ".memory"
 
 
 # ─────────── headless-friendly construction helpers (used by tests) ───────────
@@ -59,7 +63,7 @@ def build_encounter_state(
     """
     # Per-session log file mirrors the existing CLI scheme.
     timestamp = datetime.now(timezone.utc).astimezone().strftime("%Y-%m-%d_%H-%M-%S")
-    mem_dir = _REPO_ROOT / "combat-runner" / ".memory" / encounter.name
+    mem_dir = _MEMORY_DIR / encounter.name
     mem_dir.mkdir(parents=True, exist_ok=True)
     log_path = mem_dir / f"log-{timestamp}.md"
 
@@ -340,7 +344,14 @@ def main() -> int:
 
     # Main loop: show picker → build window → on close, optionally re-open picker
     current_window: MainWindow | None = None
-    picker = EncounterPicker(party_config=_party_config)
+    prefetcher = SrdPrefetcher()
+    app.aboutToQuit.connect(prefetcher.shutdown)
+    picker = EncounterPicker(party_config=_party_config, prefetcher=prefetcher)
+
+    def _forward_prefetch_progress(done: int, total: int, label: str) -> None:
+        # Prefetch usually outlives the picker; keep reporting in the main window.
+        if current_window is not None:
+            current_window.statusBar().showMessage(prefetcher.message(), 5000)
 
     def _launch(
         encounter: DiscoveredEncounter,
@@ -359,17 +370,20 @@ def main() -> int:
             return
         current_window.encounter_switch_requested.connect(_switch)
         current_window.show()
+        if prefetcher.is_running():
+            current_window.statusBar().showMessage(prefetcher.message())
 
     def _switch() -> None:
         nonlocal current_window
         if current_window is not None:
             current_window.close()
             current_window = None
-        new_picker = EncounterPicker(party_config=_party_config)
+        new_picker = EncounterPicker(party_config=_party_config, prefetcher=prefetcher)
         new_picker.launched.connect(_launch)
         new_picker.show()
 
     picker.launched.connect(_launch)
+    prefetcher.progress.connect(_forward_prefetch_progress)
     if not picker.encounters:
         QMessageBox.warning(
             None,
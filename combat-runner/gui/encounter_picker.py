@@ -8,6 +8,9 @@ The dialog shows discovered encounters sorted by most-recent NPC-file mtime.
 Selecting an encounter expands a per-NPC count panel; the user adjusts counts
 and clicks Launch. Emits `launched(encounter, counts, party_config, player_selections)`
 on Launch.
+
+With an `SrdPrefetcher` attached, selecting an encounter also starts warming the
+SRD cache for it (see srd_prefetch.py); progress shows in the dialog's status bar.
 """
 
 from __future__ import annotations
@@ -16,7 +19,7 @@ import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
@@ -29,11 +32,15 @@ from PySide6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QSpinBox,
+    QStatusBar,
     QTextBrowser,
     QVBoxLayout,
     QWidget,
 )
 
+if TYPE_CHECKING:
+    from .srd_prefetch import SrdPrefetcher
+
 _REPO_ROOT = Path(__file__).resolve().parents[2]
 _EXCLUDED_PATH_PARTS = {".history", ".cache", ".output", "image", "images"}
 _COMBAT_TAG = "#combat-runner"
@@ -270,19 +277,32 @@ class EncounterPicker(QDialog):
     launched = Signal(object, dict, object, dict)
     # (DiscoveredEncounter, counts_dict, party_config_or_None, player_selections_dict)
 
-    def __init__(self, parent: QWidget | None = None, party_config: dict | None = None) -> None:
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        party_config: dict | None = None,
+        prefetcher: SrdPrefetcher | None = None,
+    ) -> None:
         super().__init__(parent)
         self.setWindowTitle("Combat Runner — Pick an encounter")
         self.setMinimumSize(640, 480)
         self.party_config = party_config
+        self.prefetcher = prefetcher
 
         self.encounters = discover_encounters()
         self._build_ui()
 
     def _build_ui(self) -> None:
-        root = QHBoxLayout(self)
-        root.setContentsMargins(12, 12, 12, 12)
+        outer = QVBoxLayout(self)
+        outer.setContentsMargins(12, 12, 12, 0)
+        root = QHBoxLayout()
         root.setSpacing(12)
+        outer.addLayout(root, 1)
+        self.status_bar = QStatusBar()
+        self.status_bar.setSizeGripEnabled(False)
+        outer.addWidget(self.status_bar)
+        if self.prefetcher is not None:
+            self.prefetcher.progress.connect(self._on_prefetch_progress)
 
         # Left: encounter list
         left = QVBoxLayout()
@@ -432,6 +452,13 @@ class EncounterPicker(QDialog):
 
         self.launch_btn.setEnabled(True)
 
+        if self.prefetcher is not None:
+            self.prefetcher.start(enc)
+            self.status_bar.showMessage(self.prefetcher.message())
+
+    def _on_prefetch_progress(self, done: int, total: int, label: str) -> None:
+        self.status_bar.showMessage(self.prefetcher.message())
+
     def _on_launch(self) -> None:
         row = self.list_widget.currentRow()
         if row < 0 or row >= len(self.encounters):
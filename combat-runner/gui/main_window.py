@@ -22,7 +22,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import QEvent, QObject, QRunnable, Qt, QThreadPool, Signal
+from PySide6.QtCore import QEvent, QObject, QRunnable, Qt, QThreadPool, QTimer, Signal
 from PySide6.QtGui import QAction, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QApplication,
@@ -50,15 +50,20 @@ from .event_bus import (
 from .command_model import Effect, ParsedCommand
 from .effects import _CONDITION_UNKNOWN_SENTINEL, apply_effect, apply_hit
 from .history import UndoStack
-from .npc_tab import NPCTab
+from .npc_tab import NPCTab, _get_roller
 from .state import EncounterState, NPCState, deserialize_encounter, serialize_encounter
 from .suggestion_driver import SuggestionDriver
 from .widgets.combat_tab_bar import CombatTabBar
+from .widgets.dice_source_status import DiceSourceStatus
 from .widgets.reaction_prompt import ReactionPromptDialog
 from .widgets.srd_panel import build_srd_dock
 from .widgets.suggestion_bar import Suggestion
 
 _REPO_ROOT = Path(__file__).resolve().parents[2]
+# Per-encounter auto-saves and snapshots (gitignored).
+_MEMORY_DIR = _REPO_ROOT / "combat-runner" / ".memory"
+# How often the status bar re-reads the dice pool / circuit-breaker state.
+_DICE_STATUS_POLL_MS = 2000
 
 
 def _load_actions_db():
@@ -361,6 +366,25 @@ class MainWindow(QMainWindow):
         self.setStatusBar(QStatusBar(self))
         self.statusBar().showMessage(f"Loaded {len(self.encounter_state.npcs)} NPC(s) · log → {self.encounter_state.log_path.name}")
 
+        # Permanent right-hand indicator: where dice rolls come from right now
+        # (quantum / random.org / local CSPRNG) and the upstream circuit state.
+        # Polled — it only reads in-memory counters and the ring header; the
+        # ring itself is opened by the roller's refill thread, not from here.
+        self._dice_status = DiceSourceStatus(self)
+        self.statusBar().addPermanentWidget(self._dice_status)
+        self._dice_status_timer = QTimer(self)
+        self._dice_status_timer.setInterval(_DICE_STATUS_POLL_MS)
+        self._dice_status_timer.timeout.connect(self._refresh_dice_status)
+        self._dice_status_timer.start()
+        self._refresh_dice_status()
+
+    def _refresh_dice_status(self) -> None:
+        try:
+            status = _get_roller()._entropy_status(open_pool=False)
+        except Exception:  # noqa: BLE001 — roller unavailable; the label says so
+            status = None
+        self._dice_status.set_status(status)
+
     @staticmethod
     def _seed_slots_remaining(npc: NPCState, actions: list[dict]) -> None:
         """Pre-fill `npc.slots_remaining` from each action's `slots` block so a
@@ -658,8 +682,8 @@ class MainWindow(QMainWindow):
 
     def _auto_save_path(self) -> Path:
         """Per-encounter auto-save file. Lives under combat-runner/.memory/
-        which is already gitignored."""
-        return _REPO_ROOT / "combat-runner" / ".memory" / self.encounter_state.name / "auto-save.json"
+        which is gitignored."""
+        return _MEMORY_DIR / self.encounter_state.name / "auto-save.json"
 
     def _auto_save(self) -> None:
         """Persist current state to the auto-save slot. Best-effort: a write
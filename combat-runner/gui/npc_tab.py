@@ -13,7 +13,6 @@ Command parsing is delegated to `gui.dispatcher.parse`, which returns a
 
 from __future__ import annotations
 
-import asyncio
 import importlib.util
 import json
 import re
@@ -21,7 +20,7 @@ import sys
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtCore import Signal
 from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -75,68 +74,6 @@ _dnd_roller = None
 _ROUND_REFRESH_MODES = frozenset({"round", "turn"})
 
 
-# ───────── background dice-cache pre-warm ─────────
-
-# Keep the disk-backed quantum-RNG cache above this many numbers. A typical
-# combat action burns well under a dozen; staying above the low-water mark
-# means the synchronous roll on the UI thread always hits a warm cache and
-# never has to do a (blocking) network fetch.
-_CACHE_LOW_WATER = 64
-# Target fill level for a pre-warm fetch — a full quantum batch is 1024.
-_CACHE_REFILL_TARGET = 256
-
-# Shared thread pool for cache pre-warm workers. One global pool (not one per
-# tab) so N tabs don't spawn N redundant fetches; capped at a single thread so
-# concurrent fetches can't race on the roller's module-level cache list.
-_PREWARM_POOL: QThreadPool | None = None
-# Set while a pre-warm worker is in flight, so we don't queue duplicates.
-_PREWARM_IN_FLIGHT = False
-
-
-def _prewarm_pool() -> QThreadPool:
-    global _PREWARM_POOL
-    if _PREWARM_POOL is None:
-        _PREWARM_POOL = QThreadPool()
-        _PREWARM_POOL.setMaxThreadCount(1)
-    return _PREWARM_POOL
-
-
-class _PrewarmSignals(QObject):
-    """Signals for a cache pre-warm worker. A QRunnable can't own signals, so
-    they live on this QObject (mirrors suggestion_driver._WorkerSignals)."""
-
-    done = Signal(bool)  # success flag — emitted on the GUI thread
-
-
-class _CachePrewarmWorker(QRunnable):
-    """Off-thread top-up of the dnd_roller quantum-RNG cache.
-
-    Runs `_ensure_numbers` (async) inside a private event loop on a worker
-    thread. If the network is unavailable the roller falls back to local RNG
-    internally; either way this never blocks the UI thread. The synchronous
-    roll path stays synchronous — it just always finds a warm cache.
-    """
-
-    def __init__(self, target: int, signals: _PrewarmSignals) -> None:
-        super().__init__()
-        self._target = target
-        self._signals = signals
-        self.setAutoDelete(True)
-
-    def run(self) -> None:  # executes on a pool worker thread
-        ok = False
-        try:
-            roller = _get_roller()
-            ok = bool(asyncio.run(roller._ensure_numbers(self._target)))
-        except Exception:  # noqa: BLE001 — offline / fetch failure must not crash
-            ok = False
-        try:
-            self._signals.done.emit(ok)
-        except RuntimeError:
-            # Signals object already torn down (app closing) — nothing to do.
-            pass
-
-
 def _get_roller():
     """Lazy import scripts/dnd_roller; returns the module."""
     global _dnd_roller
@@ -236,17 +173,12 @@ class NPCTab(QWidget):
         if self.event_bus is not None:
             self.event_bus.subscribe("round_advanced", self._on_round_event)
 
-        # Signals object for cache pre-warm workers. Parented to `self` so it
-        # is torn down with the tab; workers emit `done` back here.
-        self._prewarm_signals = _PrewarmSignals(self)
-        self._prewarm_signals.done.connect(self._on_prewarm_done)
-
         self._build_ui()
         self._refresh()
 
-        # Cold-boot warm-up: top up the dice cache off-thread now, so the
-        # first roll of the session never has to fetch on the UI thread.
-        self._maybe_prewarm_cache()
+        # Cold-boot warm-up: start the roller's background refill now, so the
+        # pool is topped up before the first roll of the session.
+        self._start_dice_refill()
 
     # ─────────── UI construction ───────────
 
@@ -685,40 +617,17 @@ class NPCTab(QWidget):
         self._on_player_action(player_match)
         return True
 
-    # ─────────── dice-cache pre-warm ───────────
+    # ─────────── dice-pool refill ───────────
 
-    def _cache_level(self) -> int | None:
-        """Current number of cached random numbers, or None if unknown
-        (roller not importable). Reads the roller's module-level cache list."""
+    def _start_dice_refill(self) -> None:
+        """Start dnd_roller's background refill thread. It keeps the dice pool
+        above its low watermark from then on, so the synchronous roll on the UI
+        thread never waits on the network. Offline / unimportable roller is
+        not an error here — the roll itself reports that."""
         try:
-            roller = _get_roller()
-            return len(roller._number_cache)
+            _get_roller()._start_refill()
         except Exception:  # noqa: BLE001
-            return None
-
-    def _maybe_prewarm_cache(self) -> None:
-        """If the dice cache has run low, top it up on a background thread.
-
-        Keeps the synchronous roll on the UI thread fast: by the time the next
-        roll happens the cache is warm, so `roll_combat_action` never has to
-        do a (blocking, ~1s rate-limited / ~10s timeout) network fetch. Safe
-        to call liberally — it no-ops when the cache is healthy or a pre-warm
-        is already in flight.
-        """
-        global _PREWARM_IN_FLIGHT
-        if _PREWARM_IN_FLIGHT:
-            return
-        level = self._cache_level()
-        if level is None or level >= _CACHE_LOW_WATER:
-            return
-        _PREWARM_IN_FLIGHT = True
-        worker = _CachePrewarmWorker(_CACHE_REFILL_TARGET, self._prewarm_signals)
-        _prewarm_pool().start(worker)
-
-    def _on_prewarm_done(self, ok: bool) -> None:  # noqa: ARG002 — slot signature
-        """Pre-warm worker finished (success or graceful offline fallback)."""
-        global _PREWARM_IN_FLIGHT
-        _PREWARM_IN_FLIGHT = False
+            pass
 
     # ─────────── action execution ───────────
 
@@ -741,10 +650,6 @@ class NPCTab(QWidget):
         except Exception as exc:
             self._append_log(f"<span style='color:#ff5252'>ERROR running {action_name}: {exc}</span>")
             return None
-        finally:
-            # The roll just consumed numbers from the dice cache. Top it back
-            # up off-thread now so the *next* roll never blocks the UI thread.
-            self._maybe_prewarm_cache()
 
         if "error" in result:
             self._append_log(f"<span style='color:#ff5252'>{result['error']}</span>")
@@ -0,0 +1,320 @@
+"""Encounter-scoped SRD prefetch — warms the SRD cache while the picker is open.
+
+Mid-fight SRD lookups (`get_monster_details`, `list_conditions`, spells the
+NPCs cast) are fetched lazily, so the first one at the table pays a network
+round trip. When the DM selects an encounter in the picker we already know
+what those lookups will be:
+
+  - creature keys: `srd_key:` frontmatter (written by the SRD import dialog)
+    and any `srd-2024_…`-style key mentioned in an NPC file → `get_monster_details`
+  - spell names: bold bullet items under a heading mentioning spells
+    (`- **Hold Person** — …`) and actions.jsonl rows whose verbs say
+    `spell`/`cantrip` → `search_spells(name=…)`
+  - conditions: standard condition names / `@tags` in the NPC files and their
+    action rows → `list_conditions(name=…, source="core,a5e-ag")`
+
+Each lookup is issued with exactly the arguments the LLM controller's tools
+use, so it lands on the same cache entries. Work runs on a QThreadPool —
+including the scan and the srd5_2 import, so selecting an encounter never
+blocks the picker; re-selecting an encounter bumps a generation counter so stale progress from the
+previous selection is dropped (in-flight lookups still finish — they only warm
+a cache). Design mirrors `suggestion_driver.py`.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from .encounter_picker import DiscoveredEncounter
+from .state import STANDARD_CONDITIONS
+
+logger = logging.getLogger(__name__)
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Official conditions only — the app-specific markers (dodging, bloodied, …)
+# have no SRD entry to warm.
+_SRD_CONDITIONS = STANDARD_CONDITIONS[:STANDARD_CONDITIONS.index("dodging")]
+_CONDITION_RE = re.compile(r"\b(" + "|".join(_SRD_CONDITIONS) + r")\b", re.IGNORECASE)
+_SRD_KEY_RE = re.compile(r"\b(?:srd-20(?:14|24)|tob\d?|a5e-[a-z]+|open5e)_[a-z0-9][a-z0-9-]*\b")
+_FRONTMATTER_KEY_RE = re.compile(r"^srd_key\s*:\s*([\w-]+)\s*$", re.MULTILINE)
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+_BOLD_BULLET_RE = re.compile(r"^\s*[-*]\s+\*\*([^*]+?)\*\*")
+_SPELL_VERB_RE = re.compile(r"\b(spell|cantrip)\b")
+# The LLM controller looks conditions up in these sources (see
+# llm_controller._tool_list_conditions); match it so the cache entry is shared.
+_CONDITION_SOURCES = "core,a5e-ag"
+
+DEFAULT_MAX_THREADS = 4
+
+
+@dataclass
+class PrefetchPlan:
+    """What to warm for one encounter. Ordered, de-duplicated."""
+
+    monster_keys: list[str] = field(default_factory=list)
+    spells: list[str] = field(default_factory=list)
+    conditions: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.monster_keys) + len(self.spells) + len(self.conditions)
+
+
+def _add(seq: list[str], value: str) -> None:
+    if value and value not in seq:
+        seq.append(value)
+
+
+def _spells_from_markdown(text: str) -> Iterable[str]:
+    """Bold bullet items inside any section whose heading mentions spells
+    ('### Spells known', '## Spellwork', '## Cantrips'). Nested bullets under
+    them are descriptive prose and don't start with bold, so they're skipped."""
+    level = 0
+    for line in text.splitlines():
+        heading = _HEADING_RE.match(line)
+        if heading:
+            depth, title = len(heading.group(1)), heading.group(2).lower()
+            if "spell" in title or "cantrip" in title:
+                level = depth
+            elif level and depth <= level:
+                level = 0
+            continue
+        if level:
+            m = _BOLD_BULLET_RE.match(line)
+            if m:
+                yield m.group(1).strip().rstrip(":")
+
+
+def _action_rows(slugs: set[str], actions_rows: Iterable[dict[str, Any]] | None) -> list[dict[str, Any]]:
+    if actions_rows is None:
+        scripts_dir = _REPO_ROOT / "scripts"
+        if str(scripts_dir) not in sys.path:
+            sys.path.insert(0, str(scripts_dir))
+        actions_rows = importlib.import_module("combat_actions_db").read_all()
+    return [r for r in actions_rows if r.get("npc") in slugs or r.get("scope") == "global"]
+
+
+def scan_encounter(
+    encounter: DiscoveredEncounter,
+    actions_rows: Iterable[dict[str, Any]] | None = None,
+) -> PrefetchPlan:
+    """Collect SRD lookups for an encounter from its NPC .md files and their
+    actions.jsonl rows (plus global rows). `actions_rows` defaults to the live
+    combat-actions DB. Pure — no Qt, no network."""
+    plan = PrefetchPlan()
+    texts: list[str] = []
+    for npc in encounter.npcs:
+        try:
+            text = npc.md_path.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        texts.append(text)
+        for key in _FRONTMATTER_KEY_RE.findall(text):
+            _add(plan.monster_keys, key)
+        for key in _SRD_KEY_RE.findall(text):
+            _add(plan.monster_keys, key)
+        for spell in _spells_from_markdown(text):
+            _add(plan.spells, spell)
+
+    for row in _action_rows({n.slug for n in encounter.npcs}, actions_rows):
+        texts.append(json.dumps(row))
+        verbs = " ".join(str(v) for v in row.get("verbs") or [])
+        action = str(row.get("action") or "")
+        if _SPELL_VERB_RE.search(verbs) or "spell" in action:
+            _add(plan.spells, action.replace("_", " ").title())
+
+    for text in texts:
+        for cond in _CONDITION_RE.findall(text):
+            _add(plan.conditions, cond.lower())
+    return plan
+
+
+def _get_srd():
+    scripts_dir = _REPO_ROOT / "scripts"
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    return importlib.import_module("srd5_2")
+
+
+def plan_tasks(plan: PrefetchPlan, srd: Any) -> list[tuple[str, Callable[[], Any]]]:
+    """(label, zero-arg lookup) pairs — the same calls the LLM tools make."""
+    tasks: list[tuple[str, Callable[[], Any]]] = []
+    for key in plan.monster_keys:
+        tasks.append((key, lambda k=key: srd.get_monster_details(k)))
+    for spell in plan.spells:
+        tasks.append((spell, lambda s=spell: srd.search_spells(name=s)))
+    for cond in plan.conditions:
+        tasks.append((cond, lambda c=cond: srd.list_conditions(name=c, source=_CONDITION_SOURCES)))
+    return tasks
+
+
+class _WorkerSignals(QObject):
+    """Signals for prefetch workers (QRunnable can't carry signals itself)."""
+
+    planned = Signal(int, list)  # (generation, [(label, call), ...])
+    done = Signal(int, str, bool)  # (generation, label, ok)
+
+
+class _PlanWorker(QRunnable):
+    """Scans the encounter and loads srd5_2 — both touch the disk (the import
+    alone is slow), so they stay off the GUI thread. A failure plans nothing:
+    prefetch is an optimisation and must never break the picker."""
+
+    def __init__(
+        self,
+        generation: int,
+        encounter: DiscoveredEncounter,
+        srd_loader: Callable[[], Any],
+        actions_rows: Callable[[], Iterable[dict[str, Any]]] | None,
+        signals: _WorkerSignals,
+    ) -> None:
+        super().__init__()
+        self._generation = generation
+        self._encounter = encounter
+        self._srd_loader = srd_loader
+        self._actions_rows = actions_rows
+        self._signals = signals
+        self.setAutoDelete(True)
+
+    def run(self) -> None:
+        try:
+            rows = self._actions_rows() if self._actions_rows is not None else None
+            tasks = plan_tasks(scan_encounter(self._encounter, rows), self._srd_loader())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("SRD prefetch scan failed for %s: %s", self._encounter.name, exc)
+            tasks = []
+        self._signals.planned.emit(self._generation, tasks)
+
+
+class _PrefetchWorker(QRunnable):
+    """One SRD lookup. Failures are logged and reported, never raised — a
+    missed warm-up only means that lookup is slow later."""
+
+    def __init__(self, generation: int, label: str, call: Callable[[], Any], signals: _WorkerSignals) -> None:
+        super().__init__()
+        self._generation = generation
+        self._label = label
+        self._call = call
+        self._signals = signals
+        self.setAutoDelete(True)
+
+    def run(self) -> None:
+        try:
+            self._call()
+        except Exception as exc:  # noqa: BLE001
+            logger.info("SRD prefetch %r failed: %s", self._label, exc)
+            self._signals.done.emit(self._generation, self._label, False)
+            return
+        self._signals.done.emit(self._generation, self._label, True)
+
+
+class SrdPrefetcher(QObject):
+    """Warms the SRD cache for one encounter at a time.
+
+    Public API:
+      - `start(encounter)` — queue the scan; its lookups are submitted once
+        it finishes. Supersedes any earlier `start`.
+      - `cancel()` — drop queued lookups and silence in-flight ones.
+      - signals `progress(done, total, label)` and `finished(ok, failed)`, for
+        the latest generation only.
+      - `message()` — the current one-line status text (for a status bar
+        attached after the run started).
+    """
+
+    progress = Signal(int, int, str)
+    finished = Signal(int, int)
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        max_threads: int = DEFAULT_MAX_THREADS,
+        srd_loader: Callable[[], Any] = _get_srd,
+        actions_rows: Callable[[], Iterable[dict[str, Any]]] | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._srd_loader = srd_loader
+        self._actions_rows = actions_rows
+        self._generation = 0
+        self._root: Path | None = None
+        self._planning = False
+        self._total = 0
+        self._ok = 0
+        self._failed = 0
+        self._message = ""
+        self._signals = _WorkerSignals(self)
+        self._signals.planned.connect(self._on_planned)
+        self._signals.done.connect(self._on_done)
+
+    # ─────────── public API ───────────
+
+    def start(self, encounter: DiscoveredEncounter) -> None:
+        if encounter.root == self._root:
+            return  # already warming / warmed this encounter
+        self.cancel()
+        self._root = encounter.root
+        self._planning = True
+        self._message = "SRD prefetch: scanning…"
+        self._pool.start(_PlanWorker(
+            self._generation, encounter, self._srd_loader, self._actions_rows, self._signals,
+        ))
+
+    def cancel(self) -> None:
+        self._generation += 1
+        self._root = None
+        self._pool.clear()
+        self._planning = False
+        # Late results of the old generation are ignored, so nothing would
+        # ever finish the run: reset it, or is_running()/message() stay stale.
+        self._total, self._ok, self._failed = 0, 0, 0
+        self._message = ""
+
+    def is_running(self) -> bool:
+        return self._planning or self._ok + self._failed < self._total
+
+    def message(self) -> str:
+        return self._message
+
+    def shutdown(self, timeout_ms: int = 2000) -> None:
+        self.cancel()
+        self._pool.waitForDone(timeout_ms)
+
+    # ─────────── internals ───────────
+
+    def _on_planned(self, generation: int, tasks: list[tuple[str, Callable[[], Any]]]) -> None:
+        if generation != self._generation:
+            return
+        self._planning = False
+        self._total, self._ok, self._failed = len(tasks), 0, 0
+        self._message = f"SRD prefetch: 0/{self._total}" if tasks else ""
+        self.progress.emit(0, self._total, "")
+        for label, call in tasks:
+            self._pool.start(_PrefetchWorker(generation, label, call, self._signals))
+
+    def _on_done(self, generation: int, label: str, ok: bool) -> None:
+        if generation != self._generation:
+            return
+        if ok:
+            self._ok += 1
+        else:
+            self._failed += 1
+        done = self._ok + self._failed
+        if done < self._total:
+            self._message = f"SRD prefetch: {done}/{self._total} — {label}"
+            self.progress.emit(done, self._total, label)
+            return
+        self._message = f"SRD cache warm: {self._ok} lookups" + (
+            f" ({self._failed} failed)" if self._failed else ""
+        )
+        self.progress.emit(done, self._total, label)
+        self.finished.emit(self._ok, self._failed)
@@ -0,0 +1,80 @@
+"""Dice source status — permanent status-bar label for the dice pool.
+
+Shows where rolls currently come from (quantum, random.org, or the local
+CSPRNG when both upstreams are unreachable), how many numbers are cached, and
+when an open circuit is next probed. The tooltip lists each upstream's
+circuit-breaker state.
+
+Pure PySide6 — no business logic. MainWindow polls
+`dnd_roller._entropy_status()` and passes the dict to `set_status()`.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from PySide6.QtWidgets import QLabel, QWidget
+
+# Same palette as the HP bar: accent = healthy, orange = degraded, red = offline.
+_COLOR_QUANTUM = "#448aff"
+_COLOR_RANDOM_ORG = "#ff7043"
+_COLOR_LOCAL = "#ff5252"
+_COLOR_UNKNOWN = "#8a8f96"
+
+_SOURCE_LABELS = {"quantumnumbers": "quantum", "random_org": "random.org"}
+
+
+class DiceSourceStatus(QLabel):
+    """Status-bar label for the dice pool.
+
+    Public API:
+      set_status(status: dict | None) — refresh from an `_entropy_status()`
+      snapshot; None means the roller isn't available.
+    """
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.mode: str | None = None
+        self.set_status(None)
+
+    def set_status(self, status: dict[str, Any] | None) -> None:
+        if not status:
+            self.mode = None
+            self._show("dice: unavailable", _COLOR_UNKNOWN, "Dice roller not loaded.")
+            return
+        self.mode = status.get("mode")
+        breakers = status.get("breakers", {})
+        depth = status.get("pool_depth")
+        cached = f" · {depth:,} cached" if depth is not None else ""  # None: ring not opened yet
+        if self.mode == "quantumnumbers":
+            text, color = f"⚛ quantum dice{cached}", _COLOR_QUANTUM
+        elif self.mode == "random_org":
+            text, color = f"random.org dice{cached}", _COLOR_RANDOM_ORG
+            retry = breakers.get("quantumnumbers", {}).get("retry_in_s")
+            if retry:
+                text += f" · quantum retry {retry:.0f}s"
+        else:
+            text, color = "local dice (offline)", _COLOR_LOCAL
+            retries = [b["retry_in_s"] for b in breakers.values() if b.get("retry_in_s")]
+            if retries:
+                text += f" · retry {min(retries):.0f}s"
+        self._show(text, color, self._tooltip(status))
+
+    @staticmethod
+    def _tooltip(status: dict[str, Any]) -> str:
+        lines = []
+        for name, breaker in status.get("breakers", {}).items():
+            label = _SOURCE_LABELS.get(name, name)
+            state = breaker.get("state", "?")
+            if state == "open":
+                state += f", {breaker.get('failures', 0)} failure(s), retry in {breaker.get('retry_in_s', 0):.0f}s"
+            lines.append(f"{label}: {state}")
+        local = status.get("local_numbers", 0)
+        if local:
+            lines.append(f"rolled locally this session: {local} dice")
+        return "\n".join(lines)
+
+    def _show(self, text: str, color: str, tooltip: str) -> None:
+        self.setText(text)
+        self.setStyleSheet(f"color: {color}; padding: 0 6px;")
+        self.setToolTip(tooltip)
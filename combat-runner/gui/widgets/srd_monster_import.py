@@ -1,6 +1,10 @@
 """SRD-monster import wizard.
 
 Search the SRD by name → pick a result → import as a `#combat-runner` NPC.
+The search box also takes `cr:`, `type:` and `size:` filter tokens
+(`troll cr:3-6`, `type:undead size:large`). Once the creature index exists
+(offline mirror synced, or built earlier this session by `encounter_budget`)
+searches run in-process against it; otherwise they go to `search_monsters`.
 Writes:
   - `world/.../<encounter-folder>/npcs/<slug>.md` (stub stat sheet)
   - one DB row per attack in the SRD entry (`single_attack` or `multiattack`)
@@ -22,6 +26,7 @@ from __future__ import annotations
 import importlib
 import re
 import sys
+from fractions import Fraction
 from pathlib import Path
 from typing import Any
 
@@ -58,6 +63,59 @@ def _get_db():
     return importlib.import_module("combat_actions_db")
 
 
+# ─────────── search ───────────
+
+_FILTER_TOKEN = re.compile(r"\b(cr|type|size):(\S+)", re.IGNORECASE)
+_MAX_INDEX_RESULTS = 50
+
+
+def _parse_cr(text: str) -> float:
+    return float(Fraction(text))
+
+
+def _parse_search(text: str) -> tuple[str, dict[str, Any]]:
+    """Split the search box into (name, search_monsters-style filters).
+
+    `goblin cr:1/4-1 type:humanoid` → ('goblin', {'cr_min': 0.25, 'cr_max': 1.0,
+    'type': 'humanoid'}). Malformed CR tokens are dropped rather than failing
+    the search."""
+    filters: dict[str, Any] = {}
+    for field, value in _FILTER_TOKEN.findall(text):
+        field = field.lower()
+        if field != "cr":
+            filters[field] = value.lower()
+            continue
+        lo, _, hi = value.partition("-")
+        try:
+            filters["cr_min"] = _parse_cr(lo)
+            filters["cr_max"] = _parse_cr(hi) if hi else filters["cr_min"]
+        except (ValueError, ZeroDivisionError):
+            filters.pop("cr_min", None)
+    name = " ".join(_FILTER_TOKEN.sub(" ", text).split())
+    return name, filters
+
+
+def _search_creatures(srd: Any, text: str) -> list[dict[str, Any]]:
+    """Full creature records matching the search box. Uses the in-memory
+    creature index when one is already available (never builds it here — a
+    live build would stream every creature on the GUI thread)."""
+    name, filters = _parse_search(text)
+    index = srd.get_creature_index(fetch_live=False)
+    if index is None:
+        payload = srd.search_monsters(name=name or None, **filters)
+        return payload.get("results", []) if isinstance(payload, dict) else []
+    mask = index.mask(
+        name=name or None,
+        cr_min=filters.get("cr_min"),
+        cr_max=filters.get("cr_max"),
+        types=[filters["type"]] if "type" in filters else None,
+        sizes=[filters["size"]] if "size" in filters else None,
+    )
+    spec = srd.DEFAULT_PRIORITY_SRD
+    rows = index.ranked(mask, prefer=spec.prefer, demote=spec.demote)
+    return [index.records[r] for r in rows[:_MAX_INDEX_RESULTS]]
+
+
 # ─────────── attack mapping ───────────
 
 def _slugify(name: str) -> str:
@@ -205,11 +263,13 @@ def _build_md_frontmatter(monster: dict[str, Any], location: str, count: int = 1
     tag_block = ", ".join(f'"{t}"' for t in tags)
 
     count_field = f"count: {count}\n" if count > 1 else ""
+    # Lets the launch-time SRD prefetch warm this creature's stat block.
+    key_field = f"srd_key: {monster['key']}\n" if monster.get("key") else ""
 
     return f"""---
 name: {name}
 created: imported-from-srd
-status: active
+{key_field}status: active
 location: {location}
 {count_field}tags: [{tag_block}]
 ---
@@ -262,7 +322,7 @@ class SrdMonsterImportDialog(QDialog):
         search_row = QHBoxLayout()
         search_row.addWidget(QLabel("Search:"))
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("goblin · troll · frost giant · ...")
+        self.search_input.setPlaceholderText("goblin · troll cr:3-6 · type:undead size:large · ...")
         self.search_input.returnPressed.connect(self._run_search)
         search_row.addWidget(self.search_input, 1)
         root.addLayout(search_row)
@@ -324,12 +384,10 @@ class SrdMonsterImportDialog(QDialog):
         if not q:
             return
         try:
-            srd = _get_srd()
-            payload = srd.search_monsters(name=q)
+            hits = _search_creatures(_get_srd(), q)
         except Exception as exc:  # noqa: BLE001
             QMessageBox.warning(self, "Search failed", str(exc))
             return
-        hits = payload.get("results", []) if isinstance(payload, dict) else []
         self._last_results = hits
         self.results.clear()
         for h in hits:
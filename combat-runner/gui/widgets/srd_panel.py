@@ -6,12 +6,17 @@ View → SRD Search). Input box, a result list, and a markdown preview.
 Routing:
   - `spell: name` → search_spells(name=...)
   - `cond: name` → list_conditions(name=...)
-  - bare text → search_rules(query=...)
+  - bare text → fan-out: spells, conditions, rules, creatures and magic items
+    at once via iter_search_fanout(...), merged by match score
   - empty → clears
 
 The functions are imported lazily from `scripts/srd5_2.py` (in-process; no
-MCP transport overhead). Synchronous — the lookups are disk-cached and
-millisecond-fast for cache hits.
+MCP transport overhead). The prefixed lookups are synchronous — disk-cached
+and millisecond-fast for cache hits. The fan-out runs on a worker thread and
+fills the list progressively: the fastest source's hits show up first, later
+sources merge in by score, and a source that misses its deadline is named in
+the status line instead of holding up the rest. A newer search bumps a
+generation counter so batches from the previous one are dropped.
 """
 
 from __future__ import annotations
@@ -21,7 +26,7 @@ import sys
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QObject, QRunnable, Qt, QThreadPool, Signal
 from PySide6.QtWidgets import (
     QDockWidget,
     QLabel,
@@ -35,6 +40,10 @@ from PySide6.QtWidgets import (
 
 _REPO_ROOT = Path(__file__).resolve().parents[3]
 
+# Per-source hits asked of the fan-out, and rows kept in the merged list.
+_FANOUT_LIMIT = 10
+_MAX_ROWS = 40
+
 
 def _get_srd():
     """Lazy import scripts/srd5_2 so the GUI boot doesn't pay for chromadb."""
@@ -44,6 +53,60 @@ def _get_srd():
     return importlib.import_module("srd5_2")
 
 
+class _SearchSignals(QObject):
+    """Signals for fan-out workers (a QRunnable can't own signals). Batches
+    carry the requesting panel's id and generation so each panel keeps only
+    its latest search."""
+
+    batch = Signal(object, int, object)  # (panel key, generation, fan-out batch dict)
+    finished = Signal(object, int)       # (panel key, generation)
+
+
+# Process-lifetime, like the pool: a fan-out can outlive the panel that asked
+# for it, and emitting on a QObject already torn down with the panel crashes.
+_SEARCH_SIGNALS: _SearchSignals | None = None
+_SEARCH_POOL: QThreadPool | None = None
+
+
+def _search_signals() -> _SearchSignals:
+    global _SEARCH_SIGNALS
+    if _SEARCH_SIGNALS is None:
+        _SEARCH_SIGNALS = _SearchSignals()
+    return _SEARCH_SIGNALS
+
+
+def _search_pool() -> QThreadPool:
+    # The per-source parallelism lives in srd5_2's own executor; this pool
+    # only needs room for a new search while the previous one drains.
+    global _SEARCH_POOL
+    if _SEARCH_POOL is None:
+        _SEARCH_POOL = QThreadPool()
+        _SEARCH_POOL.setMaxThreadCount(2)
+    return _SEARCH_POOL
+
+
+class _FanoutWorker(QRunnable):
+    """Drives one `iter_search_fanout` and forwards each batch as it lands."""
+
+    def __init__(self, key: int, generation: int, query: str, signals: _SearchSignals) -> None:
+        super().__init__()
+        self._key = key
+        self._generation = generation
+        self._query = query
+        self._signals = signals
+        self.setAutoDelete(True)
+
+    def run(self) -> None:
+        try:
+            for batch in _get_srd().iter_search_fanout(self._query, limit=_FANOUT_LIMIT):
+                self._signals.batch.emit(self._key, self._generation, batch)
+        except Exception as exc:  # noqa: BLE001
+            self._signals.batch.emit(self._key, self._generation, {
+                "kind": "search", "status": "error", "error": str(exc), "results": [],
+            })
+        self._signals.finished.emit(self._key, self._generation)
+
+
 class SrdSearchPanel(QWidget):
     """The widget shown inside the dock. Standalone QWidget so it can also
     be embedded elsewhere or in tests."""
@@ -54,12 +117,12 @@ class SrdSearchPanel(QWidget):
         layout.setContentsMargins(6, 6, 6, 6)
         layout.setSpacing(4)
 
-        hint = QLabel("<i>Try: <code>fireball</code> · <code>spell: fly</code> · <code>cond: charmed</code></i>")
+        hint = QLabel("<i>Try: <code>fly</code> · <code>spell: fly</code> · <code>cond: charmed</code></i>")
         hint.setStyleSheet("color: #6c8eba; font-size: 10px;")
         layout.addWidget(hint)
 
         self.input = QLineEdit()
-        self.input.setPlaceholderText("Search rules · spells · conditions…")
+        self.input.setPlaceholderText("Search spells · conditions · rules · creatures · items…")
         self.input.returnPressed.connect(self._run_search)
         layout.addWidget(self.input)
 
@@ -68,6 +131,11 @@ class SrdSearchPanel(QWidget):
         self.results.setMaximumHeight(180)
         layout.addWidget(self.results)
 
+        # Fan-out progress: which sources answered / timed out.
+        self.status = QLabel("")
+        self.status.setStyleSheet("color: #6c8eba; font-size: 10px;")
+        layout.addWidget(self.status)
+
         self.detail = QTextBrowser()
         self.detail.setStyleSheet(
             "background: #14171b; color: #b8bdc4; border: 1px solid #2a2f38; "
@@ -77,33 +145,41 @@ class SrdSearchPanel(QWidget):
 
         # Cache the last result set so click-to-detail doesn't refetch
         self._last_results: list[dict[str, Any]] = []
-        self._last_kind: str = ""  # "spell" | "condition" | "rule"
+        self._last_kind: str = ""  # "spell" | "condition" | "any"
+
+        # Fan-out bookkeeping — see module docstring.
+        self._generation = 0
+        self._sources: dict[str, str] = {}
+        signals = _search_signals()
+        signals.batch.connect(self._on_fanout_batch)
+        signals.finished.connect(self._on_fanout_finished)
 
     # ─────────── search dispatch ───────────
 
     def _run_search(self) -> None:
         text = self.input.text().strip()
+        self._generation += 1  # any earlier fan-out is now stale
+        self.status.clear()
         if not text:
             self.results.clear()
             self.detail.clear()
             return
+
+        kind, query = self._classify(text)
+        if kind == "any":
+            self._start_fanout(query)
+            return
         try:
             srd = _get_srd()
         except Exception as exc:  # noqa: BLE001
             self.detail.setMarkdown(f"**SRD module failed to load:** `{exc}`")
             return
-
-        kind, query = self._classify(text)
         try:
             if kind == "spell":
                 payload = srd.search_spells(name=query)
-                hits = payload.get("results", []) if isinstance(payload, dict) else []
-            elif kind == "condition":
-                payload = srd.list_conditions(name=query, source="core,a5e-ag")
-                hits = payload.get("results", []) if isinstance(payload, dict) else []
             else:
-                payload = srd.search_rules(query=query)
-                hits = payload.get("results", []) if isinstance(payload, dict) else []
+                payload = srd.list_conditions(name=query, source="core,a5e-ag")
+            hits = payload.get("results", []) if isinstance(payload, dict) else []
         except Exception as exc:  # noqa: BLE001
             self.detail.setMarkdown(f"**Search failed:** `{exc}`")
             return
@@ -111,17 +187,71 @@ class SrdSearchPanel(QWidget):
         self._last_results = hits
         self._last_kind = kind
         self.results.clear()
+        self._show_results()
         if not hits:
             self.detail.setMarkdown(f"*No {kind} matches for `{query}`.*")
+
+    def _start_fanout(self, query: str) -> None:
+        self._last_results = []
+        self._last_kind = "any"
+        self._sources = {}
+        self.results.clear()
+        self.detail.setMarkdown(f"*Searching for `{query}`…*")
+        _search_pool().start(_FanoutWorker(id(self), self._generation, query, _search_signals()))
+
+    def _on_fanout_batch(self, key: int, generation: int, batch: dict[str, Any]) -> None:
+        if key != id(self) or generation != self._generation:
+            return
+        self._sources[batch.get("kind", "?")] = batch.get("status", "ok")
+        self._update_status(done=False)
+        if batch.get("status") == "error" and batch.get("kind") == "search":
+            self.detail.setMarkdown(f"**Search failed:** `{batch.get('error')}`")
             return
-        for h in hits[:40]:
+        hits = batch.get("results") or []
+        if not hits:
+            return
+        merged = self._last_results + hits
+        merged.sort(key=lambda h: -float(h.get("match_score") or 0.0))
+        self._last_results = merged[:_MAX_ROWS]
+        self._show_results()
+
+    def _on_fanout_finished(self, key: int, generation: int) -> None:
+        if key != id(self) or generation != self._generation:
+            return
+        self._update_status(done=True)
+        if not self._last_results and "search" not in self._sources:
+            self.detail.setMarkdown(f"*No matches for `{self.input.text().strip()}`.*")
+
+    def _update_status(self, done: bool) -> None:
+        late = [k for k, st in self._sources.items() if st == "timeout"]
+        failed = [k for k, st in self._sources.items() if st == "error" and k != "search"]
+        parts = [f"{len(self._sources)} sources answered" if done else f"{len(self._sources)} sources in…"]
+        if late:
+            parts.append("timed out: " + ", ".join(late))
+        if failed:
+            parts.append("failed: " + ", ".join(failed))
+        self.status.setText(" · ".join(parts))
+
+    def _show_results(self) -> None:
+        """(Re)fill the list from `_last_results`. Keeps the row the DM is
+        reading selected when later fan-out batches re-sort the list; with no
+        selection yet, auto-opens the top hit."""
+        current = self.results.currentItem()
+        selected = current.data(Qt.ItemDataRole.UserRole) if current is not None else None
+        self.results.clear()
+        reselect = -1
+        for row, h in enumerate(self._last_results[:_MAX_ROWS]):
             label = h.get("name") or h.get("key") or "(unnamed)"
-            extra = self._extra_label(h, kind)
-            item = QListWidgetItem(f"{label}{extra}")
+            kind = h.get("kind") or self._last_kind
+            tag = f"  [{kind}]" if "kind" in h else ""
+            item = QListWidgetItem(f"{label}{tag}{self._extra_label(h, kind)}")
             item.setData(Qt.ItemDataRole.UserRole, h)
             self.results.addItem(item)
-        # Auto-open the first result
-        if self.results.count() > 0:
+            if selected is not None and h is selected:
+                reselect = row
+        if reselect >= 0:
+            self.results.setCurrentRow(reselect)
+        elif self.results.count() > 0:
             self.results.setCurrentRow(0)
             self._render_detail(self._last_results[0])
 
@@ -133,7 +263,7 @@ class SrdSearchPanel(QWidget):
             return ("spell", text[6:].strip())
         if low.startswith("cond:") or low.startswith("condition:"):
             return ("condition", text.split(":", 1)[1].strip())
-        return ("rule", text)
+        return ("any", text)
 
     @staticmethod
     def _extra_label(entry: dict[str, Any], kind: str) -> str:
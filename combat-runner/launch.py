@@ -601,13 +601,14 @@ def _prewarm(repo_root: Path) -> None:
         start_new_session=True,
     )
 
-    # 2. Warm the quantum dice cache so the first roll doesn't pay an API call.
-    #    Imports dnd_roller and asks for a single number; it'll batch-fetch 1024.
+    # 2. Warm the quantum dice pool so the first roll doesn't wait on a refill.
+    #    Runs one round of dnd_roller's refill (to its high watermark) and exits;
+    #    the MCP server's own refill thread keeps it topped up after that.
     subprocess.Popen(
         [str(venv_python), "-c",
-         "import sys, asyncio; sys.path.insert(0, 'scripts'); "
+         "import sys; sys.path.insert(0, 'scripts'); "
          "import dnd_roller; "
-         "asyncio.run(dnd_roller._ensure_numbers(1))"],
+         "dnd_roller._get_refiller().fill()"],
         cwd=str(repo_root),
         env=os.environ.copy(),
         stdout=subprocess.DEVNULL,
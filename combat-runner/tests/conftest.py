@@ -5,10 +5,15 @@
 - Provides `sample_encounter` and `sample_npc` fixtures that build minimal
   EncounterState / NPCState instances for unit tests without needing the
   actual .md / actions.jsonl files.
+- Isolates every test from the real dice pool (autouse `isolated_dice_pool`):
+  ~/.cache/dnd_roller is never touched and no upstream is ever contacted.
+- Redirects session logs and auto-saves (autouse `isolated_memory_dir`) to
+  tmp_path, so a test run never writes under combat-runner/.memory/.
 """
 
 from __future__ import annotations
 
+import importlib
 import os
 import sys
 from pathlib import Path
@@ -27,6 +32,53 @@ if str(_GUI_ROOT) not in sys.path:
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def isolated_dice_pool(tmp_path, monkeypatch):
+    """Point dnd_roller at a per-test pool under tmp_path and cut it off from
+    the network. Covers both copies of the module: the one NPCTab / MainWindow
+    load via `_get_roller()` and the `dnd_roller` import llm_controller uses.
+    Both upstream fetches report failure, so a roll on an empty pool trips the
+    circuit breakers and rolls locally instead of calling random.org."""
+    from gui.npc_tab import _get_roller
+
+    roller = _get_roller()  # also puts scripts/ on sys.path
+    modules = [roller, importlib.import_module("dnd_roller")]
+    cache_dir = tmp_path / "dnd_roller"
+
+    async def no_quantum(count):
+        return None
+
+    for mod in modules:
+        monkeypatch.setattr(mod, "_RING_FILE", cache_dir / "quant_ring.bin")
+        monkeypatch.setattr(mod, "_REFILL_LOCK_FILE", cache_dir / "quant_refill.lock")
+        monkeypatch.setattr(mod, "_CACHE_FILE", cache_dir / "quant_numbers.bin")
+        monkeypatch.setattr(mod, "_refill_lock", mod._RefillLock(cache_dir / "quant_refill.lock"))
+        monkeypatch.setattr(mod, "_pool", None)
+        monkeypatch.setattr(mod, "_refiller", None)
+        monkeypatch.setattr(mod, "_breakers", {name: mod._CircuitBreaker(name) for name in mod._SOURCE_TAGS})
+        monkeypatch.setattr(mod, "_start_refill", lambda: None)
+        monkeypatch.setattr(mod, "_fetch_from_quantumnumbers", no_quantum)
+        monkeypatch.setattr(mod, "_fetch_from_random_org_sync", lambda count: [])
+    yield
+    for mod in modules:
+        if mod._refiller is not None:
+            mod._refiller.stop()
+        if mod._pool is not None:
+            mod._pool.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_memory_dir(tmp_path, monkeypatch):
+    """Point the per-encounter log / auto-save directory at tmp_path."""
+    import gui.app
+    import gui.main_window
+
+    memory = tmp_path / "memory"
+    monkeypatch.setattr(gui.app, "_MEMORY_DIR", memory)
+    monkeypatch.setattr(gui.main_window, "_MEMORY_DIR", memory)
+    return memory
+
+
 @pytest.fixture
 def sample_npc():
     """Single-creature NPC. Mirrors glacier-stalker for tests."""
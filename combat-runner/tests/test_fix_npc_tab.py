@@ -8,9 +8,9 @@ Fix 1 — slot `refresh` modes silently never refill.
 
 Fix 2 — action dispatch could freeze the UI on a network dice fetch.
   The synchronous roll on the UI thread drains a quantum-RNG cache; on drain
-  it blocks on a network fetch. The tab now pre-warms the cache off-thread
-  via a QThreadPool/QRunnable so the synchronous roll always hits a warm
-  cache and never has to fetch.
+  it blocked on a network fetch. dnd_roller now refills the pool on its own
+  background thread and a roll never fetches; the tab just starts that refill
+  when it opens.
 """
 
 from __future__ import annotations
@@ -18,12 +18,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from gui.event_bus import EventBus, round_event
-from gui.npc_tab import (
-    _ROUND_REFRESH_MODES,
-    NPCTab,
-    _CachePrewarmWorker,
-    _PrewarmSignals,
-)
+from gui.npc_tab import _ROUND_REFRESH_MODES, NPCTab
 from gui.state import NPCState
 
 
@@ -118,63 +113,25 @@ def test_round_event_mixed_modes_only_round_refills(qtbot):
     assert tab.npc_state.slots_remaining["avalanche"] == 0    # untouched
 
 
-# ───────── Fix 2: background dice-cache pre-warm ─────────
+# ───────── Fix 2: background dice-pool refill ─────────
 
-def test_prewarm_worker_runs_offthread_without_blocking(qtbot):
-    """The pre-warm worker tops up the dice cache on a worker thread and emits
-    `done` back on the GUI thread. Network failure must degrade gracefully —
-    `done` still fires (with ok=False), never an unhandled exception."""
-    signals = _PrewarmSignals()
-    results: list[bool] = []
-    signals.done.connect(results.append)
-
-    worker = _CachePrewarmWorker(target=8, signals=signals)
-    # Run directly (QRunnable.run is just a method) — exercises the offline-safe
-    # path: even if the network is down, run() must not raise.
-    worker.run()
-
-    qtbot.waitUntil(lambda: len(results) == 1, timeout=15000)
-    assert isinstance(results[0], bool)
-
-
-def test_run_action_triggers_prewarm_when_cache_low(qtbot, monkeypatch):
-    """After a roll, a low cache must kick off exactly one background pre-warm;
-    the roll itself stays synchronous and is never blocked."""
+def test_tab_starts_the_roller_refill(qtbot, monkeypatch):
+    """Opening a tab starts dnd_roller's background refill, so the pool is warm
+    before the first roll; the roll itself stays synchronous."""
     import gui.npc_tab as npc_tab_mod
 
-    actions = [{"npc": "frost-yeti", "action": "bite", "type": "single_attack", "verbs": ["bite"]}]
-    tab = _tab(qtbot, actions)
-
-    # Pretend the roll itself succeeded with trivial output.
-    monkeypatch.setattr(
-        npc_tab_mod._get_roller(),
-        "roll_combat_action",
-        lambda **kw: '{"output": "bite hits"}',
-    )
-    # Force a "low cache" reading and capture pre-warm submissions.
-    monkeypatch.setattr(tab, "_cache_level", lambda: 0)
-    started: list[object] = []
-    monkeypatch.setattr(npc_tab_mod, "_PREWARM_IN_FLIGHT", False)
-    monkeypatch.setattr(
-        npc_tab_mod._prewarm_pool(), "start", lambda w: started.append(w)
-    )
-
-    tab._run_action("bite")
+    started: list[bool] = []
+    monkeypatch.setattr(npc_tab_mod._get_roller(), "_start_refill", lambda: started.append(True))
+    _tab(qtbot, [])
+    assert started == [True]
 
-    assert len(started) == 1
-    assert isinstance(started[0], npc_tab_mod._CachePrewarmWorker)
 
-
-def test_prewarm_noops_when_cache_is_warm(qtbot, monkeypatch):
-    """A healthy cache must not spawn a pre-warm worker — no wasted fetches."""
+def test_tab_opens_when_refill_cannot_start(qtbot, monkeypatch):
+    """A broken roller must not stop the tab from opening."""
     import gui.npc_tab as npc_tab_mod
 
-    tab = _tab(qtbot, [])
-    monkeypatch.setattr(tab, "_cache_level", lambda: 10_000)  # well above low-water
-    started: list[object] = []
-    monkeypatch.setattr(npc_tab_mod, "_PREWARM_IN_FLIGHT", False)
-    monkeypatch.setattr(npc_tab_mod._prewarm_pool(), "start", lambda w: started.append(w))
-
-    tab._maybe_prewarm_cache()
+    def boom():
+        raise OSError("no cache dir")
 
-    assert started == []
+    monkeypatch.setattr(npc_tab_mod._get_roller(), "_start_refill", boom)
+    assert _tab(qtbot, []).npc_state.slug == "frost-yeti"
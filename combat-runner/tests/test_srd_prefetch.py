@@ -0,0 +1,183 @@
+"""Encounter-scoped SRD prefetch — scanning NPC files / action rows, and the
+background prefetcher driving a fake srd module (no network)."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from gui.encounter_picker import DiscoveredEncounter, DiscoveredNPC
+from gui.srd_prefetch import SrdPrefetcher, plan_tasks, scan_encounter
+
+_CASTER_MD = """---
+name: Hedge Witch
+srd_key: srd-2024_mage
+tags: ["#combat-runner"]
+---
+# Hedge Witch
+
+Her familiar is a srd-2024_raven.
+
+## Spellwork
+
+- **Hold Person** — binds the first debtor.
+- **Hex**
+  - Hex curses a target; it can leave them **frightened** of her.
+
+## Tactics
+
+- **Retreat** — not a spell, just running away.
+"""
+
+_ROWS = [
+    {"npc": "hedge-witch", "action": "fire_bolt", "verbs": ["fire bolt", "cantrip"],
+     "narration": "A mote of fire."},
+    {"npc": "hedge-witch", "action": "shove", "verbs": ["shove"],
+     "effect": "Target is knocked prone."},
+    {"npc": "_global", "action": "grapple", "scope": "global", "verbs": ["grapple"],
+     "effect": "Use `@grappled` on the target."},
+    {"npc": "someone-else", "action": "counterspell", "verbs": ["counterspell"],
+     "effect": "Leaves the caster stunned."},
+]
+
+
+@pytest.fixture
+def encounter(tmp_path: Path) -> DiscoveredEncounter:
+    npcs = tmp_path / "npcs"
+    npcs.mkdir()
+    md = npcs / "hedge-witch.md"
+    md.write_text(_CASTER_MD, encoding="utf-8")
+    return DiscoveredEncounter(
+        name="witch-hut", root=tmp_path,
+        npcs=[DiscoveredNPC(slug="hedge-witch", name="Hedge Witch", md_path=md)],
+        latest_mtime=0.0,
+    )
+
+
+class _FakeSrd:
+    def __init__(self, fail: set[str] = frozenset()):
+        self.calls: list[tuple] = []
+        self._fail = fail
+        self._lock = threading.Lock()
+
+    def _record(self, call):
+        with self._lock:
+            self.calls.append(call)
+        if call[1] in self._fail:
+            raise ValueError("SRD API: no record")
+        return {"results": []}
+
+    def get_monster_details(self, key):
+        return self._record(("monster", key))
+
+    def search_spells(self, name=None):
+        return self._record(("spell", name))
+
+    def list_conditions(self, name=None, source=None):
+        return self._record(("condition", name, source))
+
+
+def test_scan_collects_keys_spells_and_conditions(encounter):
+    plan = scan_encounter(encounter, _ROWS)
+    assert plan.monster_keys == ["srd-2024_mage", "srd-2024_raven"]
+    assert plan.spells == ["Hold Person", "Hex", "Fire Bolt"]
+    # Own rows + global rows only — 'stunned' belongs to another NPC's row.
+    assert sorted(plan.conditions) == ["frightened", "grappled", "prone"]
+
+
+def test_tasks_use_the_llm_tool_call_shapes(encounter):
+    srd = _FakeSrd()
+    for _, call in plan_tasks(scan_encounter(encounter, _ROWS), srd):
+        call()
+    assert ("spell", "Hold Person") in srd.calls
+    assert ("condition", "prone", "core,a5e-ag") in srd.calls
+
+
+def test_prefetcher_reports_progress_and_finishes(qtbot, encounter):
+    srd = _FakeSrd(fail={"srd-2024_raven"})
+    prefetcher = SrdPrefetcher(srd_loader=lambda: srd, actions_rows=lambda: _ROWS)
+    seen: list[tuple[int, int]] = []
+    prefetcher.progress.connect(lambda done, total, label: seen.append((done, total)))
+    with qtbot.waitSignal(prefetcher.finished, timeout=5000) as blocker:
+        prefetcher.start(encounter)
+        assert prefetcher.is_running() and prefetcher.message() == "SRD prefetch: scanning…"
+    assert blocker.args == [7, 1]
+    assert seen[0] == (0, 8) and seen[-1] == (8, 8)
+    assert prefetcher.message() == "SRD cache warm: 7 lookups (1 failed)"
+    assert not prefetcher.is_running()
+    # Re-selecting the same encounter doesn't re-queue anything.
+    prefetcher.start(encounter)
+    qtbot.wait(50)
+    assert len(srd.calls) == 8 and not prefetcher.is_running()
+    prefetcher.shutdown()
+
+
+def test_cancel_resets_progress(qtbot, encounter):
+    gate = threading.Event()
+    srd = _FakeSrd()
+    record = srd._record
+    srd._record = lambda call: gate.wait(5) and record(call)
+    prefetcher = SrdPrefetcher(max_threads=1, srd_loader=lambda: srd, actions_rows=lambda: _ROWS)
+    prefetcher.start(encounter)
+    qtbot.waitUntil(lambda: prefetcher.message() == "SRD prefetch: 0/8", timeout=5000)
+    assert prefetcher.is_running()
+    prefetcher.cancel()
+    assert not prefetcher.is_running() and prefetcher.message() == ""
+    gate.set()
+    prefetcher.shutdown()
+    qtbot.wait(50)  # deliver the in-flight lookup's late result
+    assert not prefetcher.is_running() and prefetcher.message() == ""
+
+
+def test_scan_failure_never_raises(qtbot, encounter):
+    def broken():
+        raise ImportError("no srd5_2 here")
+
+    prefetcher = SrdPrefetcher(srd_loader=broken, actions_rows=lambda: _ROWS)
+    prefetcher.start(encounter)
+    qtbot.waitUntil(lambda: not prefetcher.is_running(), timeout=5000)
+    assert prefetcher.message() == ""
+    prefetcher.shutdown()
+
+
+def test_scan_and_srd_import_stay_off_the_gui_thread(qtbot, encounter):
+    gui_thread = threading.current_thread()
+    seen: list[threading.Thread] = []
+
+    def loader():
+        seen.append(threading.current_thread())
+        return _FakeSrd()
+
+    def rows():
+        seen.append(threading.current_thread())
+        return _ROWS
+
+    prefetcher = SrdPrefetcher(srd_loader=loader, actions_rows=rows)
+    with qtbot.waitSignal(prefetcher.finished, timeout=5000):
+        prefetcher.start(encounter)
+    assert len(seen) == 2 and gui_thread not in seen
+    prefetcher.shutdown()
+
+
+def test_picker_shows_prefetch_status(qtbot, monkeypatch, encounter):
+    import gui.encounter_picker as picker_mod
+
+    monkeypatch.setattr(picker_mod, "discover_encounters", lambda: [encounter])
+    monkeypatch.setattr(picker_mod, "_REPO_ROOT", encounter.root.parent)
+    srd = _FakeSrd()
+    prefetcher = SrdPrefetcher(srd_loader=lambda: srd, actions_rows=lambda: _ROWS)
+    with qtbot.waitSignal(prefetcher.finished, timeout=5000):
+        picker = picker_mod.EncounterPicker(prefetcher=prefetcher)
+        qtbot.addWidget(picker)
+    assert picker.status_bar.currentMessage() == "SRD cache warm: 8 lookups"
+    prefetcher.shutdown()
+
+
+def test_picker_without_prefetcher_has_quiet_status_bar(qtbot):
+    from gui.encounter_picker import EncounterPicker
+    picker = EncounterPicker()
+    qtbot.addWidget(picker)
+    assert picker.status_bar.currentMessage() == ""
+
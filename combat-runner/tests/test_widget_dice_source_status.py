@@ -0,0 +1,45 @@
+"""Dice source status widget tests — needs qtbot (pytest-qt)."""
+
+from __future__ import annotations
+
+from gui.widgets.dice_source_status import DiceSourceStatus
+
+
+def _status(mode, *, quantum="closed", random_org="closed", retry=0.0, **extra):
+    breaker = lambda state: {"state": state, "failures": 1 if state == "open" else 0,  # noqa: E731
+                             "opened": 0, "retry_in_s": retry if state == "open" else 0.0}
+    return {"mode": mode, "pool_depth": 1840, "local_numbers": 0,
+            "breakers": {"quantumnumbers": breaker(quantum), "random_org": breaker(random_org)}, **extra}
+
+
+def test_unavailable_roller(qtbot):
+    label = DiceSourceStatus()
+    qtbot.addWidget(label)
+    assert label.text() == "dice: unavailable" and label.mode is None
+
+
+def test_quantum_mode(qtbot):
+    label = DiceSourceStatus()
+    qtbot.addWidget(label)
+    label.set_status(_status("quantumnumbers"))
+    assert label.text() == "⚛ quantum dice · 1,840 cached"
+    assert label.toolTip() == "quantum: closed\nrandom.org: closed"
+    label.set_status(_status("quantumnumbers", pool_depth=None))  # ring not opened yet
+    assert label.text() == "⚛ quantum dice"
+
+
+def test_random_org_mode_shows_quantum_retry(qtbot):
+    label = DiceSourceStatus()
+    qtbot.addWidget(label)
+    label.set_status(_status("random_org", quantum="open", retry=42.4))
+    assert label.text() == "random.org dice · 1,840 cached · quantum retry 42s"
+    assert "quantum: open, 1 failure(s), retry in 42s" in label.toolTip()
+
+
+def test_local_mode_when_both_circuits_open(qtbot):
+    label = DiceSourceStatus()
+    qtbot.addWidget(label)
+    label.set_status(_status("local", quantum="open", random_org="open", retry=12, local_numbers=7))
+    assert label.text() == "local dice (offline) · retry 12s"
+    assert "#ff5252" in label.styleSheet()
+    assert label.toolTip().endswith("rolled locally this session: 7 dice")
@@ -0,0 +1,60 @@
+"""SRD monster import search — filter-token parsing and the creature-index
+path vs. the search_monsters fallback (fake srd module, no network)."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from gui.widgets.srd_monster_import import _parse_search, _search_creatures
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import srd_creatures  # noqa: E402
+
+
+def _creature(key, name, cr, type_="humanoid", doc="srd-2024"):
+    return {"key": key, "name": name, "challenge_rating_decimal": str(cr),
+            "type": {"key": type_}, "size": {"key": "medium"}, "document": {"key": doc}}
+
+
+_PRIORITY = SimpleNamespace(prefer=("srd-2024",), demote=("srd-2014",))
+
+
+def test_parse_search_splits_name_and_filter_tokens():
+    assert _parse_search("goblin cr:1/4-1 type:Humanoid") == (
+        "goblin", {"cr_min": 0.25, "cr_max": 1.0, "type": "humanoid"},
+    )
+    assert _parse_search("cr:5") == ("", {"cr_min": 5.0, "cr_max": 5.0})
+    assert _parse_search("troll cr:x") == ("troll", {})
+
+
+def test_search_uses_index_when_available():
+    index = srd_creatures.CreatureIndex([
+        _creature("srd-2014_goblin", "Goblin", 0.25, doc="srd-2014"),
+        _creature("srd-2024_goblin", "Goblin", 0.25),
+        _creature("srd-2024_ghoul", "Ghoul", 1, type_="undead"),
+    ])
+
+    def no_remote(**kwargs):
+        raise AssertionError("index path must not call search_monsters")
+
+    srd = SimpleNamespace(
+        get_creature_index=lambda fetch_live: index,
+        search_monsters=no_remote,
+        DEFAULT_PRIORITY_SRD=_PRIORITY,
+    )
+    assert [h["key"] for h in _search_creatures(srd, "gob cr:0-1")] == ["srd-2024_goblin"]
+    assert [h["key"] for h in _search_creatures(srd, "type:undead")] == ["srd-2024_ghoul"]
+
+
+def test_search_falls_back_to_search_monsters_without_index():
+    calls = []
+    srd = SimpleNamespace(
+        get_creature_index=lambda fetch_live: None,
+        search_monsters=lambda **kw: calls.append(kw) or {"results": [{"name": "Troll"}]},
+        DEFAULT_PRIORITY_SRD=_PRIORITY,
+    )
+    assert _search_creatures(srd, "troll cr:5") == [{"name": "Troll"}]
+    assert calls == [{"name": "troll", "cr_min": 5.0, "cr_max": 5.0}]
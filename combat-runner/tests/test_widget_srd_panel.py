@@ -0,0 +1,63 @@
+"""SRD search panel — prefixed lookups stay synchronous, bare text fans out on a
+worker and merges batches into the list as they land (fake srd module)."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import gui.widgets.srd_panel as srd_panel
+from gui.widgets.srd_panel import SrdSearchPanel
+
+
+def _batch(kind, *hits, status="ok"):
+    return {"kind": kind, "status": status, "ms": 1,
+            "results": [{"kind": kind, **h} for h in hits]}
+
+
+def _panel(qtbot, monkeypatch, srd):
+    monkeypatch.setattr(srd_panel, "_get_srd", lambda: srd)
+    panel = SrdSearchPanel()
+    qtbot.addWidget(panel)
+    return panel
+
+
+def _labels(panel):
+    return [panel.results.item(i).text() for i in range(panel.results.count())]
+
+
+def test_bare_text_merges_fanout_batches_by_score(qtbot, monkeypatch):
+    srd = SimpleNamespace(iter_search_fanout=lambda query, limit: iter([
+        _batch("condition", {"name": "Flying", "match_score": 0.8}),
+        _batch("spell", {"name": "Fly", "match_score": 1.0, "level": 3}),
+        _batch("rule", status="timeout"),
+    ]))
+    panel = _panel(qtbot, monkeypatch, srd)
+    panel.input.setText("fly")
+    panel._run_search()
+    qtbot.waitUntil(lambda: panel.status.text().startswith("3 sources answered"), timeout=5000)
+    assert _labels(panel) == ["Fly  [spell]  · level 3", "Flying  [condition]"]
+    assert "timed out: rule" in panel.status.text()
+
+
+def test_newer_search_drops_stale_batches(qtbot, monkeypatch):
+    srd = SimpleNamespace(iter_search_fanout=lambda query, limit: iter([]))
+    panel = _panel(qtbot, monkeypatch, srd)
+    panel.input.setText("fly")
+    panel._run_search()
+    stale = panel._generation
+    panel._run_search()
+    panel._on_fanout_batch(id(panel), stale, _batch("spell", {"name": "Fly", "match_score": 1.0}))
+    assert panel.results.count() == 0
+
+
+def test_prefixed_lookup_stays_synchronous(qtbot, monkeypatch):
+    calls = []
+    srd = SimpleNamespace(
+        list_conditions=lambda **kw: calls.append(kw) or {"results": [{"name": "Charmed"}]},
+        iter_search_fanout=lambda query, limit: (_ for _ in ()).throw(AssertionError("no fan-out")),
+    )
+    panel = _panel(qtbot, monkeypatch, srd)
+    panel.input.setText("cond: charmed")
+    panel._run_search()
+    assert calls == [{"name": "charmed", "source": "core,a5e-ag"}]
+    assert _labels(panel) == ["Charmed"]
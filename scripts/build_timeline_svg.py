@@ -25,6 +25,7 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from scripts.mcp_progress import report_progress
 from scripts.timeline_svg.model import BuildConfig, FontPaths, MeasureConfig, RendererConfig
 
 # Knobs
@@ -113,6 +114,7 @@ def main() -> None:
         )
 
         # Also write a static legend for icons/symbols so the SVG views are self-explanatory.
+        report_progress(message="building timeline key")
         try:
             from scripts.build_timeline_key import build_timeline_key
 
@@ -143,6 +145,7 @@ def main() -> None:
 
     from scripts.timeline_svg.pipeline import build_timeline_svg
 
+    report_progress(message=f"rendering {input_tsv}")
     build_timeline_svg(
         repo_root=REPO_ROOT,
         input_tsv=input_tsv,
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Microbenchmark the dnd_roller number pool: pops per second.
+
+Compares the memory-mapped ring (dnd_roller._EntropyRing — a pop stores one
+8-byte cursor) with the flat-file cache it replaced (slice the in-memory
+lists, then rewrite the whole 3-bytes-per-number file), at the pop sizes real
+rolls use: 1 (a d20), 3 (a multiattack's attack rolls), 8 (fireball).
+
+    python scripts/dice_bench.py
+    python scripts/dice_bench.py --pops 50000 --sizes 1,2,8 --json
+
+Both pools live in a throwaway directory and are refilled whenever they run
+low, so each pop measures the steady state; refill time is not counted. The
+real ~/.cache/dnd_roller is never touched.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+_SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(_SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(_SCRIPTS_DIR))
+import dnd_roller  # noqa: E402
+
+DEFAULT_SIZES = (1, 3, 8)
+_BATCH = 1024  # one quantum fetch
+
+
+class _FlatFilePool:
+    """The pre-ring cache: parallel lists, whole file rewritten per pop."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.numbers: list[int] = []
+        self.sources: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def _write(self) -> None:
+        buf = bytearray()
+        for num, src in zip(self.numbers, self.sources):
+            buf.extend(struct.pack("H", num))
+            buf.append(0 if src == "quantumnumbers" else 1)
+        with open(self.path, "wb") as f:
+            f.write(bytes(buf))
+
+    def push(self, numbers: list[int], source: str) -> int:
+        self.numbers.extend(numbers)
+        self.sources.extend([source] * len(numbers))
+        self._write()
+        return len(numbers)
+
+    def pop(self, count: int) -> tuple[list[int], list[str]]:
+        numbers, sources = self.numbers[:count], self.sources[:count]
+        self.numbers[:count] = []
+        self.sources[:count] = []
+        self._write()
+        return numbers, sources
+
+
+def _measure(pool: Any, pops: int, size: int) -> float:
+    """Seconds spent in `pops` pops of `size`, excluding refills."""
+    refill = list(range(_BATCH))
+    elapsed = 0.0
+    for _ in range(pops):
+        if len(pool) < size:
+            pool.push(refill, "quantumnumbers")
+        started = time.perf_counter()
+        pool.pop(size)
+        elapsed += time.perf_counter() - started
+    return elapsed
+
+
+def run_benchmark(*, pops: int = 20_000, sizes: tuple[int, ...] = DEFAULT_SIZES) -> dict[str, Any]:
+    results: dict[str, Any] = {"pops": pops, "sizes": {}}
+    with tempfile.TemporaryDirectory(prefix="dice_bench_") as tmp:
+        for size in sizes:
+            ring = dnd_roller._EntropyRing(Path(tmp) / f"ring_{size}.bin")
+            try:
+                ring_s = _measure(ring, pops, size)
+            finally:
+                ring.close()
+            flat_s = _measure(_FlatFilePool(Path(tmp) / f"flat_{size}.bin"), pops, size)
+            results["sizes"][size] = {
+                "ring_pops_per_s": round(pops / ring_s) if ring_s else None,
+                "flat_file_pops_per_s": round(pops / flat_s) if flat_s else None,
+                "speedup": round(flat_s / ring_s, 1) if ring_s else None,
+            }
+    return results
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [f"{report['pops']} pops per size", "",
+             f"{'size':>5} {'ring pops/s':>14} {'flat-file pops/s':>17} {'speedup':>8}"]
+    for size, row in report["sizes"].items():
+        lines.append(
+            f"{size:>5} {row['ring_pops_per_s']:>14,} {row['flat_file_pops_per_s']:>17,} {row['speedup']:>7}x"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--pops", type=int, default=20_000)
+    parser.add_argument("--sizes", default=None, help="Comma-separated pop sizes (default 1,3,8).")
+    parser.add_argument("--json", action="store_true", help="Print the raw report as JSON.")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(int(n) for n in args.sizes.split(",")) if args.sizes else DEFAULT_SIZES
+    report = run_benchmark(pops=args.pops, sizes=sizes)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
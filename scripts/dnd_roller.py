@@ -5,13 +5,24 @@ D&D dice roller with cached quantum random numbers from ANU quantumnumbers API.
 Fetches batches of 1024 uint16 random numbers and caches them locally.
 Respects 1 request/second rate limit. Falls back to random.org on failure.
 Numbers are persisted to disk to survive restarts—never reuses a number.
+The on-disk pool is a fixed-size memory-mapped ring (see _EntropyRing): a roll
+advances a persisted cursor instead of rewriting the file. Every process that
+rolls — the MCP server, the combat-runner GUI, the launcher's pre-warm — maps
+the same ring and takes a file lock per pop, so a number is handed out once
+across all of them; refills are serialized across processes too (_RefillLock).
+A background thread (_RefillDaemon) keeps the pool between a low and a high
+watermark, so a roll only ever pops from the ring — it never fetches itself.
+Each upstream sits behind a circuit breaker; when both circuits are open (an
+offline table) rolls come straight from the OS CSPRNG, tagged "local".
 
 Tools exposed:
   - roll_dice            — roll one or more D&D dice with an optional modifier
+  - roll_batch           — roll many dice groups with one pool pop and one log write
   - log_combat_event     — append a non-roll event to a Markdown log file
   - roll_combat_action   — run a pre-defined combat action (multi-roll, one MCP call)
   - combat_action_upsert — author/edit a combat action (validates spec)
   - combat_actions_list  — inspect actions in the DB
+  - dice_pool_stats      — pool depth and refill latency/outcome counters
 """
 
 from __future__ import annotations
@@ -23,18 +34,30 @@ from __future__ import annotations
 MCP_GROUPS = ["combat", "all"]
 
 import asyncio
+import contextlib
 import json
+import mmap
 import os
+import random
 import re
+import secrets
 import struct
 import sys
+import threading
 import time
+import weakref
+from collections import deque
 from pathlib import Path
 from typing import Any
 
 import httpx
 import requests
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover — non-POSIX: pool locking is per-process only
+    fcntl = None  # type: ignore[assignment]
+
 # (Combat-action specs are now stored in `combat-runner/actions.jsonl` and
 # accessed via the `combat_actions_db` module — see `_execute_combat_action_async`
 # below. No registry env var needed; the launcher writes the DB and the MCP
@@ -104,20 +127,273 @@ _QUANTUM_MARKER = "⚛️"  # ⚛️
 
 # Cache configuration
 _CACHE_DIR = Path.home() / ".cache" / "dnd_roller"
+_RING_FILE = _CACHE_DIR / "quant_ring.bin"
+_REFILL_LOCK_FILE = _CACHE_DIR / "quant_refill.lock"
+# Pre-ring flat file (3 bytes per number, rewritten on every pop). Migrated
+# into the ring the first time the ring is created, then removed.
 _CACHE_FILE = _CACHE_DIR / "quant_numbers.bin"
+# Eight quantum batches' worth — comfortably above the refill high watermark,
+# so a full batch fetched just below it always fits.
+_RING_CAPACITY = 8192
+
+# Source tag stored per number, so a roll knows whether it may show ⚛️.
+_SOURCE_TAGS = ("quantumnumbers", "random_org")
+
+
+def _env_int(name: str, default: int, minimum: int = 0) -> int:
+    try:
+        return max(minimum, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+# Refill daemon watermarks: it wakes when the pool drops below LOW_WATER and
+# fetches until it holds HIGH_WATER. A combat action burns well under a dozen
+# numbers, so the low mark leaves many rolls of headroom for a refill's ~1s.
+_LOW_WATER = _env_int("DND_ROLLER_LOW_WATER", 256)
+_HIGH_WATER = min(_RING_CAPACITY - 1024, max(_LOW_WATER + 1, _env_int("DND_ROLLER_HIGH_WATER", 2048)))
+# How long a roll waits in total on the daemon when the pool is short (one
+# quantum attempt plus one random.org attempt, 10s timeout each) before
+# rolling locally.
+_REFILL_WAIT_SEC = 25.0
+# A failed upstream's circuit opens for BASE * 2**n seconds (capped), times a
+# random 0.5-1.5 jitter so processes sharing the pool don't probe in lockstep.
+_BREAKER_BASE_SEC = 2.0
+_BREAKER_MAX_SEC = 300.0
+# The daemon also re-checks the pool this often when idle: other processes
+# drain the shared ring without waking this one.
+_IDLE_CHECK_SEC = 5.0
+
+
+class _EntropyRing:
+    """Fixed-size ring of cached random numbers in a memory-mapped file.
+
+    Layout (little-endian): a 32-byte header — magic, capacity, head, tail —
+    then `capacity` 3-byte slots (uint16 number + source tag byte). `head` and
+    `tail` only ever grow (slot = cursor % capacity); `tail - head` numbers are
+    available.
+
+    A pop reads its slots and stores the new head: one 8-byte write into the
+    mapped page, no copying or rewriting of the numbers that remain. Because
+    the head is stored before the numbers are handed out, and a push stores
+    the tail only after its slots are written, a crash at any point can lose
+    unused numbers but never hands one out twice. The mapping is MAP_SHARED,
+    so that holds for a killed process without an msync per pop (the kernel
+    owns the dirty page) — the same durability the old write()-based cache had.
+
+    Processes share the ring by mapping the same file. Pops and pushes hold an
+    exclusive flock on `<ring>.lock` (a separate file that is never replaced)
+    across the cursor read-modify-write; creating or replacing the ring file
+    happens under the same lock, so nobody maps a file that is then swapped out.
+    """
 
-# In-memory cache of uint16 numbers, paired with source tag per number.
-# When we pop a number, we know whether it came from quantum or random.org.
-_number_cache: list[int] = []
-_source_cache: list[str] = []  # parallel list: "quantumnumbers" or "random_org"
-_fetch_lock = asyncio.Lock()
-_last_fetch_time: float = 0.0
+    _HEADER = struct.Struct("<8sIxxxxQQ")
+    _MAGIC = b"DNDRING1"
+    _HEAD_OFFSET = 16
+    _TAIL_OFFSET = 24
+    _CURSOR = struct.Struct("<Q")
+    _SLOT = struct.Struct("<HB")
+
+    def __init__(self, path: Path, capacity: int = _RING_CAPACITY, *, legacy_path: Path | None = None) -> None:
+        self.path = path
+        # flock is per open file description, which threads share — so the
+        # thread lock is still what keeps this process's own threads apart.
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = os.open(path.with_name(path.name + ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        with self._locked():
+            if not self._valid(path):
+                self._create(path, capacity, legacy_path)
+            self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        _, self.capacity, _, _ = self._HEADER.unpack_from(self._mm, 0)
+        # close(), or garbage collection once nobody holds the ring any more
+        # (a hot reload drops it while rolls may still be using it).
+        self._release = weakref.finalize(self, self._release_handles, self._mm, self._file, self._lock_fd)
+
+    @staticmethod
+    def _release_handles(mm: mmap.mmap, file: Any, lock_fd: int) -> None:
+        mm.close()
+        file.close()
+        os.close(lock_fd)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    @classmethod
+    def _valid(cls, path: Path) -> bool:
+        try:
+            with open(path, "rb") as f:
+                header = f.read(cls._HEADER.size)
+                size = os.fstat(f.fileno()).st_size
+        except OSError:
+            return False
+        if len(header) != cls._HEADER.size:
+            return False
+        magic, capacity, head, tail = cls._HEADER.unpack(header)
+        return (
+            magic == cls._MAGIC and capacity > 0 and head <= tail <= head + capacity
+            and size == cls._HEADER.size + capacity * cls._SLOT.size
+        )
+
+    @classmethod
+    def _create(cls, path: Path, capacity: int, legacy_path: Path | None) -> None:
+        """Write a fresh ring (seeded from the legacy flat file, if any) and
+        swap it in atomically, so a concurrent opener never sees half a file."""
+        numbers = _read_legacy_cache(legacy_path)[:capacity] if legacy_path is not None else []
+        body = bytearray(capacity * cls._SLOT.size)
+        for i, (num, tag) in enumerate(numbers):
+            cls._SLOT.pack_into(body, i * cls._SLOT.size, num, tag)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(cls._HEADER.pack(cls._MAGIC, capacity, 0, len(numbers)))
+            f.write(body)
+        os.replace(tmp, path)
+        if legacy_path is not None:
+            legacy_path.unlink(missing_ok=True)
+
+    def _cursors(self) -> tuple[int, int]:
+        return (self._CURSOR.unpack_from(self._mm, self._HEAD_OFFSET)[0],
+                self._CURSOR.unpack_from(self._mm, self._TAIL_OFFSET)[0])
+
+    def __len__(self) -> int:
+        head, tail = self._cursors()
+        return tail - head
+
+    def pop(self, count: int) -> tuple[list[int], list[str]] | None:
+        """Take the next `count` numbers and their sources, or None (taking
+        nothing) if fewer are available."""
+        with self._locked():
+            head, tail = self._cursors()
+            if tail - head < count:
+                return None
+            numbers: list[int] = []
+            sources: list[str] = []
+            for cursor in range(head, head + count):
+                num, tag = self._SLOT.unpack_from(
+                    self._mm, self._HEADER.size + (cursor % self.capacity) * self._SLOT.size,
+                )
+                numbers.append(num)
+                sources.append(_SOURCE_TAGS[1 if tag else 0])
+            self._CURSOR.pack_into(self._mm, self._HEAD_OFFSET, head + count)
+            return numbers, sources
+
+    def push(self, numbers: list[int], source: str) -> int:
+        """Append numbers from `source`; returns how many fit (the rest are
+        dropped — they were never used, so nothing is lost)."""
+        tag = _SOURCE_TAGS.index(source)
+        with self._locked():
+            head, tail = self._cursors()
+            accepted = numbers[: self.capacity - (tail - head)]
+            for i, num in enumerate(accepted):
+                self._SLOT.pack_into(
+                    self._mm, self._HEADER.size + ((tail + i) % self.capacity) * self._SLOT.size,
+                    num & 0xFFFF, tag,
+                )
+            self._CURSOR.pack_into(self._mm, self._TAIL_OFFSET, tail + len(accepted))
+            return len(accepted)
+
+    def close(self) -> None:
+        with self._lock:
+            self._release()
+
+
+class _RefillLock:
+    """Cross-process lock around a pool refill, so only one process calls the
+    quantum API at a time (a process that waited usually finds the pool already
+    refilled). The lock file also records when the API was last called, which
+    makes the 1 request/second limit hold across processes. Without fcntl it
+    degrades to an in-process lock."""
+
+    _POLL_SEC = 0.05
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.Lock()
+        self._fd: int | None = None
+
+    @contextlib.asynccontextmanager
+    async def hold(self):
+        # Polling (not a blocking flock on a thread) keeps the wait cancellable.
+        while not self._local.acquire(blocking=False):
+            await asyncio.sleep(self._POLL_SEC)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                while fcntl is not None:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(self._POLL_SEC)
+                self._fd = fd
+                yield self
+            finally:
+                self._fd = None
+                os.close(fd)  # releases the flock
+        finally:
+            self._local.release()
+
+    def last_fetch(self) -> float:
+        """Epoch seconds of the last quantum API call by any process (0 if none)."""
+        assert self._fd is not None, "hold() the lock first"
+        try:
+            return float(os.pread(self._fd, 32, 0).decode("ascii") or 0)
+        except ValueError:
+            return 0.0
+
+    def mark_fetch(self) -> None:
+        assert self._fd is not None, "hold() the lock first"
+        stamp = f"{time.time():.6f}".encode("ascii")
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, stamp, 0)
+
+
+def _read_legacy_cache(path: Path) -> list[tuple[int, int]]:
+    """(number, tag) entries from the pre-ring cache file: 2 bytes native
+    uint16 + 1 byte source tag (0=quantum, 1=random_org) per entry."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return []
+    if not data or len(data) % 3:
+        return []
+    return [(struct.unpack_from("H", data, i)[0], data[i + 2]) for i in range(0, len(data), 3)]
+
+
+_pool: _EntropyRing | None = None
+_pool_lock = threading.Lock()
+_refill_lock = _RefillLock(_REFILL_LOCK_FILE)
 
 # HTTP clients
 _sync_session: requests.Session | None = None
 _async_client: httpx.AsyncClient | None = None
 
 
+def _get_pool() -> _EntropyRing:
+    """Get or open the shared on-disk number pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _EntropyRing(_RING_FILE, legacy_path=_CACHE_FILE)
+    return _pool
+
+
+def _pool_level() -> int:
+    """Numbers currently cached."""
+    return len(_get_pool())
+
+
 def _get_sync_session() -> requests.Session:
     """Get or create a shared sync HTTP session."""
     global _sync_session
@@ -134,43 +410,8 @@ async def _get_async_client() -> httpx.AsyncClient:
     return _async_client
 
 
-def _load_cache() -> None:
-    """Load cached numbers from disk into memory.
-
-    The on-disk format is: 2 bytes uint16 number, 1 byte source tag (0=quantum, 1=random_org).
-    Total 3 bytes per entry.
-    """
-    global _number_cache, _source_cache
-    if _CACHE_FILE.exists():
-        with open(_CACHE_FILE, "rb") as f:
-            data = f.read()
-        if data and len(data) % 3 == 0:
-            entries = len(data) // 3
-            for i in range(entries):
-                num = struct.unpack_from("H", data, i * 3)[0]
-                tag = data[i * 3 + 2]
-                _number_cache.append(num)
-                _source_cache.append("quantumnumbers" if tag == 0 else "random_org")
-
-
-def _write_cache() -> None:
-    """Persist remaining numbers + source tags to disk."""
-    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    if _number_cache:
-        buf = bytearray()
-        for num, src in zip(_number_cache, _source_cache):
-            buf.extend(struct.pack("H", num))
-            buf.append(0 if src == "quantumnumbers" else 1)
-        with open(_CACHE_FILE, "wb") as f:
-            f.write(bytes(buf))
-    else:
-        _CACHE_FILE.unlink(missing_ok=True)
-
-
 async def _fetch_from_quantumnumbers(count: int = 1024) -> list[int] | None:
     """Fetch random uint16 numbers from ANU quantumnumbers API."""
-    global _last_fetch_time
-
     api_url = os.environ.get("QUANT_API_URL")
     api_key = os.environ.get("QUANT_API_KEY")
 
@@ -191,7 +432,6 @@ async def _fetch_from_quantumnumbers(count: int = 1024) -> list[int] | None:
         )
         response.raise_for_status()
         data = response.json()
-        _last_fetch_time = time.time()
         return data.get("data", [])
     except (httpx.HTTPError, httpx.TimeoutException, ValueError, KeyError) as exc:
         # Narrow to network/parse faults — a bare `except Exception` would mask
@@ -229,69 +469,428 @@ def _fetch_from_random_org_sync(count: int) -> list[int]:
         return []
 
 
-async def _ensure_numbers(needed: int) -> bool:
-    """Ensure cache has at least `needed` numbers. Fetch if necessary."""
-    global _number_cache, _source_cache, _last_fetch_time
+class _CircuitBreaker:
+    """Circuit breaker for one upstream, so an unreachable source doesn't cost
+    every refill its 10s timeout.
 
-    if len(_number_cache) >= needed:
-        return True
+    closed: calls go through. A failure opens it: calls are skipped for a
+    backoff that doubles with each consecutive failure. Once that elapses it
+    is half-open — one probe goes through; success closes it, failure re-opens
+    it with the next backoff.
+    """
 
-    async with _fetch_lock:
-        # Double-check after acquiring lock
-        if len(_number_cache) >= needed:
-            return True
+    def __init__(self, name: str, *, base: float = _BREAKER_BASE_SEC, max_backoff: float = _BREAKER_MAX_SEC) -> None:
+        self.name = name
+        self._base = base
+        self._max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0  # consecutive
+        self.opened = 0  # times opened, ever
+        self.retry_at = 0.0  # monotonic; when an open circuit next lets a probe through
+
+    def available(self) -> bool:
+        """Whether `allow()` would let a call through right now."""
+        with self._lock:
+            return self.state == "closed" or (self.state == "open" and time.monotonic() >= self.retry_at)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() >= self.retry_at:
+                self.state = "half_open"  # this caller is the probe
+                return True
+            return False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.state, self.failures = "closed", 0
+                return
+            self.failures += 1
+            self.opened += 1
+            self.state = "open"
+            backoff = min(self._max_backoff, self._base * 2 ** (self.failures - 1))
+            self.retry_at = time.monotonic() + backoff * random.uniform(0.5, 1.5)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opened": self.opened,
+                "retry_in_s": round(max(0.0, self.retry_at - time.monotonic()), 1) if self.state == "open" else 0.0,
+            }
 
-        # Rate limit: 1 request per second
-        now = time.time()
-        wait_time = 1.0 - (now - _last_fetch_time)
-        if wait_time > 0:
-            await asyncio.sleep(wait_time)
 
-        # Try quantumnumbers first (batch fetch to maximize quota)
-        new_numbers = await _fetch_from_quantumnumbers(1024)
-        if new_numbers:
-            _number_cache.extend(new_numbers)
-            _source_cache.extend(["quantumnumbers"] * len(new_numbers))
-            _write_cache()
-            return True
-
-        # Fallback: fetch enough from random.org for this request + buffer
-        fallback_count = max(needed, 100)
-        new_numbers = await asyncio.to_thread(
-            _fetch_from_random_org_sync, fallback_count
-        )
-        if new_numbers:
-            _number_cache.extend(new_numbers)
-            _source_cache.extend(["random_org"] * len(new_numbers))
-            _write_cache()
-            return True
+_breakers: dict[str, _CircuitBreaker] = {name: _CircuitBreaker(name) for name in _SOURCE_TAGS}
 
-        return False
 
+def _quantum_configured() -> bool:
+    return bool(os.environ.get("QUANT_API_URL") and os.environ.get("QUANT_API_KEY"))
 
-async def _pop_numbers(count: int) -> tuple[list[int], str]:
-    """Get `count` random numbers and the dominant source tag.
 
-    Returns:
-        (numbers, source) where source is "quantumnumbers" if ALL popped numbers
-        came from quantum, otherwise "random_org". This conservative behavior means
-        the ⚛️ marker only shows when every die in this roll was quantum-sourced.
+def _live_breakers() -> list[_CircuitBreaker]:
+    """Breakers of the upstreams this process can use (quantum needs its API config)."""
+    return [b for name, b in _breakers.items() if name != "quantumnumbers" or _quantum_configured()]
+
+
+def _sources_down() -> bool:
+    """True when every usable upstream's circuit is open — no point waiting."""
+    return not any(b.available() for b in _live_breakers())
+
+
+def _next_probe_at() -> float:
+    """Monotonic time the first open circuit lets a probe through (0 if none is open)."""
+    return min((b.retry_at for b in _live_breakers() if b.state == "open"), default=0.0)
+
+
+async def _refill_once(target: int, *, fallback_target: int | None = None) -> str | None:
+    """One refill step towards `target` numbers in the pool.
+
+    Returns the source that was fetched from ("quantumnumbers" or
+    "random_org"), "pool" if the pool already holds `target` (possibly after
+    another process refilled it while we waited for the lock), or None if both
+    sources failed or had their circuits open. random.org only tops the pool
+    up to `fallback_target` (default `target`) — its quota is small, and
+    quantum is retried later.
     """
-    if not await _ensure_numbers(count):
-        raise RuntimeError(
-            "Failed to fetch random numbers from both quantumnumbers and random.org"
-        )
+    pool = _get_pool()
+    if len(pool) >= target:
+        return "pool"
+
+    async with _refill_lock.hold() as refill:
+        # Double-check after acquiring lock — another process may have refilled.
+        if len(pool) >= target:
+            return "pool"
+
+        # Try quantumnumbers first (batch fetch to maximize quota)
+        quantum = _breakers["quantumnumbers"]
+        if _quantum_configured() and quantum.allow():
+            # Rate limit: 1 request per second, across every process sharing the pool
+            wait_time = 1.0 - (time.time() - refill.last_fetch())
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            new_numbers = None
+            try:
+                new_numbers = await _fetch_from_quantumnumbers(1024)
+            finally:  # even if cancelled: a half-open circuit must not stay stuck
+                quantum.record(bool(new_numbers))
+            if new_numbers:
+                refill.mark_fetch()
+                pool.push(new_numbers, "quantumnumbers")
+                return "quantumnumbers"
+
+        # Fallback: fetch enough from random.org for the shortfall + buffer
+        random_org = _breakers["random_org"]
+        if random_org.allow():
+            fallback_count = max((fallback_target or target) - len(pool), 100)
+            new_numbers = []
+            try:
+                new_numbers = await asyncio.to_thread(
+                    _fetch_from_random_org_sync, fallback_count
+                )
+            finally:
+                random_org.record(bool(new_numbers))
+            if new_numbers:
+                pool.push(new_numbers, "random_org")
+                return "random_org"
+
+        return None
+
+
+class _LatencyWindow:
+    """Count, p50/p95 and max (ms) over the most recent samples."""
+
+    def __init__(self, window: int = 256) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
 
-    numbers = _number_cache[:count]
-    sources = _source_cache[:count]
-    _number_cache[:count] = []
-    _source_cache[:count] = []
+    def add(self, ms: float) -> None:
+        self._samples.append(ms)
+        self.count += 1
+        self.max = max(self.max, ms)
 
-    _write_cache()
+    def summary(self) -> dict[str, Any]:
+        ordered = sorted(self._samples)
+
+        def pct(q: float) -> float | None:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1) if ordered else None
+
+        return {"count": self.count, "p50": pct(0.50), "p95": pct(0.95), "max": round(self.max, 1)}
+
+
+class _RefillDaemon:
+    """Background thread that keeps the pool between `low` and `high`.
+
+    The thread runs its own event loop (which also owns the async HTTP client).
+    It sleeps until poked — a pop left the pool below `low`, or a roll is
+    waiting — or until the idle re-check, then fetches until the pool holds
+    `high`. Each fetch goes through _refill_once, so the 1 request/second rule,
+    the cross-process refill lock and the circuit breakers apply. Without a
+    quantum batch it stops and tries again when the next circuit lets a probe
+    through; while every circuit is open, waiting rolls are released at once
+    (they roll locally) instead of sitting out the backoff.
+    """
 
+    def __init__(
+        self,
+        *,
+        low: int = _LOW_WATER,
+        high: int = _HIGH_WATER,
+        idle_check: float = _IDLE_CHECK_SEC,
+    ) -> None:
+        self.low = low
+        self.high = high
+        self._idle_check = idle_check
+        self._cond = threading.Condition()
+        self._waiting: list[int] = []  # counts of rolls blocked in wait_for
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._stopping = False
+        self._retry_at = 0.0
+        self.stats: dict[str, int] = {
+            "refills": 0, "quantumnumbers": 0, "random_org": 0, "failed": 0,
+            "roll_waits": 0, "roll_wait_timeouts": 0, "local_numbers": 0,
+        }
+        self._refill_ms = _LatencyWindow()
+        self._roll_wait_ms = _LatencyWindow()
+
+    # ── any thread ──
+
+    def poke(self) -> None:
+        """Start the thread if needed and have it re-check the pool now."""
+        with self._cond:
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(target=self._main, name="dnd-roller-refill", daemon=True)
+                self._thread.start()
+                return  # it checks the pool as soon as it starts
+            loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            with contextlib.suppress(RuntimeError):  # loop already closed (stopping)
+                loop.call_soon_threadsafe(wake.set)
+
+    def wait_for(self, count: int, timeout: float = _REFILL_WAIT_SEC) -> bool:
+        """Block until the pool holds `count` numbers. False on timeout, or at
+        once while every upstream's circuit is open or the daemon is stopping."""
+        pool = _get_pool()
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._waiting.append(count)
+            self.stats["roll_waits"] += 1
+        self.poke()
+        try:
+            with self._cond:
+                while len(pool) < count:
+                    remaining = deadline - time.monotonic()
+                    if self._stopping or _sources_down() or remaining <= 0:
+                        self.stats["roll_wait_timeouts"] += 1
+                        return False
+                    # Bounded wait: another process may refill without notifying us.
+                    self._cond.wait(min(remaining, 0.25))
+                return True
+        finally:
+            with self._cond:
+                self._waiting.remove(count)
+                self._roll_wait_ms.add((time.perf_counter() - started) * 1000)
+
+    def note_local(self, count: int) -> None:
+        """Count `count` numbers a roll drew from the local CSPRNG instead."""
+        with self._cond:
+            self.stats["local_numbers"] += count
+
+    def fill(self, timeout: float = 30.0) -> int:
+        """Block until a refill round reaches `high` (or fails / times out);
+        returns the pool depth. For one-shot pre-warming."""
+        self.wait_for(self.high, timeout)
+        return len(_get_pool())
+
+    def snapshot(self, *, open_pool: bool = True) -> dict[str, Any]:
+        """Counters and breaker state. With open_pool=False the ring is not
+        opened (mmap + flock) just to report its depth: pool_depth is None
+        until something else has opened it."""
+        pool = _get_pool() if open_pool else _pool
+        usable = {b.name for b in _live_breakers()}
+        if "quantumnumbers" in usable and _breakers["quantumnumbers"].available():
+            mode = "quantumnumbers"
+        elif _breakers["random_org"].available():
+            mode = "random_org"
+        else:
+            mode = "local"
+        with self._cond:
+            return {
+                "mode": mode,  # where the next refill comes from; "local" = rolling from the CSPRNG
+                "pool_depth": len(pool) if pool is not None else None,
+                "low_water": self.low,
+                "high_water": self.high,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "down": _sources_down(),
+                "retry_in_s": round(max(0.0, self._retry_at - time.monotonic()), 1),
+                "breakers": {
+                    name: b.snapshot() if name in usable else {"state": "unconfigured"}
+                    for name, b in _breakers.items()
+                },
+                **self.stats,
+                "refill_ms": self._refill_ms.summary(),
+                "roll_wait_ms": self._roll_wait_ms.summary(),
+            }
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._stopping = True
+            thread = self._thread
+            self._cond.notify_all()
+        self.poke()
+        if thread is not None:
+            thread.join(timeout)
+
+    # ── daemon thread ──
+
+    def _main(self) -> None:
+        asyncio.run(self._run())
+
+    async def _run(self) -> None:
+        self._wake = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        pool = _get_pool()
+        while not self._stopping:
+            self._wake.clear()
+            with self._cond:
+                demand = max(self._waiting, default=0)
+            if len(pool) < max(self.low, demand) and time.monotonic() >= self._retry_at:
+                await self._fill(pool)
+                continue
+            # Idle, or backing off: a poke, the idle re-check or the retry time
+            # wakes us (a poke during backoff just finds it still running).
+            delay = self._idle_check
+            if self._retry_at > time.monotonic():
+                delay = min(delay, self._retry_at - time.monotonic())
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), max(delay, 0.0))
+        self._loop = None
+
+    async def _fill(self, pool: _EntropyRing) -> None:
+        while not self._stopping:
+            with self._cond:
+                demand = max(self._waiting, default=0)
+            target = max(self.high, demand)
+            if len(pool) >= target:
+                return
+            started = time.perf_counter()
+            try:
+                source = await _refill_once(target, fallback_target=max(self.low, demand))
+            except Exception as exc:  # noqa: BLE001 — keep the daemon alive; retried below
+                sys.stderr.write(f"[dnd_roller] refill failed: {exc!r}\n")
+                source = None
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._cond:
+                if source in ("quantumnumbers", "random_org"):
+                    self._refill_ms.add(elapsed_ms)
+                    self.stats["refills"] += 1
+                    self.stats[source] += 1
+                if source is None:
+                    self.stats["failed"] += 1
+                self._cond.notify_all()
+                if source in ("quantumnumbers", "pool"):
+                    continue
+                # No quantum batch (random.org may have covered the low mark):
+                # come back when the next open circuit lets a probe through.
+                self._retry_at = _next_probe_at()
+                return
+
+
+_refiller: _RefillDaemon | None = None
+
+
+def _get_refiller() -> _RefillDaemon:
+    """Get or create this process's refill daemon (its thread starts on first poke)."""
+    global _refiller
+    if _refiller is None:
+        with _pool_lock:
+            if _refiller is None:
+                _refiller = _RefillDaemon()
+    return _refiller
+
+
+def _start_refill() -> None:
+    """Start the refill daemon now (e.g. when the GUI opens) rather than on the
+    first roll, so the pool is topped up before anyone rolls."""
+    _get_refiller().poke()
+
+
+def _mcp_reload_teardown() -> None:
+    """Called by the MCP server before it hot-reloads this module: stop the
+    refill daemon and drop the ring and HTTP clients, so re-running the
+    module's globals doesn't orphan a live thread. The ring isn't closed here:
+    a roll still in flight keeps popping from it, and it closes itself once
+    the last one lets go. A roll waiting on the stopped daemon rolls locally."""
+    global _refiller, _pool, _sync_session, _async_client
+    with _pool_lock:
+        refiller, _refiller = _refiller, None
+        _pool = None
+    if refiller is not None:
+        refiller.stop()
+    session, _sync_session = _sync_session, None
+    if session is not None:
+        session.close()
+    # The async client belongs to the stopped daemon's loop; just drop it.
+    _async_client = None
+
+
+# Provenance, strongest first. A roll reports its weakest number's source.
+_SOURCE_RANK = {"quantumnumbers": 0, "random_org": 1, "local": 2}
+
+
+def _dominant_source(sources: list[str]) -> str:
     # Conservative: only mark as quantum if ALL numbers in this batch are quantum
-    source = "quantumnumbers" if all(s == "quantumnumbers" for s in sources) else "random_org"
-    return numbers, source
+    return max(sources, key=_SOURCE_RANK.__getitem__, default="quantumnumbers")
+
+
+async def _take_numbers(count: int) -> tuple[list[int], list[str]]:
+    """Pop `count` numbers and their per-number sources in one pool operation.
+
+    Never fetches: pops from the pool, and if it's short waits (off the event
+    loop) for the refill daemon — or, when no upstream is reachable, draws
+    from the local CSPRNG.
+    """
+    pool = _get_pool()
+    refiller = _get_refiller()
+    taken = pool.pop(count)
+    # A concurrent roll can drain the pool between the wait and the pop;
+    # pop() takes nothing in that case, so keep waiting while an upstream is
+    # reachable — but against one deadline for the whole roll, not per wait.
+    deadline = time.monotonic() + _REFILL_WAIT_SEC
+    while taken is None and not _sources_down():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not await asyncio.to_thread(refiller.wait_for, count, remaining):
+            break
+        taken = pool.pop(count)
+    if len(pool) < refiller.low:
+        refiller.poke()
+    if taken is None:
+        # Every upstream circuit is open (or the refill timed out): don't stall
+        # the table — roll from the OS CSPRNG, tagged so no ⚛️ is shown.
+        refiller.note_local(count)
+        return [secrets.randbits(16) for _ in range(count)], ["local"] * count
+    return taken
+
+
+async def _pop_numbers(count: int) -> tuple[list[int], str]:
+    """Get `count` random numbers and the dominant source tag.
+
+    Returns:
+        (numbers, source) where source is the weakest provenance among the
+        popped numbers: "quantumnumbers" only if ALL came from quantum, else
+        "random_org", or "local" if any came from the CSPRNG fallback. This
+        conservative behavior means the ⚛️ marker only shows when every die in
+        this roll was quantum-sourced.
+    """
+    numbers, sources = await _take_numbers(count)
+    return numbers, _dominant_source(sources)
 
 
 def _glyph_for_die(dice_size: int) -> str:
@@ -368,16 +967,20 @@ def _append_log_entry(log_path: str, description: str, narrative: str) -> None:
     re-append it. Creates parent directory and a header line if the file is fresh.
     Never raises — logging failures must not break a roll.
     """
+    _append_log_entries(log_path, [(description, narrative)])
+
+
+def _append_log_entries(log_path: str, entries: list[tuple[str, str]]) -> None:
+    """`_append_log_entry` for several (description, narrative) pairs, in one write."""
     from datetime import datetime as _dt
     try:
         p = _confined_log_path(log_path)
         p.parent.mkdir(parents=True, exist_ok=True)
         fresh = not p.exists() or p.stat().st_size == 0
         ts = _dt.now().strftime("%Y-%m-%d %H:%M:%S")
+        text = "".join(f"- `{ts}` — **{description}** — {narrative}\n" for description, narrative in entries)
         with open(p, "a", encoding="utf-8") as f:
-            if fresh:
-                f.write("# Combat log\n\n")
-            f.write(f"- `{ts}` — **{description}** — {narrative}\n")
+            f.write(("# Combat log\n\n" if fresh else "") + text)
     except (OSError, ValueError):
         pass
 
@@ -391,6 +994,19 @@ async def _roll_dice_async(
     log_path: str | None = None,
 ) -> dict[str, Any]:
     """Roll D&D dice asynchronously with per-die bonuses and total modifier."""
+    bonuses_list = _check_roll(num_dice, dice_size, bonuses, modifier)
+    raw_numbers, source = await _pop_numbers(num_dice)
+    result = _resolve_roll(dice_size, raw_numbers, source, bonuses_list, modifier)
+
+    # Auto-log if both description and log_path are provided.
+    if description and log_path:
+        _append_log_entry(log_path, description, result["narrative"])
+        result["logged"] = True
+    return result
+
+
+def _check_roll(num_dice: int, dice_size: int, bonuses: list[int] | None, modifier: int) -> list[int]:
+    """Validate one roll's arguments; returns the per-die bonuses list."""
     if not isinstance(num_dice, int) or not (1 <= num_dice <= 100):
         raise ValueError("num_dice must be an integer between 1 and 100")
     if dice_size not in (4, 6, 8, 10, 12, 20, 100):
@@ -410,9 +1026,18 @@ async def _roll_dice_async(
                 f"bonuses length ({len(bonuses)}) must match num_dice ({num_dice})"
             )
         bonuses_list = bonuses
+    return bonuses_list
 
-    raw_numbers, source = await _pop_numbers(num_dice)
 
+def _resolve_roll(
+    dice_size: int,
+    raw_numbers: list[int],
+    source: str,
+    bonuses_list: list[int],
+    modifier: int,
+) -> dict[str, Any]:
+    """Turn popped numbers into a roll result (with `logged` False)."""
+    num_dice = len(raw_numbers)
     rolls = [num % dice_size + 1 for num in raw_numbers]
     rolls_with_bonuses = [r + b for r, b in zip(rolls, bonuses_list)]
     total_raw = sum(rolls)
@@ -427,12 +1052,6 @@ async def _roll_dice_async(
         source=source,
     )
 
-    # Auto-log if both description and log_path are provided.
-    logged = False
-    if description and log_path:
-        _append_log_entry(log_path, description, narrative)
-        logged = True
-
     return {
         "narrative": narrative,
         "source": source,
@@ -444,7 +1063,7 @@ async def _roll_dice_async(
         "total_with_bonuses": total_with_bonuses,
         "dice_code": _dice_code_for_size(dice_size),
         "dice_notation": _build_dice_notation(num_dice, dice_size, modifier),
-        "logged": logged,
+        "logged": False,
     }
 
 
@@ -459,9 +1078,11 @@ def roll_dice(
     """
     Roll D&D dice with per-die bonuses and total modifier.
 
-    Fetches batches of 1024 uint16 values from ANU quantumnumbers API,
-    caches them locally, and serves rolls from cache. Falls back to
-    random.org on API failure. Respects 1 request/second rate limit.
+    Serves rolls from the local pool of uint16 values, which a background
+    thread keeps filled from the ANU quantumnumbers API (random.org on API
+    failure). Never makes a network call itself; if the pool is short it waits
+    for the refill, or rolls from the local CSPRNG (source "local") when both
+    upstreams are unreachable.
 
     Args:
         num_dice: Number of dice to roll (1-100).
@@ -478,10 +1099,101 @@ def roll_dice(
         JSON string with: narrative, source, rolls, bonuses, rolls_with_bonuses,
         total_raw, total_with_bonuses, dice_code, dice_notation, logged.
     """
-    result = asyncio.run(
-        _roll_dice_async(num_dice, dice_size, bonuses, modifier, description, log_path)
+    return asyncio.run(
+        roll_dice_async(num_dice, dice_size, bonuses, modifier, description, log_path)
     )
-    return json.dumps(result, indent=2, ensure_ascii=False)
+
+
+async def roll_dice_async(
+    num_dice: int,
+    dice_size: int,
+    bonuses: list[int] | None = None,
+    modifier: int = 0,
+    description: str | None = None,
+    log_path: str | None = None,
+) -> str:
+    """Coroutine form of `roll_dice` for callers that already run an event loop
+    (the MCP server awaits it via MCP_ASYNC_HANDLERS). Same arguments and result."""
+    result = await _roll_dice_async(num_dice, dice_size, bonuses, modifier, description, log_path)
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
+# Most numbers one batch may draw — well under the refill high watermark, so a
+# single refill always covers a batch.
+_BATCH_MAX_DICE = 1000
+_BATCH_GROUP_KEYS = frozenset({"num_dice", "dice_size", "bonuses", "modifier", "description"})
+
+
+async def _roll_batch_async(groups: list[dict], log_path: str | None = None) -> list[dict[str, Any]]:
+    """Roll several dice groups from ONE pool pop, logged in ONE write.
+
+    Each group is a `roll_dice` argument dict (num_dice, dice_size, and
+    optional bonuses, modifier, description). Every group is validated before
+    anything is drawn. Results come back in group order, shaped like
+    `roll_dice`'s, each with its own source / ⚛️ marker.
+    """
+    if not isinstance(groups, list) or not groups:
+        raise ValueError("groups must be a non-empty list of dice groups")
+    checked: list[tuple[dict, list[int]]] = []
+    for i, group in enumerate(groups):
+        if not isinstance(group, dict):
+            raise ValueError(f"groups[{i}] must be an object")
+        unknown = sorted(set(group) - _BATCH_GROUP_KEYS)
+        if unknown:
+            raise ValueError(f"groups[{i}]: unknown keys {unknown}")
+        try:
+            bonuses_list = _check_roll(
+                group.get("num_dice"), group.get("dice_size"), group.get("bonuses"), group.get("modifier", 0)
+            )
+        except ValueError as exc:
+            raise ValueError(f"groups[{i}]: {exc}") from None
+        checked.append((group, bonuses_list))
+    total = sum(group["num_dice"] for group, _ in checked)
+    if total > _BATCH_MAX_DICE:
+        raise ValueError(f"a batch may roll at most {_BATCH_MAX_DICE} dice in total (got {total})")
+
+    numbers, sources = await _take_numbers(total)
+
+    results: list[dict[str, Any]] = []
+    entries: list[tuple[str, str]] = []
+    offset = 0
+    for group, bonuses_list in checked:
+        end = offset + group["num_dice"]
+        result = _resolve_roll(
+            group["dice_size"], numbers[offset:end], _dominant_source(sources[offset:end]),
+            bonuses_list, group.get("modifier", 0),
+        )
+        offset = end
+        if group.get("description") and log_path:
+            entries.append((group["description"], result["narrative"]))
+            result["logged"] = True
+        results.append(result)
+    if entries:
+        _append_log_entries(log_path, entries)
+    return results
+
+
+def roll_batch(groups: list[dict], log_path: str | None = None) -> str:
+    """Roll many dice groups at once — initiative for a whole encounter, or
+    every roll of a multiattack — with one pool pop and one log write.
+
+    Args:
+        groups: List of `roll_dice` argument dicts: num_dice, dice_size, and
+            optionally bonuses, modifier, description. At most 1000 dice total.
+        log_path: Optional Markdown log; every group with a description is
+            appended to it (in group order) in a single write.
+
+    Returns:
+        JSON string with `count` and `results` (one roll_dice-shaped result
+        per group, in order).
+    """
+    return asyncio.run(roll_batch_async(groups, log_path))
+
+
+async def roll_batch_async(groups: list[dict], log_path: str | None = None) -> str:
+    """Coroutine form of `roll_batch` (for MCP_ASYNC_HANDLERS)."""
+    results = await _roll_batch_async(groups, log_path)
+    return json.dumps({"count": len(results), "results": results}, ensure_ascii=False, separators=(",", ":"))
 
 
 def log_combat_event(
@@ -619,46 +1331,43 @@ async def _execute_combat_action_async(
         if not attacks:
             return {"error": "no attacks defined for this action"}
 
-        # ONE batched to-hit roll for all attacks
-        to_hit_bonuses = [int(a.get("to_hit_bonus", 0)) for a in attacks]
-        to_hit_result = await _roll_dice_async(
-            num_dice=len(attacks),
-            dice_size=20,
-            bonuses=to_hit_bonuses,
-            modifier=0,
-            description=f"{npc} {action_name} to-hits",
-            log_path=log_path,
-        )
-
-        # One damage roll per attack — fire them concurrently with asyncio.gather.
-        # Each await calls _pop_numbers which contends a single fetch lock, but
-        # under a warm in-memory cache that's a fast critical section; gather
-        # still wins ~50-200ms per multiattack vs. sequential await.
-        async def _roll_attack_damage(atk: dict) -> dict:
+        # Every roll of the action — one to-hit per attack, each attack's damage
+        # and its optional `extra_damage: {dice, modifier?, type}` rider — is one
+        # batch: a single pool pop and a single log write.
+        groups: list[dict] = [{
+            "num_dice": len(attacks),
+            "dice_size": 20,
+            "bonuses": [int(a.get("to_hit_bonus", 0)) for a in attacks],
+            "description": f"{npc} {action_name} to-hits",
+        }]
+        for atk in attacks:
             num, size = _parse_dice_spec(atk["damage"])
-            mod = int(atk.get("damage_modifier", 0))
-            base = await _roll_dice_async(
-                num_dice=num,
-                dice_size=size,
-                bonuses=None,
-                modifier=mod,
-                description=f"{npc} {atk['name']} damage",
-                log_path=log_path,
-            )
-            # Optional `extra_damage: {dice, modifier?, type}` rider — roll it,
-            # fold the result into the attack's total, and stash it for the
-            # output loop so the DM sees the breakdown.
+            groups.append({
+                "num_dice": num,
+                "dice_size": size,
+                "modifier": int(atk.get("damage_modifier", 0)),
+                "description": f"{npc} {atk['name']} damage",
+            })
             extra = atk.get("extra_damage")
             if isinstance(extra, dict) and "dice" in extra:
                 en, es = _parse_dice_spec(extra["dice"])
-                ex = await _roll_dice_async(
-                    num_dice=en,
-                    dice_size=es,
-                    bonuses=None,
-                    modifier=int(extra.get("modifier", 0)),
-                    description=f"{npc} {atk['name']} extra damage",
-                    log_path=log_path,
-                )
+                groups.append({
+                    "num_dice": en,
+                    "dice_size": es,
+                    "modifier": int(extra.get("modifier", 0)),
+                    "description": f"{npc} {atk['name']} extra damage",
+                })
+        batch = iter(await _roll_batch_async(groups, log_path))
+
+        to_hit_result = next(batch)
+        damage_results: list[dict] = []
+        for atk in attacks:
+            base = next(batch)
+            # Fold the rider into the attack's total, and stash it for the
+            # output loop so the DM sees the breakdown.
+            extra = atk.get("extra_damage")
+            if isinstance(extra, dict) and "dice" in extra:
+                ex = next(batch)
                 base = {
                     **base,
                     "total_with_bonuses": base["total_with_bonuses"]
@@ -666,11 +1375,7 @@ async def _execute_combat_action_async(
                     "extra_damage": ex,
                     "extra_damage_type": extra.get("type", ""),
                 }
-            return base
-
-        damage_results: list[dict] = await asyncio.gather(
-            *(_roll_attack_damage(a) for a in attacks)
-        )
+            damage_results.append(base)
 
         # Structured sidecar: an attack-roll action lands 0 until confirmed
         # `hit`. `damage_total` is the sum of every attack's rolled damage.
@@ -884,6 +1589,18 @@ def roll_combat_action(
 ) -> str:
     """Run a structured combat action for an NPC in one MCP call.
 
+    Synchronous wrapper around `roll_combat_action_async`; see there.
+    """
+    return asyncio.run(roll_combat_action_async(npc, action, log_path))
+
+
+async def roll_combat_action_async(
+    npc: str,
+    action: str,
+    log_path: str | None = None,
+) -> str:
+    """Run a structured combat action for an NPC in one MCP call.
+
     Looks up the action in `combat-runner/actions.jsonl` (flat DB). `action` can
     be the action name OR a verb (resolved via the action's `verbs` list).
 
@@ -914,7 +1631,7 @@ def roll_combat_action(
     # Build the spec dict from the record (drop bookkeeping fields)
     spec = {k: v for k, v in record.items() if k not in ("npc", "action", "updated_at")}
     try:
-        result = asyncio.run(_execute_combat_action_async(npc, resolved, spec, log_path))
+        result = await _execute_combat_action_async(npc, resolved, spec, log_path)
         result["resolved_action"] = resolved
         return json.dumps(result, ensure_ascii=False)
     except Exception as e:
@@ -953,6 +1670,19 @@ def combat_action_upsert(npc: str, action: str, spec: dict) -> str:
         return json.dumps({"ok": False, "error": str(e)})
 
 
+def _entropy_status(*, open_pool: bool = True) -> dict[str, Any]:
+    """Pool depth, refill counters and circuit-breaker state (no network, no
+    thread start) — for dice_pool_stats and the GUI status bar. The GUI polls
+    with open_pool=False so its UI thread never does the first ring open."""
+    return _get_refiller().snapshot(open_pool=open_pool)
+
+
+def dice_pool_stats() -> str:
+    """Report the dice pool depth, the refill daemon's counters and the
+    upstream circuit breakers as JSON."""
+    return json.dumps(_entropy_status(), ensure_ascii=False)
+
+
 def combat_actions_list(
     npc: str | None = None,
     npcs: list[str] | None = None,
@@ -967,10 +1697,6 @@ def combat_actions_list(
     return json.dumps({"count": len(summaries), "actions": summaries}, ensure_ascii=False)
 
 
-# Initialize cache on module load
-_load_cache()
-
-
 MCP_TOOLS = [
     {
         "name": "roll_dice",
@@ -1214,10 +1940,83 @@ MCP_TOOLS.append({
 })
 
 
+MCP_TOOLS.append({
+    "name": "roll_batch",
+    "description": (
+        "Roll many dice groups in ONE call — initiative for a whole encounter, a volley "
+        "of attacks, every roll of a custom multiattack. Each group takes the same "
+        "arguments as roll_dice (num_dice, dice_size, optional bonuses, modifier, "
+        "description); at most 1000 dice in total. All numbers are drawn from the pool "
+        "at once, and groups with a description are appended to log_path in one write.\n\n"
+        "RETURNS: JSON with `count` and `results` — one roll_dice-shaped result per group, "
+        "in order, each with its own 'narrative'. Print a group's narrative VERBATIM "
+        "when you report it, exactly as for roll_dice."
+    ),
+    "annotations": {"title": "Roll Dice Batch (Quantum)", **_RW_LOCAL},
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "groups": {
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "num_dice": {"type": "integer", "minimum": 1, "maximum": 100},
+                        "dice_size": {"type": "integer", "enum": [4, 6, 8, 10, 12, 20, 100]},
+                        "bonuses": {"type": "array", "items": {"type": "integer"}},
+                        "modifier": {"type": "integer", "minimum": -1000, "maximum": 1000},
+                        "description": {"type": "string"},
+                    },
+                    "required": ["num_dice", "dice_size"],
+                    "additionalProperties": False,
+                },
+                "description": (
+                    "Dice groups, e.g. [{\"num_dice\": 1, \"dice_size\": 20, \"modifier\": 2, "
+                    "\"description\": \"Goblin 1 initiative\"}, ...]."
+                ),
+            },
+            "log_path": {
+                "type": "string",
+                "description": "Optional Markdown log file inside the repo (as for roll_dice).",
+            },
+        },
+        "required": ["groups"],
+        "additionalProperties": False,
+    },
+})
+
+
+MCP_TOOLS.append({
+    "name": "dice_pool_stats",
+    "description": (
+        "Report the quantum dice pool as JSON: numbers cached (pool_depth), the refill "
+        "watermarks, where rolls currently come from (mode: quantumnumbers, random_org, "
+        "or local when both upstreams are unreachable), each upstream's circuit breaker "
+        "(closed / open / half_open, retry time), refill counts by source, numbers "
+        "rolled locally, and p50/p95/max of refill latency and of the time rolls spent "
+        "waiting for a refill."
+    ),
+    "annotations": {"title": "Dice Pool Stats (read-only)", **_RO_LOCAL, "idempotentHint": False},
+    "input_schema": {"type": "object", "properties": {}, "additionalProperties": False},
+})
+
+
 MCP_HANDLERS = {
     "roll_dice": roll_dice,
     "log_combat_event": log_combat_event,
     "roll_combat_action": roll_combat_action,
     "combat_action_upsert": combat_action_upsert,
     "combat_actions_list": combat_actions_list,
+    "dice_pool_stats": dice_pool_stats,
+    "roll_batch": roll_batch,
+}
+
+# Coroutine variants of the rolling tools. The MCP server awaits these on its
+# event loop instead of running the sync wrapper (one asyncio.run per call) on
+# a worker thread; MCP_HANDLERS stays the sync dispatch table for other callers.
+MCP_ASYNC_HANDLERS = {
+    "roll_dice": roll_dice_async,
+    "roll_combat_action": roll_combat_action_async,
+    "roll_batch": roll_batch_async,
 }
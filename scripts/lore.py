@@ -575,6 +575,8 @@ _RO_LOCAL = {
 }
 
 
+# Each tool's "cache" entry lists the vault paths it reads, so the MCP server
+# can memoize its results and drop them when one of those files changes.
 MCP_TOOLS = [
     {
         "name": "search_npcs",
@@ -591,6 +593,7 @@ MCP_TOOLS = [
             "or `get_npc(name=...)` (which now falls back to file search)."
         ),
         "annotations": {"title": "Search Campaign NPCs", **_RO_LOCAL},
+        "cache": {"depends_on": ["world/naming_conventions/character-registry.tsv"]},
         "argv": ["--mcp-tool", "search_npcs"],
         "value_flags": {
             "name": "--name",
@@ -631,6 +634,7 @@ MCP_TOOLS = [
             "as files only, with no registry row. The fallback finds them; `search_npcs` will not."
         ),
         "annotations": {"title": "Get NPC / PC details", **_RO_LOCAL},
+        "cache": {"depends_on": ["world", "characters"]},
         "argv": ["--mcp-tool", "get_npc", "{name}"],
         "input_schema": {
             "type": "object",
@@ -660,6 +664,7 @@ MCP_TOOLS = [
             "first-class in the tool surface."
         ),
         "annotations": {"title": "Get Faction Overview", **_RO_LOCAL},
+        "cache": {"depends_on": ["world/factions"]},
         "argv": ["--mcp-tool", "get_faction_overview", "{slug}"],
         "input_schema": {
             "type": "object",
@@ -683,6 +688,7 @@ MCP_TOOLS = [
             "session summaries written from in-character perspectives."
         ),
         "annotations": {"title": "Last Session Notes", **_RO_LOCAL},
+        "cache": {"depends_on": ["sessions"]},
         "argv": ["--mcp-tool", "last_session_summary"],
         "value_flags": {"session": "--session"},
         "input_schema": {
@@ -716,6 +722,7 @@ MCP_TOOLS = [
             "automatically."
         ),
         "annotations": {"title": "Find Lore (text search)", **_RO_LOCAL},
+        "cache": {"depends_on": ["."]},
         "argv": ["--mcp-tool", "find_lore"],
         "value_flags": {
             "query": "--query",
@@ -3,29 +3,39 @@
 from __future__ import annotations
 
 import ast
+import asyncio
 import importlib.util
+import inspect
 import json
+import math
 import os
+import queue
 import subprocess
 import sys
 import threading
+import time
+import uuid
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 PROTOCOL_VERSION = "2025-06-18"
 _TRANSPORT_MODE: Optional[str] = None  # "jsonl" | "lsp"
 
-# Concurrent dispatch: tool calls go to a thread pool so a batch of cold
-# (cache-miss) HTTP fetches doesn't run end-to-end serially. The stdin loop is
-# still single-threaded — only `tools/call` is parallelized; initialize and
-# tools/list stay inline because they're sub-millisecond. _STDOUT_LOCK
-# serializes byte writes so concurrent JSON-RPC responses don't interleave.
+# Concurrent dispatch: the serve loop runs on asyncio (stdin is read on a
+# helper thread). Each `tools/call` becomes a task (see _Dispatcher):
+# coroutine handlers are awaited on the loop, sync handlers and subprocess
+# tools go to a thread pool so a batch of cold (cache-miss) HTTP fetches
+# doesn't run end-to-end serially. initialize and tools/list stay inline
+# because they're sub-millisecond. _STDOUT_LOCK serializes byte writes so
+# concurrent JSON-RPC responses don't interleave.
 # Pool size is tunable via DND_MCP_MAX_WORKERS (default 8 — Open5e tolerates
-# this comfortably and SQLite's per-connection locking handles the rest).
+# this comfortably, and srd_cache's WAL backend gives each worker thread its own
+# SQLite connection with writes batched behind the readers).
 _STDOUT_LOCK = threading.Lock()
 
 # Sentinel returned by _read_message for a malformed-but-recoverable frame: the
@@ -33,6 +43,25 @@ _STDOUT_LOCK = threading.Lock()
 _SKIP_MESSAGE: dict[str, Any] = {}
 
 
+def _group_limits_env(name: str) -> dict[str, int]:
+    """Parse `group=N,group=N` (e.g. DND_MCP_GROUP_CONCURRENCY=combat=4) into
+    per-group caps; malformed or non-positive entries are warned about and dropped."""
+    limits: dict[str, int] = {}
+    for item in os.environ.get(name, "").split(","):
+        if not item.strip():
+            continue
+        group, _, raw = item.partition("=")
+        try:
+            limit = int(raw)
+        except ValueError:
+            limit = 0
+        if not group.strip() or limit < 1:
+            print(f"warn: ignoring {name} entry {item.strip()!r}", file=sys.stderr)
+            continue
+        limits[group.strip()] = limit
+    return limits
+
+
 def _safe_int_env(name: str, default: int) -> int:
     """Parse an env var as int, falling back to `default` on missing or invalid
     input. Avoids crashing the server at import time on a typo (e.g. 'eight')."""
@@ -53,10 +82,30 @@ _DEFAULT_MAX_WORKERS = max(1, _safe_int_env("DND_MCP_MAX_WORKERS", 8))
 # JSON-RPC error rather than silently piling up. Default = 4× workers, leaving
 # headroom for short bursts without letting them grow without bound.
 _INFLIGHT_LIMIT = max(_DEFAULT_MAX_WORKERS * 4, 32)
-_inflight_slots = threading.Semaphore(_INFLIGHT_LIMIT)
-# Per-call wall-clock cap on subprocess tools — a hung child would otherwise pin
-# its worker forever. Bypass with DND_MCP_TOOL_TIMEOUT=<seconds>; raise it for
-# slow generators (e.g. PDF export) or set <=0 to disable (NOT recommended).
+# Backpressure before rejecting: a call arriving at the cap waits up to
+# DND_MCP_QUEUE_WAIT_MS (default 2000) for a slot, so a short burst queues
+# instead of failing; only a sustained overload gets "Server busy".
+_QUEUE_WAIT_SEC = max(0, _safe_int_env("DND_MCP_QUEUE_WAIT_MS", 2000)) / 1000
+# Per-tool cap on concurrent calls, default 3/4 of the pool: a burst of one
+# slow tool (a PDF export, a cold SRD crawl) always leaves threads for quick
+# ones. A tool's MCP_TOOL entry can set `"concurrency": N` instead.
+_TOOL_CONCURRENCY = max(1, _safe_int_env("DND_MCP_TOOL_CONCURRENCY", max(1, _DEFAULT_MAX_WORKERS * 3 // 4)))
+# Caps shared by every tool of a module MCP_GROUPS group, e.g. "combat=4".
+_GROUP_CONCURRENCY = _group_limits_env("DND_MCP_GROUP_CONCURRENCY")
+# Latency lanes. "interactive" tools (at-table: dice, combat actions, SRD
+# lookups) get DND_MCP_INTERACTIVE_RESERVED worker threads that "batch" tools
+# (reports, timeline renders, PDF exports) can never occupy, and go first when
+# a thread frees up. A tool's lane is its MCP_TOOL `"lane"`, else interactive
+# when its module is in one of _INTERACTIVE_GROUPS, else batch.
+_LANES = ("interactive", "batch")
+_TOOL_METRICS = ("queue_ms", "handler_ms", "serialize_ms", "payload_bytes")
+_INTERACTIVE_GROUPS = frozenset({"combat"})
+_INTERACTIVE_RESERVED = max(0, _safe_int_env("DND_MCP_INTERACTIVE_RESERVED", max(1, _DEFAULT_MAX_WORKERS // 4)))
+# Per-call inactivity cap on subprocess tools — a hung child would otherwise pin
+# its worker forever. Measured from the start or the child's latest progress
+# line (scripts/mcp_progress.py), so long jobs that report progress aren't
+# killed. Bypass with DND_MCP_TOOL_TIMEOUT=<seconds>; raise it for silent slow
+# generators or set <=0 to disable (NOT recommended).
 _TOOL_TIMEOUT_SEC = _safe_int_env("DND_MCP_TOOL_TIMEOUT", 60)
 
 
@@ -77,9 +126,10 @@ def _read_exact(stream: Any, n: int) -> bytes:
     return buf
 
 
-def _read_message() -> Optional[dict[str, Any]]:
+def _read_message() -> Optional[dict[str, Any] | list[Any]]:
     # Codex uses newline-delimited JSON-RPC over stdio (JSONL). Some MCP clients use LSP-style
-    # Content-Length headers. Support both by sniffing the first line.
+    # Content-Length headers. Support both by sniffing the first line. A JSON-RPC
+    # batch comes back as a list.
     global _TRANSPORT_MODE
 
     while True:
@@ -142,52 +192,620 @@ def _read_message() -> Optional[dict[str, Any]]:
         return _SKIP_MESSAGE
 
 
-def _write_message(payload: dict[str, Any]) -> None:
-    """Serialize a JSON-RPC envelope to stdout. Holds _STDOUT_LOCK so concurrent
-    worker threads can't interleave bytes mid-message."""
-    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+# Compact JSON for everything the server sends: `indent=2` padded tool results
+# by a third or more, and no client reads the raw frames.
+_COMPACT = (",", ":")
+
+
+def _encode_message(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=_COMPACT).encode("utf-8")
+
+
+def _write_message(payload: dict[str, Any]) -> int:
+    """Serialize a JSON-RPC envelope to stdout and return its body size in
+    bytes."""
+    return _write_frame(_encode_message(payload))
+
+
+def _write_frame(body: bytes) -> int:
+    """Write one encoded JSON-RPC frame to stdout. Holds _STDOUT_LOCK so
+    concurrent worker threads can't interleave bytes mid-message."""
     with _STDOUT_LOCK:
         if _TRANSPORT_MODE == "jsonl":
             sys.stdout.buffer.write(body + b"\n")
             sys.stdout.buffer.flush()
-            return
+            return len(body)
         sys.stdout.buffer.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii"))
         sys.stdout.buffer.write(body)
         sys.stdout.buffer.flush()
+    return len(body)
+
+
+def _call_tool(
+    runner: "ToolRunner",
+    arguments: dict[str, Any],
+    *,
+    progress: Optional[Callable[[dict[str, Any]], None]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> str:
+    """Run one sync tools/call on a worker thread. Read-only tools go through
+    the result cache (see _ResultCache); any other call makes the cache re-check
+    its dependencies, since it may have written files a cached read depends on."""
+    cache = _result_cache
+    if cache is not None and runner.cache_ttl is not None:
+        return cache.call(runner, arguments, lambda: runner.run(arguments=arguments, progress=progress, cancel=cancel))
+    try:
+        return runner.run(arguments=arguments, progress=progress, cancel=cancel)
+    finally:
+        if cache is not None and not (runner.tool.annotations or {}).get("readOnlyHint"):
+            cache.note_write()
+
+
+async def _call_tool_async(
+    runner: "ToolRunner",
+    handler: Callable[..., Awaitable[Any]],
+    arguments: dict[str, Any],
+) -> str:
+    """_call_tool for a coroutine handler, awaited on the serve loop."""
+    cache = _result_cache
+    if cache is not None and runner.cache_ttl is not None:
+        return await cache.call_async(runner, arguments, lambda: runner.run_async(handler, arguments=arguments))
+    try:
+        return await runner.run_async(handler, arguments=arguments)
+    finally:
+        if cache is not None and not (runner.tool.annotations or {}).get("readOnlyHint"):
+            cache.note_write()
+
+
+@dataclass
+class _CallTiming:
+    """perf_counter() marks for one tools/call; 0.0 = not reached."""
+    arrived: float
+    started: float = 0.0
+    finished: float = 0.0
+    written: float = 0.0
+    payload_bytes: int = 0
+    outcome: str = "ok"  # ok | error | cancelled | rejected
+
+
+# Structured trace: DND_MCP_TRACE=<path> appends one Chrome trace event per
+# line (nestable async "b"/"e" pairs: the call, then its queue / handler /
+# serialize phases). `server.py --trace-to-chrome <path>` wraps the file as
+# {"traceEvents": [...]} for Perfetto or chrome://tracing.
+_TRACE_PATH = os.environ.get("DND_MCP_TRACE", "").strip()
+
+
+class _TraceLog:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._stream: Any = None
+        self._seq = 0
+        self._pid = os.getpid()
+        # perf_counter() → wall-clock microseconds, so traces from one run line up.
+        self._offset = time.time() - time.perf_counter()
+
+    def _us(self, mark: float) -> int:
+        return int((mark + self._offset) * 1_000_000)
+
+    def record(self, runner: "ToolRunner", msg_id: Any, timing: _CallTiming) -> None:
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        lane = runner.lane
+        base = {"cat": lane, "id": seq, "pid": self._pid, "tid": _LANES.index(lane) + 1}
+        end = timing.written or timing.finished or timing.started or timing.arrived
+        events = [{**base, "name": runner.tool.name, "ph": "b", "ts": self._us(timing.arrived),
+                   "args": {"request_id": msg_id, "outcome": timing.outcome,
+                            "payload_bytes": timing.payload_bytes}}]
+        for phase, begin, stop in (("queue", timing.arrived, timing.started),
+                                   ("handler", timing.started, timing.finished),
+                                   ("serialize", timing.finished, timing.written)):
+            if begin and stop:
+                events.append({**base, "name": phase, "ph": "b", "ts": self._us(begin)})
+                events.append({**base, "name": phase, "ph": "e", "ts": self._us(stop)})
+        events.append({**base, "name": runner.tool.name, "ph": "e", "ts": self._us(end)})
+        lines = "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in events)
+        with self._lock:
+            try:
+                if self._stream is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._stream = self.path.open("a", encoding="utf-8")
+                self._stream.write(lines)
+                self._stream.flush()
+            except OSError as exc:
+                sys.stderr.write(f"[mcp-server] trace log {self.path} failed, tracing off: {exc}\n")
+                self._stream = None
+                self.record = lambda *args, **kwargs: None  # type: ignore[method-assign]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+
+def _trace_to_chrome(path: Path) -> dict[str, Any]:
+    events = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                events.append(json.loads(line))
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+class _RollingStats:
+    """Count, max and percentiles over the most recent `window` samples."""
+
+    def __init__(self, window: int = 1024) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def summary(self, digits: int = 1) -> dict[str, Any]:
+        ordered = sorted(self._samples)
+
+        def pct(q: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], digits)
 
+        return {"count": self.count, "p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99),
+                "max": round(self.max, digits)}
 
-def _run_call_worker(msg_id: Any, runner: "ToolRunner", arguments: dict[str, Any]) -> None:
-    """Execute one tools/call in a worker thread. Catches every exception so a
-    failing handler can never crash the server — converts to a JSON-RPC error.
-    Notifications (msg_id is None) are silently completed with no response.
-    Always releases the inflight semaphore in `finally` so admission control
-    can't leak slots even if the handler explodes."""
-    try:
-        out = runner.run(arguments=arguments)
-        if msg_id is not None:
-            _write_message({
-                "jsonrpc": "2.0",
-                "id": msg_id,
-                "result": {"content": [{"type": "text", "text": out}]},
-            })
-    except Exception as exc:
-        # Surface the full traceback to stderr (the MCP client sees only the
-        # short error message via JSON-RPC, but mid-fight debugging benefits
-        # from the real stack — Claude Code's MCP logs capture stderr).
-        import traceback as _tb
-        sys.stderr.write(
-            f"\n[mcp-server] tool {runner.tool.name!r} crashed:\n"
-            f"{_tb.format_exc()}\n"
+
+class _LaneScheduler:
+    """Worker-thread slots for the executor, shared by the two lanes. Batch
+    calls may hold at most `size - reserved` slots; interactive calls may hold
+    any, and a freed slot goes to a waiting interactive call first. FIFO within
+    a lane. Loop-thread only (no locking)."""
+
+    def __init__(self, size: int, reserved: int) -> None:
+        self.size = max(1, size)
+        self.reserved = min(max(0, reserved), self.size - 1)
+        self._busy = 0
+        self._waiters: dict[str, deque[asyncio.Future[None]]] = {lane: deque() for lane in _LANES}
+
+    def _has_room(self, lane: str) -> bool:
+        if lane == "interactive":
+            return self._busy < self.size
+        return self._busy < self.size - self.reserved and not self._waiters["interactive"]
+
+    async def acquire(self, lane: str) -> None:
+        if not self._waiters[lane] and self._has_room(lane):
+            self._busy += 1
+            return
+        granted: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(granted)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                self.release()  # granted just as it was cancelled: hand it on
+            else:
+                self._waiters[lane].remove(granted)
+                self._wake()
+            raise
+
+    def release(self) -> None:
+        self._busy -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for lane in _LANES:
+            waiters = self._waiters[lane]
+            while waiters and self._has_room(lane):
+                granted = waiters.popleft()
+                if granted.done():
+                    continue
+                self._busy += 1
+                granted.set_result(None)
+
+
+class _Dispatcher:
+    """tools/call scheduling on the serve loop (one per _serve).
+
+    - Admission: at most `inflight_limit` calls in flight. Past that a call
+      waits up to `queue_wait` seconds for a slot (with at most `inflight_limit`
+      calls waiting) before it is rejected with "Server busy".
+    - Caps: an admitted call then waits for its tool's slot and each of its
+      groups' slots, so one slow tool can't occupy every worker thread.
+    - Coroutine handlers are awaited on the loop (counted per lane, holding
+      no thread); everything else — including a lazy tool's first-call
+      import — runs on `executor` once its lane grants a thread (see
+      _LaneScheduler). Time from arrival to start is recorded per lane.
+    - cancel(request_id) cancels the call's task. A subprocess tool has its
+      process killed; an in-process sync handler runs to completion with its
+      result discarded, still holding its slots. A cancelled call gets no response.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        *,
+        inflight_limit: int = _INFLIGHT_LIMIT,
+        queue_wait: float = _QUEUE_WAIT_SEC,
+        tool_limit: int = _TOOL_CONCURRENCY,
+        group_limits: Optional[dict[str, int]] = None,
+        threads: int = _DEFAULT_MAX_WORKERS,
+        interactive_reserved: int = _INTERACTIVE_RESERVED,
+        trace: Optional[_TraceLog] = None,
+    ) -> None:
+        self._executor = executor
+        self._inflight_limit = inflight_limit
+        self._queue_wait = queue_wait
+        self._tool_limit = tool_limit
+        self._group_limits = _GROUP_CONCURRENCY if group_limits is None else group_limits
+        self._slots = asyncio.Semaphore(inflight_limit)
+        self._caps: dict[str, asyncio.Semaphore] = {}
+        self._waiting = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._by_id: dict[Any, asyncio.Task[None]] = {}
+        self._lanes = _LaneScheduler(threads, interactive_reserved)
+        self._lane_waits = {lane: _RollingStats() for lane in _LANES}
+        self._on_loop = {lane: 0 for lane in _LANES}
+        self._tool_metrics: dict[str, dict[str, Any]] = {}
+        self._trace = trace
+        self.stats = {"calls": 0, "queued": 0, "rejected": 0, "cancelled": 0}
+
+    def tool_stats(self) -> dict[str, Any]:
+        """Rolling p50/p95/p99/max per tool: queue wait, handler time and
+        response serialization (encode + write) in ms, response size in bytes."""
+        return {
+            name: {
+                "calls": metrics["calls"],
+                "errors": metrics["errors"],
+                **{key: metrics[key].summary() for key in _TOOL_METRICS},
+            }
+            for name, metrics in sorted(self._tool_metrics.items())
+        }
+
+    def _finish(self, runner: "ToolRunner", msg_id: Any, timing: _CallTiming) -> None:
+        metrics = self._tool_metrics.get(runner.tool.name)
+        if metrics is None:
+            metrics = self._tool_metrics[runner.tool.name] = {
+                "calls": 0, "errors": 0, **{key: _RollingStats() for key in _TOOL_METRICS},
+            }
+        metrics["calls"] += 1
+        if timing.outcome == "error":
+            metrics["errors"] += 1
+        if timing.started:
+            metrics["queue_ms"].add((timing.started - timing.arrived) * 1000)
+        if timing.finished:
+            metrics["handler_ms"].add((timing.finished - timing.started) * 1000)
+        if timing.written:
+            metrics["serialize_ms"].add((timing.written - timing.finished) * 1000)
+            metrics["payload_bytes"].add(timing.payload_bytes)
+        if self._trace is not None:
+            self._trace.record(runner, msg_id, timing)
+
+    def lane_stats(self) -> dict[str, Any]:
+        """Queue wait (ms from arrival to start) and coroutine calls running
+        on the loop per lane, plus the thread split."""
+        return {
+            "threads": self._lanes.size,
+            "interactive_reserved": self._lanes.reserved,
+            **{lane: {"queue_wait_ms": waits.summary(), "on_loop": self._on_loop[lane]}
+               for lane, waits in self._lane_waits.items()},
+        }
+
+    def submit(
+        self,
+        msg_id: Any,
+        runner: "ToolRunner",
+        arguments: dict[str, Any],
+        progress_token: Any = None,
+        *,
+        reply: Optional[Callable[[dict[str, Any]], int]] = None,
+    ) -> "asyncio.Task[None]":
+        """Start a tools/call as its own task. Its response goes to `reply`
+        (a batch member's slot), or straight to stdout by default."""
+        self.stats["calls"] += 1
+        timing = _CallTiming(arrived=time.perf_counter())
+        task = asyncio.get_running_loop().create_task(
+            self._call(msg_id, runner, arguments, progress_token, timing, reply)
         )
-        sys.stderr.flush()
+        self._tasks.add(task)
         if msg_id is not None:
-            _write_message({
-                "jsonrpc": "2.0",
-                "id": msg_id,
-                "error": {"code": -32000, "message": str(exc)},
-            })
-    finally:
-        _inflight_slots.release()
+            self._by_id[msg_id] = task
+
+        def forget(done: asyncio.Task[None]) -> None:
+            self._tasks.discard(done)
+            if msg_id is not None and self._by_id.get(msg_id) is done:
+                del self._by_id[msg_id]
+
+        task.add_done_callback(forget)
+        return task
+
+    def cancel(self, request_id: Any) -> bool:
+        task = self._by_id.get(request_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    async def drain(self) -> None:
+        """Wait for every in-flight call (used on stdin EOF)."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _cap(self, key: str, limit: int) -> asyncio.Semaphore:
+        sem = self._caps.get(key)
+        if sem is None:
+            sem = self._caps[key] = asyncio.Semaphore(limit)
+        return sem
+
+    def _caps_for(self, runner: "ToolRunner") -> list[asyncio.Semaphore]:
+        # Groups first, then the tool, always in the same order — two calls
+        # can't each hold a slot the other is waiting for.
+        caps = [
+            self._cap(f"group:{group}", self._group_limits[group])
+            for group in sorted(runner.groups) if group in self._group_limits
+        ]
+        caps.append(self._cap(f"tool:{runner.tool.name}", runner.concurrency or self._tool_limit))
+        return caps
+
+    async def _admit(self) -> bool:
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return True
+        if self._queue_wait <= 0 or self._waiting >= self._inflight_limit:
+            return False
+        self._waiting += 1
+        self.stats["queued"] += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self._queue_wait)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            self._waiting -= 1
+
+    async def _call(self, msg_id: Any, runner: "ToolRunner", arguments: dict[str, Any], progress_token: Any,
+                    timing: _CallTiming, reply: Optional[Callable[[dict[str, Any]], int]] = None) -> None:
+        write = reply if reply is not None else _write_message
+        try:
+            admitted = await self._admit()
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            timing.outcome = "cancelled"
+            self._finish(runner, msg_id, timing)
+            return
+        if not admitted:
+            self.stats["rejected"] += 1
+            timing.outcome = "rejected"
+            if msg_id is not None:
+                write({
+                    "jsonrpc": "2.0",
+                    "id": msg_id,
+                    "error": {
+                        "code": -32000,
+                        "message": (
+                            f"Server busy: {self._inflight_limit} in-flight tool calls. "
+                            "Retry after some complete."
+                        ),
+                    },
+                })
+            self._finish(runner, msg_id, timing)
+            return
+        acquired: list[asyncio.Semaphore] = []
+        response: Optional[dict[str, Any]] = None
+        try:
+            for cap in self._caps_for(runner):
+                await cap.acquire()
+                acquired.append(cap)
+            out = await self._invoke(runner, arguments, progress_token, timing)
+        except asyncio.CancelledError:
+            # Per MCP, a cancelled request gets no response.
+            self.stats["cancelled"] += 1
+            timing.outcome = "cancelled"
+        except Exception as exc:
+            # Surface the full traceback to stderr (the MCP client sees only the
+            # short error message via JSON-RPC, but mid-fight debugging benefits
+            # from the real stack — Claude Code's MCP logs capture stderr).
+            import traceback as _tb
+            sys.stderr.write(
+                f"\n[mcp-server] tool {runner.tool.name!r} crashed:\n"
+                f"{_tb.format_exc()}\n"
+            )
+            sys.stderr.flush()
+            timing.outcome = "error"
+            response = {"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32000, "message": str(exc)}}
+        else:
+            response = {"jsonrpc": "2.0", "id": msg_id, "result": {"content": _result_content(runner.tool.name, out)}}
+        finally:
+            for cap in reversed(acquired):
+                cap.release()
+            self._slots.release()
+        if timing.started and not timing.finished:
+            timing.finished = time.perf_counter()
+        if response is not None and msg_id is not None:
+            timing.payload_bytes = write(response) or 0
+            timing.written = time.perf_counter()
+        self._finish(runner, msg_id, timing)
+
+    def _started(self, lane: str, timing: _CallTiming) -> None:
+        timing.started = time.perf_counter()
+        self._lane_waits[lane].add((timing.started - timing.arrived) * 1000)
+
+    async def _invoke(self, runner: "ToolRunner", arguments: dict[str, Any], progress_token: Any,
+                      timing: _CallTiming) -> str:
+        loop = asyncio.get_running_loop()
+        lane = runner.lane
+        handler = runner.async_handler
+        lazy = runner.handler if isinstance(runner.handler, _LazyHandler) else None
+        if handler is None and lazy is not None and lazy.module.loaded:
+            handler = lazy.load_async()
+            lazy = None
+        if handler is not None:
+            self._started(lane, timing)
+            try:
+                return await self._await_on_loop(runner, handler, arguments, lane)
+            finally:
+                timing.finished = time.perf_counter()
+
+        await self._lanes.acquire(lane)
+        holding = True
+        try:
+            self._started(lane, timing)
+            if handler is None and lazy is not None:
+                # The first call imports the module — on one of the lane's
+                # threads, so a burst of cold calls can't take the whole pool.
+                handler = await loop.run_in_executor(self._executor, lazy.load_async)
+                if handler is not None:
+                    self._lanes.release()  # a coroutine tool needs no thread past this
+                    holding = False
+                    return await self._await_on_loop(runner, handler, arguments, lane)
+            return await self._run_on_thread(runner, arguments, progress_token)
+        finally:
+            timing.finished = time.perf_counter()
+            if holding:
+                self._lanes.release()
+
+    async def _await_on_loop(self, runner: "ToolRunner", handler: Callable[..., Awaitable[Any]],
+                             arguments: dict[str, Any], lane: str) -> str:
+        """Await a coroutine handler. It takes no worker thread, but counts
+        against its lane while it runs (lane_stats' `on_loop`)."""
+        self._on_loop[lane] += 1
+        try:
+            return await _call_tool_async(runner, handler, arguments)
+        finally:
+            self._on_loop[lane] -= 1
+
+    async def _run_on_thread(self, runner: "ToolRunner", arguments: dict[str, Any], progress_token: Any) -> str:
+        cancel = threading.Event()
+        relay = _progress_relay(progress_token) if progress_token is not None else None
+        progress = None
+        if relay is not None:
+            def progress(event: dict[str, Any]) -> None:
+                if not cancel.is_set():
+                    relay(event)
+        future = self._executor.submit(_call_tool, runner, arguments, progress=progress, cancel=cancel)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            if not future.cancel():
+                # Already running. Subprocess tools stop within _CANCEL_POLL_SEC;
+                # either way the call keeps its slots until its thread is free.
+                await asyncio.wait([asyncio.wrap_future(future)])
+            raise
+
+
+_dispatcher: Optional[_Dispatcher] = None
+_trace_log: Optional[_TraceLog] = None
+
+
+# Oversized tool results: the first page goes back inline, and the rest as
+# `resource_link` handles the client fetches with resources/read
+# (`dnd-result://<token>/<page>`). The newest _RESULT_PAGES_KEEP results stay
+# readable.
+_RESULT_PAGE_CHARS = max(1024, _safe_int_env("DND_MCP_RESULT_PAGE_CHARS", 50_000))
+_RESULT_PAGES_KEEP = 32
+_RESULT_URI_PREFIX = "dnd-result://"
+
+
+def _split_pages(text: str, size: int) -> list[str]:
+    """Cut `text` into pieces of at most `size` characters, at a line break
+    when there's one in the back half of the window."""
+    pages = []
+    start = 0
+    while len(text) - start > size:
+        cut = text.rfind("\n", start + size // 2, start + size)
+        end = cut + 1 if cut != -1 else start + size
+        pages.append(text[start:end])
+        start = end
+    pages.append(text[start:])
+    return pages
+
+
+class _ResultPages:
+    """Pages of recent oversized results, by token. Loop-thread only."""
+
+    def __init__(self, keep: int = _RESULT_PAGES_KEEP) -> None:
+        self._keep = keep
+        self._results: OrderedDict[str, tuple[str, list[str]]] = OrderedDict()
+
+    def store(self, tool_name: str, pages: list[str]) -> str:
+        token = uuid.uuid4().hex[:12]
+        self._results[token] = (tool_name, pages)
+        while len(self._results) > self._keep:
+            self._results.popitem(last=False)
+        return token
+
+    def read(self, uri: str) -> Optional[str]:
+        token, _, page = uri.removeprefix(_RESULT_URI_PREFIX).partition("/")
+        entry = self._results.get(token) if uri.startswith(_RESULT_URI_PREFIX) else None
+        if entry is None or not page.isdigit() or not 1 <= int(page) <= len(entry[1]):
+            return None
+        self._results.move_to_end(token)
+        return entry[1][int(page) - 1]
+
+    def listing(self) -> list[dict[str, Any]]:
+        return [
+            _page_link(token, tool_name, number, len(pages))
+            for token, (tool_name, pages) in reversed(self._results.items())
+            for number in range(2, len(pages) + 1)
+        ]
+
+
+def _page_link(token: str, tool_name: str, number: int, total: int) -> dict[str, Any]:
+    return {
+        "type": "resource_link",
+        "uri": f"{_RESULT_URI_PREFIX}{token}/{number}",
+        "name": f"{tool_name} result, page {number} of {total}",
+        "mimeType": "text/plain",
+    }
+
+
+_result_pages = _ResultPages()
+
+
+def _result_content(tool_name: str, text: str) -> list[dict[str, Any]]:
+    """MCP `content` for a tool result: one text block, or for a result over
+    _RESULT_PAGE_CHARS its first page plus a resource link per further page."""
+    if len(text) <= _RESULT_PAGE_CHARS:
+        return [{"type": "text", "text": text}]
+    pages = _split_pages(text, _RESULT_PAGE_CHARS)
+    token = _result_pages.store(tool_name, pages)
+    note = (
+        f"\n[page 1 of {len(pages)}; {len(text)} characters in all. "
+        "Read the linked resources for the rest, in order.]"
+    )
+    return [{"type": "text", "text": pages[0] + note}] + [
+        _page_link(token, tool_name, number, len(pages)) for number in range(2, len(pages) + 1)
+    ]
+
+
+class _BatchReply:
+    """Collects the responses to one JSON-RPC batch and writes them as a
+    single array, in request order, once every member has finished. Members
+    that get no response (notifications, cancelled calls) are left out; if
+    none get one, nothing is written. Loop-thread only."""
+
+    def __init__(self, size: int) -> None:
+        self._parts: list[Optional[bytes]] = [None] * size
+        self._open = size
+
+    def slot(self, index: int) -> Callable[[dict[str, Any]], int]:
+        def write(payload: dict[str, Any]) -> int:
+            body = _encode_message(payload)
+            self._parts[index] = body
+            return len(body)
+
+        return write
+
+    def finish(self, index: int) -> None:
+        self._open -= 1
+        if self._open == 0:
+            parts = [part for part in self._parts if part is not None]
+            if parts:
+                _write_frame(b"[" + b",".join(parts) + b"]")
 
 
 @dataclass(frozen=True)
@@ -205,22 +823,48 @@ class ToolRunner:
     bool_flags: dict[str, str]
     value_flags: dict[str, str]
     handler: Optional[Callable[..., Any]] = None
-
-    def run(self, *, arguments: dict[str, Any]) -> str:
+    # False → always a fresh subprocess, never a warm worker (`"worker": False`).
+    use_worker: bool = True
+    # Result-cache policy from _cache_policy: TTL in seconds (None → uncached)
+    # and the repo paths whose changes invalidate a cached result.
+    cache_ttl: Optional[float] = None
+    cache_deps: tuple[str, ...] = ()
+    # Coroutine variant from the module's MCP_ASYNC_HANDLERS, awaited on the
+    # serve loop instead of running `handler` on a worker thread.
+    async_handler: Optional[Callable[..., Awaitable[Any]]] = None
+    # Concurrency cap for this tool (`"concurrency": N`; None → _TOOL_CONCURRENCY)
+    # and the module's MCP_GROUPS, whose caps come from DND_MCP_GROUP_CONCURRENCY.
+    concurrency: Optional[int] = None
+    groups: tuple[str, ...] = ()
+    # "interactive" | "batch" from the entry's `"lane"`; None → derived (see lane).
+    lane_override: Optional[str] = None
+
+    @property
+    def lane(self) -> str:
+        if self.lane_override is not None:
+            return self.lane_override
+        return "interactive" if _INTERACTIVE_GROUPS.intersection(self.groups) else "batch"
+
+    def run(
+        self,
+        *,
+        arguments: dict[str, Any],
+        progress: Optional[Callable[[dict[str, Any]], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> str:
         # In-process dispatch when the script exposes MCP_HANDLERS — skips subprocess startup
         # and lets the script's module-level state (e.g. cached HTTP sessions) persist across calls.
+        # A running in-process handler can't be interrupted, so `cancel` only
+        # reaches subprocess tools.
         if self.handler is not None:
             try:
                 result = self.handler(**arguments)
             except TypeError as exc:
                 raise ValueError(f"Invalid arguments for {self.tool.name}: {exc}") from exc
-            if isinstance(result, str):
-                return result
-            return json.dumps(result, indent=2, ensure_ascii=False)
+            return _format_result(result)
 
         # TODO: replace token.format(**fmt_args) below with explicit {name} substitution so
         # values containing literal `{` or `}` don't break argv construction.
-        python = _python_bin()
         argv: list[str] = []
         fmt_args: dict[str, str] = {}
         for key, value in arguments.items():
@@ -268,49 +912,765 @@ class ToolRunner:
                 continue
             argv.extend([self.value_flags[key], rendered])
 
-        # Wall-clock timeout protects against a hung child pinning a worker
-        # forever; subprocess.run raises subprocess.TimeoutExpired on overrun
-        # and DOES kill the child (the wait happens in the subprocess module).
-        # _TOOL_TIMEOUT_SEC <= 0 means "no timeout" — opt-in only via env.
-        timeout = _TOOL_TIMEOUT_SEC if _TOOL_TIMEOUT_SEC > 0 else None
+        pool = _script_pool
+        if pool is not None and self.use_worker:
+            return pool.run(self.script_path, argv, progress=progress, cancel=cancel)
+        return _run_script(self.script_path, argv, progress=progress, cancel=cancel)
+
+    async def run_async(self, handler: Callable[..., Awaitable[Any]], *, arguments: dict[str, Any]) -> str:
+        """Await a coroutine handler for this tool (see async_handler)."""
         try:
-            proc = subprocess.run(
-                [str(python), str(self.script_path), *argv],
-                cwd=str(REPO_ROOT),
-                env={**os.environ, "PYTHONUTF8": "1"},
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
-        except subprocess.TimeoutExpired as exc:
-            raw = exc.stderr
-            if isinstance(raw, (bytes, bytearray, memoryview)):
-                stderr = bytes(raw).decode("utf-8", errors="replace")
+            result = await handler(**arguments)
+        except TypeError as exc:
+            raise ValueError(f"Invalid arguments for {self.tool.name}: {exc}") from exc
+        return _format_result(result)
+
+
+def _format_result(result: Any) -> str:
+    if isinstance(result, str):
+        return result
+    return json.dumps(result, ensure_ascii=False, separators=_COMPACT)
+
+
+# Progress protocol for subprocess tools (see scripts/mcp_progress.py): the
+# child runs with DND_MCP_PROGRESS=1 and may print lines of
+#     @@mcp-progress {"progress": 3, "total": 10, "message": "..."}
+# on stderr. They are stripped from the stderr we report, relayed to the client
+# as notifications/progress, and each one resets the timeout clock.
+_PROGRESS_PREFIX = "@@mcp-progress "
+
+
+def _parse_progress_line(line: str) -> Optional[dict[str, Any]]:
+    """{"progress"?, "total"?, "message"?} for a well-formed progress line, else
+    None (the line is then kept as ordinary stderr)."""
+    if not line.startswith(_PROGRESS_PREFIX):
+        return None
+    try:
+        raw = json.loads(line[len(_PROGRESS_PREFIX):])
+    except ValueError:
+        return None
+    if not isinstance(raw, dict):
+        return None
+    event: dict[str, Any] = {}
+    for key in ("progress", "total"):
+        value = raw.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            event[key] = value
+    if isinstance(raw.get("message"), str) and raw["message"]:
+        event["message"] = raw["message"]
+    return event
+
+
+def _progress_relay(token: Any) -> Callable[[dict[str, Any]], None]:
+    """Send each progress event as notifications/progress for `token`. MCP
+    requires `progress` to increase with every notification, so an update that
+    doesn't advance it (message-only, or a repeated value) goes out at the
+    smallest float above the previous one — same progress, newer message."""
+    last: list[Optional[float]] = [None]
+
+    def relay(event: dict[str, Any]) -> None:
+        value = event.get("progress")
+        prev = last[0]
+        if value is None or (prev is not None and value <= prev):
+            value = 0 if prev is None else math.nextafter(prev, math.inf)
+        last[0] = value
+        params: dict[str, Any] = {"progressToken": token, "progress": value}
+        if "total" in event:
+            params["total"] = event["total"]
+        if "message" in event:
+            params["message"] = event["message"]
+        _write_message({"jsonrpc": "2.0", "method": "notifications/progress", "params": params})
+
+    return relay
+
+
+def _run_script(
+    script_path: Path,
+    argv: list[str],
+    *,
+    progress: Optional[Callable[[dict[str, Any]], None]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> str:
+    """Run a subprocess tool to completion, streaming its progress lines to
+    `progress` as they arrive. DND_MCP_TOOL_TIMEOUT bounds the time since the
+    last sign of life (start, or the latest progress line): a job that keeps
+    reporting runs as long as it needs, a silent one is killed as hung.
+    _TOOL_TIMEOUT_SEC <= 0 means "no timeout" — opt-in only via env.
+    Setting `cancel` kills the child and raises _CallCancelled."""
+    timeout = _TOOL_TIMEOUT_SEC if _TOOL_TIMEOUT_SEC > 0 else None
+    proc = subprocess.Popen(
+        [str(_python_bin()), str(script_path), *argv],
+        cwd=str(REPO_ROOT),
+        env={**os.environ, "PYTHONUTF8": "1", "DND_MCP_PROGRESS": "1"},
+        # Never let a child read the JSON-RPC stream off our stdin.
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    stdout_parts: list[str] = []
+    stderr_lines: list[str] = []
+    last_activity = [time.monotonic()]
+
+    def pump_stdout() -> None:
+        stdout_parts.append(proc.stdout.read())
+
+    def pump_stderr() -> None:
+        for line in proc.stderr:
+            event = _parse_progress_line(line.rstrip("\r\n"))
+            if event is None:
+                stderr_lines.append(line)
+                continue
+            last_activity[0] = time.monotonic()
+            if progress is not None:
+                try:
+                    progress(event)
+                except Exception as exc:  # a broken relay must not kill the tool
+                    sys.stderr.write(f"[mcp-server] progress relay failed: {exc}\n")
+
+    pumps = [
+        threading.Thread(target=pump_stdout, name="dnd-mcp-stdout", daemon=True),
+        threading.Thread(target=pump_stderr, name="dnd-mcp-stderr", daemon=True),
+    ]
+    for t in pumps:
+        t.start()
+
+    timed_out = cancelled = False
+    poll = 1.0 if cancel is None else _CANCEL_POLL_SEC
+    while True:
+        if cancel is not None and cancel.is_set():
+            proc.kill()
+            proc.wait()
+            cancelled = True
+            break
+        if timeout is None and cancel is None:
+            proc.wait()
+            break
+        remaining = poll if timeout is None else last_activity[0] + timeout - time.monotonic()
+        if remaining <= 0:
+            proc.kill()
+            proc.wait()
+            timed_out = True
+            break
+        try:
+            proc.wait(timeout=min(remaining, poll))
+            break
+        except subprocess.TimeoutExpired:
+            continue
+    for t in pumps:
+        t.join(timeout=5)
+
+    if cancelled:
+        raise _CallCancelled(f"{script_path.name} was cancelled")
+    stderr = "".join(stderr_lines)
+    if timed_out:
+        raise _timeout_error(script_path, timeout, stderr)
+    return _script_output(script_path, proc.returncode, "".join(stdout_parts), stderr)
+
+
+class _CallCancelled(Exception):
+    """The client cancelled the call (notifications/cancelled); its subprocess
+    or worker was killed. Never reaches the client — no response is sent."""
+
+
+# How often a subprocess wait checks for cancellation.
+_CANCEL_POLL_SEC = 0.1
+
+
+def _timeout_error(script_path: Path, timeout: Optional[int], stderr: str) -> RuntimeError:
+    return RuntimeError(
+        f"{script_path.name} exceeded {timeout}s timeout without reporting progress "
+        f"(set DND_MCP_TOOL_TIMEOUT to adjust). stderr: {stderr.strip()[:300]}"
+    )
+
+
+def _script_output(script_path: Path, returncode: int, stdout: str, stderr: str) -> str:
+    """A finished script run → the tool result text, or RuntimeError on failure."""
+    if returncode != 0:
+        msg = (stderr or stdout or "").strip() or f"{script_path.name} exited with {returncode}"
+        raise RuntimeError(msg)
+    out = stdout.strip()
+    warn = stderr.strip()
+    if warn:
+        # Success-path stderr is real diagnostic signal (e.g. a malformed DB
+        # line was skipped). Surface it so the caller isn't handed a silently
+        # short result. Kept after stdout so machine parsers can split on it.
+        if out:
+            return f"{out}\n\n[warnings from {script_path.name}]\n{warn}"
+        return f"[warnings from {script_path.name}]\n{warn}"
+    return out
+
+
+# Warm worker processes for subprocess tools (scripts/mcp/worker.py): instead
+# of a fresh interpreter per call, calls go to long-lived workers that keep
+# third-party imports (pandas, chromadb, Pillow, …) loaded between calls and
+# run the script as __main__ with the call's argv. Output capture, progress and
+# the inactivity timeout behave as for a one-shot subprocess; a timed-out worker
+# is killed and replaced. Workers recycle after DND_MCP_WORKER_MAX_CALLS calls
+# (default 50), once their peak RSS grows by DND_MCP_WORKER_MAX_GROWTH_MB
+# (default 512), or when a repo module they imported changes on disk.
+# DND_MCP_SCRIPT_WORKERS sets the pool size (default 2; 0 = one subprocess per
+# call, as before). A tool can opt out with `"worker": False` in its MCP_TOOL.
+_SCRIPT_WORKERS = max(0, _safe_int_env("DND_MCP_SCRIPT_WORKERS", 2))
+_WORKER_MAX_CALLS = max(1, _safe_int_env("DND_MCP_WORKER_MAX_CALLS", 50))
+_WORKER_MAX_GROWTH_MB = max(1, _safe_int_env("DND_MCP_WORKER_MAX_GROWTH_MB", 512))
+_WORKER_SCRIPT = Path(__file__).resolve().parent / "worker.py"
+
+
+class _WorkerDied(RuntimeError):
+    pass
+
+
+class _WorkerNotStarted(RuntimeError):
+    """The worker was already gone before it accepted the call."""
+
+
+class _ScriptWorker:
+    """One worker process plus the thread that reads its channel."""
+
+    def __init__(self, *, max_calls: int, max_growth_mb: int) -> None:
+        to_child_r, to_child_w = os.pipe()
+        from_child_r, from_child_w = os.pipe()
+        self.proc = subprocess.Popen(
+            [str(_python_bin()), str(_WORKER_SCRIPT),
+             "--channel", str(to_child_r), str(from_child_w),
+             "--max-calls", str(max_calls), "--max-growth-mb", str(max_growth_mb)],
+            cwd=str(REPO_ROOT),
+            env={**os.environ, "PYTHONUTF8": "1", "DND_MCP_PROGRESS": "1"},
+            # The worker must never touch the JSON-RPC stream; its own stderr
+            # (outside calls) goes to the server log.
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            pass_fds=(to_child_r, from_child_w),
+        )
+        os.close(to_child_r)
+        os.close(from_child_w)
+        self._to_child = os.fdopen(to_child_w, "w", encoding="utf-8")
+        self._events: "queue.Queue[Optional[dict[str, Any]]]" = queue.Queue()
+        self._reader = threading.Thread(
+            target=self._read_events, args=(os.fdopen(from_child_r, "r", encoding="utf-8"),),
+            name="dnd-mcp-worker-io", daemon=True,
+        )
+        self._reader.start()
+        self._next_id = 0
+        self.alive = True
+
+    def _read_events(self, stream: Any) -> None:
+        with stream:
+            for line in stream:
+                try:
+                    self._events.put(json.loads(line))
+                except ValueError:
+                    continue
+        self._events.put(None)  # EOF: the worker exited
+
+    def run(
+        self,
+        script_path: Path,
+        argv: list[str],
+        *,
+        timeout: Optional[int],
+        progress: Optional[Callable[[dict[str, Any]], None]],
+        cancel: Optional[threading.Event] = None,
+    ) -> dict[str, Any]:
+        """Send one call and wait for its "done" (or "stale") event. A set
+        `cancel` kills the worker and raises _CallCancelled; a worker that
+        can't take the request raises _WorkerNotStarted (the call never ran)."""
+        self._next_id += 1
+        call_id = self._next_id
+        try:
+            self._to_child.write(json.dumps({"id": call_id, "script": str(script_path), "argv": argv}) + "\n")
+            self._to_child.flush()
+        except OSError as exc:
+            self.kill()
+            try:
+                self._to_child.close()  # drop the unsent line; it would fail again at GC
+            except OSError:
+                pass
+            raise _WorkerNotStarted(f"worker {self.proc.pid} is gone: {exc}") from exc
+        last_activity = time.monotonic()
+        poll = 1.0 if cancel is None else _CANCEL_POLL_SEC
+        while True:
+            if cancel is not None and cancel.is_set():
+                self.kill()
+                raise _CallCancelled(f"{script_path.name} was cancelled")
+            wait = None if timeout is None else last_activity + timeout - time.monotonic()
+            if wait is not None and wait <= 0:
+                self.kill()
+                raise _timeout_error(script_path, timeout, "")
+            if wait is None:
+                get_timeout = None if cancel is None else poll
             else:
-                stderr = str(raw) if raw else ""
-            raise RuntimeError(
-                f"{self.script_path.name} exceeded {timeout}s timeout (set DND_MCP_TOOL_TIMEOUT to adjust). "
-                f"stderr: {stderr.strip()[:300]}"
-            ) from exc
-        if proc.returncode != 0:
-            msg = (proc.stderr or proc.stdout or "").strip() or f"{self.script_path.name} exited with {proc.returncode}"
-            raise RuntimeError(msg)
-        out = (proc.stdout or "").strip()
-        warn = (proc.stderr or "").strip()
-        if warn:
-            # Success-path stderr is real diagnostic signal (e.g. a malformed DB
-            # line was skipped). Surface it so the caller isn't handed a silently
-            # short result. Kept after stdout so machine parsers can split on it.
-            if out:
-                return f"{out}\n\n[warnings from {self.script_path.name}]\n{warn}"
-            return f"[warnings from {self.script_path.name}]\n{warn}"
-        return out
+                get_timeout = min(wait, poll)
+            try:
+                event = self._events.get(timeout=get_timeout)
+            except queue.Empty:
+                continue
+            if event is None:
+                self.alive = False
+                raise _WorkerDied(f"worker {self.proc.pid} exited during {script_path.name}")
+            if event.get("id") != call_id:
+                continue
+            kind = event.get("event")
+            if kind == "stderr_line":
+                parsed = _parse_progress_line(str(event.get("line") or ""))
+                if parsed is not None:
+                    last_activity = time.monotonic()
+                    if progress is not None:
+                        try:
+                            progress(parsed)
+                        except Exception as exc:  # a broken relay must not kill the tool
+                            sys.stderr.write(f"[mcp-server] progress relay failed: {exc}\n")
+                continue
+            if kind in ("done", "stale"):
+                if kind == "stale" or event.get("recycle"):
+                    self.retire()
+                return event
+
+    def retire(self) -> None:
+        """The worker is exiting on its own; reap it off-thread."""
+        self.alive = False
+        threading.Thread(target=self.proc.wait, name="dnd-mcp-worker-reap", daemon=True).start()
+
+    def kill(self) -> None:
+        self.alive = False
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def close(self) -> None:
+        if not self.alive:
+            return
+        self.alive = False
+        try:
+            self._to_child.write(json.dumps({"op": "exit"}) + "\n")
+            self._to_child.flush()
+            self.proc.wait(timeout=5)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            self.kill()
+
+
+class _ScriptWorkerPool:
+    """Up to `size` warm workers; a call takes an idle one (starting a worker if
+    under the cap, else waiting) and returns it afterwards unless it retired."""
+
+    def __init__(self, size: int, *, max_calls: int = _WORKER_MAX_CALLS,
+                 max_growth_mb: int = _WORKER_MAX_GROWTH_MB) -> None:
+        self.size = size
+        self.max_calls = max_calls
+        self.max_growth_mb = max_growth_mb
+        self._idle: list[_ScriptWorker] = []
+        self._count = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {"calls": 0, "started": 0, "timeouts": 0, "crashes": 0, "stale_retries": 0,
+                      "dead_retries": 0, "cancelled": 0}
+
+    def prestart(self) -> None:
+        """Start every worker now so the first calls don't pay interpreter startup."""
+        started = []
+        with self._cond:
+            while self._count < self.size:
+                self._count += 1
+                started.append(None)
+        workers = []
+        for _ in started:
+            try:
+                workers.append(self._spawn())
+            except OSError:
+                with self._cond:
+                    self._count -= 1
+        for worker in workers:
+            self._release(worker)
+
+    def _bump(self, key: str) -> None:
+        with self._cond:
+            self.stats[key] += 1
+
+    def _spawn(self) -> _ScriptWorker:
+        self._bump("started")
+        return _ScriptWorker(max_calls=self.max_calls, max_growth_mb=self.max_growth_mb)
+
+    def _acquire(self) -> _ScriptWorker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("script worker pool is shut down")
+                if self._idle:
+                    return self._idle.pop()
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                self._cond.wait()
+        try:
+            return self._spawn()
+        except OSError:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: _ScriptWorker) -> None:
+        with self._cond:
+            if worker.alive and not self._closed:
+                self._idle.append(worker)
+            else:
+                self._count -= 1
+            self._cond.notify()
+        if not worker.alive or self._closed:
+            worker.close()
+
+    def run(
+        self,
+        script_path: Path,
+        argv: list[str],
+        *,
+        progress: Optional[Callable[[dict[str, Any]], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> str:
+        timeout = _TOOL_TIMEOUT_SEC if _TOOL_TIMEOUT_SEC > 0 else None
+        self._bump("calls")
+        # A stale worker answers without running the call, and an idle worker
+        # that died never received it, so both are safe to retry on a fresh
+        # one; a crash mid-call is not retried (the script may have had side
+        # effects).
+        for _attempt in range(3):
+            worker = self._acquire()
+            try:
+                event = worker.run(script_path, argv, timeout=timeout, progress=progress, cancel=cancel)
+            except _CallCancelled:
+                self._bump("cancelled")
+                self._release(worker)
+                raise
+            except _WorkerNotStarted:
+                self._bump("dead_retries")
+                self._release(worker)
+                continue
+            except _WorkerDied:
+                self._bump("crashes")
+                worker.kill()
+                self._release(worker)
+                raise RuntimeError(f"{script_path.name}: worker process died mid-call")
+            except RuntimeError:
+                self._bump("timeouts")
+                self._release(worker)
+                raise
+            self._release(worker)
+            if event.get("event") == "stale":
+                self._bump("stale_retries")
+                continue
+            return _script_output(
+                script_path, int(event.get("returncode") or 0),
+                str(event.get("stdout") or ""), str(event.get("stderr") or ""),
+            )
+        raise RuntimeError(f"{script_path.name}: no usable worker after repeated retries")
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            worker.close()
+
+
+_script_pool: Optional[_ScriptWorkerPool] = None
+
+
+def _set_script_pool(pool: Optional[_ScriptWorkerPool]) -> None:
+    global _script_pool
+    _script_pool = pool
+
+
+# Read-only result cache. One conversation often repeats the same get_npc or
+# list_conditions call several times; tools annotated readOnlyHint (and not
+# idempotentHint=False) are memoized on (tool name, canonical arguments):
+# - open-world tools (the SRD lookups) are cached for DND_MCP_RESULT_CACHE_TTL
+#   seconds (default 600) — the content behind them changes on release cycles;
+# - local tools are cached only when their MCP_TOOL entry declares what they
+#   read, `"cache": {"depends_on": ["world", "characters"]}` (repo-relative files
+#   or directories), and an entry is dropped as soon as any of those changes;
+# - `"cache": {"ttl": N}` overrides the TTL, `"cache": False` opts a tool out.
+# DND_MCP_RESULT_CACHE_TTL=0 disables the cache; DND_MCP_RESULT_CACHE_SIZE caps
+# the entry count (LRU, default 512). Hit rates are reported by server_stats.
+_RESULT_CACHE_TTL = _safe_int_env("DND_MCP_RESULT_CACHE_TTL", 600)
+_RESULT_CACHE_SIZE = max(1, _safe_int_env("DND_MCP_RESULT_CACHE_SIZE", 512))
+# A dependency fingerprint is reused for this long so a burst of hits doesn't
+# re-walk world/ on every call. Any call to a tool that isn't read-only resets
+# them, so a write made through the server is seen by the very next read.
+_DEP_RECHECK_SEC = 1.0
+_DEP_SKIP_DIRS = frozenset({"__pycache__", "node_modules", "venv", "temp"})
+
+
+def _cache_policy(name: str, entry: dict[str, Any], annotations: Optional[dict[str, Any]]) -> tuple[Optional[float], tuple[str, ...]]:
+    """(ttl, depends_on) for one MCP_TOOL entry; ttl None → never cached."""
+    spec = entry.get("cache")
+    hints = annotations or {}
+    if spec is False or not hints.get("readOnlyHint") or hints.get("idempotentHint") is False:
+        return None, ()
+    if spec is None or spec is True:
+        spec = {}
+    if not isinstance(spec, dict):
+        raise ValueError(f"{name}: cache must be a dict or False")
+    deps_raw = spec.get("depends_on") or []
+    if isinstance(deps_raw, str):
+        deps_raw = [deps_raw]
+    if not isinstance(deps_raw, list) or not all(isinstance(d, str) for d in deps_raw):
+        raise ValueError(f"{name}: cache.depends_on must be a list of repo-relative paths")
+    deps = tuple(d.strip().strip("/") or "." for d in deps_raw)
+    if not deps and not hints.get("openWorldHint"):
+        # A local tool that doesn't say what it reads: no way to tell when its
+        # result goes stale, so don't cache it.
+        return None, ()
+    ttl = spec.get("ttl", _RESULT_CACHE_TTL)
+    if isinstance(ttl, bool) or not isinstance(ttl, (int, float)):
+        raise ValueError(f"{name}: cache.ttl must be a number of seconds")
+    return (float(ttl) if ttl > 0 else None), deps
+
+
+def _canonical_arguments(schema: dict[str, Any], arguments: dict[str, Any]) -> str:
+    """Cache key for a call's arguments: key order doesn't matter, and an
+    argument left at its schema default keys the same as one passed explicitly."""
+    merged: dict[str, Any] = {}
+    props = schema.get("properties") if isinstance(schema, dict) else None
+    if isinstance(props, dict):
+        for key, prop in props.items():
+            if isinstance(prop, dict) and "default" in prop:
+                merged[key] = prop["default"]
+    merged.update(arguments)
+    return json.dumps(merged, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _deps_fingerprint(repo_root: Path, deps: tuple[str, ...]) -> tuple[tuple[int, int], ...]:
+    """(file count, newest mtime_ns) per dependency. Directories are walked
+    (skipping dot- and scratch dirs); their own mtimes count too, so a rename
+    changes the fingerprint. A missing path is (0, 0)."""
+    out: list[tuple[int, int]] = []
+    for dep in deps:
+        path = repo_root / dep
+        try:
+            st = path.stat()
+        except OSError:
+            out.append((0, 0))
+            continue
+        if not path.is_dir():
+            out.append((1, st.st_mtime_ns))
+            continue
+        count = 0
+        newest = st.st_mtime_ns
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in _DEP_SKIP_DIRS]
+            for name in (*filenames, *dirnames):
+                try:
+                    mtime = os.stat(os.path.join(dirpath, name)).st_mtime_ns
+                except OSError:
+                    continue
+                count += 1
+                newest = max(newest, mtime)
+        out.append((count, newest))
+    return tuple(out)
+
+
+class _ResultCache:
+    """LRU of read-only tool results keyed on (tool name, canonical arguments)."""
+
+    def __init__(self, max_entries: int = _RESULT_CACHE_SIZE, *, repo_root: Path = REPO_ROOT,
+                 recheck_sec: float = _DEP_RECHECK_SEC) -> None:
+        self._max_entries = max(1, max_entries)
+        self._repo_root = repo_root
+        self._recheck_sec = recheck_sec
+        self._lock = threading.Lock()
+        # key → (expires_at, dependency fingerprint, result text)
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any, str]] = OrderedDict()
+        # depends_on → (taken_at, fingerprint)
+        self._fingerprints: dict[tuple[str, ...], tuple[float, Any]] = {}
+        self._tools: dict[str, dict[str, int]] = {}
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "invalidated": 0, "evicted": 0}
+
+    def note_write(self) -> None:
+        """Forget dependency fingerprints so the next lookup re-stats its files."""
+        with self._lock:
+            self._fingerprints.clear()
+
+    def clear(self) -> None:
+        """Drop every entry — results computed by code that has since been reloaded."""
+        with self._lock:
+            self.stats["invalidated"] += len(self._entries)
+            self._entries.clear()
+            self._fingerprints.clear()
+
+    def _fingerprint(self, deps: tuple[str, ...], now: float) -> Any:
+        if not deps:
+            return None
+        with self._lock:
+            memo = self._fingerprints.get(deps)
+        if memo is not None and now - memo[0] < self._recheck_sec:
+            return memo[1]
+        fingerprint = _deps_fingerprint(self._repo_root, deps)
+        with self._lock:
+            self._fingerprints[deps] = (now, fingerprint)
+        return fingerprint
+
+    def _count(self, tool: str, outcome: str) -> None:
+        self.stats[outcome] += 1
+        self._tools.setdefault(tool, {"hits": 0, "misses": 0})[outcome] += 1
+
+    def _lookup(self, runner: "ToolRunner", arguments: dict[str, Any]) -> tuple[tuple[str, str], float, Any, Optional[str]]:
+        """(key, now, fingerprint, cached text or None), counting the hit or miss."""
+        name = runner.tool.name
+        key = (name, _canonical_arguments(runner.tool.input_schema, arguments))
+        now = time.monotonic()
+        # Taken before the call runs: if a file changes mid-call, the stored
+        # entry is already stale and the next lookup drops it.
+        fingerprint = self._fingerprint(runner.cache_deps, now)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                expires_at, cached_fingerprint, text = cached
+                if now >= expires_at:
+                    self.stats["expired"] += 1
+                    del self._entries[key]
+                elif cached_fingerprint != fingerprint:
+                    self.stats["invalidated"] += 1
+                    del self._entries[key]
+                else:
+                    self._entries.move_to_end(key)
+                    self._count(name, "hits")
+                    return key, now, fingerprint, text
+            self._count(name, "misses")
+        return key, now, fingerprint, None
+
+    def _store(self, key: tuple[str, str], expires_at: float, fingerprint: Any, text: str) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, fingerprint, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+
+    def call(self, runner: "ToolRunner", arguments: dict[str, Any], compute: Callable[[], str]) -> str:
+        """Return the cached result for this call, or run `compute` and cache it.
+        Failures propagate and are never cached."""
+        if runner.cache_ttl is None:
+            return compute()
+        key, now, fingerprint, text = self._lookup(runner, arguments)
+        if text is None:
+            text = compute()
+            self._store(key, now + runner.cache_ttl, fingerprint, text)
+        return text
+
+    async def call_async(self, runner: "ToolRunner", arguments: dict[str, Any],
+                         compute: Callable[[], Awaitable[str]]) -> str:
+        """`call` for a coroutine tool. The lookup runs inline on the loop: its
+        dependency walk is memoized for _DEP_RECHECK_SEC."""
+        if runner.cache_ttl is None:
+            return await compute()
+        key, now, fingerprint, text = self._lookup(runner, arguments)
+        if text is None:
+            text = await compute()
+            self._store(key, now + runner.cache_ttl, fingerprint, text)
+        return text
+
+    def snapshot(self) -> dict[str, Any]:
+        def rate(hits: int, misses: int) -> Optional[float]:
+            return round(hits / (hits + misses), 3) if hits + misses else None
+
+        with self._lock:
+            return {
+                **self.stats,
+                "hit_rate": rate(self.stats["hits"], self.stats["misses"]),
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "tools": {
+                    name: {**counts, "hit_rate": rate(counts["hits"], counts["misses"])}
+                    for name, counts in sorted(self._tools.items())
+                },
+            }
+
+
+_result_cache: Optional[_ResultCache] = None
+
+
+def _set_result_cache(cache: Optional[_ResultCache]) -> None:
+    global _result_cache
+    _result_cache = cache
 
 
 @dataclass(frozen=True)
 class DiscoveryResult:
     tools: tuple[ToolRunner, ...]
     skipped: tuple[tuple[Path, str], ...]
+    # {"elapsed_ms", "parsed", "cached", "imported", "cache"} — see discover_tools.
+    stats: dict[str, Any] = field(default_factory=dict)
+
+
+# Discovery cache: per-script results of the source scan (MCP_GROUPS, whether
+# MCP_HANDLERS is assigned, the MCP_TOOL literal or the reason it was
+# rejected), keyed on the script's relative path and invalidated per file when
+# its (mtime_ns, size) changes. A warm restart reads no script source and runs
+# no AST parse. MCP_HANDLERS modules also cache the MCP_TOOLS they built at
+# import, their handler names and the stamps of the sibling scripts loaded
+# alongside them ("deps"); while all of those are fresh the module is not
+# imported at startup — its tools are advertised from the cached schemas and
+# bound to _LazyHandler, which imports on the first tools/call. Lives at <repo>/.cache/mcp_discovery.json; point
+# DND_MCP_DISCOVERY_CACHE at another path, or set it to 0/off to disable.
+# Bump the version whenever the scan's output shape or semantics change.
+_DISCOVERY_CACHE_VERSION = 2
+
+
+def _discovery_cache_path(repo_root: Path) -> Optional[Path]:
+    raw = os.environ.get("DND_MCP_DISCOVERY_CACHE", "").strip()
+    if raw.lower() in ("0", "off", "false", "no"):
+        return None
+    return Path(raw) if raw else repo_root / ".cache" / "mcp_discovery.json"
+
+
+def _load_discovery_cache(path: Optional[Path]) -> dict[str, Any]:
+    if path is None:
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _DISCOVERY_CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_discovery_cache(path: Path, files: dict[str, Any]) -> None:
+    """Atomic write (tmp + replace) so a concurrently starting server never
+    reads half a file. Failures are logged, never fatal — the cache is optional."""
+    payload = json.dumps({"version": _DISCOVERY_CACHE_VERSION, "files": files}, ensure_ascii=False)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        sys.stderr.write(f"[mcp-server] could not write discovery cache {path}: {exc}\n")
+        sys.stderr.flush()
+        tmp.unlink(missing_ok=True)
+
+
+def _scan_script_source(source: str, *, path: Path) -> dict[str, Any]:
+    """Everything discovery needs from a script's source, as a JSON-able entry."""
+    entry: dict[str, Any] = {
+        "groups": _read_top_level_string_list(source, "MCP_GROUPS"),
+        "handlers": _has_top_level_assignment(source, "MCP_HANDLERS"),
+        "literal": None,
+        "error": None,
+    }
+    if not entry["handlers"]:
+        try:
+            entry["literal"] = _extract_mcp_tool_literal(source, path=path)
+        except Exception as exc:
+            entry["error"] = str(exc)
+    return entry
 
 
 def _load_script_module(path: Path) -> Any:
@@ -325,6 +1685,116 @@ def _load_script_module(path: Path) -> Any:
     return module
 
 
+def _loaded_script_deps(scripts_dir: Path, *, exclude: Path) -> dict[str, list[int]]:
+    """(mtime_ns, size) of every module under scripts/ currently imported —
+    what an MCP_HANDLERS module's MCP_TOOLS may have been built from. A
+    superset of the real dependencies, which only costs an extra re-import."""
+    deps: dict[str, list[int]] = {}
+    for module in list(sys.modules.values()):
+        file = getattr(module, "__file__", None)
+        if not file:
+            continue
+        path = Path(file).resolve()
+        if path == exclude or scripts_dir not in path.parents:
+            continue
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        deps[path.relative_to(scripts_dir).as_posix()] = [st.st_mtime_ns, st.st_size]
+    return deps
+
+
+def _deps_fresh(scripts_dir: Path, deps: Any) -> bool:
+    if not isinstance(deps, dict):
+        return False
+    for rel, stamp in deps.items():
+        try:
+            st = (scripts_dir / rel).stat()
+        except OSError:
+            return False
+        if [st.st_mtime_ns, st.st_size] != stamp:
+            return False
+    return True
+
+
+class _LazyModule:
+    """An MCP_HANDLERS script whose import is deferred to its first tools/call
+    (or the post-handshake warm-up), so tools/list never waits on heavy
+    imports. Thread-safe: concurrent first calls import it once."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._module: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> Any:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    try:
+                        module = _load_script_module(self.path)
+                    except Exception as exc:
+                        raise RuntimeError(f"in-process import of {self.path.name} failed: {exc}") from exc
+                    if module is None:
+                        raise RuntimeError(f"in-process import of {self.path.name} returned None")
+                    self._module = module
+        return self._module
+
+
+@dataclass(frozen=True)
+class _LazyHandler:
+    module: _LazyModule
+    name: str
+
+    def __call__(self, **arguments: Any) -> Any:
+        handlers = getattr(self.module.load(), "MCP_HANDLERS", None)
+        handler = handlers.get(self.name) if isinstance(handlers, dict) else None
+        if handler is None:
+            raise RuntimeError(f"{self.module.path.name} no longer has an MCP_HANDLERS entry for {self.name!r}")
+        return handler(**arguments)
+
+    def load_async(self) -> Optional[Callable[..., Awaitable[Any]]]:
+        """Import the module (blocking) and return the tool's coroutine
+        handler, if it has one — see _async_handler_for."""
+        return _async_handler_for(self.module.load(), self.name)
+
+
+def _async_handler_for(module: Any, name: str) -> Optional[Callable[..., Awaitable[Any]]]:
+    """The coroutine to await for tool `name`: its MCP_ASYNC_HANDLERS entry, or
+    its MCP_HANDLERS entry when that is itself an `async def`."""
+    for attr in ("MCP_ASYNC_HANDLERS", "MCP_HANDLERS"):
+        handlers = getattr(module, attr, None)
+        handler = handlers.get(name) if isinstance(handlers, dict) else None
+        if handler is not None and inspect.iscoroutinefunction(handler):
+            return handler
+    return None
+
+
+def _lazy_modules(runners: tuple[ToolRunner, ...]) -> list[_LazyModule]:
+    seen: dict[int, _LazyModule] = {}
+    for r in runners:
+        if isinstance(r.handler, _LazyHandler):
+            seen.setdefault(id(r.handler.module), r.handler.module)
+    return list(seen.values())
+
+
+def _warm_modules(modules: list[_LazyModule]) -> None:
+    """Import deferred modules one by one (run on a background thread after the
+    handshake) so the first real call doesn't pay for the import. Failures are
+    logged; the tool's first call will retry and report the error itself."""
+    for module in modules:
+        try:
+            module.load()
+        except Exception as exc:
+            sys.stderr.write(f"[mcp-server] background warm-up: {exc}\n")
+            sys.stderr.flush()
+
+
 def _has_top_level_assignment(source: str, name: str) -> bool:
     """True if `name` is assigned at module top-level. Avoids false positives
     from comments, docstrings, or string literals that merely mention the name."""
@@ -483,6 +1953,16 @@ def _tools_from_mcp_tool(*, path: Path, mcp_tool: dict[str, Any]) -> list[ToolRu
                 continue
             value_flags[key] = flag
 
+        cache_ttl, cache_deps = _cache_policy(name, entry, annotations)
+        concurrency = entry.get("concurrency")
+        if concurrency is not None and (
+            isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1
+        ):
+            raise ValueError(f"{name}: concurrency must be a positive integer")
+        lane = entry.get("lane")
+        if lane is not None and lane not in _LANES:
+            raise ValueError(f"{name}: lane must be one of {', '.join(_LANES)}")
+
         runners.append(
             ToolRunner(
                 tool=Tool(name=name, description=description, input_schema=input_schema, annotations=annotations),
@@ -490,22 +1970,45 @@ def _tools_from_mcp_tool(*, path: Path, mcp_tool: dict[str, Any]) -> list[ToolRu
                 argv_template=tuple(argv_raw),
                 bool_flags=bool_flags,
                 value_flags=value_flags,
+                use_worker=bool(entry.get("worker", True)),
+                cache_ttl=cache_ttl,
+                cache_deps=cache_deps,
+                concurrency=concurrency,
+                lane_override=lane,
             )
         )
     return runners
 
 
-def discover_tools(*, repo_root: Path) -> DiscoveryResult:
-    # TODO: cache discovery output keyed on (path, mtime) to skip AST re-parse
-    # for unchanged files on server restart.
-    # TODO: add streaming progress notifications for slow subprocess-dispatched tools
-    # (dnd_pass*, pandoc_export_pdf, build_timeline_*) via MCP `notifications/progress`.
+def discover_tools(
+    *,
+    repo_root: Path,
+    use_cache: bool = True,
+    lazy: bool = True,
+    only: Optional[set[Path]] = None,
+) -> DiscoveryResult:
+    """Find every tool under scripts/. `only` (resolved paths) limits the scan
+    to those scripts — hot reload's partial rediscovery; the rest of the
+    discovery cache is carried over untouched."""
+    started = time.perf_counter()
     scripts_dir = (repo_root / "scripts").resolve()
     skipped: list[tuple[Path, str]] = []
     runners: list[ToolRunner] = []
     if not scripts_dir.exists():
         return DiscoveryResult(tools=tuple(), skipped=tuple())
 
+    cache_path = _discovery_cache_path(repo_root) if use_cache else None
+    cached_files = _load_discovery_cache(cache_path)
+    fresh_files: dict[str, Any] = {}
+    if only is not None:
+        fresh_files = {
+            rel: entry for rel, entry in cached_files.items()
+            if (scripts_dir / rel).resolve() not in only
+        }
+    parsed = cached = imported = deferred = 0
+    dirty = False
+    lazy = lazy and cache_path is not None
+
     # Recursively discover all .py files in scripts/ and subdirectories
     # Skip __pycache__ and other special directories
     server_dir = (scripts_dir / "mcp").resolve()
@@ -516,6 +2019,7 @@ def discover_tools(*, repo_root: Path) -> DiscoveryResult:
         and not p.name.startswith("_")
         and p.name != "__init__.py"
         and server_dir not in p.resolve().parents
+        and (only is None or p.resolve() in only)
     ]
     
     # Optional group filter: when DND_MCP_TOOLS_GROUP is set, only load modules
@@ -526,14 +2030,32 @@ def discover_tools(*, repo_root: Path) -> DiscoveryResult:
     group_filter = os.environ.get("DND_MCP_TOOLS_GROUP", "").strip()
 
     for path in sorted(all_py_files, key=lambda p: str(p.relative_to(scripts_dir))):
+        rel = path.relative_to(scripts_dir).as_posix()
         try:
-            source = path.read_text(encoding="utf-8")
-        except Exception as exc:
+            st = path.stat()
+        except OSError as exc:
             skipped.append((path, f"unreadable: {exc}"))
             continue
+        entry = cached_files.get(rel)
+        if (
+            isinstance(entry, dict)
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("size") == st.st_size
+        ):
+            cached += 1
+        else:
+            try:
+                source = path.read_text(encoding="utf-8")
+            except Exception as exc:
+                skipped.append((path, f"unreadable: {exc}"))
+                continue
+            entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                     **_scan_script_source(source, path=path)}
+            parsed += 1
+        fresh_files[rel] = entry
 
         if group_filter:
-            module_groups = _read_top_level_string_list(source, "MCP_GROUPS")
+            module_groups = entry["groups"]
             if group_filter not in module_groups:
                 skipped.append((path, f"group filter excludes (DND_MCP_TOOLS_GROUP={group_filter!r}, module groups={module_groups})"))
                 continue
@@ -547,12 +2069,21 @@ def discover_tools(*, repo_root: Path) -> DiscoveryResult:
         # AST-based check (not substring) so a comment or string mentioning
         # `MCP_HANDLERS` doesn't trigger a module import.
         handlers: Optional[dict[str, Any]] = None
-        if _has_top_level_assignment(source, "MCP_HANDLERS"):
+        module: Any = None
+        if entry["handlers"] and lazy and entry.get("literal") is not None \
+                and isinstance(entry.get("handler_names"), list) \
+                and _deps_fresh(scripts_dir, entry.get("deps")):
+            literal = entry["literal"]
+            lazy_module = _LazyModule(path)
+            handlers = {name: _LazyHandler(lazy_module, name) for name in entry["handler_names"]}
+            deferred += 1
+        elif entry["handlers"]:
             try:
                 module = _load_script_module(path)
             except Exception as exc:
                 skipped.append((path, f"in-process import failed: {exc}"))
                 continue
+            imported += 1
             if module is None:
                 skipped.append((path, "in-process import returned None"))
                 continue
@@ -569,12 +2100,23 @@ def discover_tools(*, repo_root: Path) -> DiscoveryResult:
                 continue
             handlers_attr = getattr(module, "MCP_HANDLERS", None)
             handlers = handlers_attr if isinstance(handlers_attr, dict) else None
-        else:
+            # Remember what the import produced so the next start can skip it.
+            # Schemas that aren't plain JSON can't be cached; that module just
+            # keeps importing eagerly.
             try:
-                literal = _extract_mcp_tool_literal(source, path=path)
-            except Exception as exc:
-                skipped.append((path, str(exc)))
+                json.dumps(literal)
+            except (TypeError, ValueError):
+                entry["literal"] = None
+            else:
+                entry["literal"] = literal
+                entry["handler_names"] = sorted(str(k) for k in (handlers or {}))
+                entry["deps"] = _loaded_script_deps(scripts_dir, exclude=path.resolve())
+            dirty = True
+        else:
+            if entry["error"] is not None:
+                skipped.append((path, entry["error"]))
                 continue
+            literal = entry["literal"]
             if literal is None:
                 skipped.append((path, "no MCP_TOOL"))
                 continue
@@ -597,11 +2139,22 @@ def discover_tools(*, repo_root: Path) -> DiscoveryResult:
                 if h is None:
                     skipped.append((path, f"tool {r.tool.name!r} has no MCP_HANDLERS entry"))
                     continue
-                rewired.append(replace(r, handler=h))
+                # A lazy module's coroutine handler is resolved on first call.
+                async_handler = _async_handler_for(module, r.tool.name) if module is not None else None
+                rewired.append(replace(r, handler=h, async_handler=async_handler))
             new_runners = rewired
 
+        groups = tuple(str(g) for g in entry.get("groups") or ())
+        if groups:
+            new_runners = [replace(r, groups=groups) for r in new_runners]
+
         runners.extend(new_runners)
 
+    # Rewrite the cache only when something changed — a file was re-scanned or
+    # re-imported, or one that was cached has since been deleted.
+    if cache_path is not None and (parsed or dirty or set(cached_files) != set(fresh_files)):
+        _save_discovery_cache(cache_path, fresh_files)
+
     # Enforce globally-unique tool names.
     by_name: dict[str, ToolRunner] = {}
     for r in runners:
@@ -610,7 +2163,338 @@ def discover_tools(*, repo_root: Path) -> DiscoveryResult:
             continue
         by_name[r.tool.name] = r
 
-    return DiscoveryResult(tools=tuple(by_name.values()), skipped=tuple(skipped))
+    stats = {
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "parsed": parsed,
+        "cached": cached,
+        "imported": imported,
+        "deferred": deferred,
+        "cache": str(cache_path) if cache_path is not None else None,
+    }
+    return DiscoveryResult(tools=tuple(by_name.values()), skipped=tuple(skipped), stats=stats)
+
+
+# Hot reload (DND_MCP_HOT_RELOAD, default on): a watcher thread notices edits
+# under scripts/ — inotify on Linux, else a stat() poll every
+# DND_MCP_RELOAD_POLL seconds — and the serve loop reloads only what they touch:
+# - an edited helper module (combat_actions_db, srd_cache, …) is reloaded in
+#   place, so tools holding the module object (`combat_actions_db.get(...)`)
+#   see the new code and keep their own state (HTTP sessions, dice pool);
+# - a tool script is re-imported and its tools rediscovered when its own file
+#   changed or it holds functions/classes taken from a reloaded module;
+# - everything else keeps its module objects and in-memory state.
+# When the advertised tool list changes, clients get notifications/tools/list_changed.
+_HOT_RELOAD = _safe_int_env("DND_MCP_HOT_RELOAD", 1) != 0
+_RELOAD_POLL_SEC = float(max(1, _safe_int_env("DND_MCP_RELOAD_POLL", 1)))
+# Editors save in several steps (truncate + write, or write temp + rename);
+# wait this long after the first event before looking.
+_RELOAD_SETTLE_SEC = 0.2
+
+
+def _scripts_snapshot(scripts_dir: Path) -> dict[str, tuple[int, int]]:
+    """(mtime_ns, size) of every .py file under scripts/, except the server's own."""
+    server_dir = scripts_dir / "mcp"
+    snapshot: dict[str, tuple[int, int]] = {}
+    for path in scripts_dir.rglob("*.py"):
+        if "__pycache__" in path.parts or server_dir in path.parents:
+            continue
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        snapshot[path.relative_to(scripts_dir).as_posix()] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+class _Inotify:
+    """Minimal inotify(7) binding via ctypes: only answers "did anything under
+    the tree change?" — the watcher diffs stat() snapshots to find out what."""
+
+    _MASK = 0x008 | 0x040 | 0x080 | 0x100 | 0x200  # CLOSE_WRITE, MOVED_FROM/TO, CREATE, DELETE
+
+    def __init__(self, root: Path) -> None:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._get_errno = ctypes.get_errno
+        self._root = root
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(self._get_errno(), "inotify_init1 failed")
+        try:
+            self._watch_tree()
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _watch_tree(self) -> None:
+        # Re-adding a watched directory is a no-op, so this also picks up new ones.
+        for dirpath, dirnames, _ in os.walk(self._root):
+            dirnames[:] = [d for d in dirnames if d != "__pycache__" and not d.startswith(".")]
+            if self._add_watch(self._fd, os.fsencode(dirpath), self._MASK) < 0:
+                raise OSError(self._get_errno(), f"inotify_add_watch failed for {dirpath}")
+
+    def wait(self, timeout: float) -> bool:
+        import select
+
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        while True:
+            try:
+                if not os.read(self._fd, 65536):
+                    break
+            except BlockingIOError:
+                break
+        try:
+            self._watch_tree()
+        except OSError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _ScriptWatcher:
+    """Daemon thread that calls `notify(changed)` — relative paths of .py files
+    under scripts/ that were edited, added or deleted — after each burst of changes."""
+
+    def __init__(self, scripts_dir: Path, notify: Callable[[frozenset[str]], None], *,
+                 poll_sec: float = _RELOAD_POLL_SEC, use_inotify: bool = True) -> None:
+        self.scripts_dir = scripts_dir
+        self._notify = notify
+        self._poll_sec = poll_sec
+        self._stop = threading.Event()
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify(scripts_dir)
+            except (OSError, AttributeError) as exc:
+                sys.stderr.write(f"[mcp-server] inotify unavailable ({exc}); polling scripts/ for changes\n")
+        self.mode = "inotify" if self._inotify is not None else "poll"
+        self._snapshot = _scripts_snapshot(scripts_dir)
+        self._thread = threading.Thread(target=self._run, name="dnd-mcp-reload", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=2)
+        if self._inotify is not None:
+            self._inotify.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                if not self._inotify.wait(0.5):
+                    continue
+                if self._stop.wait(_RELOAD_SETTLE_SEC):
+                    return
+            elif self._stop.wait(self._poll_sec):
+                return
+            current = _scripts_snapshot(self.scripts_dir)
+            changed = frozenset(
+                rel for rel in current.keys() | self._snapshot.keys()
+                if current.get(rel) != self._snapshot.get(rel)
+            )
+            self._snapshot = current
+            if changed:
+                self._notify(changed)
+
+
+@dataclass(frozen=True)
+class _ScriptsChanged:
+    """Inbox item from the watcher: scripts/-relative paths that changed."""
+    paths: frozenset[str]
+
+
+def _uses_names_from(module: Any, names: set[str]) -> bool:
+    """True if `module` holds functions, classes or instances defined in any
+    of the modules `names` (i.e. `from x import y`, which a reload of x does
+    not reach). Plain `import x` references are fine: x is reloaded in place."""
+    for value in list(vars(module).values()):
+        if inspect.ismodule(value):
+            continue
+        if getattr(value, "__module__", None) in names:
+            return True
+    return False
+
+
+class _ScriptReloader:
+    def __init__(self, repo_root: Path, *, lazy: bool) -> None:
+        self.scripts_dir = (repo_root / "scripts").resolve()
+        self._repo_root = repo_root
+        self._lazy = lazy
+        self.stats = {"reloads": 0, "modules_reloaded": 0, "scripts_rediscovered": 0, "errors": 0}
+
+    def _script_modules(self) -> dict[str, Any]:
+        """Loaded modules whose file is under scripts/ (server excluded), by name."""
+        server_dir = self.scripts_dir / "mcp"
+        modules: dict[str, Any] = {}
+        for name, module in list(sys.modules.items()):
+            file = getattr(module, "__file__", None)
+            if not file:
+                continue
+            path = Path(file).resolve()
+            if self.scripts_dir in path.parents and server_dir not in path.parents:
+                modules[name] = module
+        return modules
+
+    def _teardown(self, name: str, module: Any) -> None:
+        """Run a module's optional `_mcp_reload_teardown()` before its globals
+        are re-run, so stateful helpers (daemon threads, sessions, executors)
+        release what they hold instead of leaving it orphaned."""
+        teardown = getattr(module, "_mcp_reload_teardown", None)
+        if not callable(teardown):
+            return
+        try:
+            teardown()
+        except Exception as exc:
+            self.stats["errors"] += 1
+            sys.stderr.write(f"[mcp-server] hot reload teardown of {name} failed: {exc}\n")
+
+    def rediscover(
+        self, changed: frozenset[str], runners: tuple[ToolRunner, ...],
+    ) -> tuple[set[Path], DiscoveryResult]:
+        """Reload the helper modules `changed` touches and rediscover the tool
+        scripts that need it. Blocking (imports) — run off the serve loop.
+        Returns the rediscovered script paths and their discovery result."""
+        self.stats["reloads"] += 1
+        changed_paths = {(self.scripts_dir / rel).resolve() for rel in changed}
+        modules = self._script_modules()
+        stale = {name for name, module in modules.items()
+                 if Path(module.__file__).resolve() in changed_paths}
+        # Helper modules (not tool scripts imported by discovery) reload in
+        # place, followed by any helper that took names from one of them.
+        order = [name for name in stale if not name.startswith("_mcp_script_")]
+        pending = [name for name in modules if name not in stale and not name.startswith("_mcp_script_")]
+        grew = True
+        while grew:
+            grew = False
+            for name in list(pending):
+                if _uses_names_from(modules[name], stale):
+                    stale.add(name)
+                    order.append(name)
+                    pending.remove(name)
+                    grew = True
+        for name in order:
+            self._teardown(name, modules[name])
+            try:
+                importlib.reload(modules[name])
+                self.stats["modules_reloaded"] += 1
+            except Exception as exc:
+                self.stats["errors"] += 1
+                sys.stderr.write(f"[mcp-server] hot reload of {name} failed, keeping the old code: {exc}\n")
+
+        scripts = {p for p in changed_paths if p.suffix == ".py"}
+        for runner in runners:
+            path = runner.script_path.resolve()
+            if self.scripts_dir not in path.parents or path in scripts:
+                continue
+            handler = runner.handler
+            if isinstance(handler, _LazyHandler):
+                module = handler.module._module
+                if module is None:
+                    # Not imported yet: rediscovering is only a cache check, and
+                    # refreshes a schema built from a changed helper.
+                    if stale:
+                        scripts.add(path)
+                    continue
+            else:
+                module = sys.modules.get(f"_mcp_script_{path.stem}")
+            if module is not None and _uses_names_from(module, stale):
+                scripts.add(path)
+        for path in scripts:
+            # Rediscovery imports a fresh copy of the script; retire the old one.
+            name = f"_mcp_script_{path.stem}"
+            if name in sys.modules:
+                self._teardown(name, sys.modules[name])
+        result = discover_tools(repo_root=self._repo_root, lazy=self._lazy, only=scripts)
+        self.stats["scripts_rediscovered"] += len(scripts)
+        return scripts, result
+
+
+_reloader: Optional[_ScriptReloader] = None
+
+
+def _set_reloader(reloader: Optional[_ScriptReloader]) -> None:
+    global _reloader
+    _reloader = reloader
+
+
+def _swap_runners(
+    runner_by_name: dict[str, ToolRunner], scripts: set[Path], result: DiscoveryResult,
+) -> None:
+    """Replace the tools of the rediscovered `scripts` in place; tools of other
+    scripts keep their runner (and handler) objects."""
+    fresh: dict[str, ToolRunner] = {}
+    for runner in result.tools:
+        current = runner_by_name.get(runner.tool.name)
+        if current is not None and current.script_path.resolve() not in scripts:
+            sys.stderr.write(
+                f"[mcp-server] hot reload: {runner.script_path.name} defines {runner.tool.name!r}, "
+                "already provided by another script; ignored\n"
+            )
+            continue
+        fresh[runner.tool.name] = runner
+    for path, reason in result.skipped:
+        if reason != "no MCP_TOOL":  # a plain helper module
+            sys.stderr.write(f"[mcp-server] hot reload skipped {path.name}: {reason}\n")
+    # Keep each surviving tool at its position so tools/list order is stable.
+    swapped: dict[str, ToolRunner] = {}
+    for name, runner in runner_by_name.items():
+        if runner.script_path.resolve() not in scripts:
+            swapped[name] = runner
+        elif name in fresh:
+            swapped[name] = fresh.pop(name)
+    swapped.update(fresh)
+    runner_by_name.clear()
+    runner_by_name.update(swapped)
+
+
+def _tool_listing(runner_by_name: dict[str, ToolRunner]) -> list[dict[str, Any]]:
+    listing = []
+    for r in runner_by_name.values():
+        entry: dict[str, Any] = {
+            "name": r.tool.name,
+            "description": r.tool.description,
+            "inputSchema": r.tool.input_schema,
+        }
+        if r.tool.annotations:
+            entry["annotations"] = r.tool.annotations
+        listing.append(entry)
+    return listing
+
+
+def _discovery_probe(*, use_cache: bool) -> Optional[dict[str, Any]]:
+    """Run discovery in a fresh interpreter (`--discovery-probe`) and return its
+    stats — an in-process rerun would find every heavy import already loaded
+    and understate the real startup cost."""
+    env = {**os.environ, "PYTHONUTF8": "1"}
+    if not use_cache:
+        env["DND_MCP_DISCOVERY_CACHE"] = "0"
+    try:
+        proc = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--discovery-probe"],
+            cwd=str(REPO_ROOT), env=env, capture_output=True, text=True, timeout=300,
+        )
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    except (subprocess.SubprocessError, OSError, ValueError, IndexError):
+        return None
+
+
+def _format_discovery_stats(label: str, stats: Optional[dict[str, Any]]) -> str:
+    if not stats:
+        return f"- {label}: (probe failed)\n"
+    return (
+        f"- {label}: {stats['elapsed_ms']:.1f} ms — {stats['parsed']} parsed, "
+        f"{stats['cached']} from cache, {stats['imported']} modules imported, "
+        f"{stats.get('deferred', 0)} deferred\n"
+    )
 
 
 def _print_list_tools(result: DiscoveryResult) -> int:
@@ -621,21 +2505,104 @@ def _print_list_tools(result: DiscoveryResult) -> int:
         sys.stdout.write("- (none)\n")
     for r in tools:
         desc = r.tool.description.splitlines()[0].strip() if r.tool.description else ""
-        mode = "in-process" if r.handler is not None else "subprocess"
+        if isinstance(r.handler, _LazyHandler):
+            mode = "in-process, lazy"
+        else:
+            mode = "in-process" if r.handler is not None else "subprocess"
         sys.stdout.write(f"- {r.tool.name} [{mode}] ({r.script_path.relative_to(REPO_ROOT)}): {desc}\n")
     sys.stdout.write("\nSkipped scripts:\n")
     if not skipped:
         sys.stdout.write("- (none)\n")
     for path, reason in skipped:
         sys.stdout.write(f"- {path.relative_to(REPO_ROOT)}: {reason}\n")
+
+    sys.stdout.write("\nDiscovery timing:\n")
+    sys.stdout.write(_format_discovery_stats("this run", result.stats))
+    if "--no-timing" not in sys.argv[1:]:
+        # This run has just (re)written the cache, so the warm probe sees it populated.
+        sys.stdout.write(_format_discovery_stats("cold start (fresh interpreter, no cache)",
+                                                 _discovery_probe(use_cache=False)))
+        sys.stdout.write(_format_discovery_stats("warm start (fresh interpreter, cache)",
+                                                 _discovery_probe(use_cache=True)))
     return 0
 
 
+def _server_stats_runner(discovery: DiscoveryResult) -> ToolRunner:
+    """Built-in `server_stats` tool: per-tool latency histograms, result-cache
+    hit rates, worker-pool and discovery counters for this server process."""
+    started = time.monotonic()
+
+    def server_stats() -> dict[str, Any]:
+        cache = _result_cache
+        pool = _script_pool
+        dispatcher = _dispatcher
+        return {
+            "uptime_s": round(time.monotonic() - started, 1),
+            "dispatch": dict(dispatcher.stats) if dispatcher is not None else None,
+            "lanes": dispatcher.lane_stats() if dispatcher is not None else None,
+            "tools": dispatcher.tool_stats() if dispatcher is not None else None,
+            "result_cache": cache.snapshot() if cache is not None else None,
+            "worker_pool": dict(pool.stats) if pool is not None else None,
+            "hot_reload": dict(_reloader.stats) if _reloader is not None else None,
+            "discovery": discovery.stats,
+        }
+
+    return ToolRunner(
+        tool=Tool(
+            name="server_stats",
+            description=(
+                "Report this MCP server's counters as JSON: tool calls queued, rejected as "
+                "busy and cancelled; queue wait per latency lane (interactive / batch); "
+                "per tool, p50/p95/p99/max of queue wait, handler time, response "
+                "serialization time and response size over its recent calls; "
+                "read-only result cache hits, "
+                "misses and hit rate (overall and per tool), entry count, expiries and "
+                "invalidations; warm worker pool calls, restarts and timeouts; hot reload "
+                "counts; and tool discovery timing."
+            ),
+            input_schema={"type": "object", "properties": {}, "additionalProperties": False},
+            annotations={
+                "title": "MCP Server Stats (read-only)",
+                "readOnlyHint": True,
+                "destructiveHint": False,
+                "idempotentHint": False,
+                "openWorldHint": False,
+            },
+        ),
+        script_path=Path(__file__).resolve(),
+        argv_template=(),
+        bool_flags={},
+        value_flags={},
+        handler=server_stats,
+        # Diagnosing a busy server shouldn't wait behind its batch backlog.
+        lane_override="interactive",
+    )
+
+
 def main() -> int:
     if "--list-tools" in sys.argv[1:]:
         return _print_list_tools(discover_tools(repo_root=REPO_ROOT))
-
-    discovery = discover_tools(repo_root=REPO_ROOT)
+    if "--discovery-probe" in sys.argv[1:]:
+        sys.stdout.write(json.dumps(discover_tools(repo_root=REPO_ROOT).stats) + "\n")
+        return 0
+    if "--trace-to-chrome" in sys.argv[1:]:
+        # `server.py --trace-to-chrome trace.jsonl > trace.json`, then open it in
+        # https://ui.perfetto.dev or chrome://tracing.
+        args = sys.argv[sys.argv.index("--trace-to-chrome") + 1:]
+        if not args:
+            sys.stderr.write("usage: server.py --trace-to-chrome TRACE.jsonl\n")
+            return 2
+        json.dump(_trace_to_chrome(Path(args[0])), sys.stdout)
+        sys.stdout.write("\n")
+        return 0
+
+    # Lazy import (default): MCP_HANDLERS modules with a fresh discovery-cache
+    # entry are advertised from cached schemas and imported on first call, so
+    # initialize/tools/list answer in roughly interpreter-startup time.
+    # DND_MCP_LAZY_IMPORT=0 restores eager imports; DND_MCP_WARM_MODULES=0
+    # skips the background warm-up that starts after the handshake.
+    lazy = _safe_int_env("DND_MCP_LAZY_IMPORT", 1) != 0
+    discovery = discover_tools(repo_root=REPO_ROOT, lazy=lazy)
     if discovery.skipped:
         # A running client only sees discovery.tools via tools/list; the skip
         # set (import failure, duplicate name, missing handler, …) is otherwise
@@ -647,7 +2614,8 @@ def main() -> int:
             sys.stderr.write(f"  - {path.name}: {reason}\n")
         sys.stderr.flush()
     runners = discovery.tools
-    tools = tuple(r.tool for r in runners)
+    if all(r.tool.name != "server_stats" for r in runners):
+        runners += (_server_stats_runner(discovery),)
     runner_by_name = {r.tool.name: r for r in runners}
 
     # Worker pool for tools/call dispatch. Cold (cache-miss) HTTP fetches now
@@ -658,64 +2626,172 @@ def main() -> int:
         thread_name_prefix="dnd-mcp",
     )
 
+    on_ready: Optional[Callable[[], None]] = None
+    deferred = _lazy_modules(runners)
+    if deferred and _safe_int_env("DND_MCP_WARM_MODULES", 1) != 0:
+        def on_ready() -> None:
+            threading.Thread(
+                target=_warm_modules, args=(deferred,), name="dnd-mcp-warm", daemon=True,
+            ).start()
+
+    if _SCRIPT_WORKERS and os.name == "posix" and any(
+        r.handler is None and r.use_worker for r in runners
+    ):
+        pool = _ScriptWorkerPool(_SCRIPT_WORKERS)
+        _set_script_pool(pool)
+        threading.Thread(target=pool.prestart, name="dnd-mcp-prestart", daemon=True).start()
+
+    if _RESULT_CACHE_TTL > 0:
+        _set_result_cache(_ResultCache())
+
+    global _trace_log
+    if _TRACE_PATH:
+        _trace_log = _TraceLog(Path(_TRACE_PATH).expanduser())
+
     try:
-        return _serve_loop(tools, runner_by_name, executor)
+        reloader = _ScriptReloader(REPO_ROOT, lazy=lazy) if _HOT_RELOAD else None
+        _set_reloader(reloader)
+        return _serve_loop(runner_by_name, executor, on_ready=on_ready, reloader=reloader)
     finally:
-        # On stdin EOF, finish in-flight tool calls before exiting so we don't
-        # truncate a response mid-write. Bounded by the per-call HTTP timeout
-        # (~10s in srd5_2), so worst-case shutdown delay is small.
+        # _serve has already drained in-flight calls; this only joins the
+        # threads. Bounded by the per-call HTTP timeout (~10s in srd5_2), so
+        # worst-case shutdown delay is small.
         executor.shutdown(wait=True)
+        if _script_pool is not None:
+            _script_pool.close()
+        if _trace_log is not None:
+            _trace_log.close()
 
 
 def _serve_loop(
-    tools: tuple["Tool", ...],
     runner_by_name: dict[str, "ToolRunner"],
     executor: ThreadPoolExecutor,
+    *,
+    on_ready: Optional[Callable[[], None]] = None,
+    reloader: Optional[_ScriptReloader] = None,
 ) -> int:
-    while True:
-        msg = _read_message()
-        if msg is None:
-            return 0
-        if msg is _SKIP_MESSAGE:
-            # A malformed frame was logged and discarded — keep serving.
-            continue
+    return asyncio.run(_serve(runner_by_name, executor, on_ready=on_ready, reloader=reloader))
+
+
+def _start_stdin_reader(loop: asyncio.AbstractEventLoop, inbox: "asyncio.Queue[Optional[dict[str, Any] | list[Any]]]") -> None:
+    """Read frames on a daemon thread (stdin isn't portably awaitable) and hand
+    them to the loop; `None` marks EOF."""
+    def read_forever() -> None:
+        while True:
+            msg = _read_message()
+            loop.call_soon_threadsafe(inbox.put_nowait, msg)
+            if msg is None:
+                return
+
+    threading.Thread(target=read_forever, name="dnd-mcp-stdin", daemon=True).start()
+
+
+async def _serve(
+    runner_by_name: dict[str, "ToolRunner"],
+    executor: ThreadPoolExecutor,
+    *,
+    on_ready: Optional[Callable[[], None]] = None,
+    reloader: Optional[_ScriptReloader] = None,
+) -> int:
+    # `on_ready` fires once, when the handshake completes (the client's
+    # `notifications/initialized`, or its first tools/list if it never sends one).
+    global _dispatcher
+    loop = asyncio.get_running_loop()
+    inbox: asyncio.Queue[Any] = asyncio.Queue()
+    _start_stdin_reader(loop, inbox)
+    dispatcher = _dispatcher = _Dispatcher(executor, trace=_trace_log)
+    watcher: Optional[_ScriptWatcher] = None
+    if reloader is not None:
+        watcher = _ScriptWatcher(
+            reloader.scripts_dir,
+            lambda paths: loop.call_soon_threadsafe(inbox.put_nowait, _ScriptsChanged(paths)),
+        )
+        watcher.start()
+    try:
+        return await _serve_messages(inbox, runner_by_name, dispatcher, on_ready=on_ready, reloader=reloader)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        # On stdin EOF, finish in-flight tool calls before exiting so we don't
+        # truncate a response mid-write.
+        await dispatcher.drain()
+
+
+async def _serve_messages(
+    inbox: "asyncio.Queue[Any]",
+    runner_by_name: dict[str, "ToolRunner"],
+    dispatcher: _Dispatcher,
+    *,
+    on_ready: Optional[Callable[[], None]] = None,
+    reloader: Optional[_ScriptReloader] = None,
+) -> int:
+    reload_lock = asyncio.Lock()
+    reloads: set[asyncio.Task[None]] = set()
+
+    async def reload_scripts(changed: frozenset[str]) -> None:
+        assert reloader is not None
+        async with reload_lock:
+            before = _tool_listing(runner_by_name)
+            try:
+                scripts, result = await asyncio.to_thread(
+                    reloader.rediscover, changed, tuple(runner_by_name.values()),
+                )
+            except Exception as exc:
+                reloader.stats["errors"] += 1
+                sys.stderr.write(f"[mcp-server] hot reload failed: {exc}\n")
+                return
+            _swap_runners(runner_by_name, scripts, result)
+            if _result_cache is not None:
+                _result_cache.clear()
+            sys.stderr.write(
+                f"[mcp-server] hot reload: {', '.join(sorted(changed))} changed; "
+                f"rediscovered {len(scripts)} script(s)\n"
+            )
+            if _tool_listing(runner_by_name) != before:
+                _write_message({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+
+    def handle(msg: Any, reply: Callable[[dict[str, Any]], int]) -> Optional["asyncio.Task[None]"]:
+        """Answer one request or notification through `reply`. A tools/call
+        returns its task, whose response arrives once it completes."""
+        nonlocal on_ready
+        if not isinstance(msg, dict):
+            reply({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}})
+            return None
 
         method = msg.get("method")
         msg_id = msg.get("id")
         params = msg.get("params") or {}
 
         try:
+            if method == "notifications/initialized" and on_ready is not None:
+                ready, on_ready = on_ready, None
+                ready()
+                return None
+
             if method == "initialize":
                 req_version = params.get("protocolVersion")
                 result = {
                     "protocolVersion": str(req_version) if req_version else PROTOCOL_VERSION,
-                    "capabilities": {"tools": {"listChanged": False}},
+                    "capabilities": {"tools": {"listChanged": reloader is not None}, "resources": {}},
                     "serverInfo": {"name": "dnd-scripts", "version": "0.1.0"},
                 }
                 if msg_id is not None:
-                    _write_message({"jsonrpc": "2.0", "id": msg_id, "result": result})
-                continue
+                    reply({"jsonrpc": "2.0", "id": msg_id, "result": result})
+                return None
 
             if method == "tools/list":
-                tool_payload = []
-                for t in tools:
-                    entry: dict[str, Any] = {
-                        "name": t.name,
-                        "description": t.description,
-                        "inputSchema": t.input_schema,
-                    }
-                    if t.annotations:
-                        entry["annotations"] = t.annotations
-                    tool_payload.append(entry)
-                result = {"tools": tool_payload}
+                result = {"tools": _tool_listing(runner_by_name)}
                 if msg_id is not None:
-                    _write_message({"jsonrpc": "2.0", "id": msg_id, "result": result})
-                continue
+                    reply({"jsonrpc": "2.0", "id": msg_id, "result": result})
+                if on_ready is not None:
+                    ready, on_ready = on_ready, None
+                    ready()
+                return None
 
             if method == "tools/call":
-                # Validate sync (so shape/lookup errors return in-order via the
-                # outer except), then dispatch the actual handler to a worker so
-                # concurrent calls overlap their HTTP latency.
+                # Validate inline (so shape/lookup errors return in-order via the
+                # outer except), then dispatch the call as a task so concurrent
+                # calls overlap their HTTP latency.
                 tool_name = str(params.get("name") or "")
                 arguments = params.get("arguments") or {}
                 if not isinstance(arguments, dict):
@@ -723,31 +2799,48 @@ def _serve_loop(
                 runner = runner_by_name.get(tool_name)
                 if runner is None:
                     raise ValueError(f"Unknown tool: {tool_name}")
-                # Admission control: refuse new work past the in-flight cap so a
-                # fast sender can't pile up unbounded queue depth (memory + tail
-                # latency). Slot is released by the worker in its finally clause.
-                if not _inflight_slots.acquire(blocking=False):
-                    if msg_id is not None:
-                        _write_message({
-                            "jsonrpc": "2.0",
-                            "id": msg_id,
-                            "error": {
-                                "code": -32000,
-                                "message": (
-                                    f"Server busy: {_INFLIGHT_LIMIT} in-flight tool calls. "
-                                    "Retry after some complete."
-                                ),
-                            },
-                        })
-                    continue
-                executor.submit(_run_call_worker, msg_id, runner, arguments)
-                continue
+                meta = params.get("_meta")
+                progress_token = meta.get("progressToken") if isinstance(meta, dict) else None
+                # Admission, per-tool/group caps and the actual call all run in
+                # the call's own task; the loop goes straight back to reading.
+                return dispatcher.submit(msg_id, runner, arguments, progress_token, reply=reply)
+
+            if method == "resources/read":
+                uri = str(params.get("uri") or "")
+                text = _result_pages.read(uri)
+                if msg_id is None:
+                    return None
+                if text is None:
+                    reply({
+                        "jsonrpc": "2.0",
+                        "id": msg_id,
+                        "error": {"code": -32002, "message": f"Resource not found (or expired): {uri}"},
+                    })
+                else:
+                    reply({
+                        "jsonrpc": "2.0",
+                        "id": msg_id,
+                        "result": {"contents": [{"uri": uri, "mimeType": "text/plain", "text": text}]},
+                    })
+                return None
+
+            if method == "resources/list":
+                if msg_id is not None:
+                    resources = [
+                        {key: link[key] for key in ("uri", "name", "mimeType")} for link in _result_pages.listing()
+                    ]
+                    reply({"jsonrpc": "2.0", "id": msg_id, "result": {"resources": resources}})
+                return None
+
+            if method == "notifications/cancelled":
+                dispatcher.cancel(params.get("requestId"))
+                return None
 
             # Ignore notifications like "initialized".
             if msg_id is None:
-                continue
+                return None
 
-            _write_message(
+            reply(
                 {
                     "jsonrpc": "2.0",
                     "id": msg_id,
@@ -756,14 +2849,46 @@ def _serve_loop(
             )
         except Exception as exc:
             if msg_id is None:
-                continue
-            _write_message(
+                return None
+            reply(
                 {
                     "jsonrpc": "2.0",
                     "id": msg_id,
                     "error": {"code": -32000, "message": str(exc)},
                 }
             )
+        return None
+
+    while True:
+        msg = await inbox.get()
+        if msg is None:
+            return 0
+        if msg is _SKIP_MESSAGE:
+            # A malformed frame was logged and discarded — keep serving.
+            continue
+        if isinstance(msg, _ScriptsChanged):
+            if reloader is not None:
+                task = asyncio.create_task(reload_scripts(msg.paths))
+                reloads.add(task)
+                task.add_done_callback(reloads.discard)
+            continue
+
+        if not isinstance(msg, list):
+            handle(msg, _write_message)
+            continue
+
+        # JSON-RPC batch: members dispatch concurrently like separate frames,
+        # and their responses go back together as one array in request order.
+        if not msg:
+            _write_message({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}})
+            continue
+        batch = _BatchReply(len(msg))
+        for index, member in enumerate(msg):
+            task = handle(member, batch.slot(index))
+            if task is None:
+                batch.finish(index)
+            else:
+                task.add_done_callback(lambda _task, index=index: batch.finish(index))
 
 
 if __name__ == "__main__":
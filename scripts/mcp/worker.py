@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Long-lived worker process for subprocess-dispatched MCP tools.
+
+Started by scripts/mcp/server.py (see _ScriptWorkerPool) with the same
+interpreter and environment a one-shot tool subprocess would get. Each call
+runs a tool script as `__main__` via runpy with its argv — exactly what
+`python script.py argv…` would do — but in an interpreter that has already
+imported pandas, chromadb, Pillow, … for earlier calls, so only the script's
+own top level re-executes.
+
+Per call, fds 1 and 2 are pointed at fresh pipes (so output from the script
+*and* any child process it spawns, e.g. pandoc, is captured and kept apart
+from other calls); sys.argv, sys.path, sys.stdout/sys.stderr, the working
+directory, os.environ, the root logger's handlers and level, and signal
+handlers are restored afterwards. A call that leaves a thread running can't
+be undone that way, so it recycles the worker. Progress lines
+(scripts/mcp_progress.py) are forwarded to the server as they are written.
+
+Protocol: one JSON object per line over the fd pair passed as
+`--channel <read_fd> <write_fd>`.
+  server → worker  {"id": n, "script": "/abs/path.py", "argv": [...]}
+  worker → server  {"event": "ready", "pid": …}
+                   {"id": n, "event": "stderr_line", "line": "@@mcp-progress …"}
+                   {"id": n, "event": "done", "returncode": rc, "stdout": …,
+                    "stderr": …, "recycle": bool}
+                   {"id": n, "event": "stale"}
+After a "done" with recycle=true (N calls served, peak RSS grew past the
+limit, or the call left extra threads running) the worker exits and the
+server starts a fresh one. "stale" means a repo module this interpreter
+imported has changed on disk since: the call was not run, the worker exits,
+and the server retries it on a fresh worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import runpy
+import signal
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover — non-POSIX; the pool is POSIX-only anyway
+    resource = None  # type: ignore[assignment]
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PROGRESS_PREFIX = "@@mcp-progress "
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _repo_module_stamps() -> dict[str, float]:
+    stamps: dict[str, float] = {}
+    for module in list(sys.modules.values()):
+        file = getattr(module, "__file__", None)
+        if not file or not file.startswith(str(REPO_ROOT)):
+            continue
+        try:
+            stamps[file] = os.stat(file).st_mtime
+        except OSError:
+            stamps[file] = -1.0
+    return stamps
+
+
+class _Channel:
+    def __init__(self, read_fd: int, write_fd: int) -> None:
+        self._reader = os.fdopen(read_fd, "r", encoding="utf-8")
+        self._writer = os.fdopen(write_fd, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def send(self, payload: dict[str, Any]) -> None:
+        line = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            self._writer.write(line + "\n")
+            self._writer.flush()
+
+    def receive(self) -> Optional[dict[str, Any]]:
+        line = self._reader.readline()
+        return json.loads(line) if line else None
+
+
+def _pump(fd: int, sink: list[str], on_progress: Optional[Any] = None) -> None:
+    with os.fdopen(fd, "r", encoding="utf-8", errors="replace") as stream:
+        for line in stream:
+            if on_progress is not None and line.startswith(PROGRESS_PREFIX):
+                on_progress(line.rstrip("\r\n"))
+            else:
+                sink.append(line)
+
+
+def _exit_code(exc: SystemExit) -> int:
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def _signal_handlers() -> dict[int, Any]:
+    handlers = {}
+    for sig in signal.valid_signals():
+        try:
+            handler = signal.getsignal(sig)
+        except (OSError, ValueError):
+            continue
+        if handler is not None:  # None: installed outside Python, can't restore
+            handlers[sig] = handler
+    return handlers
+
+
+def _restore_signal_handlers(saved: dict[int, Any]) -> None:
+    for sig, handler in saved.items():
+        if signal.getsignal(sig) is not handler:
+            try:
+                signal.signal(sig, handler)
+            except (OSError, ValueError):
+                pass
+
+
+def run_call(channel: _Channel, call_id: Any, script: str, argv: list[str]) -> dict[str, Any]:
+    stdout_parts: list[str] = []
+    stderr_parts: list[str] = []
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    pumps = [
+        threading.Thread(target=_pump, args=(out_r, stdout_parts), daemon=True),
+        threading.Thread(
+            target=_pump, args=(err_r, stderr_parts,
+                                lambda line: channel.send({"id": call_id, "event": "stderr_line", "line": line})),
+            daemon=True,
+        ),
+    ]
+    for t in pumps:
+        t.start()
+
+    saved_streams = (sys.stdout, sys.stderr)
+    saved_argv = sys.argv
+    saved_cwd = os.getcwd()
+    saved_path = list(sys.path)
+    saved_environ = dict(os.environ)
+    root = logging.getLogger()
+    saved_logging = (list(root.handlers), root.level)
+    saved_signals = _signal_handlers()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = (os.dup(1), os.dup(2))
+    os.dup2(out_w, 1)
+    os.dup2(err_w, 2)
+    os.close(out_w)
+    os.close(err_w)
+    returncode = 0
+    try:
+        sys.argv = [script, *argv]
+        # Like `python script.py`: the script's own directory leads sys.path.
+        sys.path.insert(0, str(Path(script).parent))
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as exc:
+        returncode = _exit_code(exc)
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr, *saved_streams):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        sys.stdout, sys.stderr = saved_streams
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        os.chdir(saved_cwd)
+        if os.environ != saved_environ:
+            os.environ.clear()
+            os.environ.update(saved_environ)
+        for handler in root.handlers:
+            if handler not in saved_logging[0]:
+                handler.close()
+        root.handlers[:] = saved_logging[0]
+        root.setLevel(saved_logging[1])
+        _restore_signal_handlers(saved_signals)
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        for fd in saved_fds:
+            os.close(fd)
+    # The pipes' write ends are now closed (unless a leaked grandchild still
+    # holds them — don't wait on that forever).
+    for t in pumps:
+        t.join(timeout=5)
+    return {
+        "id": call_id,
+        "event": "done",
+        "returncode": returncode,
+        "stdout": "".join(stdout_parts),
+        "stderr": "".join(stderr_parts),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--channel", nargs=2, type=int, required=True, metavar=("READ_FD", "WRITE_FD"))
+    parser.add_argument("--max-calls", type=int, default=50)
+    parser.add_argument("--max-growth-mb", type=float, default=512.0)
+    args = parser.parse_args(argv)
+
+    channel = _Channel(*args.channel)
+    baseline_rss = _peak_rss_mb()
+    # mtimes of repo modules as first seen in this process. If one has changed
+    # on disk by the next call, this interpreter would run stale code: answer
+    # "stale" and exit, and the server retries the call on a fresh worker.
+    loaded = _repo_module_stamps()
+    baseline_threads = threading.active_count()
+    calls = 0
+    channel.send({"event": "ready", "pid": os.getpid()})
+    while True:
+        request = channel.receive()
+        if request is None or request.get("op") == "exit":
+            return 0
+        current = _repo_module_stamps()
+        if any(current.get(file, stamp) != stamp for file, stamp in loaded.items()):
+            channel.send({"id": request.get("id"), "event": "stale"})
+            return 0
+        result = run_call(channel, request.get("id"), str(request["script"]), list(request.get("argv") or []))
+        calls += 1
+        for file, stamp in _repo_module_stamps().items():
+            loaded.setdefault(file, stamp)
+        result["recycle"] = (
+            calls >= args.max_calls
+            or _peak_rss_mb() - baseline_rss > args.max_growth_mb
+            # A thread the script started would keep running into later calls.
+            or threading.active_count() > baseline_threads
+        )
+        channel.send(result)
+        if result["recycle"]:
+            return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
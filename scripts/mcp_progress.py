@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Progress reporting for scripts the MCP server runs as subprocesses.
+
+scripts/mcp/server.py launches subprocess tools with DND_MCP_PROGRESS=1 and
+reads their stderr line by line while they run. A line of the form
+
+    @@mcp-progress {"progress": 3, "total": 10, "message": "batch 3/10"}
+
+is stripped from the tool's stderr and relayed to the client as an MCP
+`notifications/progress` (when the client asked for progress), and it resets
+the server's DND_MCP_TOOL_TIMEOUT clock — a job that keeps reporting is never
+killed as hung. Every field is optional; `message` is free text, so a script
+can stream partial output through it as well as status.
+
+Outside the server (DND_MCP_PROGRESS unset) `report_progress` is a no-op, so
+CLI runs print nothing extra.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from typing import Optional
+
+PREFIX = "@@mcp-progress "
+ENV_VAR = "DND_MCP_PROGRESS"
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_VAR, "").strip() not in ("", "0")
+
+
+def format_progress(
+    progress: Optional[float] = None,
+    total: Optional[float] = None,
+    message: Optional[str] = None,
+) -> str:
+    payload: dict[str, object] = {}
+    if progress is not None:
+        payload["progress"] = progress
+    if total is not None:
+        payload["total"] = total
+    if message:
+        payload["message"] = message
+    return PREFIX + json.dumps(payload, ensure_ascii=False)
+
+
+def report_progress(
+    progress: Optional[float] = None,
+    total: Optional[float] = None,
+    message: Optional[str] = None,
+) -> None:
+    """Emit one progress line on stderr (only when running under the server)."""
+    if not enabled():
+        return
+    sys.stderr.write(format_progress(progress, total, message) + "\n")
+    sys.stderr.flush()
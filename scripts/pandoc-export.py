@@ -9,6 +9,8 @@ import re
 import subprocess
 import sys
 
+from mcp_progress import report_progress
+
 MCP_TOOL = {
     "name": "pandoc_export_pdf",
     "description": (
@@ -468,8 +470,11 @@ def main(argv: list[str]) -> int:
         seen.add(resolved)
         unique_files.append(path)
 
+    # One step per merged file, plus the Pandoc run itself.
+    steps = len(unique_files) + 1
     merged_chunks: list[str] = []
-    for path in unique_files:
+    for index, path in enumerate(unique_files):
+        report_progress(index, steps, f"merging {path.name}")
         try:
             body = _read_markdown_body(path)
         except OSError as exc:
@@ -513,6 +518,7 @@ def main(argv: list[str]) -> int:
 
     # Feed Pandoc via stdin to avoid creating temp files next to the source markdown.
     cmd = ["pandoc", "-f", "markdown", "-", *pandoc_args]
+    report_progress(steps - 1, steps, f"running pandoc on {len(merged_chunks)} merged file(s)")
     completed = subprocess.run(cmd, input=merged_markdown, text=True)
 
     return int(completed.returncode)
@@ -16,6 +16,10 @@ Common source keys for the `source` parameter:
 
 Import as: from scripts.srd5_2 import search_monsters, search_spells, etc.
 
+Offline play: `python scripts/srd5_2.py mirror sync` copies every /v2/ list
+endpoint into a local SQLite mirror (scripts/srd_mirror.py); with
+DND_SRD_OFFLINE=1 every search_*/get_* call is answered from it with no network.
+
 == KNOWN OPEN5E v2 QUIRKS — read before adding/modifying filters ==
 
 The OpenAPI schema at https://api.open5e.com/schema/ is auto-generated by
@@ -28,7 +32,9 @@ to anything server-side. Verify behavior empirically when in doubt.
    returns the full unfiltered list regardless of X. The ONLY working full-
    text path is the dedicated /v2/search/ endpoint — exposed as `search_srd`.
    Use search_srd(query=..., object_model='rule'|'creature'|...) and pass
-   vector=True for semantic queries ('creatures that breathe fire').
+   vector=True for semantic queries ('creatures that breathe fire'). Once the
+   offline mirror is synced, rules/spells/creatures/conditions/magic items are
+   searched by a local BM25 index instead (scripts/srd_search.py).
 
 2) name__icontains is documented on SOME endpoints but not others. Endpoints
    that only declare name__contains silently drop name__icontains. See
@@ -74,22 +80,41 @@ from __future__ import annotations
 # search_spells, get_monster_details) are essential for adjudicating edge cases.
 MCP_GROUPS = ["combat", "all"]
 
+import base64
 import functools
 import inspect
 import json
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 
 import requests
 from requests.adapters import HTTPAdapter
 from requests_cache import CachedSession
 from urllib3.util.retry import Retry
 
+# Sibling helper modules live next to this file; make them importable whether
+# we're loaded as `scripts.srd5_2`, by path from the MCP server, or as a script.
+_SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(_SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(_SCRIPTS_DIR))
+import srd_cache  # noqa: E402
+import srd_creatures  # noqa: E402
+import srd_mirror  # noqa: E402
+import srd_search  # noqa: E402
+
 
-BASE_URL = "https://api.open5e.com"
+# DND_SRD_BASE_URL points the client at another Open5e-compatible host — e.g.
+# the local stand-in (`python scripts/srd_standin.py serve`) for benchmarks or
+# offline GUI work against recorded responses.
+BASE_URL = os.environ.get("DND_SRD_BASE_URL", "").rstrip("/") or "https://api.open5e.com"
 
 _REPO_ROOT = Path(__file__).resolve().parents[1]
 _CACHE_DIR = _REPO_ROOT / ".cache"
@@ -99,18 +124,54 @@ _CACHE_DIR.mkdir(parents=True, exist_ok=True)
 # automatically on first call after the v2 migration.
 _CACHE_NAME = "srd5_2_v2"
 
+def _env_int(name: str, default: int) -> int:
+    """Positive int from the environment; anything unparsable or < 1 falls back
+    to `default` rather than crashing the importing MCP server."""
+    try:
+        value = int(os.environ.get(name, ""))
+    except ValueError:
+        return default
+    return value if value >= 1 else default
+
+
+# Keep-alive connections held per host by the shared session. Sized to cover
+# the MCP server's worker pool (DND_MCP_MAX_WORKERS, default 8) with headroom,
+# so parallel tool calls reuse warm TLS connections instead of each opening
+# (and then discarding) its own. Override with DND_SRD_POOL_SIZE.
+_POOL_SIZE = _env_int("DND_SRD_POOL_SIZE", 16)
+
+# Response cache backend. "concurrent" (default) is srd_cache's WAL /
+# per-thread-connection / write-behind store, built for the MCP server's worker
+# pool; "sqlite" is requests_cache's stock single-connection backend. Both use
+# the same file. DND_SRD_CACHE_SHARDS="creatures,spells" splits those endpoints
+# into their own files (concurrent backend only).
+_CACHE_BACKEND = os.environ.get("DND_SRD_CACHE_BACKEND", "concurrent").strip().lower()
+_CACHE_SHARDS = tuple(
+    s.strip() for s in os.environ.get("DND_SRD_CACHE_SHARDS", "").split(",") if s.strip()
+)
+
 _session: Optional[CachedSession] = None
 
 
+def _make_cache_backend():
+    cache_path = _CACHE_DIR / _CACHE_NAME
+    if _CACHE_BACKEND == "sqlite":
+        return "sqlite", {"cache_name": str(cache_path)}
+    backend = srd_cache.ConcurrentSQLiteCache(cache_path, shards=_CACHE_SHARDS)
+    extra = {"key_fn": srd_cache.shard_key_fn(_CACHE_SHARDS)} if _CACHE_SHARDS else {}
+    return backend, extra
+
+
 def _get_session() -> CachedSession:
     global _session
     if _session is not None:
         return _session
+    backend, extra = _make_cache_backend()
     session = CachedSession(
-        cache_name=str(_CACHE_DIR / _CACHE_NAME),
-        backend="sqlite",
+        backend=backend,
         expire_after=60 * 60 * 24 * 30,  # 30 days
         allowable_methods=("GET",),
+        **extra,
     )
     retry = Retry(
         total=3,
@@ -118,14 +179,212 @@ def _get_session() -> CachedSession:
         status_forcelist=(500, 502, 503, 504),
         allowed_methods=("GET",),
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(
+        pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE, max_retries=retry,
+    )
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     _session = session
     return session
 
 
+# Offline mode: answer every call from the local mirror (scripts/srd_mirror.py)
+# instead of the network. Enabled by DND_SRD_OFFLINE=1 (set it in the MCP
+# server's env block to run the whole server offline), or forced per-process
+# with set_offline_mode() — the override wins over the env var.
+_offline_override: Optional[bool] = None
+
+
+def _offline_enabled() -> bool:
+    if _offline_override is not None:
+        return _offline_override
+    return os.environ.get("DND_SRD_OFFLINE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
 def _api_get(endpoint: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    """GET an open5e endpoint — from the offline mirror when offline mode is
+    on, otherwise over the network via `_http_get`. Every search_*/get_* call
+    funnels through here, so the name-form map, client-side name filtering and
+    `_apply_priority_and_dedupe` run unchanged on top of either source."""
+    if _offline_enabled():
+        return _mirror_get(endpoint, params)
+    return _http_get(endpoint, params)
+
+
+def _mirror_get(endpoint: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    """Resolve a call against the mirror, with the same ValueError contract as
+    the network path so MCP clients see one error shape either way."""
+    try:
+        return srd_mirror.resolve(
+            endpoint, params, name_forms=_ENDPOINT_NAME_FORMS, base_url=BASE_URL,
+        )
+    except srd_mirror.MirrorMiss as exc:
+        raise ValueError(
+            f"SRD offline mirror has no answer for {endpoint} ({exc}). Run "
+            f"`python scripts/srd5_2.py mirror sync` while online, or turn "
+            f"offline mode off."
+        ) from exc
+
+
+# In-memory LRU of decoded responses, in front of the requests_cache SQLite.
+# A warm SQLite hit still costs a row read plus a full JSON decode (ms for a
+# creature page); the enum tables the GUI polls constantly don't need that.
+# Entries are the decoded dicts themselves — shared, never copied, so callers
+# must not mutate them (same contract as the single-flight below).
+_DAY = 60 * 60 * 24
+# Per-endpoint freshness. None = never expires in-process (these short enums
+# only change when Open5e ships a new document). Everything else defaults to
+# _DEFAULT_LRU_TTL; the disk cache still applies its own 30-day expiry below.
+_LRU_TTL_SEC: dict[str, Optional[float]] = {
+    **{ep: None for ep in (
+        "/v2/abilities/", "/v2/alignments/", "/v2/creaturetypes/", "/v2/damagetypes/",
+        "/v2/sizes/", "/v2/skills/", "/v2/spellschools/", "/v2/itemcategories/",
+        "/v2/itemrarities/", "/v2/languages/", "/v2/weaponproperties/",
+        "/v2/gamesystems/", "/v2/publishers/", "/v2/licenses/", "/v2/documents/",
+        "/v2/conditions/",
+    )},
+    "/v2/creatures/": 30 * _DAY,
+    "/v2/spells/": 30 * _DAY,
+    "/v2/search/": _DAY,
+}
+_DEFAULT_LRU_TTL = 7 * _DAY
+
+
+def _lru_ttl(endpoint: str) -> Optional[float]:
+    """TTL for an endpoint; detail paths (/v2/spells/<key>/) inherit their
+    list endpoint's policy."""
+    parts = [p for p in endpoint.split("/") if p]
+    base = "/" + "/".join(parts[:2]) + "/" if len(parts) >= 2 else endpoint
+    return _LRU_TTL_SEC.get(base, _DEFAULT_LRU_TTL)
+
+
+class _ResponseLRU:
+    """Bounded, thread-safe LRU of (endpoint, params) → decoded response."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._entries: OrderedDict[tuple, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: tuple) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: Any, ttl: Optional[float]) -> None:
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_response_lru = _ResponseLRU(_env_int("DND_SRD_LRU_SIZE", 512))
+
+
+# Single-flight: identical (endpoint, params) requests already on the wire are
+# joined rather than repeated. When the LLM fans the same get_monster_details
+# out from several tabs, the first caller (the leader) does the HTTP round trip
+# and writes the SQLite cache once; every concurrent duplicate blocks on the
+# leader's flight and gets the same decoded response (or the same error).
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+_inflight: dict[tuple, _Flight] = {}
+_inflight_lock = threading.Lock()
+# Counters for observability: `fetched` HTTP calls made by leaders, `joined`
+# callers served by someone else's in-flight request.
+_singleflight_stats = {"fetched": 0, "joined": 0}
+
+
+def _request_key(endpoint: str, params: Optional[dict[str, Any]]) -> tuple:
+    """Canonical identity of a GET. Values are compared as `requests` would
+    serialize them (True → 'True'), so {"limit": 5} and {"limit": "5"} — the
+    same URL — share one flight."""
+    return (endpoint, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+
+def _http_get(endpoint: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    """`_fetch_json` behind the in-memory LRU, deduplicated against identical
+    in-flight requests.
+
+    The shared response is never copied — callers must not mutate it (the
+    same contract `_apply_priority_and_dedupe` already honors)."""
+    key = _request_key(endpoint, params)
+    cached = _response_lru.get(key)
+    if cached is not None:
+        return cached
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+            _singleflight_stats["fetched"] += 1
+        else:
+            _singleflight_stats["joined"] += 1
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            # Fresh exception per waiter: re-raising one shared instance from
+            # several threads would splice their tracebacks together.
+            if isinstance(flight.error, ValueError):
+                raise ValueError(str(flight.error)) from flight.error
+            raise flight.error
+        return flight.result
+    try:
+        flight.result = _fetch_json(endpoint, params)
+        _response_lru.put(key, flight.result, _lru_ttl(endpoint))
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+    return flight.result
+
+
+def _fetch_json(endpoint: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
     """GET an open5e endpoint via the cached, retrying session.
 
     Transport faults are converted to caller-actionable ``ValueError``s here —
@@ -375,11 +634,14 @@ def _apply_priority_and_dedupe(
 
 # Endpoints whose Open5e filterset has no server-side name form (None in
 # _ENDPOINT_NAME_FORMS — e.g. /v2/weapons/, /v2/armor/, /v2/skills/) can't match
-# `name` server-side; the param is silently ignored. For those we over-fetch the
-# whole list and filter in Python. Every such endpoint is a small reference table
-# (weapons 75, armor 25, skills 20, ...), each returned by Open5e in a single
-# page well under this limit — so one over-fetch is cheap and disk-cached.
-_CLIENT_FILTER_FETCH_LIMIT = 1000
+# `name` server-side; the param is silently ignored. For those we stream the
+# whole list page by page (following `next`) and keep only the name matches, so
+# neither a page boundary nor the caller's `limit` can hide a match and memory
+# holds matches, not the full table.
+_CLIENT_FILTER_PAGE_SIZE = 100
+
+# Page size for the iter_* generators unless the caller picks one.
+_ITER_PAGE_SIZE = 100
 
 
 def _server_name_form(endpoint: str, match: str) -> Optional[str]:
@@ -395,6 +657,99 @@ def _matches_name(entry: Any, needle_casefold: str, match: str) -> bool:
     return candidate == needle_casefold if match == "exact" else needle_casefold in candidate
 
 
+# --- Pagination ----------------------------------------------------------------
+# Open5e pages every list endpoint and links the next page as an absolute
+# `next` URL. `_iter_pages` follows those links and fetches page N+1 on a small
+# background pool while the caller is still consuming page N, so a long pull
+# costs roughly one round trip per page in total rather than one per page plus
+# the caller's own processing time.
+
+_prefetch_pool: Optional[ThreadPoolExecutor] = None
+_prefetch_pool_lock = threading.Lock()
+
+
+def _get_prefetch_pool() -> ThreadPoolExecutor:
+    global _prefetch_pool
+    with _prefetch_pool_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(
+                max_workers=_env_int("DND_SRD_PREFETCH_WORKERS", 4),
+                thread_name_prefix="srd-prefetch",
+            )
+        return _prefetch_pool
+
+
+def _iter_pages(endpoint: str, params: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Yield each page of a list query, prefetching the next one concurrently.
+    Closing the generator early cancels (or abandons) the pending prefetch."""
+    pending: Optional[Future] = None
+    try:
+        page = _api_get(endpoint, params)
+        while True:
+            next_url = page.get("next") if isinstance(page, dict) else None
+            if next_url:
+                next_endpoint, next_params = srd_mirror.split_next_url(next_url)
+                pending = _get_prefetch_pool().submit(_api_get, next_endpoint, next_params)
+            yield page
+            if pending is None:
+                return
+            page, pending = pending.result(), None
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def _iter_records(endpoint: str, params: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    for page in _iter_pages(endpoint, params):
+        results = page.get("results") if isinstance(page, dict) else None
+        if not isinstance(results, list):
+            return
+        yield from results
+
+
+# Cursor-based continuation for MCP callers. A search response that has more
+# to give carries `next_cursor`, an opaque token the caller hands back to
+# `srd_next_page`. The token records the exact query (plus priority/dedupe
+# settings), so a page of a sorted, deduped search continues the same way.
+
+def _encode_cursor(state: dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor — pass `next_cursor` exactly as a search returned it.") from exc
+    if not isinstance(state, dict) or "e" not in state or "p" not in state:
+        raise ValueError("Invalid cursor — pass `next_cursor` exactly as a search returned it.")
+    return state
+
+
+def _spec_state(spec: PrioritySpec) -> list[list[str]]:
+    return [list(spec.prefer), list(spec.demote)]
+
+
+def _with_cursor(
+    response: dict[str, Any], endpoint: str, spec: PrioritySpec, dedupe: bool,
+) -> dict[str, Any]:
+    next_url = response.get("next") if isinstance(response, dict) else None
+    if not next_url:
+        return response
+    next_endpoint, next_params = srd_mirror.split_next_url(next_url)
+    return {**response, "next_cursor": _encode_cursor({
+        "e": next_endpoint, "p": next_params, "s": _spec_state(spec), "d": dedupe,
+    })}
+
+
+# iter_* capture: while a capture list is set, `_search_endpoint` records the
+# query it *would* run instead of running it. That lets every iter_* variant
+# reuse its search_* twin's argument handling verbatim (see `_iter_variant`).
+_query_capture: ContextVar[Optional[list]] = ContextVar("_query_capture", default=None)
+
+
 def _search_endpoint(
     endpoint: str,
     params: dict[str, Any],
@@ -404,34 +759,103 @@ def _search_endpoint(
     name: Optional[str] = None,
     match: str = "partial",
     limit: int = 10,
+    offset: int = 0,
 ) -> dict[str, Any]:
     """Fetch + finalize a search/list query. When the endpoint can filter `name`
     server-side, this is `_api_get` + `_apply_priority_and_dedupe`. When it can't
-    (server form is None), over-fetch the full list, filter by name in Python,
-    rank + dedupe, then truncate to `limit` so paging never hides a match."""
+    (server form is None), stream the full list, filter by name in Python,
+    rank + dedupe, then slice `offset:offset+limit` so paging never hides a
+    match. Either way, a response with more to give carries `next_cursor`."""
+    captured = _query_capture.get()
+    if captured is not None:
+        captured.append((endpoint, params, name, match))
+        return {"count": 0, "next": None, "results": []}
     if not name or _server_name_form(endpoint, match) is not None:
-        return _apply_priority_and_dedupe(_api_get(endpoint, params), spec, dedupe)
-    response = _api_get(endpoint, {**params, "limit": _CLIENT_FILTER_FETCH_LIMIT})
-    results = response.get("results")
-    if isinstance(results, list):
-        needle = name.casefold()
-        kept = [r for r in results if _matches_name(r, needle, match)]
-        response = {**response, "results": kept, "count": len(kept)}
+        return _with_cursor(
+            _apply_priority_and_dedupe(_api_get(endpoint, params), spec, dedupe),
+            endpoint, spec, dedupe,
+        )
+    needle = name.casefold()
+    kept = [
+        r for r in _iter_records(endpoint, {**params, "limit": _CLIENT_FILTER_PAGE_SIZE})
+        if _matches_name(r, needle, match)
+    ]
+    response = {"count": len(kept), "next": None, "previous": None, "results": kept}
     finalized = _apply_priority_and_dedupe(response, spec, dedupe)
     fin_results = finalized.get("results")
-    if isinstance(fin_results, list) and len(fin_results) > limit:
-        # Truncate to `limit` and keep `count` honest: it was set to the exact
-        # post-name-filter match count above, but after the slice the response
-        # carries only `limit` items, so a `len(results) == count` caller would
-        # otherwise be misled.
-        finalized = {
-            **finalized,
-            "results": fin_results[:limit],
-            "count": min(finalized.get("count", limit), limit),
-        }
+    if isinstance(fin_results, list) and (offset or len(fin_results) > limit):
+        # Slice to the requested window and keep `count` honest: it was set to
+        # the exact post-name-filter match count above, but after the slice the
+        # response carries only the window, so a `len(results) == count` caller
+        # would otherwise be misled.
+        window = fin_results[offset:offset + limit]
+        finalized = {**finalized, "results": window, "count": len(window)}
+        if offset + limit < len(fin_results):
+            finalized["next_cursor"] = _encode_cursor({
+                "e": endpoint, "p": params, "s": _spec_state(spec), "d": dedupe,
+                "n": name, "m": match, "o": offset + limit, "l": limit,
+            })
     return finalized
 
 
+def srd_next_page(cursor: str) -> dict[str, Any]:
+    """Continue a search from the `next_cursor` it returned."""
+    state = _decode_cursor(cursor)
+    prefer, demote = state.get("s") or ([], [])
+    spec = PrioritySpec(prefer=tuple(prefer), demote=tuple(demote))
+    if "o" in state:
+        return _search_endpoint(
+            state["e"], state["p"], spec=spec, dedupe=bool(state.get("d", True)),
+            name=state.get("n"), match=state.get("m", "partial"),
+            limit=int(state.get("l", 10)), offset=int(state["o"]),
+        )
+    return _search_endpoint(state["e"], state["p"], spec=spec, dedupe=bool(state.get("d", True)))
+
+
+def _iter_variant(search_fn: Callable[..., dict[str, Any]]) -> Callable[..., Iterator[dict[str, Any]]]:
+    """Build iter_<x> from search_<x>: same filter kwargs, but yields every
+    matching record across all pages (following `next`, with the next page
+    prefetched) instead of returning one `limit`-capped page.
+
+    `limit` caps the total number of records yielded (default: all);
+    `page_size` sets records per request. Records come in API order —
+    the priority sort and dedupe need the whole set, so they don't apply."""
+
+    def iterate(
+        *, limit: Optional[int] = None, page_size: int = _ITER_PAGE_SIZE, **filters: Any,
+    ) -> Iterator[dict[str, Any]]:
+        captured: list = []
+        token = _query_capture.set(captured)
+        try:
+            search_fn(**filters)
+        finally:
+            _query_capture.reset(token)
+        endpoint, params, name, match = captured[0]
+        client_filter = bool(name) and _server_name_form(endpoint, match) is None
+        needle = name.casefold() if client_filter else ""
+        emitted = 0
+        records = _iter_records(endpoint, {**params, "limit": page_size})
+        try:
+            for record in records:
+                if client_filter and not _matches_name(record, needle, match):
+                    continue
+                if limit is not None and emitted >= limit:
+                    return
+                emitted += 1
+                yield record
+        finally:
+            records.close()
+
+    iterate.__name__ = iterate.__qualname__ = search_fn.__name__.replace("search_", "iter_", 1)
+    iterate.__doc__ = (
+        f"Generator twin of {search_fn.__name__}: same filter kwargs, yields every "
+        f"matching record across all pages. `limit` caps the total yielded "
+        f"(default: all); `page_size` sets records per request. API order — no "
+        f"priority sort or dedupe."
+    )
+    return iterate
+
+
 # --- Filter helpers ----------------------------------------------------------
 # These are the building blocks every search_* function uses to translate Pythonic
 # kwargs into Open5e v2 query params. Open5e's filterset is Django-style: a field
@@ -556,7 +980,7 @@ def search_monsters(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/creatures/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/creatures/", params), spec, dedupe)
+    return _search_endpoint("/v2/creatures/", params, spec=spec, dedupe=dedupe)
 
 
 def get_monster_details(key: str) -> dict[str, Any]:
@@ -620,7 +1044,7 @@ def search_spells(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/spells/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/spells/", params), spec, dedupe)
+    return _search_endpoint("/v2/spells/", params, spec=spec, dedupe=dedupe)
 
 
 def get_spell_details(key: str) -> dict[str, Any]:
@@ -647,7 +1071,7 @@ def list_conditions(
         limit=limit, extra=extra,
         endpoint="/v2/conditions/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/conditions/", params), spec, dedupe)
+    return _search_endpoint("/v2/conditions/", params, spec=spec, dedupe=dedupe)
 
 
 # --- Magic items --------------------------------------------------------------
@@ -704,7 +1128,7 @@ def search_magic_items(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/magicitems/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/magicitems/", params), spec, dedupe)
+    return _search_endpoint("/v2/magicitems/", params, spec=spec, dedupe=dedupe)
 
 
 def get_magic_item(key: str) -> dict[str, Any]:
@@ -762,7 +1186,7 @@ def search_items(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/items/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/items/", params), spec, dedupe)
+    return _search_endpoint("/v2/items/", params, spec=spec, dedupe=dedupe)
 
 
 def get_item(key: str) -> dict[str, Any]:
@@ -796,7 +1220,7 @@ def search_classes(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/classes/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/classes/", params), spec, dedupe)
+    return _search_endpoint("/v2/classes/", params, spec=spec, dedupe=dedupe)
 
 
 def get_class_info(key: str) -> dict[str, Any]:
@@ -924,6 +1348,27 @@ def search_rules(
         if exclude: params["exclude"] = exclude
         return _apply_priority_and_dedupe(_api_get("/v2/rules/", params), spec, dedupe=False)
 
+    # Step 1 (local): the in-process BM25 index over the mirror, when it holds
+    # the rules. It takes a multi-source filter directly, and Step 2 then reads
+    # the full records from the mirror too — no network on either step.
+    hits = _local_search_hits(
+        query, kinds=["rule"],
+        document_keys=set(filter_source.split(",")) if filter_source else None,
+        limit=limit, vector=vector,
+    )
+    if hits is not None:
+        if not hits:
+            return {"count": 0, "results": []}
+        local_params: dict[str, Any] = {
+            "key__in": ",".join(h["key"] for h in hits), "limit": limit,
+        }
+        if fields: local_params["fields"] = fields
+        if exclude: local_params["exclude"] = exclude
+        full = _mirror_get("/v2/rules/", local_params)
+        return _apply_priority_and_dedupe(
+            _rank_rules_by_keys(full, [h["key"] for h in hits]), spec, dedupe=False,
+        )
+
     # Step 1: relevance-ranked rule keys via /v2/search/.
     search_params: dict[str, Any] = {
         "query": query, "object_model": "rule", "limit": limit,
@@ -955,23 +1400,28 @@ def search_rules(
     if exclude: detail_params["exclude"] = exclude
     full = _api_get("/v2/rules/", detail_params)
 
-    # Preserve the relevance order from /v2/search/ — /v2/rules/?key__in=…
-    # returns alphabetically by default, which discards the ranking. Also set
-    # `count` to the materialised result length: the result set is fully in
-    # memory and bounded by `limit`, and the Step-2 `document__key__in` filter
-    # can drop keys Step 1 produced — so `full["count"]` from /v2/rules/ is a
-    # third, unrelated number. `len(results)` is the only honest value.
-    if isinstance(full.get("results"), list):
-        order = {k: i for i, k in enumerate(rule_keys)}
-        ranked = sorted(
-            full["results"],
-            key=lambda r: order.get(str(r.get("key", "")), len(rule_keys)),
-        )
-        full = {**full, "results": ranked, "count": len(ranked)}
-
     # Don't dedupe rules — same-name sections across editions cover the same
     # topic in different words, not true duplicates.
-    return _apply_priority_and_dedupe(full, spec, dedupe=False)
+    return _apply_priority_and_dedupe(_rank_rules_by_keys(full, rule_keys), spec, dedupe=False)
+
+
+def _rank_rules_by_keys(full: dict[str, Any], rule_keys: list[str]) -> dict[str, Any]:
+    """Restore search_rules' Step-1 relevance order on the Step-2 records.
+
+    /v2/rules/?key__in=… returns alphabetically by default, which discards the
+    ranking. Also set `count` to the materialised result length: the result
+    set is fully in memory and bounded by `limit`, and the Step-2
+    `document__key__in` filter can drop keys Step 1 produced — so
+    `full["count"]` from /v2/rules/ is a third, unrelated number.
+    `len(results)` is the only honest value."""
+    if not isinstance(full.get("results"), list):
+        return full
+    order = {k: i for i, k in enumerate(rule_keys)}
+    ranked = sorted(
+        full["results"],
+        key=lambda r: order.get(str(r.get("key", "")), len(rule_keys)),
+    )
+    return {**full, "results": ranked, "count": len(ranked)}
 
 
 def get_rule_section(key: str) -> dict[str, Any]:
@@ -999,7 +1449,7 @@ def search_backgrounds(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/backgrounds/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/backgrounds/", params), spec, dedupe)
+    return _search_endpoint("/v2/backgrounds/", params, spec=spec, dedupe=dedupe)
 
 
 def get_background(key: str) -> dict[str, Any]:
@@ -1034,7 +1484,7 @@ def search_species(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/species/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/species/", params), spec, dedupe)
+    return _search_endpoint("/v2/species/", params, spec=spec, dedupe=dedupe)
 
 
 def get_species(key: str) -> dict[str, Any]:
@@ -1060,7 +1510,7 @@ def search_feats(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/feats/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/feats/", params), spec, dedupe)
+    return _search_endpoint("/v2/feats/", params, spec=spec, dedupe=dedupe)
 
 
 def get_feat(key: str) -> dict[str, Any]:
@@ -1081,6 +1531,55 @@ def get_spell_list(class_slug: str) -> dict[str, Any]:
 
 # --- Universal cross-type search ---------------------------------------------
 
+def _local_search_hits(
+    query: str,
+    *,
+    kinds: list[str],
+    document_keys: Optional[set[str]],
+    limit: int,
+    vector: Optional[bool] = None,
+) -> Optional[list[dict[str, Any]]]:
+    """Ranked hits from the local index (scripts/srd_search.py), or None when
+    the remote /v2/search/ has to answer instead: a kind the index doesn't
+    cover, endpoints not mirrored yet, or a semantic (vector=True) query while
+    online — the embedding search only exists upstream. Offline, the local
+    index is the best available answer even for vector queries."""
+    if any(k not in srd_search.KINDS for k in kinds):
+        return None
+    if vector and not _offline_enabled():
+        return None
+    index = srd_search.get_index()
+    if not {srd_search.KINDS[k] for k in kinds} <= index.indexed_endpoints():
+        return None
+    return index.search(query, kinds=kinds, document_keys=document_keys, limit=limit)
+
+
+def _local_search_response(hits: list[dict[str, Any]]) -> dict[str, Any]:
+    """Shape local hits like a /v2/search/ page so callers can't tell the two
+    engines apart."""
+    return {
+        "count": len(hits),
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "object_pk": h["key"],
+                "object_name": h["name"],
+                "object_model": h["kind"],
+                "route": srd_search.KINDS[h["kind"]].lstrip("/"),
+                "document": h["document"],
+                "highlighted": srd_search.highlight(
+                    f"{h['name']}: {h['text']}", h["matched_terms"],
+                ),
+                "match_type": h["match_type"],
+                "matched_term": " ".join(h["matched_terms"]),
+                "match_score": h["score"],
+            }
+            for h in hits
+        ],
+    }
+
+
 def search_srd(
     query: str,
     limit: int = 10,
@@ -1089,6 +1588,8 @@ def search_srd(
     strict: Optional[bool] = None,
     object_model: Optional[str] = None,
     document_pk: Optional[str] = None,
+    fanout: Optional[bool] = None,
+    deadline: Optional[float] = None,
 ) -> dict[str, Any]:
     """Search all object types in one call (/v2/search/). Returns mixed results
     with `object_model` indicating type and `highlighted` snippets.
@@ -1100,9 +1601,44 @@ def search_srd(
     - object_model filters to one type (e.g. 'creature', 'spell', 'magicitem',
       'rule', 'background', 'species', 'feat', 'item', 'condition').
     - document_pk filters to a single source (document key/slug).
+
+    An object_model of rule, spell, creature, condition or magicitem is
+    answered by the local BM25 index (always prefix- and typo-tolerant, so
+    `fuzzy` is implied; one kind, so `strict` holds) once it's in the offline
+    mirror. Unfiltered queries, other object models and online vector=True
+    queries go to /v2/search/ — except offline, where an unfiltered query is
+    searched locally over those five kinds and the result's `coverage` says so.
+
+    fanout=True instead asks the typed endpoints (spells, conditions, rules,
+    creatures, magic items — or just `object_model`) concurrently and merges
+    their full records by a unified relevance score; see `search_fanout`.
+    `deadline` caps how long, in seconds, any one source may take.
     """
     if not query or not str(query).strip():
         raise ValueError("search_srd requires a non-empty `query` keyword.")
+    if fanout:
+        return search_fanout(
+            query, kinds=[object_model] if object_model else None,
+            source=document_pk, limit=limit, deadline=deadline,
+        )
+    # The local index covers only srd_search.KINDS, so an unfiltered query
+    # would silently drop backgrounds, feats, species, items… — online, let
+    # /v2/search/ answer it.
+    if object_model in srd_search.KINDS or (not object_model and _offline_enabled()):
+        hits = _local_search_hits(
+            query,
+            kinds=[object_model] if object_model else list(srd_search.KINDS),
+            document_keys={document_pk} if document_pk else None,
+            limit=limit, vector=vector,
+        )
+        if hits is not None:
+            response = _local_search_response(hits)
+            if not object_model:
+                response["coverage"] = (
+                    f"Offline: searched {', '.join(srd_search.KINDS)} only; other object "
+                    "models need /v2/search/ (go online)."
+                )
+            return response
     params: dict[str, Any] = {"query": query, "limit": limit}
     _add_bool(params, "vector", vector)
     _add_bool(params, "fuzzy", fuzzy)
@@ -1114,6 +1650,193 @@ def search_srd(
     return _api_get("/v2/search/", params)
 
 
+
+# --- Fan-out search ------------------------------------------------------------
+# When the kind of a query is ambiguous ("fly", "shield", "frightened") the
+# typed endpoints are asked at once on a small pool instead of guessing one and
+# making the DM re-type. Each source has its own deadline; a source that misses
+# it is reported as `timeout` and left running (it only warms the cache), so
+# total latency is bounded by the slowest allowed deadline, not the slowest
+# source. Rules are two round trips online, so they get the most room.
+
+_FANOUT_SOURCES: dict[str, Callable[[str, int, Optional[str]], dict[str, Any]]] = {
+    "spell": lambda q, n, s: search_spells(name=q, source=s, limit=n),
+    "condition": lambda q, n, s: list_conditions(name=q, source=s, limit=n),
+    "rule": lambda q, n, s: search_rules(query=q, source=s, limit=n),
+    "creature": lambda q, n, s: search_monsters(name=q, source=s, limit=n),
+    "magicitem": lambda q, n, s: search_magic_items(name=q, source=s, limit=n),
+}
+_FANOUT_DEADLINES: dict[str, float] = {
+    "spell": 3.0, "condition": 2.0, "rule": 5.0, "creature": 3.0, "magicitem": 3.0,
+}
+# Rule sections that share a name across editions cover the same topic in
+# different words (see search_rules), so only the other kinds are deduped.
+_FANOUT_NO_DEDUPE = {"rule"}
+
+_fanout_pool: Optional[ThreadPoolExecutor] = None
+_fanout_pool_lock = threading.Lock()
+
+
+def _get_fanout_pool() -> ThreadPoolExecutor:
+    global _fanout_pool
+    with _fanout_pool_lock:
+        if _fanout_pool is None:
+            # Room for one straggler per source plus a full fresh fan-out.
+            _fanout_pool = ThreadPoolExecutor(
+                max_workers=2 * len(_FANOUT_SOURCES), thread_name_prefix="srd-fanout",
+            )
+        return _fanout_pool
+
+
+def _mcp_reload_teardown() -> None:
+    """Called by the MCP server before it hot-reloads this module: shut down
+    the prefetch and fan-out pools and close the cached session (flushing its
+    write-behind queue), so the reloaded module starts from fresh ones instead
+    of orphaning these."""
+    global _session, _prefetch_pool, _fanout_pool
+    with _prefetch_pool_lock:
+        prefetch, _prefetch_pool = _prefetch_pool, None
+    with _fanout_pool_lock:
+        fanout, _fanout_pool = _fanout_pool, None
+    for pool in (prefetch, fanout):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    session, _session = _session, None
+    if session is not None:
+        session.close()
+
+
+def _fanout_kinds(kinds: Optional[list[str]]) -> list[str]:
+    if not kinds:
+        return list(_FANOUT_SOURCES)
+    unknown = [k for k in kinds if k not in _FANOUT_SOURCES]
+    if unknown:
+        raise ValueError(
+            f"Fan-out search can't query {', '.join(unknown)}; "
+            f"choose from {', '.join(_FANOUT_SOURCES)}."
+        )
+    return list(dict.fromkeys(kinds))
+
+
+def _fanout_score(entry: dict[str, Any], needle: str, rank: int, spec: PrioritySpec) -> float:
+    """One scale for every source: how the name matches the query (exact >
+    prefix > word prefix > substring > body-only, e.g. a rule found by its
+    text), minus a small step for the record's source priority tier and its
+    position in the source's own ranking."""
+    name = str(entry.get("name") or "").casefold()
+    if name == needle:
+        tier = 1.0
+    elif name.startswith(needle):
+        tier = 0.8
+    elif any(word.startswith(needle) for word in name.split()):
+        tier = 0.7
+    elif needle in name:
+        tier = 0.6
+    else:
+        tier = 0.4
+    priority, _ = _rank_by_spec(_doc_key(entry), spec)
+    return round(tier - 0.05 * priority - 0.001 * min(rank, 49), 3)
+
+
+def _fanout_batch(
+    kind: str, query: str, future: Future, started: float, source: Optional[str],
+) -> dict[str, Any]:
+    batch: dict[str, Any] = {
+        "kind": kind, "status": "ok", "ms": round((time.monotonic() - started) * 1000), "results": [],
+    }
+    try:
+        response = future.result()
+    except Exception as exc:  # noqa: BLE001 — one failing source must not sink the rest
+        batch.update(status="error", error=str(exc))
+        return batch
+    default = DEFAULT_PRIORITY_CONDITIONS if kind == "condition" else DEFAULT_PRIORITY_SRD
+    _, spec = _resolve_source(source, default)
+    response = _apply_priority_and_dedupe(response, spec, kind not in _FANOUT_NO_DEDUPE)
+    needle = query.strip().casefold()
+    batch["results"] = [
+        {**entry, "kind": kind, "match_score": _fanout_score(entry, needle, rank, spec)}
+        for rank, entry in enumerate(response.get("results") or [])
+        if isinstance(entry, dict)
+    ]
+    if response.get("dropped_variants"):
+        batch["dropped_variants"] = response["dropped_variants"]
+    return batch
+
+
+def iter_search_fanout(
+    query: str,
+    kinds: Optional[list[str]] = None,
+    source: Optional[str] = None,
+    limit: int = 10,
+    deadline: Optional[float] = None,
+) -> Iterator[dict[str, Any]]:
+    """Query every kind concurrently and yield one batch per source as soon as
+    it answers — fastest first — so a UI can show the first useful hits while
+    slower sources are still out. Each batch is `{kind, status, ms, results}`
+    with status `ok`, `error` (plus `error`) or `timeout`; every result carries
+    `kind` and `match_score`. `deadline` (seconds) caps each source's own
+    deadline from `_FANOUT_DEADLINES`."""
+    if not query or not str(query).strip():
+        raise ValueError("Fan-out search requires a non-empty `query` keyword.")
+    started = time.monotonic()
+    pool = _get_fanout_pool()
+    futures: dict[Future, str] = {
+        pool.submit(_FANOUT_SOURCES[kind], query, limit, source): kind
+        for kind in _fanout_kinds(kinds)
+    }
+    cutoff = {
+        fut: started + (min(_FANOUT_DEADLINES[kind], deadline) if deadline is not None
+                        else _FANOUT_DEADLINES[kind])
+        for fut, kind in futures.items()
+    }
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        for fut in [f for f in pending if cutoff[f] <= now and not f.done()]:
+            pending.discard(fut)
+            fut.cancel()
+            yield {"kind": futures[fut], "status": "timeout",
+                   "ms": round((now - started) * 1000), "results": []}
+        if not pending:
+            return
+        done, pending = wait(
+            pending, timeout=max(0.0, min(cutoff[f] for f in pending) - now),
+            return_when=FIRST_COMPLETED,
+        )
+        for fut in done:
+            yield _fanout_batch(futures[fut], query, fut, started, source)
+
+
+def search_fanout(
+    query: str,
+    kinds: Optional[list[str]] = None,
+    source: Optional[str] = None,
+    limit: int = 10,
+    deadline: Optional[float] = None,
+) -> dict[str, Any]:
+    """Collect `iter_search_fanout` into one response: the top `limit` records
+    across all kinds by `match_score`, plus per-source `sources` status (ok /
+    error / timeout and how long it took) so the caller can tell "no match"
+    from "didn't answer in time"."""
+    results: list[dict[str, Any]] = []
+    dropped: list[str] = []
+    sources: dict[str, dict[str, Any]] = {}
+    for batch in iter_search_fanout(query, kinds, source=source, limit=limit, deadline=deadline):
+        results.extend(batch["results"])
+        dropped.extend(batch.get("dropped_variants", ()))
+        sources[batch["kind"]] = {
+            k: v for k, v in batch.items() if k in ("status", "ms", "error")
+        } | {"count": len(batch["results"])}
+    results.sort(key=lambda r: -r["match_score"])  # stable: ties keep arrival order
+    out: dict[str, Any] = {
+        "query": query, "count": min(len(results), limit), "results": results[:limit],
+        "sources": sources,
+    }
+    if dropped:
+        out["dropped_variants"] = dropped
+    return out
+
+
 # --- Environments (biome / location tags) -----------------------------------
 
 def search_environments(
@@ -1139,7 +1862,7 @@ def search_environments(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/environments/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/environments/", params), spec, dedupe)
+    return _search_endpoint("/v2/environments/", params, spec=spec, dedupe=dedupe)
 
 
 def get_environment(key: str) -> dict[str, Any]:
@@ -1170,7 +1893,7 @@ def search_creaturesets(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/creaturesets/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/creaturesets/", params), spec, dedupe)
+    return _search_endpoint("/v2/creaturesets/", params, spec=spec, dedupe=dedupe)
 
 
 def get_creatureset(key: str) -> dict[str, Any]:
@@ -1201,7 +1924,7 @@ def search_itemsets(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/itemsets/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/itemsets/", params), spec, dedupe)
+    return _search_endpoint("/v2/itemsets/", params, spec=spec, dedupe=dedupe)
 
 
 def get_itemset(key: str) -> dict[str, Any]:
@@ -1233,7 +1956,7 @@ def search_rulesets(
         ordering=ordering, limit=limit, extra=extra,
         endpoint="/v2/rulesets/",
     )
-    return _apply_priority_and_dedupe(_api_get("/v2/rulesets/", params), spec, dedupe)
+    return _search_endpoint("/v2/rulesets/", params, spec=spec, dedupe=dedupe)
 
 
 def get_ruleset(key: str) -> dict[str, Any]:
@@ -1457,6 +2180,175 @@ def list_documents(name: Optional[str] = None, keys: Optional[str] = None,
     return _api_get("/v2/documents/", params)
 
 
+# --- Streaming iterators -------------------------------------------------------
+# Large pulls ("every CR 1-5 creature") without one giant `limit`:
+#     for creature in iter_monsters(cr_min=1, cr_max=5, source="srd-2024"):
+#         ...
+
+iter_monsters = _iter_variant(search_monsters)
+iter_spells = _iter_variant(search_spells)
+iter_magic_items = _iter_variant(search_magic_items)
+iter_items = _iter_variant(search_items)
+iter_classes = _iter_variant(search_classes)
+iter_weapons = _iter_variant(search_weapons)
+iter_armor = _iter_variant(search_armor)
+iter_backgrounds = _iter_variant(search_backgrounds)
+iter_species = _iter_variant(search_species)
+iter_feats = _iter_variant(search_feats)
+
+
+# --- Creature index & encounter building ---------------------------------------
+# Stat-block filters over every creature without a round trip per query, via
+# the NumPy columns in scripts/srd_creatures.py.
+
+def get_creature_index(
+    fetch_live: bool = True, *, background: bool = False,
+) -> Optional[srd_creatures.CreatureIndex]:
+    """The shared columnar creature index. Built from the offline mirror when
+    /v2/creatures/ is synced (ability scores included — quirk #4 doesn't apply
+    to detail records); otherwise, when online and `fetch_live`, from one
+    streamed pass over the live list — on a background thread with
+    `background`, returning None until it's ready. None when neither applies,
+    so callers can fall back to search_monsters."""
+    live = None
+    if fetch_live and not _offline_enabled():
+        def live():
+            return _iter_records("/v2/creatures/", {"limit": _ITER_PAGE_SIZE})
+    return srd_creatures.get_index(live, background=background)
+
+
+def _comma_set(value: Optional[str]) -> Optional[list[str]]:
+    if not value:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()] or None
+
+
+def encounter_budget(
+    party_level: int,
+    party_size: int = 4,
+    difficulty: str = "moderate",
+    type: Optional[str] = None,
+    size: Optional[str] = None,
+    cr_min: Optional[float] = None,
+    cr_max: Optional[float] = None,
+    source: Optional[str] = None,
+    max_creatures: int = 8,
+    max_groups: int = 2,
+    limit: int = 10,
+    examples: int = 3,
+) -> dict[str, Any]:
+    """Monster mixes that fit a party's 2024 DMG XP budget. A combination is a
+    set of CR groups with counts; each group lists example creatures at that
+    CR (source-priority ranked, deduped by name) from the filtered pool. The
+    XP window for a difficulty runs from just above the next-lower tier's
+    budget (half the Low budget, for 'low') up to its own budget."""
+    difficulty = difficulty.strip().lower()
+    if difficulty not in srd_creatures.DIFFICULTIES:
+        raise ValueError(
+            f"difficulty must be one of {', '.join(srd_creatures.DIFFICULTIES)}, got {difficulty!r}"
+        )
+    budget = srd_creatures.party_budget(int(party_level), int(party_size))
+    tier = srd_creatures.DIFFICULTIES.index(difficulty)
+    max_xp = budget[difficulty]
+    min_xp = budget[srd_creatures.DIFFICULTIES[tier - 1]] + 1 if tier else budget["low"] // 2
+
+    # Never page every creature inside a tool call: without a mirror the live
+    # index is built in the background and this call asks for a retry.
+    index = get_creature_index(background=True)
+    if index is None:
+        if _offline_enabled():
+            raise ValueError(
+                "SRD API: offline mode is on but /v2/creatures/ is not in the offline "
+                "mirror. Run `python scripts/srd5_2.py mirror sync` while online."
+            )
+        failed = srd_creatures.build_status()["error"]
+        raise ValueError(
+            "SRD API: the creature index is being built from the live API in the "
+            "background (every creature, paged); retry in a minute, or run "
+            "`python scripts/srd5_2.py mirror sync` once for an instant offline index."
+            + (f" The last build failed: {failed}" if failed else "")
+        )
+    filter_source, spec = _resolve_source(source, DEFAULT_PRIORITY_SRD)
+    mask = index.mask(
+        cr_min=cr_min, cr_max=cr_max,
+        types=_comma_set(type), sizes=_comma_set(size),
+        document_keys=_comma_set(filter_source),
+    )
+    rows = index.ranked(mask, prefer=spec.prefer, demote=spec.demote)
+    by_xp: dict[int, list[int]] = {}
+    for row in rows:
+        by_xp.setdefault(int(index.xp[row]), []).append(int(row))
+
+    combos = srd_creatures.compositions(
+        by_xp, min_xp, max_xp,
+        max_groups=max_groups, max_creatures=max_creatures, limit=limit,
+    )
+    return {
+        "party": {"level": int(party_level), "size": int(party_size)},
+        "budget": budget,
+        "difficulty": difficulty,
+        "xp_range": [min_xp, max_xp],
+        "candidates": len(rows),
+        "combinations": [
+            {
+                "total_xp": combo["total_xp"],
+                "creature_count": combo["creature_count"],
+                "groups": [
+                    {
+                        "cr": srd_creatures.cr_label(index.cr[by_xp[xp][0]]),
+                        "xp": xp,
+                        "count": count,
+                        "examples": [
+                            {"key": index.keys[r], "name": index.names[r]}
+                            for r in by_xp[xp][:examples]
+                        ],
+                    }
+                    for xp, count in combo["groups"]
+                ],
+            }
+            for combo in combos
+        ],
+    }
+
+
+# --- Offline mirror ------------------------------------------------------------
+
+def sync_mirror(
+    endpoints: Optional[list[str]] = None,
+    details: bool = True,
+    log: Any = None,
+) -> dict[str, int]:
+    """Page every endpoint in _ENDPOINT_NAME_FORMS (or the given subset) from
+    the live API into the offline mirror. Always goes to the network, even when
+    offline mode is on — it is the one call that refreshes the mirror."""
+    return srd_mirror.sync(
+        _http_get,
+        endpoints or list(_ENDPOINT_NAME_FORMS),
+        details=details,
+        log=log or (lambda msg: None),
+    )
+
+
+def srd_cache_stats() -> dict[str, Any]:
+    """Counters for the in-memory response LRU and the single-flight layer."""
+    with _inflight_lock:
+        flights = {**_singleflight_stats, "in_flight": len(_inflight)}
+    return {"lru": _response_lru.stats(), "single_flight": flights}
+
+
+def set_offline_mode(enabled: Optional[bool]) -> None:
+    """Force offline mode on/off for this process (None = back to following
+    DND_SRD_OFFLINE). For in-process callers like the combat-runner GUI."""
+    global _offline_override
+    _offline_override = enabled
+
+
+def srd_mirror_status() -> dict[str, Any]:
+    """Whether offline mode is on, plus the mirror's per-endpoint record counts
+    and sync times."""
+    return {"offline": _offline_enabled(), "mirror": srd_mirror.status()}
+
+
 # --- Tool definitions for the MCP server -------------------------------------
 
 # Common annotations for read-only, cached, external-API tools.
@@ -1506,7 +2398,14 @@ _PARAM_ORDERING = {
         "'-challenge_rating', 'level'."
     ),
 }
-_PARAM_LIMIT = {"type": "integer", "description": "Max results (default varies by tool).", "default": 10}
+_PARAM_LIMIT = {
+    "type": "integer",
+    "description": (
+        "Max results per page (default varies by tool). When more exist, the response "
+        "carries `next_cursor` — pass it to srd_next_page to continue."
+    ),
+    "default": 10,
+}
 _PARAM_DEDUPE = {
     "type": "boolean",
     "description": (
@@ -1646,6 +2545,52 @@ MCP_TOOLS = [
             "additionalProperties": False,
         },
     },
+    {
+        "name": "encounter_budget",
+        "description": (
+            "Build encounters to an XP budget (2024 DMG rules): given party level and size, "
+            "returns monster mixes whose total XP lands in the chosen difficulty's window, "
+            "closest to the budget first. Each combination is a list of CR groups with a "
+            "count and example creatures at that CR. Answered from an in-memory index of "
+            "every creature stat block, so it is fast enough to call repeatedly while "
+            "tuning filters. Without an offline mirror the first call starts building that "
+            "index in the background and asks you to retry shortly. Examples: encounter_budget(party_level=5, party_size=4); "
+            "encounter_budget(party_level=3, difficulty='high', type='undead', max_groups=1)."
+        ),
+        "annotations": {"title": "Encounter XP Budget (SRD/v2)", **_RO_OPEN_WORLD},
+        "argv": ["--mcp-tool", "encounter_budget"],
+        "value_flags": {
+            "party_level": "--party_level", "party_size": "--party_size",
+            "difficulty": "--difficulty", "type": "--type", "size": "--size",
+            "cr_min": "--cr_min", "cr_max": "--cr_max", "source": "--source",
+            "max_creatures": "--max_creatures", "max_groups": "--max_groups",
+            "limit": "--limit", "examples": "--examples",
+        },
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "party_level": _int_param("Character level (1-20)."),
+                "party_size": {**_int_param("Number of characters."), "default": 4},
+                "difficulty": {
+                    "type": "string",
+                    "enum": ["low", "moderate", "high"],
+                    "description": "2024 DMG encounter difficulty.",
+                    "default": "moderate",
+                },
+                "type": _str_param("Comma list of creature type keys to draw from (e.g. 'undead,fiend')."),
+                "size": _str_param("Comma list of size keys (e.g. 'small,medium')."),
+                "cr_min": _num_param("Lowest CR to use (inclusive)."),
+                "cr_max": _num_param("Highest CR to use (inclusive)."),
+                "source": _PARAM_SOURCE,
+                "max_creatures": {**_int_param("Most creatures in one encounter (capped at 20)."), "default": 8},
+                "max_groups": {**_int_param("Most distinct CRs in one encounter (1-3)."), "default": 2},
+                "limit": {**_int_param("Number of combinations to return."), "default": 10},
+                "examples": {**_int_param("Example creatures listed per CR group."), "default": 3},
+            },
+            "required": ["party_level"],
+            "additionalProperties": False,
+        },
+    },
     {
         "name": "search_spells",
         "description": (
@@ -2174,7 +3119,10 @@ MCP_TOOLS = [
             "backgrounds, etc. all in one call. Best when you don't know which tool to use, "
             "or when checking whether a term exists in any category. "
             "Returns results with `object_model` indicating the type and `highlighted` snippets. "
-            "Chain into the type-specific get_* tool using the returned `object_pk` as the key."
+            "Chain into the type-specific get_* tool using the returned `object_pk` as the key. "
+            "With fanout=true, spells, conditions, rules, creatures and magic items are queried "
+            "concurrently instead and full records come back merged by `match_score`, each "
+            "tagged with its `kind`; `sources` reports which kinds answered before the deadline."
         ),
         "annotations": {"title": "Universal SRD Search", **_RO_OPEN_WORLD},
         "argv": ["--mcp-tool", "search_srd"],
@@ -2182,6 +3130,7 @@ MCP_TOOLS = [
             "query": "--query", "limit": "--limit",
             "vector": "--vector", "fuzzy": "--fuzzy", "strict": "--strict",
             "object_model": "--object_model", "document_pk": "--document_pk",
+            "fanout": "--fanout", "deadline": "--deadline",
         },
         "input_schema": {
             "type": "object",
@@ -2193,6 +3142,8 @@ MCP_TOOLS = [
                 "strict": _bool_param("Return only explicitly-requested object types."),
                 "object_model": _str_param("Restrict to one type: 'creature', 'spell', 'magicitem', 'item', 'rule', 'background', 'species', 'feat', 'condition', 'class'."),
                 "document_pk": _str_param("Restrict to a single document key (e.g. 'srd-2024')."),
+                "fanout": _bool_param("Query spells, conditions, rules, creatures and magic items concurrently and merge full records by relevance. object_model narrows to one of those kinds."),
+                "deadline": _num_param("Fan-out only: seconds any one source may take before it is reported as timed out (default 2-5s per source)."),
             },
             "required": ["query"],
             "additionalProperties": False,
@@ -2446,6 +3397,49 @@ MCP_TOOLS = [
         "value_flags": {"name": "--name", "keys": "--keys", "gamesystem": "--gamesystem", "publisher": "--publisher", "limit": "--limit"},
         "input_schema": {"type": "object", "properties": {"name": _str_param("Document name."), "keys": _PARAM_KEYS, "gamesystem": _str_param("Filter to a gamesystem key (e.g. '5e-2024')."), "publisher": _str_param("Filter to a publisher key."), "limit": _PARAM_LIMIT}, "additionalProperties": False},
     },
+    {
+        "name": "srd_mirror_status",
+        "description": (
+            "Report SRD offline-mirror status: whether offline mode is on and, per /v2/ "
+            "endpoint, how many records the local mirror holds and when it was synced. "
+            "Offline mode (every SRD tool answered from the mirror, no network) is enabled "
+            "by setting DND_SRD_OFFLINE=1 in the MCP server's environment; the mirror is "
+            "built with `python scripts/srd5_2.py mirror sync`."
+        ),
+        "annotations": {"title": "SRD Mirror Status", **_RO_OPEN_WORLD, "openWorldHint": False},
+        "argv": ["--mcp-tool", "srd_mirror_status"],
+        "input_schema": {"type": "object", "properties": {}, "additionalProperties": False},
+    },
+    {
+        "name": "srd_next_page",
+        "description": (
+            "Continue any search_*/list_* result that came back with a `next_cursor`: pass "
+            "that token to get the next page, ranked and deduped the same way as the first. "
+            "Each page may carry its own `next_cursor`; stop when it is absent. Use this "
+            "instead of re-running a search with a huge `limit`."
+        ),
+        "annotations": {"title": "SRD Next Page", **_RO_OPEN_WORLD},
+        "argv": ["--mcp-tool", "srd_next_page"],
+        "value_flags": {"cursor": "--cursor"},
+        "input_schema": {
+            "type": "object",
+            "properties": {"cursor": _str_param("The `next_cursor` value from a previous SRD search response.")},
+            "required": ["cursor"],
+            "additionalProperties": False,
+        },
+    },
+    {
+        "name": "srd_cache_stats",
+        "description": (
+            "Report SRD client cache effectiveness for this server process: the in-memory "
+            "response LRU (size, capacity, hits, misses, evictions, TTL expirations, hit "
+            "ratio) and single-flight counters (HTTP fetches made vs. duplicate concurrent "
+            "calls that joined an in-flight request). Diagnostic only."
+        ),
+        "annotations": {"title": "SRD Cache Stats", **_RO_OPEN_WORLD, "openWorldHint": False},
+        "argv": ["--mcp-tool", "srd_cache_stats"],
+        "input_schema": {"type": "object", "properties": {}, "additionalProperties": False},
+    },
 ]
 
 
@@ -2493,6 +3487,7 @@ def _with_query_alias(fn):
 _RAW_MCP_HANDLERS = {
     "search_monsters": search_monsters,
     "get_monster_details": get_monster_details,
+    "encounter_budget": encounter_budget,
     "search_spells": search_spells,
     "get_spell_details": get_spell_details,
     "list_conditions": list_conditions,
@@ -2538,6 +3533,9 @@ _RAW_MCP_HANDLERS = {
     "list_publishers": list_publishers,
     "list_licenses": list_licenses,
     "list_documents": list_documents,
+    "srd_mirror_status": srd_mirror_status,
+    "srd_cache_stats": srd_cache_stats,
+    "srd_next_page": srd_next_page,
 }
 
 # Wrap name-filter handlers so they also accept `query` as an alias for `name`.
@@ -2582,6 +3580,7 @@ def _parse_flag_args(tokens: list[str]) -> dict[str, Any]:
         "wisdom_min", "wisdom_max", "charisma_min", "charisma_max",
         "strength_required_min", "strength_required_max",
         "range_min", "range_max",
+        "party_level", "party_size", "max_creatures", "max_groups", "examples",
     )
     for int_key in int_keys:
         if int_key in out and isinstance(out[int_key], str):
@@ -2589,7 +3588,7 @@ def _parse_flag_args(tokens: list[str]) -> dict[str, Any]:
                 out[int_key] = int(out[int_key])
             except ValueError:
                 pass
-    float_keys = ("cr_min", "cr_max", "cost_min", "cost_max", "weight_min", "weight_max")
+    float_keys = ("cr_min", "cr_max", "cost_min", "cost_max", "weight_min", "weight_max", "deadline")
     for f_key in float_keys:
         if f_key in out and isinstance(out[f_key], str):
             try:
@@ -2603,7 +3602,7 @@ def _parse_flag_args(tokens: list[str]) -> dict[str, Any]:
         "requires_attunement", "is_weapon", "is_armor", "is_light", "is_versatile",
         "is_thrown", "is_finesse", "is_two_handed", "is_subclass", "is_subspecies",
         "is_exotic", "is_secret", "ac_add_dexmod", "grants_stealth_disadvantage",
-        "vector", "fuzzy", "strict",
+        "vector", "fuzzy", "strict", "fanout",
     )
     for bool_key in bool_keys:
         if bool_key in out and isinstance(out[bool_key], str):
@@ -2611,7 +3610,45 @@ def _parse_flag_args(tokens: list[str]) -> dict[str, Any]:
     return out
 
 
+def _mirror_main(argv: list[str]) -> int:
+    """`srd5_2.py mirror sync [--endpoint /v2/spells/ ...] [--no-details]` and
+    `srd5_2.py mirror status`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="srd5_2.py mirror")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_p = sub.add_parser("sync", help="Page every /v2/ endpoint into the offline mirror.")
+    sync_p.add_argument(
+        "--endpoint", action="append", dest="endpoints", metavar="PATH",
+        help="Only sync this endpoint (repeatable), e.g. /v2/conditions/.",
+    )
+    sync_p.add_argument(
+        "--no-details", action="store_true",
+        help="Skip per-record detail fetches (creature ability scores stay unfilterable offline).",
+    )
+    sub.add_parser("status", help="Show what the mirror holds.")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        print(json.dumps(srd_mirror.status(), indent=2))
+        return 0
+    unknown = [e for e in (args.endpoints or []) if e not in _ENDPOINT_NAME_FORMS]
+    if unknown:
+        print(f"Error: not a mirrored endpoint: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+    synced = sync_mirror(
+        args.endpoints, details=not args.no_details,
+        log=lambda msg: print(msg, file=sys.stderr),
+    )
+    wanted = len(args.endpoints or _ENDPOINT_NAME_FORMS)
+    print(f"Mirrored {len(synced)}/{wanted} endpoints "
+          f"({sum(synced.values())} records) into {srd_mirror.mirror_path()}")
+    return 0 if len(synced) == wanted else 1
+
+
 def main() -> int:
+    if len(sys.argv) >= 2 and sys.argv[1] == "mirror":
+        return _mirror_main(sys.argv[2:])
     if len(sys.argv) >= 3 and sys.argv[1] == "--mcp-tool":
         tool_name = sys.argv[2]
         handler = MCP_HANDLERS.get(tool_name)
@@ -2652,6 +3689,10 @@ def main() -> int:
                         return 1
                 else:
                     kwargs = {}
+            if tool_name == "encounter_budget":
+                # A one-shot process can't wait for the background build, so
+                # build the index here (a no-op when the mirror has it).
+                get_creature_index()
             result = handler(**kwargs)
             print(json.dumps(result, indent=2, ensure_ascii=False))
             return 0
@@ -2666,6 +3707,7 @@ def main() -> int:
             return 1
 
     print("Usage: srd5_2.py --mcp-tool <tool_name> [args]", file=sys.stderr)
+    print("       srd5_2.py mirror {sync,status}", file=sys.stderr)
     print(f"Available tools: {', '.join(sorted(MCP_HANDLERS.keys()))}", file=sys.stderr)
     return 1
 
@@ -2681,6 +3723,8 @@ _COMBAT_SRD_TOOLS = {
     "list_conditions",
     "search_spells",
     "get_spell_details",
+    "srd_mirror_status",
+    "srd_next_page",
 }
 if os.environ.get("DND_MCP_TOOLS_GROUP") == "combat":
     MCP_TOOLS = [t for t in MCP_TOOLS if t["name"] in _COMBAT_SRD_TOOLS]
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""Benchmark the srd5_2 client against the local Open5e stand-in.
+
+Drives the real search_*/get_* functions — cache layers, single-flight,
+retries and all — against scripts/srd_standin.py serving a recorded fixture,
+so latency and cache effectiveness can be measured without api.open5e.com:
+
+    python scripts/srd_bench.py --latency-ms 40 --jitter-ms 15 --workers 8
+    python scripts/srd_bench.py --json > bench.json
+
+Scenarios, each over the same workload derived from the fixture (name
+searches and detail fetches for every spell, condition, creature and magic
+item; search_rules for every recorded rule query):
+
+  cold        empty in-memory LRU and empty requests_cache SQLite
+  disk_warm   LRU cleared, SQLite kept — every lookup is a disk-cache hit
+  warm        both kept — every lookup is an LRU hit
+  concurrent  cold caches, the workload repeated `--rounds` times in shuffled
+              order across `--workers` threads (duplicates exercise
+              single-flight)
+
+Each scenario reports p50/p95/p99 call latency (overall and per tool) and, per
+endpoint, client lookups vs. requests that reached the server, the cache hit
+ratio that implies, and bytes transferred.
+
+`--stress` instead measures throughput scaling: for each requests_cache
+backend (`sqlite`, the stock single-connection store, and `concurrent`, the
+WAL/write-behind store from srd_cache.py) and each worker count (default
+1, 2, 4 and DND_MCP_MAX_WORKERS), the workload is repeated `--rounds` times on
+cold caches across that many threads — the burst of parallel tool calls the
+MCP server's pool produces — and calls/s is reported:
+
+    python scripts/srd_bench.py --stress --stress-workers 1,2,4,8,16
+
+The client runs against a throwaway cache directory and an empty offline
+mirror (so the local BM25 path doesn't answer rule searches); the real
+.cache is never touched.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+_SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(_SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(_SCRIPTS_DIR))
+import srd_standin  # noqa: E402
+
+SCENARIOS = ("cold", "disk_warm", "warm", "concurrent")
+STRESS_BACKENDS = ("sqlite", "concurrent")
+
+Workload = list[tuple[str, Callable[[], Any]]]
+
+
+def percentile(samples: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; None for no samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _latency(samples: list[float]) -> dict[str, Optional[float]]:
+    def r(v: Optional[float]) -> Optional[float]:
+        return None if v is None else round(v, 2)
+
+    return {
+        "p50": r(percentile(samples, 50)),
+        "p95": r(percentile(samples, 95)),
+        "p99": r(percentile(samples, 99)),
+        "mean": r(sum(samples) / len(samples)) if samples else None,
+        "max": r(max(samples)) if samples else None,
+    }
+
+
+def default_workload(srd: Any, fixture: dict[str, Any]) -> Workload:
+    """(tool label, zero-arg call) pairs covering every fixture record."""
+    work: Workload = []
+    records = fixture["endpoints"]
+
+    def names(endpoint: str) -> list[str]:
+        return list(dict.fromkeys(r["name"] for r in records.get(endpoint, []) if r.get("name")))
+
+    def keys(endpoint: str) -> list[str]:
+        return [r["key"] for r in records.get(endpoint, []) if r.get("key")]
+
+    for name in names("/v2/spells/"):
+        work.append(("search_spells", lambda n=name: srd.search_spells(name=n)))
+    for key in keys("/v2/spells/"):
+        work.append(("get_spell_details", lambda k=key: srd.get_spell_details(k)))
+    for name in names("/v2/conditions/"):
+        work.append(("list_conditions", lambda n=name: srd.list_conditions(name=n)))
+    for name in names("/v2/creatures/"):
+        work.append(("search_monsters", lambda n=name: srd.search_monsters(name=n)))
+    for key in keys("/v2/creatures/"):
+        work.append(("get_monster_details", lambda k=key: srd.get_monster_details(k)))
+    for name in names("/v2/magicitems/"):
+        work.append(("search_magic_items", lambda n=name: srd.search_magic_items(name=n)))
+    for response in fixture.get("responses", []):
+        query = response.get("query") or {}
+        if response.get("path") == "/v2/search/" and query.get("object_model") == "rule":
+            work.append(("search_rules", lambda q=query["query"]: srd.search_rules(query=q)))
+    return work
+
+
+@contextlib.contextmanager
+def pointed_at(srd: Any, base_url: str, cache_dir: Path) -> Iterator[dict[str, int]]:
+    """Point `srd` at the stand-in with private caches for the duration; yields
+    a live {endpoint: client lookups} counter. Everything is restored after."""
+    saved = {
+        name: getattr(srd, name)
+        for name in ("BASE_URL", "_CACHE_DIR", "_CACHE_BACKEND", "_session",
+                     "_offline_override", "_http_get")
+    }
+    # Private mirror and search-index paths, so neither the user's mirror is
+    # read nor their search index re-saved from the stand-in's data.
+    env = {
+        "DND_SRD_MIRROR_PATH": str(cache_dir / "no-mirror.sqlite"),
+        "DND_SRD_INDEX_PATH": str(cache_dir / "srd_search_index.pickle"),
+    }
+    saved_env = {name: os.environ.get(name) for name in env}
+    lookups: dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    http_get = srd._http_get
+
+    def counting_http_get(endpoint: str, params: Optional[dict[str, Any]] = None) -> Any:
+        with lock:
+            lookups[srd_standin.endpoint_of(endpoint)] += 1
+        return http_get(endpoint, params)
+
+    srd.BASE_URL = base_url
+    srd._CACHE_DIR = cache_dir
+    srd._session = None
+    srd._offline_override = False
+    srd._http_get = counting_http_get
+    os.environ.update(env)
+    srd._response_lru.clear()
+    srd.srd_search.reset()
+    try:
+        yield lookups
+    finally:
+        if srd._session is not None:
+            srd._session.close()
+        for name, value in saved.items():
+            setattr(srd, name, value)
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        srd._response_lru.clear()
+        srd.srd_search.reset()
+
+
+def _timed(label: str, call: Callable[[], Any]) -> tuple[str, float, Optional[str]]:
+    start = time.perf_counter()
+    try:
+        call()
+    except Exception as exc:  # noqa: BLE001 — a failed call is a data point, not a crash
+        return label, (time.perf_counter() - start) * 1000, str(exc)
+    return label, (time.perf_counter() - start) * 1000, None
+
+
+def _scenario_report(
+    outcomes: list[tuple[str, float, Optional[str]]],
+    wall_ms: float,
+    lookups: dict[str, int],
+    server_stats: dict[str, dict[str, int]],
+) -> dict[str, Any]:
+    ok = [ms for _, ms, err in outcomes if err is None]
+    by_tool: dict[str, list[float]] = defaultdict(list)
+    for label, ms, err in outcomes:
+        if err is None:
+            by_tool[label].append(ms)
+    endpoints: dict[str, dict[str, Any]] = {}
+    for ep in sorted(set(lookups) | set(server_stats)):
+        counters = server_stats.get(ep, {})
+        requests = counters.get("requests", 0)
+        n = lookups.get(ep, 0)
+        endpoints[ep] = {
+            "lookups": n,
+            "requests": requests,
+            # Retries can push requests above lookups; never report a negative hit ratio.
+            "hit_ratio": round(max(0.0, 1 - requests / n), 4) if n else None,
+            "bytes": counters.get("bytes", 0),
+            "failures": counters.get("failures", 0),
+        }
+    total_lookups = sum(e["lookups"] for e in endpoints.values())
+    total_requests = sum(e["requests"] for e in endpoints.values())
+    return {
+        "calls": len(outcomes),
+        "errors": sum(1 for _, _, err in outcomes if err is not None),
+        "wall_ms": round(wall_ms, 2),
+        "latency_ms": _latency(ok),
+        "by_tool": {tool: {"calls": len(s), **_latency(s)} for tool, s in sorted(by_tool.items())},
+        "endpoints": endpoints,
+        "totals": {
+            "lookups": total_lookups,
+            "requests": total_requests,
+            "hit_ratio": round(max(0.0, 1 - total_requests / total_lookups), 4) if total_lookups else None,
+            "bytes": sum(e["bytes"] for e in endpoints.values()),
+        },
+    }
+
+
+def run_benchmark(
+    server: srd_standin.StandinServer,
+    fixture: dict[str, Any],
+    *,
+    srd: Any = None,
+    workers: int = 8,
+    rounds: int = 3,
+    seed: int = 0,
+    scenarios: tuple[str, ...] = SCENARIOS,
+) -> dict[str, Any]:
+    """Run `scenarios` against a started stand-in; returns the report dict."""
+    if srd is None:
+        import srd5_2 as srd
+    report: dict[str, Any] = {
+        "server": {
+            "latency_ms": server.latency_ms, "jitter_ms": server.jitter_ms,
+            "fail_rate": server.fail_rate,
+        },
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="srd-bench-") as tmp, \
+            pointed_at(srd, server.url, Path(tmp)) as lookups:
+        workload = default_workload(srd, fixture)
+        report["workload_calls"] = len(workload)
+        for scenario in scenarios:
+            if scenario not in SCENARIOS:
+                raise ValueError(f"unknown scenario {scenario!r}; choose from {', '.join(SCENARIOS)}")
+            if scenario in ("cold", "disk_warm", "concurrent"):
+                srd._response_lru.clear()
+            if scenario in ("cold", "concurrent"):
+                srd._get_session().cache.clear()
+            lookups.clear()
+            server.reset_stats()
+            start = time.perf_counter()
+            if scenario == "concurrent":
+                jobs = workload * rounds
+                random.Random(seed).shuffle(jobs)
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="srd-bench") as pool:
+                    outcomes = list(pool.map(lambda job: _timed(*job), jobs))
+            else:
+                outcomes = [_timed(label, call) for label, call in workload]
+            wall_ms = (time.perf_counter() - start) * 1000
+            report["scenarios"][scenario] = _scenario_report(
+                outcomes, wall_ms, dict(lookups), server.stats(),
+            )
+    return report
+
+
+def default_stress_workers() -> tuple[int, ...]:
+    """1, 2, 4 and the MCP server's pool size (DND_MCP_MAX_WORKERS, default 8)."""
+    try:
+        pool = int(os.environ.get("DND_MCP_MAX_WORKERS", ""))
+    except ValueError:
+        pool = 8
+    return tuple(sorted({1, 2, 4, max(1, pool)}))
+
+
+def run_stress(
+    server: srd_standin.StandinServer,
+    fixture: dict[str, Any],
+    *,
+    srd: Any = None,
+    worker_counts: Optional[tuple[int, ...]] = None,
+    backends: tuple[str, ...] = STRESS_BACKENDS,
+    rounds: int = 3,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Cold-cache throughput per (backend, worker count); returns the report dict.
+
+    Every run gets a fresh cache directory so each starts from the same empty
+    SQLite file; `speedup` is relative to the backend's single-worker run."""
+    if srd is None:
+        import srd5_2 as srd
+    worker_counts = worker_counts or default_stress_workers()
+    report: dict[str, Any] = {
+        "server": {"latency_ms": server.latency_ms, "jitter_ms": server.jitter_ms},
+        "rounds": rounds,
+        "backends": {},
+    }
+    for backend in backends:
+        if backend not in STRESS_BACKENDS:
+            raise ValueError(f"unknown backend {backend!r}; choose from {', '.join(STRESS_BACKENDS)}")
+        runs: dict[int, dict[str, Any]] = {}
+        for workers in worker_counts:
+            with tempfile.TemporaryDirectory(prefix="srd-stress-") as tmp, \
+                    pointed_at(srd, server.url, Path(tmp)):
+                srd._CACHE_BACKEND = backend
+                jobs = default_workload(srd, fixture) * rounds
+                random.Random(seed).shuffle(jobs)
+                server.reset_stats()
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="srd-stress") as pool:
+                    outcomes = list(pool.map(lambda job: _timed(*job), jobs))
+                wall = time.perf_counter() - start
+            ok = [ms for _, ms, err in outcomes if err is None]
+            runs[workers] = {
+                "calls": len(outcomes),
+                "errors": sum(1 for _, _, err in outcomes if err is not None),
+                "wall_ms": round(wall * 1000, 2),
+                "calls_per_sec": round(len(outcomes) / wall, 1) if wall > 0 else None,
+                "requests": sum(c["requests"] for c in server.stats().values()),
+                "latency_ms": _latency(ok),
+            }
+        base = runs[min(runs)]["calls_per_sec"]
+        for run in runs.values():
+            run["speedup"] = round(run["calls_per_sec"] / base, 2) if base and run["calls_per_sec"] else None
+        report["backends"][backend] = runs
+    return report
+
+
+def format_stress_report(report: dict[str, Any]) -> str:
+    srv = report["server"]
+    lines = [
+        f"Open5e stand-in: latency {srv['latency_ms']:g}±{srv['jitter_ms']:g} ms; "
+        f"workload x{report['rounds']}, cold caches",
+    ]
+    for backend, runs in report["backends"].items():
+        lines += [
+            "",
+            f"== {backend}",
+            f"   {'workers':>7} {'calls':>6} {'errors':>6} {'wall ms':>9} {'calls/s':>9} "
+            f"{'speedup':>8} {'p95 ms':>8}",
+        ]
+        for workers, run in runs.items():
+            p95 = run["latency_ms"]["p95"]
+            lines.append(
+                f"   {workers:>7} {run['calls']:>6} {run['errors']:>6} {run['wall_ms']:>9.0f} "
+                f"{run['calls_per_sec'] or 0:>9.1f} {run['speedup'] or 0:>7.2f}x "
+                f"{'-' if p95 is None else f'{p95:.1f}':>8}"
+            )
+    return "\n".join(lines)
+
+
+def format_report(report: dict[str, Any]) -> str:
+    def ms(v: Optional[float]) -> str:
+        return "-" if v is None else f"{v:.1f}"
+
+    srv = report["server"]
+    lines = [
+        f"Open5e stand-in: latency {srv['latency_ms']:g}±{srv['jitter_ms']:g} ms, "
+        f"fail rate {srv['fail_rate']:g}; {report['workload_calls']} calls per pass",
+    ]
+    for name, sc in report["scenarios"].items():
+        lat, tot = sc["latency_ms"], sc["totals"]
+        hit = "-" if tot["hit_ratio"] is None else f"{tot['hit_ratio']:.0%}"
+        lines += [
+            "",
+            f"== {name}: {sc['calls']} calls, {sc['errors']} errors, {sc['wall_ms']:.0f} ms wall",
+            f"   latency ms  p50 {ms(lat['p50'])}  p95 {ms(lat['p95'])}  p99 {ms(lat['p99'])}  "
+            f"max {ms(lat['max'])}",
+            f"   cache hit {hit} ({tot['lookups']} lookups, {tot['requests']} requests, "
+            f"{tot['bytes']:,} bytes)",
+            f"   {'endpoint':<18} {'lookups':>8} {'requests':>9} {'hit':>6} {'bytes':>10}",
+        ]
+        for ep, e in sc["endpoints"].items():
+            ep_hit = "-" if e["hit_ratio"] is None else f"{e['hit_ratio']:.0%}"
+            lines.append(
+                f"   {ep:<18} {e['lookups']:>8} {e['requests']:>9} {ep_hit:>6} {e['bytes']:>10,}"
+            )
+        lines.append(f"   {'tool':<20} {'calls':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for tool, t in sc["by_tool"].items():
+            lines.append(
+                f"   {tool:<20} {t['calls']:>6} {ms(t['p50']):>8} {ms(t['p95']):>8} {ms(t['p99']):>8}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--fixture", type=Path, default=srd_standin.DEFAULT_FIXTURE)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="Fraction of requests answered 503 (the client retries them).")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, dest="scenarios")
+    parser.add_argument("--json", action="store_true", help="Print the raw report as JSON.")
+    parser.add_argument("--stress", action="store_true",
+                        help="Measure cold-cache throughput per worker count and cache backend.")
+    parser.add_argument("--stress-workers", default=None,
+                        help="Comma-separated worker counts (default 1,2,4,DND_MCP_MAX_WORKERS).")
+    parser.add_argument("--backend", action="append", choices=STRESS_BACKENDS, dest="backends")
+    args = parser.parse_args(argv)
+
+    fixture = srd_standin.load_fixture(args.fixture)
+    with srd_standin.StandinServer(
+        fixture, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        fail_rate=args.fail_rate, seed=args.seed,
+    ) as server:
+        if args.stress:
+            counts = tuple(int(n) for n in args.stress_workers.split(",")) if args.stress_workers else None
+            report = run_stress(
+                server, fixture, worker_counts=counts, rounds=args.rounds, seed=args.seed,
+                backends=tuple(args.backends or STRESS_BACKENDS),
+            )
+            print(json.dumps(report, indent=2) if args.json else format_stress_report(report))
+            return 0
+        report = run_benchmark(
+            server, fixture, workers=args.workers, rounds=args.rounds, seed=args.seed,
+            scenarios=tuple(args.scenarios or SCENARIOS),
+        )
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""Concurrency-safe requests_cache backend for scripts/srd5_2.py.
+
+requests_cache's stock SQLite backend shares one connection per file behind
+one lock, so when the MCP server's worker pool (DND_MCP_MAX_WORKERS) fires a
+burst of tool calls, every cache read queues behind every cache write and a
+long write can stall readers into "database is locked". This backend keeps
+the same on-disk table (`key`, `value`, `expires`) but:
+
+  - opens the file in WAL mode, so readers never block on the writer;
+  - gives each thread its own connection (no shared-connection lock on reads),
+    closed again when that thread exits;
+  - queues new responses in memory and commits them in batches from a single
+    writer thread (write-behind) — one transaction per batch instead of one
+    per response. Reads check the queue first, so a response is visible to
+    every thread the moment it is stored;
+  - optionally shards by endpoint: with `shards=("creatures", "spells")`,
+    responses for /v2/creatures/… and /v2/spells/… live in their own files
+    (`<name>.creatures.sqlite`, …), each with its own writer, so a burst of
+    creature fetches never contends with spell lookups. Routing uses a key
+    prefix, added by `shard_key_fn`, because requests_cache keys are hashes.
+
+`flush()` forces pending writes to disk; `close()` flushes and stops the
+writers. A crash can lose at most one batch window of responses — this is a
+cache, so the cost is a refetch.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+from requests_cache import BaseCache, create_key
+from requests_cache.backends.base import BaseStorage
+from requests_cache.serializers import pickle_serializer
+
+DEFAULT_SHARD = "default"
+# Write-behind tuning: commit at least this often, or sooner once this many
+# responses are queued.
+FLUSH_INTERVAL_SEC = 0.05
+BATCH_SIZE = 64
+BUSY_TIMEOUT_SEC = 30.0
+
+# Pending-queue marker for a delete that hasn't reached the file yet.
+_DELETED = object()
+
+
+def endpoint_shard(url: str) -> str:
+    """'https://api.open5e.com/v2/creatures/srd-2024_ogre/' → 'creatures'."""
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    return segments[1] if len(segments) >= 2 else DEFAULT_SHARD
+
+
+def shard_key_fn(shards: Iterable[str]):
+    """A requests_cache `key_fn` that prefixes the normal cache key with the
+    request's shard ('creatures:3f2a…'), or leaves it bare for unsharded
+    endpoints."""
+    wanted = frozenset(shards)
+
+    def key_fn(request: Any, **kwargs: Any) -> str:
+        key = create_key(request, **kwargs)
+        shard = endpoint_shard(request.url)
+        return f"{shard}:{key}" if shard in wanted else key
+
+    return key_fn
+
+
+class _ConnectionHolder:
+    """Owns one thread's connection; closes it when the thread's locals are
+    released (thread exit) or on `close()`, whichever comes first."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.close = weakref.finalize(self, conn.close)
+
+
+class ConcurrentSQLiteDict(BaseStorage):
+    """One SQLite table: WAL, a connection per thread, batched write-behind."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        table_name: str = "responses",
+        serializer: Any = pickle_serializer,
+        flush_interval: float = FLUSH_INTERVAL_SEC,
+        batch_size: int = BATCH_SIZE,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(serializer=serializer, **kwargs)
+        self.db_path = Path(db_path)
+        self.table_name = table_name
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._local = threading.local()
+        # One `_ConnectionHolder` per live thread; a holder dies with its
+        # thread's locals and its finalizer closes the connection, so worker
+        # churn doesn't pile up open WAL handles until `close()`.
+        self._holders: weakref.WeakSet[_ConnectionHolder] = weakref.WeakSet()
+        self._conn_lock = threading.Lock()
+        # `_pending` (queued) and `_inflight` (being committed) are guarded by
+        # `_cond`; readers check both so a stored response never "disappears"
+        # mid-commit. `_write_lock` orders batches so an older batch can never
+        # land on top of a newer one.
+        self._pending: dict[str, Any] = {}
+        self._inflight: dict[str, Any] = {}
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        self.batches_written = 0
+        self.rows_written = 0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} "
+                "(key TEXT PRIMARY KEY, value BLOB, expires INTEGER)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table_name}_expires_idx "
+                f"ON {self.table_name}(expires)"
+            )
+
+    # ─────────── connections ───────────
+
+    def _connection(self) -> sqlite3.Connection:
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = sqlite3.connect(
+                str(self.db_path), timeout=BUSY_TIMEOUT_SEC,
+                isolation_level=None, check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            holder = _ConnectionHolder(conn)
+            self._local.holder = holder
+            with self._conn_lock:
+                self._holders.add(holder)
+        return holder.conn
+
+    # ─────────── write-behind ───────────
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None:
+            with self._conn_lock:
+                if self._writer is None and not self._closed:
+                    self._writer = threading.Thread(
+                        target=self._writer_loop, name=f"srd-cache-{self.db_path.stem}", daemon=True,
+                    )
+                    self._writer.start()
+
+    def _enqueue(self, key: str, entry: Any) -> None:
+        with self._cond:
+            # A background fetch finishing after the session closed: drop the
+            # write rather than reopen a file that may already be gone.
+            if self._closed:
+                return
+            self._pending[key] = entry
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+        self._ensure_writer()
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.batch_size,
+                    self.flush_interval,
+                )
+                stop = self._closed
+            self.flush()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Write every queued response / delete in one transaction."""
+        with self._write_lock:
+            with self._cond:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return
+            upserts = [(k, *v) for k, v in batch.items() if v is not _DELETED]
+            deletes = [(k,) for k, v in batch.items() if v is _DELETED]
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if upserts:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {self.table_name} (key, value, expires) VALUES (?, ?, ?)",
+                        upserts,
+                    )
+                if deletes:
+                    conn.executemany(f"DELETE FROM {self.table_name} WHERE key = ?", deletes)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                # Put the batch back (behind anything newer) so nothing is lost.
+                with self._cond:
+                    self._pending = {**batch, **self._pending}
+                    self._inflight = {}
+                raise
+            conn.execute("COMMIT")
+            with self._cond:
+                self._inflight = {}
+            self.batches_written += 1
+            self.rows_written += len(batch)
+
+    # ─────────── mapping interface ───────────
+
+    def __getitem__(self, key: str) -> Any:
+        with self._cond:
+            pending = self._pending.get(key, self._inflight.get(key))
+        if pending is _DELETED:
+            raise KeyError(key)
+        if pending is not None:
+            return self.deserialize(key, pending[0])
+        row = self._connection().execute(
+            f"SELECT value FROM {self.table_name} WHERE key = ?", (key,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self.deserialize(key, row[0])
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        expires = getattr(value, "expires_unix", None)
+        blob = self.serialize(value)
+        if isinstance(blob, bytes):
+            blob = sqlite3.Binary(blob)
+        self._enqueue(key, (blob, expires))
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._enqueue(key, _DELETED)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        self.flush()
+        rows = self._connection().execute(f"SELECT key FROM {self.table_name}").fetchall()
+        return iter([r[0] for r in rows])
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._connection().execute(f"SELECT COUNT(key) FROM {self.table_name}").fetchone()[0]
+
+    def bulk_delete(self, keys: Iterable[str]) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            for key in keys:
+                self._pending[key] = _DELETED
+        self._ensure_writer()
+
+    def clear(self) -> None:
+        with self._write_lock:
+            with self._cond:
+                self._pending = {}
+                self._inflight = {}
+            self._connection().execute(f"DELETE FROM {self.table_name}")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        with self._conn_lock:
+            writer = self._writer
+        if writer is not None:
+            writer.join(5)
+        self.flush()
+        with self._conn_lock:
+            holders = list(self._holders)
+            self._holders.clear()
+        for holder in holders:
+            holder.close()
+        self._local = threading.local()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            pending = len(self._pending)
+        with self._conn_lock:
+            connections = len(self._holders)
+        return {
+            "path": str(self.db_path), "pending": pending, "connections": connections,
+            "batches_written": self.batches_written, "rows_written": self.rows_written,
+        }
+
+
+class _ShardedDict(BaseStorage):
+    """Routes `<shard>:<hash>` keys to one ConcurrentSQLiteDict per shard."""
+
+    def __init__(self, stores: dict[str, ConcurrentSQLiteDict]) -> None:
+        super().__init__(serializer=None)
+        self.stores = stores
+        self.serializer = stores[DEFAULT_SHARD].serializer
+
+    def _store(self, key: str) -> ConcurrentSQLiteDict:
+        prefix, sep, _ = key.partition(":")
+        return self.stores.get(prefix, self.stores[DEFAULT_SHARD]) if sep else self.stores[DEFAULT_SHARD]
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store(key)[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._store(key)[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._store(key)[key]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key in self._store(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for store in self.stores.values():
+            yield from store
+
+    def __len__(self) -> int:
+        return sum(len(s) for s in self.stores.values())
+
+    def bulk_delete(self, keys: Iterable[str]) -> None:
+        by_store: dict[int, list[str]] = {}
+        for key in keys:
+            by_store.setdefault(id(self._store(key)), []).append(key)
+        for store in self.stores.values():
+            if id(store) in by_store:
+                store.bulk_delete(by_store[id(store)])
+
+    def flush(self) -> None:
+        for store in self.stores.values():
+            store.flush()
+
+    def clear(self) -> None:
+        for store in self.stores.values():
+            store.clear()
+
+    def close(self) -> None:
+        for store in self.stores.values():
+            store.close()
+
+
+class ConcurrentSQLiteCache(BaseCache):
+    """requests_cache backend built on ConcurrentSQLiteDict.
+
+    `db_path` is the main file ('…/srd5_2_v2.sqlite'); each name in `shards`
+    gets a sibling file ('…/srd5_2_v2.creatures.sqlite'). Sharding only takes
+    effect when the session also uses `shard_key_fn(shards)`."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        shards: Iterable[str] = (),
+        flush_interval: float = FLUSH_INTERVAL_SEC,
+        batch_size: int = BATCH_SIZE,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(cache_name=str(db_path), **kwargs)
+        path = Path(db_path)
+        if path.suffix != ".sqlite":
+            path = path.with_name(path.name + ".sqlite")
+        self._path = path
+        tuning = {"flush_interval": flush_interval, "batch_size": batch_size}
+        stores = {DEFAULT_SHARD: ConcurrentSQLiteDict(path, "responses", **tuning)}
+        for shard in dict.fromkeys(shards):
+            if shard != DEFAULT_SHARD:
+                stores[shard] = ConcurrentSQLiteDict(
+                    path.with_name(f"{path.stem}.{shard}.sqlite"), "responses", **tuning,
+                )
+        self.responses = _ShardedDict(stores) if len(stores) > 1 else stores[DEFAULT_SHARD]
+        self.redirects = ConcurrentSQLiteDict(path, "redirects", serializer=None, **tuning)
+
+    @property
+    def db_path(self) -> Path:
+        return self._path
+
+    def flush(self) -> None:
+        self.responses.flush()
+        self.redirects.flush()
+
+    def stats(self) -> dict[str, Any]:
+        stores = self.responses.stores if isinstance(self.responses, _ShardedDict) else {
+            DEFAULT_SHARD: self.responses,
+        }
+        return {name: store.stats() for name, store in stores.items()}
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""Columnar in-memory index of creature stat blocks (NumPy).
+
+`search_monsters` filters server-side, one HTTP round trip per query, and some
+filterable fields (ability scores — quirk #4 in srd5_2) never come back on list
+pages. Encounter building asks dozens of "every CR 2-4 undead" questions in a
+row, so this module loads every creature once — from the offline mirror's
+detail records when synced, otherwise from one streamed pass over the live
+list — into parallel NumPy columns and answers filters as vectorized masks.
+
+Columns (one row per creature, row order = mirror/API order):
+  cr, xp                     float64 / int64
+  ac, hp, passive_perception float64 (NaN when the record lacks the field)
+  abilities                  float64 (n, 6) in ABILITIES order, NaN if missing
+  speed                      float64 (n, 5) in SPEED_KINDS order, 0 if absent
+  type, size, document       int32 codes into sorted label tables
+  name                       lower-cased unicode array for substring matching
+
+Missing numeric fields are NaN so any range filter on them excludes the row
+rather than guessing.
+
+The index is rebuilt only when the mirror's /v2/creatures/ `synced_at` stamp
+changes; a live-built index lives for the process. Paging the live list takes
+a while, so in-process tool handlers ask for it in the background and tell
+the caller to retry rather than hold a worker thread for the whole pull.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from fractions import Fraction
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+import srd_mirror
+
+ENDPOINT = "/v2/creatures/"
+
+ABILITIES = ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")
+SPEED_KINDS = ("walk", "fly", "swim", "climb", "burrow")
+DIFFICULTIES = ("low", "moderate", "high")
+
+# XP by challenge rating (2024 Monster Manual / SRD 5.2).
+CR_XP: dict[float, int] = {
+    0: 10, 0.125: 25, 0.25: 50, 0.5: 100,
+    1: 200, 2: 450, 3: 700, 4: 1100, 5: 1800, 6: 2300, 7: 2900, 8: 3900,
+    9: 5000, 10: 5900, 11: 7200, 12: 8400, 13: 10000, 14: 11500, 15: 13000,
+    16: 15000, 17: 18000, 18: 20000, 19: 22000, 20: 25000, 21: 33000,
+    22: 41000, 23: 50000, 24: 62000, 25: 75000, 26: 90000, 27: 105000,
+    28: 120000, 29: 135000, 30: 155000,
+}
+
+# XP budget per character by level: (low, moderate, high) — 2024 DMG. The
+# party's budget is the sum over characters; monster XP is not multiplied.
+XP_BUDGET: dict[int, tuple[int, int, int]] = {
+    1: (50, 75, 100), 2: (100, 150, 200), 3: (150, 225, 400), 4: (250, 375, 500),
+    5: (500, 750, 1100), 6: (600, 1000, 1400), 7: (750, 1300, 1700),
+    8: (1000, 1700, 2100), 9: (1300, 2000, 2600), 10: (1600, 2300, 3100),
+    11: (1900, 2900, 4100), 12: (2200, 3700, 4700), 13: (2600, 4200, 5400),
+    14: (2900, 4900, 6200), 15: (3300, 5400, 7800), 16: (3800, 6100, 9800),
+    17: (4500, 7200, 11700), 18: (5000, 8700, 14200), 19: (5500, 10700, 17200),
+    20: (6400, 13200, 22000),
+}
+
+# Upper bounds for encounter enumeration — keeps the (combos x counts) grid to
+# a few million cells even with every CR in play.
+MAX_GROUPS = 3
+MAX_CREATURES = 20
+# Rows of CR combinations scored per vectorized step.
+_COMBO_CHUNK = 2048
+
+
+def cr_label(cr: float) -> str:
+    """0.25 → '1/4', 3.0 → '3'."""
+    if cr is None or np.isnan(cr):
+        return "?"
+    return str(Fraction(cr).limit_denominator(8))
+
+
+def party_budget(level: int, size: int) -> dict[str, int]:
+    """{'low': .., 'moderate': .., 'high': ..} XP for `size` characters of `level`."""
+    if level not in XP_BUDGET:
+        raise ValueError(f"party_level must be 1-20, got {level}")
+    if size < 1:
+        raise ValueError(f"party_size must be at least 1, got {size}")
+    return {d: XP_BUDGET[level][i] * size for i, d in enumerate(DIFFICULTIES)}
+
+
+def _label(value: Any) -> str:
+    """FK fields come back as {key, name} objects or bare strings."""
+    if isinstance(value, dict):
+        value = value.get("key") or value.get("name")
+    return str(value or "").strip().lower()
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _cr_of(record: dict[str, Any]) -> float:
+    cr = _number(record.get("challenge_rating_decimal"))
+    if np.isnan(cr):
+        raw = record.get("challenge_rating")
+        try:
+            cr = float(Fraction(str(raw).strip()))
+        except (TypeError, ValueError, ZeroDivisionError):
+            cr = np.nan
+    return cr
+
+
+def _codes(values: list[str]) -> tuple[np.ndarray, tuple[str, ...]]:
+    labels, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+    return codes.astype(np.int32), tuple(str(x) for x in labels)
+
+
+class CreatureIndex:
+    """Parallel NumPy columns over a list of creature records."""
+
+    def __init__(self, rows: Iterable[dict[str, Any]]):
+        self.records: list[dict[str, Any]] = [r for r in rows if isinstance(r, dict)]
+        n = len(self.records)
+        self.keys = np.array([str(r.get("key") or "") for r in self.records], dtype=object)
+        self.names = np.array([str(r.get("name") or "") for r in self.records], dtype=object)
+        self._names_lower = np.array([s.casefold() for s in self.names], dtype=str)
+        self.cr = np.array([_cr_of(r) for r in self.records], dtype=np.float64)
+        xp = [_number(r.get("experience_points")) for r in self.records]
+        self.xp = np.array([
+            int(x) if not np.isnan(x) else CR_XP.get(float(c), 0)
+            for x, c in zip(xp, self.cr)
+        ], dtype=np.int64)
+        self.ac = np.array([_number(r.get("armor_class")) for r in self.records], dtype=np.float64)
+        self.hp = np.array([_number(r.get("hit_points")) for r in self.records], dtype=np.float64)
+        self.passive_perception = np.array(
+            [_number(r.get("passive_perception")) for r in self.records], dtype=np.float64,
+        )
+        self.abilities = np.full((n, len(ABILITIES)), np.nan)
+        self.speed = np.zeros((n, len(SPEED_KINDS)))
+        for i, r in enumerate(self.records):
+            scores = r.get("ability_scores")
+            if isinstance(scores, dict):
+                self.abilities[i] = [_number(scores.get(ab)) for ab in ABILITIES]
+            speed = r.get("speed")
+            if isinstance(speed, dict):
+                self.speed[i] = [np.nan_to_num(_number(speed.get(k))) for k in SPEED_KINDS]
+        self.type, self.type_labels = _codes([_label(r.get("type")) for r in self.records])
+        self.size, self.size_labels = _codes([_label(r.get("size")) for r in self.records])
+        self.document, self.document_labels = _codes([_label(r.get("document")) for r in self.records])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _code_mask(self, column: np.ndarray, labels: tuple[str, ...], wanted: Iterable[str]) -> np.ndarray:
+        codes = [labels.index(w) for w in (s.strip().lower() for s in wanted) if w in labels]
+        return np.isin(column, codes)
+
+    def mask(
+        self,
+        *,
+        name: Optional[str] = None,
+        cr_min: Optional[float] = None,
+        cr_max: Optional[float] = None,
+        types: Optional[Iterable[str]] = None,
+        sizes: Optional[Iterable[str]] = None,
+        document_keys: Optional[Iterable[str]] = None,
+        ac_min: Optional[float] = None,
+        ac_max: Optional[float] = None,
+        hp_min: Optional[float] = None,
+        hp_max: Optional[float] = None,
+        passive_perception_min: Optional[float] = None,
+        passive_perception_max: Optional[float] = None,
+        abilities: Optional[dict[str, tuple[Optional[float], Optional[float]]]] = None,
+        speed_min: Optional[dict[str, float]] = None,
+    ) -> np.ndarray:
+        """Boolean row mask for the given filters (all inclusive, AND-ed)."""
+        m = np.ones(len(self), dtype=bool)
+        if name:
+            m &= np.char.find(self._names_lower, name.strip().casefold()) >= 0
+        for column, lo, hi in (
+            (self.cr, cr_min, cr_max),
+            (self.ac, ac_min, ac_max),
+            (self.hp, hp_min, hp_max),
+            (self.passive_perception, passive_perception_min, passive_perception_max),
+        ):
+            if lo is not None:
+                m &= column >= lo
+            if hi is not None:
+                m &= column <= hi
+        if types:
+            m &= self._code_mask(self.type, self.type_labels, types)
+        if sizes:
+            m &= self._code_mask(self.size, self.size_labels, sizes)
+        if document_keys:
+            m &= np.isin(self.document, [
+                self.document_labels.index(d) for d in document_keys if d in self.document_labels
+            ])
+        for ab, (lo, hi) in (abilities or {}).items():
+            column = self.abilities[:, ABILITIES.index(ab)]
+            if lo is not None:
+                m &= column >= lo
+            if hi is not None:
+                m &= column <= hi
+        for kind, lo in (speed_min or {}).items():
+            m &= self.speed[:, SPEED_KINDS.index(kind)] >= lo
+        return m
+
+    def ranked(
+        self,
+        mask: np.ndarray,
+        *,
+        prefer: tuple[str, ...] = (),
+        demote: tuple[str, ...] = (),
+        dedupe: bool = True,
+    ) -> np.ndarray:
+        """Row indices under `mask`, source-priority sorted (same 3-tier rule as
+        srd5_2._rank_by_spec) and optionally collapsed to one row per name."""
+        rows = np.flatnonzero(mask)
+        if prefer or demote:
+            tier = np.ones(len(self.document_labels), dtype=np.int64) * 1000
+            for i, d in enumerate(prefer):
+                if d in self.document_labels:
+                    tier[self.document_labels.index(d)] = i
+            for i, d in enumerate(demote):
+                if d in self.document_labels:
+                    tier[self.document_labels.index(d)] = 2000 + i
+            rows = rows[np.argsort(tier[self.document[rows]], kind="stable")]
+        if dedupe and len(rows):
+            _, first = np.unique(self._names_lower[rows], return_index=True)
+            rows = rows[np.sort(first)]
+        return rows
+
+    def summary(self, row: int) -> dict[str, Any]:
+        """Compact stat line for tool output and list widgets."""
+        return {
+            "key": self.keys[row],
+            "name": self.names[row],
+            "document": self.document_labels[self.document[row]],
+            "cr": cr_label(self.cr[row]),
+            "xp": int(self.xp[row]),
+            "type": self.type_labels[self.type[row]],
+            "size": self.size_labels[self.size[row]],
+            "armor_class": None if np.isnan(self.ac[row]) else int(self.ac[row]),
+            "hit_points": None if np.isnan(self.hp[row]) else int(self.hp[row]),
+        }
+
+
+_count_grids: dict[tuple[int, int], np.ndarray] = {}
+
+
+def _count_grid(groups: int, max_creatures: int) -> np.ndarray:
+    """(K, groups) array of every per-group count tuple (each >= 1) whose
+    total stays within max_creatures."""
+    grid = _count_grids.get((groups, max_creatures))
+    if grid is None:
+        grid = np.array([
+            c for c in itertools.product(range(1, max_creatures + 1), repeat=groups)
+            if sum(c) <= max_creatures
+        ], dtype=np.int64).reshape(-1, groups)
+        _count_grids[(groups, max_creatures)] = grid
+    return grid
+
+
+def compositions(
+    xp_values: Iterable[int],
+    min_xp: int,
+    max_xp: int,
+    *,
+    max_groups: int = MAX_GROUPS,
+    max_creatures: int = 8,
+    limit: int = 10,
+) -> list[dict[str, Any]]:
+    """Every way to pick up to `max_groups` distinct XP values (one per CR) with
+    per-group counts totalling <= `max_creatures` creatures and XP within
+    [min_xp, max_xp]. Best `limit` are returned — closest to max_xp first, then
+    fewer creatures, then fewer groups.
+
+    Each group's (CR combo x count) grid is scored as one matrix product, so a
+    full 34-CR sweep is a handful of small NumPy ops rather than a Python loop
+    over millions of candidates.
+    """
+    max_groups = max(1, min(int(max_groups), MAX_GROUPS))
+    max_creatures = max(1, min(int(max_creatures), MAX_CREATURES))
+    values = np.unique(np.array([v for v in xp_values if 0 < v <= max_xp], dtype=np.int64))
+    found_total: list[np.ndarray] = []
+    found_size: list[np.ndarray] = []
+    found_groups: list[tuple[np.ndarray, np.ndarray]] = []
+    for g in range(1, min(max_groups, len(values)) + 1):
+        counts = _count_grid(g, max_creatures)
+        combos = np.array(list(itertools.combinations(range(len(values)), g)), dtype=np.intp)
+        for start in range(0, len(combos), _COMBO_CHUNK):
+            chunk = combos[start:start + _COMBO_CHUNK]
+            totals = values[chunk] @ counts.T
+            ci, ki = np.nonzero((totals >= min_xp) & (totals <= max_xp))
+            if not len(ci):
+                continue
+            found_total.append(totals[ci, ki])
+            found_size.append(counts[ki].sum(axis=1))
+            found_groups.append((values[chunk[ci]], counts[ki]))
+    if not found_total:
+        return []
+    total = np.concatenate(found_total)
+    size = np.concatenate(found_size)
+    n_groups = np.concatenate([np.full(len(v), v.shape[1]) for v, _ in found_groups])
+    order = np.lexsort((n_groups, size, max_xp - total))[:limit]
+    # Map flat positions back to their (values, counts) block.
+    offsets = np.cumsum([0] + [len(v) for v, _ in found_groups])
+    out: list[dict[str, Any]] = []
+    for pos in order:
+        block = int(np.searchsorted(offsets, pos, side="right") - 1)
+        vals, cnts = found_groups[block]
+        j = pos - offsets[block]
+        out.append({
+            "total_xp": int(total[pos]),
+            "creature_count": int(size[pos]),
+            "groups": [(int(v), int(c)) for v, c in zip(vals[j], cnts[j])],
+        })
+    return out
+
+
+# --- Shared instance ----------------------------------------------------------
+
+_lock = threading.Lock()
+_index: Optional[CreatureIndex] = None
+# Mirror stamp the index was built from; "live" for an API-built index.
+_index_stamp: Any = None
+# Background live build (see get_index(background=True)) and why the last one
+# failed, if it did.
+_builder: Optional[threading.Thread] = None
+_build_error: Optional[str] = None
+
+
+def get_index(
+    live_rows: Optional[Callable[[], Iterable[dict[str, Any]]]] = None,
+    *,
+    background: bool = False,
+) -> Optional[CreatureIndex]:
+    """The shared index. Built from the mirror when /v2/creatures/ is synced
+    (rebuilt whenever it is re-synced); otherwise from `live_rows()` once per
+    process. With `background`, a live build runs on a daemon thread instead
+    and this returns None until it has finished. Returns None when neither
+    source is available."""
+    global _index, _index_stamp
+    stamp = srd_mirror.sync_stamps().get(ENDPOINT)
+    with _lock:
+        if _index is not None and (_index_stamp == stamp or (stamp is None and _index_stamp == "live")):
+            return _index
+    if stamp is not None:
+        index, new_stamp = CreatureIndex(srd_mirror.endpoint_rows(ENDPOINT)), stamp
+    elif live_rows is not None and background:
+        _start_live_build(live_rows)
+        return None
+    elif live_rows is not None:
+        index, new_stamp = CreatureIndex(live_rows()), "live"
+    else:
+        return None
+    with _lock:
+        _index, _index_stamp = index, new_stamp
+    return index
+
+
+def _start_live_build(live_rows: Callable[[], Iterable[dict[str, Any]]]) -> None:
+    global _builder
+    with _lock:
+        if _builder is not None and _builder.is_alive():
+            return
+        _builder = threading.Thread(target=_build_live, args=(live_rows,), name="srd-creature-index", daemon=True)
+        _builder.start()
+
+
+def _build_live(live_rows: Callable[[], Iterable[dict[str, Any]]]) -> None:
+    global _index, _index_stamp, _build_error
+    try:
+        index = CreatureIndex(live_rows())
+    except Exception as exc:  # noqa: BLE001 — reported by build_status(); the next call retries
+        with _lock:
+            _build_error = str(exc)
+        return
+    with _lock:
+        _index, _index_stamp, _build_error = index, "live", None
+
+
+def build_status() -> dict[str, Any]:
+    """Whether a background live build is running, and the last one's error."""
+    with _lock:
+        return {"building": _builder is not None and _builder.is_alive(), "error": _build_error}
+
+
+def reset() -> None:
+    """Drop the shared index (tests; or after switching mirror paths)."""
+    global _index, _index_stamp, _build_error
+    with _lock:
+        _index = None
+        _index_stamp = None
+        _build_error = None
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""Offline mirror of the Open5e v2 API (SQLite) for scripts/srd5_2.py.
+
+`python scripts/srd5_2.py mirror sync` pages every list endpoint srd5_2 knows
+about (its `_ENDPOINT_NAME_FORMS` map) into one normalized SQLite file:
+
+    records(endpoint, key, name, document_key, position, body)
+    endpoints(endpoint, count, synced_at, detailed)
+
+`body` is the raw JSON record exactly as Open5e returned it; the other columns
+are lifted out for lookups and the status report. `position` preserves the
+API's own list order so a mirrored list comes back in the same order the live
+endpoint would have used.
+
+With offline mode on (DND_SRD_OFFLINE=1, or srd5_2.set_offline_mode(True)),
+srd5_2._api_get routes here instead of the network. `resolve()` emulates the
+parts of Open5e's Django-filter surface that srd5_2 actually sends — lookups
+(`__icontains`, `__iexact`, `__contains`, `__in`, `__gte`/`__lte`/`__gt`/`__lt`,
+`__isnull`), nested FK paths (`document__key__in`, `school__key`,
+`classes__key__in`), `limit`/`page`, `ordering`, `fields`/`exclude` — and
+deliberately reproduces the quirks srd5_2 is written against:
+
+  - `?search=` is dropped (quirk #1).
+  - A `name` filter form is only honored if it is the endpoint's working form
+    in the name-form map; every other form is silently dropped, exactly as the
+    live filterset drops it (quirk #2). That keeps `_search_endpoint`'s
+    client-side name filter load-bearing offline too.
+  - A bare FK filter (`type`, `size`, `rarity`, `category`) compares against
+    the nested object's `key` (quirk #3).
+
+Filters against fields that only exist on detail responses (quirk #4 —
+ability scores, saves, skills on creatures) work when the endpoint was synced
+with details; `sync` fetches per-record details for DETAIL_ENDPOINTS by default.
+
+Stdlib only. srd5_2 hands in its network fetcher and name-form map, so this
+module never imports srd5_2 (no import cycle, and tests can drive it with fakes).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_DEFAULT_PATH = _REPO_ROOT / ".cache" / "srd5_2_mirror.sqlite"
+
+# Endpoints whose list responses strip fields that the filterset still honors
+# (module quirk #4 in srd5_2). Syncing these also pulls every detail record so
+# offline filters on e.g. ability_score_strength behave like the live API.
+DETAIL_ENDPOINTS: tuple[str, ...] = ("/v2/creatures/",)
+
+# Open5e's default page size when no `limit` is sent.
+_DEFAULT_PAGE_SIZE = 50
+# Page size used while syncing. Large pages keep the sync to a handful of
+# round-trips per endpoint; Open5e serves up to this without complaint.
+_SYNC_PAGE_SIZE = 500
+
+_LOOKUPS = frozenset({
+    "exact", "iexact", "contains", "icontains", "in",
+    "gt", "gte", "lt", "lte", "isnull",
+})
+
+# Filter names whose response field is spelled differently (quirk #4). Each
+# alias is a `__`-path tried when the literal field is absent from the record.
+_FIELD_ALIASES: dict[str, dict[str, tuple[str, ...]]] = {
+    "/v2/creatures/": {
+        "challenge_rating": ("challenge_rating_decimal",),
+        "passive_perception": ("perception",),
+        **{
+            f"ability_score_{ab}": (f"ability_scores__{ab}",)
+            for ab in ("strength", "dexterity", "constitution",
+                       "intelligence", "wisdom", "charisma")
+        },
+    },
+}
+# `saving_throw_<ability>` / `skill_bonus_<skill>` (has_saves / has_skills) map
+# onto the nested dicts the detail response carries.
+_PREFIX_ALIASES: dict[str, tuple[tuple[str, str], ...]] = {
+    "/v2/creatures/": (
+        ("saving_throw_", "saving_throws__"),
+        ("skill_bonus_", "skill_bonuses__"),
+    ),
+}
+
+# Params that control paging/shape rather than filtering.
+_CONTROL_PARAMS = frozenset({"limit", "page", "offset", "ordering", "fields", "exclude", "format", "depth"})
+
+
+class MirrorMiss(LookupError):
+    """The mirror has no answer for this request (endpoint never synced, key
+    absent, or an endpoint shape the mirror does not model)."""
+
+
+# --- Storage -------------------------------------------------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    endpoint     TEXT NOT NULL,
+    key          TEXT NOT NULL,
+    name         TEXT,
+    document_key TEXT,
+    position     INTEGER NOT NULL,
+    body         TEXT NOT NULL,
+    PRIMARY KEY (endpoint, key)
+);
+CREATE INDEX IF NOT EXISTS records_name ON records (endpoint, name);
+CREATE TABLE IF NOT EXISTS endpoints (
+    endpoint  TEXT PRIMARY KEY,
+    count     INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    detailed  INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def mirror_path() -> Path:
+    """Override-able for tests via DND_SRD_MIRROR_PATH env var."""
+    return Path(os.environ.get("DND_SRD_MIRROR_PATH", str(_DEFAULT_PATH)))
+
+
+def _connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    p = path or mirror_path()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p), timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _doc_key(record: dict[str, Any]) -> str:
+    doc = record.get("document")
+    if isinstance(doc, dict):
+        return str(doc.get("key") or "")
+    return str(doc or "")
+
+
+def _store_endpoint(
+    conn: sqlite3.Connection, endpoint: str, records: list[dict[str, Any]], detailed: bool,
+) -> None:
+    """Replace every row for `endpoint` in one transaction, so a half-finished
+    sync never leaves a mixed old/new endpoint behind."""
+    with conn:
+        conn.execute("DELETE FROM records WHERE endpoint = ?", (endpoint,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO records (endpoint, key, name, document_key, position, body) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    endpoint,
+                    str(r.get("key") or r.get("url") or i),
+                    r.get("name"),
+                    _doc_key(r),
+                    i,
+                    json.dumps(r, ensure_ascii=False, separators=(",", ":")),
+                )
+                for i, r in enumerate(records)
+            ],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO endpoints (endpoint, count, synced_at, detailed) VALUES (?, ?, ?, ?)",
+            (endpoint, len(records), time.time(), int(detailed)),
+        )
+
+
+# Decoded rows per endpoint, reused until that endpoint is re-synced (its
+# `synced_at` stamp changes). Decoding ~3k creature bodies per query would
+# otherwise dominate offline latency.
+_rows_lock = threading.Lock()
+_rows_cache: dict[tuple[str, str], tuple[float, list[dict[str, Any]]]] = {}
+
+
+def endpoint_rows(endpoint: str) -> list[dict[str, Any]]:
+    path = mirror_path()
+    if not path.exists():
+        raise MirrorMiss(f"no SRD mirror at {path}")
+    conn = _connect(path)
+    try:
+        row = conn.execute(
+            "SELECT synced_at FROM endpoints WHERE endpoint = ?", (endpoint,),
+        ).fetchone()
+        if row is None:
+            raise MirrorMiss(f"{endpoint} was never synced into the mirror")
+        stamp = row[0]
+        cache_key = (str(path), endpoint)
+        with _rows_lock:
+            cached = _rows_cache.get(cache_key)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+        bodies = conn.execute(
+            "SELECT body FROM records WHERE endpoint = ? ORDER BY position", (endpoint,),
+        ).fetchall()
+    finally:
+        conn.close()
+    rows = [json.loads(b[0]) for b in bodies]
+    with _rows_lock:
+        _rows_cache[cache_key] = (stamp, rows)
+    return rows
+
+
+def status() -> dict[str, Any]:
+    """Per-endpoint record counts and sync times, for the MCP status tool."""
+    path = mirror_path()
+    if not path.exists():
+        return {"path": str(path), "exists": False, "endpoints": {}}
+    conn = _connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT endpoint, count, synced_at, detailed FROM endpoints ORDER BY endpoint"
+        ).fetchall()
+    finally:
+        conn.close()
+    return {
+        "path": str(path),
+        "exists": True,
+        "endpoints": {
+            ep: {
+                "count": count,
+                "synced_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(ts)),
+                "detailed": bool(detailed),
+            }
+            for ep, count, ts, detailed in rows
+        },
+    }
+
+
+def sync_stamps() -> dict[str, float]:
+    """{endpoint: synced_at} — changes whenever an endpoint is re-synced, so
+    derived structures (the local search index) know what to rebuild."""
+    path = mirror_path()
+    if not path.exists():
+        return {}
+    conn = _connect(path)
+    try:
+        return dict(conn.execute("SELECT endpoint, synced_at FROM endpoints"))
+    finally:
+        conn.close()
+
+
+def synced_endpoints() -> set[str]:
+    path = mirror_path()
+    if not path.exists():
+        return set()
+    conn = _connect(path)
+    try:
+        return {r[0] for r in conn.execute("SELECT endpoint FROM endpoints")}
+    finally:
+        conn.close()
+
+
+# --- Sync ----------------------------------------------------------------------
+
+def split_next_url(next_url: str) -> tuple[str, dict[str, str]]:
+    """Turn an absolute Open5e `next` link into (endpoint, params) for the
+    caller's (endpoint, params)-shaped fetcher."""
+    parts = urlsplit(next_url)
+    return parts.path, dict(parse_qsl(parts.query, keep_blank_values=True))
+
+
+def _fetch_all(
+    fetch: Callable[[str, dict[str, Any]], dict[str, Any]], endpoint: str,
+) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    page_endpoint, params = endpoint, {"limit": _SYNC_PAGE_SIZE}
+    while True:
+        response = fetch(page_endpoint, params)
+        results = response.get("results") if isinstance(response, dict) else None
+        if not isinstance(results, list):
+            raise ValueError(f"{endpoint} did not return a paginated list")
+        records.extend(r for r in results if isinstance(r, dict))
+        next_url = response.get("next")
+        if not next_url:
+            return records
+        page_endpoint, params = split_next_url(next_url)
+
+
+def sync(
+    fetch: Callable[[str, dict[str, Any]], dict[str, Any]],
+    endpoints: Iterable[str],
+    *,
+    details: bool = True,
+    log: Callable[[str], None] = lambda msg: None,
+) -> dict[str, int]:
+    """Page every endpoint through `fetch` into the mirror. Returns
+    {endpoint: record_count}. An endpoint that fails is reported via `log` and
+    left as it was; the rest of the sync carries on."""
+    synced: dict[str, int] = {}
+    conn = _connect()
+    try:
+        for endpoint in endpoints:
+            try:
+                records = _fetch_all(fetch, endpoint)
+                detailed = details and endpoint in DETAIL_ENDPOINTS
+                if detailed:
+                    enriched = []
+                    for n, rec in enumerate(records, 1):
+                        key = rec.get("key")
+                        enriched.append(fetch(f"{endpoint}{key}/", {}) if key else rec)
+                        if n % 250 == 0:
+                            log(f"  {endpoint}: {n}/{len(records)} details")
+                    records = enriched
+            except ValueError as exc:
+                log(f"! {endpoint}: {exc}")
+                continue
+            _store_endpoint(conn, endpoint, records, detailed)
+            synced[endpoint] = len(records)
+            log(f"{endpoint}: {len(records)} records")
+    finally:
+        conn.close()
+    return synced
+
+
+# --- Query emulation -------------------------------------------------------------
+
+def _split_lookup(param: str) -> tuple[list[str], str]:
+    parts = param.split("__")
+    if len(parts) > 1 and parts[-1] in _LOOKUPS:
+        return parts[:-1], parts[-1]
+    return parts, "exact"
+
+
+def _walk(record: Any, path: list[str]) -> list[Any]:
+    """Every leaf value reachable along `path`, flattening lists (M2M) and
+    collapsing a trailing FK object to its `key`."""
+    current: list[Any] = [record]
+    for part in path:
+        nxt: list[Any] = []
+        for value in current:
+            if isinstance(value, dict):
+                if part in value:
+                    nxt.append(value[part])
+            elif isinstance(value, str) and part == "key":
+                # Bare-string FK (rules' `document`) already is the key.
+                nxt.append(value)
+        current = []
+        for value in nxt:
+            current.extend(value if isinstance(value, list) else [value])
+    leaves: list[Any] = []
+    for value in current:
+        if isinstance(value, dict):
+            leaves.append(value.get("key"))
+        else:
+            leaves.append(value)
+    return leaves
+
+
+def _resolve_field(endpoint: str, record: dict[str, Any], path: list[str]) -> list[Any]:
+    values = _walk(record, path)
+    if values:
+        return values
+    head = "__".join(path)
+    for alias in _FIELD_ALIASES.get(endpoint, {}).get(head, ()):
+        values = _walk(record, alias.split("__"))
+        if values:
+            return values
+    for prefix, replacement in _PREFIX_ALIASES.get(endpoint, ()):
+        if head.startswith(prefix):
+            values = _walk(record, (replacement + head[len(prefix):]).split("__"))
+            if values:
+                return values
+    return []
+
+
+def _as_bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text == "true":
+        return True
+    if text == "false":
+        return False
+    return None  # Open5e rejects 1/0 (quirk #5) — treat as "no filter"
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(candidate: Any, lookup: str, wanted: Any) -> bool:
+    if candidate is None:
+        return False
+    if lookup in ("gt", "gte", "lt", "lte"):
+        a, b = _as_number(candidate), _as_number(wanted)
+        if a is None or b is None:
+            return False
+        return {"gt": a > b, "gte": a >= b, "lt": a < b, "lte": a <= b}[lookup]
+    if isinstance(candidate, bool):
+        flag = _as_bool(wanted)
+        # Integer 1/0 is silently rejected upstream (quirk #5): no filtering.
+        return True if flag is None else candidate == flag
+    if lookup in ("contains", "icontains"):
+        hay, needle = str(candidate), str(wanted)
+        if lookup == "icontains":
+            return needle.casefold() in hay.casefold()
+        return needle in hay
+    a, b = _as_number(candidate), _as_number(wanted)
+    if a is not None and b is not None:
+        return a == b
+    if lookup == "iexact":
+        return str(candidate).casefold() == str(wanted).casefold()
+    return str(candidate) == str(wanted)
+
+
+def _record_matches(endpoint: str, record: dict[str, Any], param: str, wanted: Any) -> bool:
+    path, lookup = _split_lookup(param)
+    values = _resolve_field(endpoint, record, path)
+    if lookup == "isnull":
+        flag = _as_bool(wanted)
+        if flag is None:
+            return True
+        present = any(v is not None for v in values)
+        return (not present) if flag else present
+    if lookup == "in":
+        options = [o.strip() for o in str(wanted).split(",") if o.strip()]
+        return any(_compare(v, "exact", o) for v in values for o in options)
+    return any(_compare(v, lookup, wanted) for v in values)
+
+
+def _honored_filters(
+    endpoint: str, params: dict[str, Any], name_forms: tuple[Optional[str], Optional[str]],
+) -> list[tuple[str, Any]]:
+    """Filters the live endpoint would actually apply (see module docstring)."""
+    honored = []
+    for param, value in params.items():
+        if param in _CONTROL_PARAMS or param == "search" or value is None:
+            continue
+        if param == "name" or param.startswith("name__"):
+            if param not in name_forms:
+                continue
+        honored.append((param, value))
+    return honored
+
+
+def _sort_key(endpoint: str, field: str) -> Callable[[dict[str, Any]], tuple]:
+    path = field.split("__")
+
+    def key(record: dict[str, Any]) -> tuple:
+        values = _resolve_field(endpoint, record, path)
+        value = values[0] if values else None
+        if value is None:
+            return (1, 0, "")
+        number = _as_number(value)
+        if number is not None:
+            return (0, 0, number)
+        return (0, 1, str(value).casefold())
+    return key
+
+
+def _project(record: dict[str, Any], fields: Optional[str], exclude: Optional[str]) -> dict[str, Any]:
+    out = record
+    if fields:
+        wanted = {f.strip() for f in str(fields).split(",") if f.strip()}
+        out = {k: v for k, v in out.items() if k in wanted}
+    if exclude:
+        dropped = {f.strip() for f in str(exclude).split(",") if f.strip()}
+        out = {k: v for k, v in out.items() if k not in dropped}
+    return out
+
+
+def _page_url(base_url: str, endpoint: str, params: dict[str, Any], page: int) -> str:
+    query = {k: v for k, v in params.items() if v is not None}
+    query["page"] = page
+    return f"{base_url}{endpoint}?{urlencode(query)}"
+
+
+def resolve(
+    endpoint: str,
+    params: Optional[dict[str, Any]],
+    *,
+    name_forms: dict[str, tuple[Optional[str], Optional[str]]],
+    base_url: str,
+    rows_for: Callable[[str], list[dict[str, Any]]] = endpoint_rows,
+) -> dict[str, Any]:
+    """Answer one `_api_get(endpoint, params)` call from the mirror.
+
+    List endpoints ('/v2/spells/') return Open5e's paginated envelope; detail
+    endpoints ('/v2/spells/<key>/') return the stored record. Raises MirrorMiss
+    when the mirror can't answer. `rows_for` supplies an endpoint's records —
+    the SQLite mirror by default; the local stand-in server (srd_standin.py)
+    passes its in-memory fixture instead."""
+    params = dict(params or {})
+    segments = [s for s in endpoint.split("/") if s]
+    if len(segments) == 3 and segments[0] == "v2":
+        list_endpoint = f"/v2/{segments[1]}/"
+        key = segments[2]
+        for record in rows_for(list_endpoint):
+            if str(record.get("key")) == key:
+                return record
+        raise MirrorMiss(f"no record {key!r} in mirrored {list_endpoint}")
+    if len(segments) != 2 or segments[0] != "v2" or endpoint == "/v2/search/":
+        raise MirrorMiss(f"{endpoint} is not served by the offline mirror")
+
+    rows = rows_for(endpoint)
+    forms = name_forms.get(endpoint, (None, None))
+    filters = _honored_filters(endpoint, params, forms)
+    matched = [r for r in rows if all(_record_matches(endpoint, r, p, v) for p, v in filters)]
+
+    ordering = params.get("ordering")
+    if ordering:
+        for field in reversed([f.strip() for f in str(ordering).split(",") if f.strip()]):
+            descending = field.startswith("-")
+            matched.sort(key=_sort_key(endpoint, field.lstrip("-")), reverse=descending)
+
+    try:
+        limit = max(1, int(params.get("limit") or _DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        limit = _DEFAULT_PAGE_SIZE
+    try:
+        page = max(1, int(params.get("page") or 1))
+    except (TypeError, ValueError):
+        page = 1
+    start = (page - 1) * limit
+    window = matched[start:start + limit]
+    return {
+        "count": len(matched),
+        "next": _page_url(base_url, endpoint, params, page + 1) if start + limit < len(matched) else None,
+        "previous": _page_url(base_url, endpoint, params, page - 1) if page > 1 else None,
+        "results": [_project(r, params.get("fields"), params.get("exclude")) for r in window],
+    }
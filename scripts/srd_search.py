@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""Local full-text index over the offline SRD mirror (BM25 + prefix + typos).
+
+Open5e's only working full-text path is the remote /v2/search/ endpoint (quirk
+#1 in srd5_2), so every rules lookup used to be a network round trip. This
+module indexes the mirrored records (scripts/srd_mirror.py) for the kinds the
+table actually searches — rule sections, spells, creatures, conditions and
+magic items — and answers queries in-process in well under 10 ms.
+
+Matching, per query term:
+  - exact term                       → full weight
+  - prefix of an indexed term (last query term only, so search-as-you-type
+    works: 'firebal' → fireball)      → PREFIX_WEIGHT
+  - one edit away (insert / delete / substitute / transpose; terms of 4+
+    chars only)                       → TYPO_WEIGHT
+Each expansion is scored with Okapi BM25 against the expanded term's own
+postings; a document's score is the sum over query terms of its best expansion.
+Name tokens are counted NAME_BOOST times so a 'Grappled' condition outranks a
+rule section that merely mentions grappling.
+
+Incremental rebuild: `refresh()` compares each indexed endpoint's mirror
+`synced_at` stamp with the last one it saw; only changed endpoints are
+re-read, and within them only records whose content hash changed are
+re-tokenized. The index is pickled to .cache/ so a new process starts warm.
+
+Stdlib only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+import math
+import os
+import pickle
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+import srd_mirror
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_DEFAULT_PATH = _REPO_ROOT / ".cache" / "srd_search_index.pickle"
+
+# object_model (the /v2/search/ filter value) → mirrored list endpoint.
+KINDS: dict[str, str] = {
+    "rule": "/v2/rules/",
+    "spell": "/v2/spells/",
+    "creature": "/v2/creatures/",
+    "condition": "/v2/conditions/",
+    "magicitem": "/v2/magicitems/",
+}
+
+K1 = 1.2
+B = 0.75
+NAME_BOOST = 3
+PREFIX_WEIGHT = 0.8
+TYPO_WEIGHT = 0.6
+_MAX_PREFIX_EXPANSIONS = 64
+_MIN_TYPO_LEN = 4
+
+# Bump when tokenization/scoring changes so stale pickles are discarded.
+_FORMAT_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the to was were "
+    "will with you your".split()
+)
+# Record fields whose text is worth indexing. Walked recursively so nested
+# action / trait / description objects are covered; `document` is skipped so
+# every record doesn't match 'system reference document'.
+_TEXT_FIELDS = frozenset({"name", "desc", "description", "descriptions", "higher_level",
+                          "actions", "traits", "text"})
+_SKIP_FIELDS = frozenset({"document", "key", "url"})
+
+
+def index_path() -> Path:
+    """Override-able for tests via DND_SRD_INDEX_PATH env var."""
+    return Path(os.environ.get("DND_SRD_INDEX_PATH", str(_DEFAULT_PATH)))
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.casefold()) if t not in _STOPWORDS]
+
+
+def _collect_text(value: Any, out: list[str], indexed: bool = False) -> None:
+    if isinstance(value, str):
+        if indexed:
+            out.append(value)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_text(item, out, indexed)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            if k in _SKIP_FIELDS:
+                continue
+            _collect_text(v, out, indexed or k in _TEXT_FIELDS)
+
+
+def _body_text(record: dict[str, Any]) -> str:
+    parts: list[str] = []
+    _collect_text({k: v for k, v in record.items() if k != "name"}, parts)
+    return "\n".join(parts)
+
+
+def _deletes(term: str) -> set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Optimal-string-alignment distance <= 1 (transpositions count as one)."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diffs = [i for i in range(la) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]])
+    if la > lb:
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class SrdIndex:
+    """In-memory inverted index. Thread-safe: queries take a read snapshot under
+    the lock; refresh() mutates under it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.stamps: dict[str, float] = {}
+        # doc id = (endpoint, key)
+        self.docs: dict[tuple[str, str], dict[str, Any]] = {}
+        self.postings: dict[str, dict[tuple[str, str], int]] = defaultdict(dict)
+        self.doc_terms: dict[tuple[str, str], tuple[str, ...]] = {}
+        self.doc_len: dict[tuple[str, str], int] = {}
+        self.total_len = 0
+        self._vocab_sorted: Optional[list[str]] = None
+        self._delete_map: Optional[dict[str, set[str]]] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Locks don't pickle and the derived lookup tables are cheap to rebuild.
+        state = self.__dict__.copy()
+        state["postings"] = dict(self.postings)
+        for transient in ("_lock", "_vocab_sorted", "_delete_map"):
+            state.pop(transient, None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.postings = defaultdict(dict, state["postings"])
+        self._lock = threading.RLock()
+        self._vocab_sorted = None
+        self._delete_map = None
+
+    # --- maintenance -----------------------------------------------------------
+
+    def _remove(self, doc_id: tuple[str, str]) -> None:
+        for term in set(self.doc_terms.pop(doc_id, ())):
+            bucket = self.postings.get(term)
+            if bucket is not None:
+                bucket.pop(doc_id, None)
+                if not bucket:
+                    del self.postings[term]
+        self.total_len -= self.doc_len.pop(doc_id, 0)
+        self.docs.pop(doc_id, None)
+
+    def _add(self, doc_id: tuple[str, str], record: dict[str, Any], digest: str) -> None:
+        name = str(record.get("name") or "")
+        body = _body_text(record)
+        terms = tokenize(name) * NAME_BOOST + tokenize(body)
+        counts: dict[str, int] = defaultdict(int)
+        for term in terms:
+            counts[term] += 1
+        for term, tf in counts.items():
+            self.postings[term][doc_id] = tf
+        self.doc_terms[doc_id] = tuple(counts)
+        self.doc_len[doc_id] = len(terms)
+        self.total_len += len(terms)
+        doc = record.get("document")
+        self.docs[doc_id] = {
+            "hash": digest,
+            "name": name,
+            "document": doc if isinstance(doc, dict) else {"key": str(doc or "")},
+            "text": body,
+        }
+
+    def _reindex_endpoint(self, endpoint: str, rows: list[dict[str, Any]]) -> int:
+        """Apply one endpoint's current rows; returns how many docs were
+        (re)tokenized."""
+        seen: set[tuple[str, str]] = set()
+        touched = 0
+        for record in rows:
+            key = str(record.get("key") or "")
+            if not key:
+                continue
+            doc_id = (endpoint, key)
+            seen.add(doc_id)
+            digest = hashlib.blake2b(
+                json.dumps(record, sort_keys=True).encode("utf-8"), digest_size=16,
+            ).hexdigest()
+            current = self.docs.get(doc_id)
+            if current is not None and current["hash"] == digest:
+                continue
+            if current is not None:
+                self._remove(doc_id)
+            self._add(doc_id, record, digest)
+            touched += 1
+        for doc_id in [d for d in self.docs if d[0] == endpoint and d not in seen]:
+            self._remove(doc_id)
+            touched += 1
+        return touched
+
+    def refresh(self) -> int:
+        """Bring the index in line with the mirror. Cheap no-op when nothing was
+        re-synced. Returns the number of docs re-tokenized."""
+        stamps = srd_mirror.sync_stamps()
+        touched = 0
+        with self._lock:
+            for endpoint in KINDS.values():
+                stamp = stamps.get(endpoint)
+                if stamp is None:
+                    if endpoint in self.stamps:
+                        for doc_id in [d for d in self.docs if d[0] == endpoint]:
+                            self._remove(doc_id)
+                            touched += 1
+                        del self.stamps[endpoint]
+                    continue
+                if self.stamps.get(endpoint) == stamp:
+                    continue
+                try:
+                    rows = srd_mirror.endpoint_rows(endpoint)
+                except srd_mirror.MirrorMiss:
+                    continue
+                touched += self._reindex_endpoint(endpoint, rows)
+                self.stamps[endpoint] = stamp
+            if touched:
+                # Rebuild the prefix/typo tables now rather than on the first
+                # query, which would otherwise eat a few hundred ms mid-combat.
+                self._vocab_sorted = None
+                self._delete_map = None
+                self._vocab()
+                self._typo_map()
+        return touched
+
+    def indexed_endpoints(self) -> set[str]:
+        with self._lock:
+            return set(self.stamps)
+
+    # --- querying ----------------------------------------------------------------
+
+    def _vocab(self) -> list[str]:
+        if self._vocab_sorted is None:
+            self._vocab_sorted = sorted(self.postings)
+        return self._vocab_sorted
+
+    def _typo_map(self) -> dict[str, set[str]]:
+        if self._delete_map is None:
+            dm: dict[str, set[str]] = defaultdict(set)
+            for term in self.postings:
+                if len(term) >= _MIN_TYPO_LEN - 1:
+                    dm[term].add(term)
+                    for d in _deletes(term):
+                        dm[d].add(term)
+            self._delete_map = dm
+        return self._delete_map
+
+    def _expand(self, token: str, allow_prefix: bool) -> dict[str, tuple[float, str]]:
+        """term → (weight, match_type) for one query token."""
+        out: dict[str, tuple[float, str]] = {}
+        if token in self.postings:
+            out[token] = (1.0, "exact")
+        if allow_prefix:
+            vocab = self._vocab()
+            i = bisect_left(vocab, token)
+            n = 0
+            while i < len(vocab) and vocab[i].startswith(token) and n < _MAX_PREFIX_EXPANSIONS:
+                if vocab[i] not in out:
+                    out[vocab[i]] = (PREFIX_WEIGHT, "prefix")
+                i += 1
+                n += 1
+        if len(token) >= _MIN_TYPO_LEN and token not in self.postings:
+            dm = self._typo_map()
+            candidates: set[str] = set(dm.get(token, ()))
+            for d in _deletes(token):
+                candidates |= dm.get(d, set())
+            for term in candidates:
+                if term not in out and _within_one_edit(token, term):
+                    out[term] = (TYPO_WEIGHT, "fuzzy")
+        return out
+
+    def search(
+        self,
+        query: str,
+        *,
+        kinds: Optional[list[str]] = None,
+        document_keys: Optional[set[str]] = None,
+        limit: int = 10,
+    ) -> list[dict[str, Any]]:
+        """Ranked hits: dicts with kind, key, name, document, score, match_type,
+        matched_terms. `kinds` restricts to object models (see KINDS)."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        endpoints = {KINDS[k] for k in (kinds or KINDS) if k in KINDS}
+        with self._lock:
+            n_docs = len(self.docs) or 1
+            avgdl = (self.total_len / n_docs) if self.docs else 1.0
+            scores: dict[tuple[str, str], float] = defaultdict(float)
+            matched: dict[tuple[str, str], dict[str, str]] = defaultdict(dict)
+            for pos, token in enumerate(tokens):
+                expansions = self._expand(token, allow_prefix=pos == len(tokens) - 1)
+                best: dict[tuple[str, str], tuple[float, str, str]] = {}
+                for term, (weight, how) in expansions.items():
+                    bucket = self.postings.get(term, {})
+                    df = len(bucket)
+                    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                    for doc_id, tf in bucket.items():
+                        if doc_id[0] not in endpoints:
+                            continue
+                        dl = self.doc_len[doc_id]
+                        s = weight * idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+                        if doc_id not in best or s > best[doc_id][0]:
+                            best[doc_id] = (s, term, how)
+                for doc_id, (s, term, how) in best.items():
+                    scores[doc_id] += s
+                    matched[doc_id][term] = how
+            ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+            hits = []
+            for doc_id, score in ranked:
+                meta = self.docs[doc_id]
+                if document_keys and str(meta["document"].get("key") or "") not in document_keys:
+                    continue
+                hows = set(matched[doc_id].values())
+                hits.append({
+                    "kind": next(k for k, ep in KINDS.items() if ep == doc_id[0]),
+                    "key": doc_id[1],
+                    "name": meta["name"],
+                    "document": meta["document"],
+                    "text": meta["text"],
+                    "score": round(score, 4),
+                    "match_type": "exact" if hows == {"exact"} else
+                                  ("fuzzy" if "fuzzy" in hows else "prefix"),
+                    "matched_terms": sorted(matched[doc_id]),
+                })
+                if len(hits) >= limit:
+                    break
+        return hits
+
+
+def highlight(text: str, terms: list[str], width: int = 200) -> str:
+    """An HTML snippet around the first matched term, with matches wrapped the
+    way Open5e's /v2/search/ marks them."""
+    if not text:
+        return ""
+    pattern = re.compile(
+        r"\b(" + "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)) + r")\w*",
+        re.IGNORECASE,
+    ) if terms else None
+    start = 0
+    if pattern is not None:
+        m = pattern.search(text)
+        if m:
+            start = max(0, m.start() - width // 4)
+    snippet = text[start:start + width]
+    escaped = html.escape(snippet)
+    if pattern is not None:
+        escaped = pattern.sub(lambda m: f'<span class="highlighted">{m.group(0)}</span>', escaped)
+    return ("…" if start else "") + escaped + ("…" if start + width < len(text) else "")
+
+
+# --- Process-wide index ------------------------------------------------------------
+
+_index: Optional[SrdIndex] = None
+_index_lock = threading.Lock()
+# get_index() re-checks the mirror's sync stamps at most this often, so a burst
+# of keystroke queries from the GUI doesn't open SQLite on every one.
+_REFRESH_INTERVAL_SEC = 1.0
+_index_checked_at = 0.0
+
+
+def _load_pickle(path: Path) -> Optional[SrdIndex]:
+    try:
+        with path.open("rb") as f:
+            version, index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError, TypeError):
+        return None
+    if version != _FORMAT_VERSION or not isinstance(index, SrdIndex):
+        return None
+    return index
+
+
+def _save_pickle(index: SrdIndex, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with index._lock:
+        with tmp.open("wb") as f:
+            pickle.dump((_FORMAT_VERSION, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def get_index() -> SrdIndex:
+    """The shared index, loaded from its pickle and refreshed against the
+    mirror. Re-persists only when the refresh actually changed something."""
+    global _index, _index_checked_at
+    with _index_lock:
+        if _index is None:
+            loaded = _load_pickle(index_path())
+            _index = loaded if loaded is not None else SrdIndex()
+            _index_checked_at = 0.0
+        index = _index
+        due = time.monotonic() - _index_checked_at >= _REFRESH_INTERVAL_SEC
+        if due:
+            _index_checked_at = time.monotonic()
+    if due and index.refresh():
+        try:
+            _save_pickle(index, index_path())
+        except OSError:
+            pass  # a read-only .cache just means a cold start next time
+    return index
+
+
+def reset() -> None:
+    """Drop the in-process index (tests; or after switching mirror paths)."""
+    global _index, _index_checked_at
+    with _index_lock:
+        _index = None
+        _index_checked_at = 0.0
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Open5e v2 API, replaying recorded responses.
+
+Lets scripts/srd5_2.py be exercised — benchmarked (scripts/srd_bench.py),
+tested, or run from the GUI/MCP server — without touching api.open5e.com:
+
+    python scripts/srd_standin.py serve --port 8765 --latency-ms 40
+    DND_SRD_BASE_URL=http://127.0.0.1:8765 python scripts/srd5_2.py --mcp-tool search_spells --name fire
+
+A fixture file holds what was recorded:
+
+    {"endpoints": {"/v2/spells/": [record, ...], ...},
+     "responses": [{"path": "/v2/search/", "query": {...}, "status": 200, "body": {...}}]}
+
+`responses` are replayed verbatim when path and query match exactly (that is
+how /v2/search/ is answered). Every other list or detail request is answered
+from the `endpoints` records through srd_mirror's Open5e filter emulation, so
+any name / FK / range filter srd5_2 sends works — with the same quirks the live
+filterset has. Anything else is a 404, like an unknown key upstream.
+
+Latency (`--latency-ms` ± `--jitter-ms`) and failures (`--fail-rate` of
+requests answered with `--fail-status`, 503 by default) are injected per
+request. Per-endpoint request, byte and failure counters feed the benchmark.
+
+`record` refreshes a fixture from the live API: it pages the chosen list
+endpoints and captures /v2/search/ responses for the given rule queries.
+
+Stdlib only, apart from srd5_2's name-form map (imported lazily).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+_SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(_SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(_SCRIPTS_DIR))
+import srd_mirror  # noqa: E402
+
+DEFAULT_FIXTURE = _SCRIPTS_DIR / "tests" / "fixtures" / "open5e_v2_sample.json"
+DEFAULT_RECORD_ENDPOINTS = (
+    "/v2/spells/", "/v2/conditions/", "/v2/creatures/", "/v2/magicitems/", "/v2/rules/",
+)
+
+
+def _response_key(path: str, query: dict[str, Any]) -> tuple:
+    return (path, tuple(sorted((str(k), str(v)) for k, v in query.items())))
+
+
+def endpoint_of(path: str) -> str:
+    """Counter bucket for a request path: detail paths count toward their list
+    endpoint ('/v2/spells/srd-2024_fly/' → '/v2/spells/')."""
+    segments = [s for s in path.split("/") if s]
+    return "/" + "/".join(segments[:2]) + "/" if len(segments) >= 2 else path
+
+
+def load_fixture(path: Path) -> dict[str, Any]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data.get("endpoints"), dict):
+        raise ValueError(f"{path}: fixture needs an `endpoints` object")
+    data.setdefault("responses", [])
+    return data
+
+
+def _srd_name_forms() -> dict[str, tuple[Optional[str], Optional[str]]]:
+    import srd5_2
+
+    return srd5_2._ENDPOINT_NAME_FORMS
+
+
+class _StandinHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default listen() backlog is 5: a burst of parallel
+    # clients overflows it and the dropped SYNs cost a 1 s retransmit each,
+    # which shows up as a phantom p99 spike in concurrent benchmarks.
+    request_queue_size = 128
+
+
+class StandinServer:
+    """Threaded HTTP server answering Open5e v2 requests from a fixture.
+
+    Usable as a context manager; `url` is valid once started. Port 0 picks a
+    free port. `stats()` / `reset_stats()` expose per-endpoint counters."""
+
+    def __init__(
+        self,
+        fixture: Path | dict[str, Any] = DEFAULT_FIXTURE,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        fail_rate: float = 0.0,
+        fail_status: int = 503,
+        seed: Optional[int] = None,
+        name_forms: Optional[dict[str, tuple[Optional[str], Optional[str]]]] = None,
+    ) -> None:
+        data = fixture if isinstance(fixture, dict) else load_fixture(fixture)
+        self._records: dict[str, list[dict[str, Any]]] = data["endpoints"]
+        self._responses = {
+            _response_key(r["path"], r.get("query") or {}): (int(r.get("status", 200)), r["body"])
+            for r in data["responses"]
+        }
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self._name_forms = name_forms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"requests": 0, "bytes": 0, "failures": 0, "not_found": 0}
+        )
+        self._httpd = _StandinHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    # ─────────── lifecycle ───────────
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="srd-standin", daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # ─────────── counters ───────────
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {ep: dict(c) for ep, c in sorted(self._stats.items())}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    # ─────────── request handling ───────────
+
+    def _rows(self, endpoint: str) -> list[dict[str, Any]]:
+        rows = self._records.get(endpoint)
+        if rows is None:
+            raise srd_mirror.MirrorMiss(f"{endpoint} is not in the fixture")
+        return rows
+
+    def _delay(self) -> tuple[float, bool]:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            fail = self.fail_rate > 0 and self._rng.random() < self.fail_rate
+        return max(0.0, self.latency_ms + jitter) / 1000.0, fail
+
+    def answer(self, path: str, query: dict[str, str]) -> tuple[int, dict[str, Any]]:
+        """(status, body) for one GET, before latency/failure injection."""
+        recorded = self._responses.get(_response_key(path, query))
+        if recorded is not None:
+            return recorded
+        if self._name_forms is None:
+            self._name_forms = _srd_name_forms()
+        try:
+            return 200, srd_mirror.resolve(
+                path, query, name_forms=self._name_forms, base_url=self.url, rows_for=self._rows,
+            )
+        except srd_mirror.MirrorMiss:
+            return 404, {"detail": "Not found."}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+            # Headers and body go out as two writes; with Nagle on, the body
+            # waits for the client's delayed ACK (~40 ms) on every request.
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802 — http.server naming
+                parts = urlsplit(self.path)
+                query = dict(parse_qsl(parts.query, keep_blank_values=True))
+                delay, fail = server._delay()
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    status, body = server.fail_status, {"detail": "Injected failure."}
+                else:
+                    status, body = server.answer(parts.path, query)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                with server._lock:
+                    counters = server._stats[endpoint_of(parts.path)]
+                    counters["requests"] += 1
+                    counters["bytes"] += len(payload)
+                    counters["failures"] += int(fail)
+                    counters["not_found"] += int(status == 404)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+        return Handler
+
+
+# --- Recording -------------------------------------------------------------------
+
+def record(
+    fetch: Callable[[str, dict[str, Any]], dict[str, Any]],
+    endpoints: tuple[str, ...] = DEFAULT_RECORD_ENDPOINTS,
+    rule_queries: tuple[str, ...] = (),
+    *,
+    max_records: Optional[int] = None,
+    log: Callable[[str], None] = lambda msg: None,
+) -> dict[str, Any]:
+    """Build a fixture by paging `endpoints` through `fetch` (srd5_2's network
+    fetcher) and capturing /v2/search/ rule responses for `rule_queries` — the
+    exact requests search_rules sends, so they replay verbatim."""
+    fixture: dict[str, Any] = {"endpoints": {}, "responses": []}
+    for endpoint in endpoints:
+        rows: list[dict[str, Any]] = []
+        page_endpoint, params = endpoint, {"limit": 100}
+        while page_endpoint and (max_records is None or len(rows) < max_records):
+            page = fetch(page_endpoint, params)
+            rows.extend(r for r in page.get("results") or [] if isinstance(r, dict))
+            next_url = page.get("next")
+            page_endpoint, params = srd_mirror.split_next_url(next_url) if next_url else (None, {})
+        fixture["endpoints"][endpoint] = rows[:max_records]
+        log(f"{endpoint}: {len(fixture['endpoints'][endpoint])} records")
+    for query in rule_queries:
+        params = {"query": query, "object_model": "rule", "limit": "5"}
+        fixture["responses"].append({
+            "path": "/v2/search/", "query": params, "status": 200,
+            "body": fetch("/v2/search/", params),
+        })
+        log(f"/v2/search/ {query!r}: recorded")
+    return fixture
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Serve a fixture over HTTP until interrupted.")
+    serve.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency-ms", type=float, default=0.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--fail-rate", type=float, default=0.0)
+    serve.add_argument("--fail-status", type=int, default=503)
+    serve.add_argument("--seed", type=int, default=None)
+
+    rec = sub.add_parser("record", help="Record a fixture from the live Open5e API.")
+    rec.add_argument("--out", type=Path, required=True)
+    rec.add_argument("--endpoint", action="append", dest="endpoints",
+                     help="List endpoint to page (repeatable). Default: spells, conditions, "
+                          "creatures, magic items, rules.")
+    rec.add_argument("--rule-query", action="append", default=[], dest="rule_queries",
+                     help="search_rules query whose /v2/search/ response to capture (repeatable).")
+    rec.add_argument("--max-records", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        import srd5_2
+
+        fixture = record(
+            srd5_2._fetch_json, tuple(args.endpoints or DEFAULT_RECORD_ENDPOINTS),
+            tuple(args.rule_queries), max_records=args.max_records,
+            log=lambda msg: print(msg, file=sys.stderr),
+        )
+        fixture["description"] = f"Recorded from {srd5_2.BASE_URL} on {time.strftime('%Y-%m-%d')}."
+        args.out.write_text(json.dumps(fixture, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+        return 0
+
+    server = StandinServer(
+        args.fixture, host=args.host, port=args.port, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, fail_rate=args.fail_rate, fail_status=args.fail_status,
+        seed=args.seed,
+    ).start()
+    print(f"Open5e stand-in on {server.url} — export DND_SRD_BASE_URL={server.url}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
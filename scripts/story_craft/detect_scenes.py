@@ -34,6 +34,7 @@ _REPO_ROOT = _SCRIPT_DIR.parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
+from scripts.mcp_progress import report_progress
 from scripts.story_craft._shared import (
     REPO_ROOT,
     discover_latest_session,
@@ -427,6 +428,10 @@ Output your decision as JSON following the format specified in the system prompt
             batch_start_seconds = [float(e.get("start", 0.0)) for e in batch]
             
             print(f"\nProcessing batch {batch_num + 1}/{total_batches} (entries {start_idx}-{end_idx})...")
+            report_progress(
+                batch_num, total_batches,
+                f"batch {batch_num + 1}/{total_batches}: {len(scenes)} scene(s) closed so far",
+            )
             
             batch_prompt = self.build_batch_prompt(
                 batch,
@@ -538,6 +543,7 @@ Output your decision as JSON following the format specified in the system prompt
             print(f"  Closed final scene: {current_scene_state['scene_id']}")
         
         # Save results
+        report_progress(total_batches, total_batches, f"saving {len(scenes)} scenes")
         print(f"\nSaving {len(scenes)} scenes to {output_path}...")
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
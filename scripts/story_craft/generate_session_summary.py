@@ -38,6 +38,7 @@ _REPO_ROOT = _SCRIPT_DIR.parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
+from scripts.mcp_progress import report_progress
 from scripts.story_craft._shared import (
     REPO_ROOT,
     discover_latest_session,
@@ -350,7 +351,8 @@ def main():
     print(f"{'='*60}\n")
     
     outputs = []
-    for prompt_slug in prompt_slugs:
+    for index, prompt_slug in enumerate(prompt_slugs):
+        report_progress(index, len(prompt_slugs), f"generating summary with prompt '{prompt_slug}'")
         try:
             # Load prompt configuration
             prompt_config = summarizer.load_prompt_config(prompt_slug)
@@ -370,6 +372,7 @@ def main():
                 prompt_name=prompt_config["name"],
             )
             outputs.append(output_file)
+            report_progress(index + 1, len(prompt_slugs), f"saved {output_file}")
             
             print()
             
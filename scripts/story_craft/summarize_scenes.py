@@ -37,6 +37,7 @@ _REPO_ROOT = _SCRIPT_DIR.parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
+from scripts.mcp_progress import report_progress
 from scripts.story_craft._shared import (
     REPO_ROOT,
     discover_latest_session,
@@ -665,6 +666,7 @@ Output ONLY valid JSON. No additional commentary.
             end_seconds = scene.get("end_seconds", 0)
             
             print(f"Scene {idx+1}/{len(scenes)}: {scene_id}")
+            report_progress(idx, len(scenes), f"scene {idx+1}/{len(scenes)}: {scene_id}")
             print(f"  Time range: {start_seconds:.1f}s - {end_seconds:.1f}s")
             print(f"  Location: {scene.get('location', 'Unknown')}")
             
@@ -708,6 +710,7 @@ Output ONLY valid JSON. No additional commentary.
             
             summaries.append(full_summary)
             print(f"  ✓ Complete\n")
+            report_progress(idx + 1, len(scenes), f"summarized {scene_id}")
         
         # Save results as TOML files in output directory
         print(f"Saving {len(summaries)} scene summaries to {output_path}/...")
@@ -0,0 +1,39 @@
+"""Shared setup for the scripts/mcp/server.py tests (test_server_*.py).
+
+server.py is a script, not a package module, so it is loaded once by path and
+every test file uses that one module object; tests patch it with monkeypatch.
+The `executor` fixture lives in conftest.py.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+SERVER_PATH = SCRIPTS_DIR / "mcp" / "server.py"
+
+
+def _load_server():
+    name = "_mcp_server_tests"
+    spec = importlib.util.spec_from_file_location(name, SERVER_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # Register before exec: @dataclass resolves the module namespace via sys.modules.
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+server = _load_server()
+
+
+def tool_runner(name, handler=None, *, async_handler=None, concurrency=None, groups=(), lane=None):
+    """An in-process ToolRunner for `handler` (or the coroutine `async_handler`)."""
+    return server.ToolRunner(
+        tool=server.Tool(name=name, description="", input_schema={}),
+        script_path=SERVER_PATH, argv_template=(), bool_flags={}, value_flags={},
+        handler=handler, async_handler=async_handler, concurrency=concurrency, groups=groups,
+        lane_override=lane,
+    )
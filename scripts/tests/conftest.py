@@ -0,0 +1,15 @@
+"""Fixtures shared by the scripts/ tests."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.fixture
+def executor():
+    """A worker pool standing in for the MCP server's tool executor."""
+    pool = ThreadPoolExecutor(max_workers=8)
+    yield pool
+    pool.shutdown(wait=True)
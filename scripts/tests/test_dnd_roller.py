@@ -1,27 +1,319 @@
 """Tests for the D&D roller's pure logic (narrative, bonuses, validation)."""
 from __future__ import annotations
 
+import asyncio
+import gc
 import json
+import re
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
 
 import pytest
 
 from scripts import dnd_roller
 
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
 
 @pytest.fixture(autouse=True)
-def reset_cache():
-    """Reset module-level cache state before each test."""
-    dnd_roller._number_cache.clear()
-    dnd_roller._source_cache.clear()
+def reset_cache(tmp_path, monkeypatch):
+    """Give each test its own empty on-disk number pool and closed circuits.
+    The refill daemon's watermarks are zero, so it never starts unless a roll
+    has to wait."""
+    pool = dnd_roller._EntropyRing(tmp_path / "ring.bin", capacity=64)
+    refiller = dnd_roller._RefillDaemon(low=0, high=0)
+    monkeypatch.setenv("QUANT_API_URL", "https://quantum.invalid/api")
+    monkeypatch.setenv("QUANT_API_KEY", "test")
+    monkeypatch.setattr(dnd_roller, "_breakers", {
+        name: dnd_roller._CircuitBreaker(name) for name in dnd_roller._SOURCE_TAGS
+    })
+    monkeypatch.setattr(dnd_roller, "_pool", pool)
+    monkeypatch.setattr(dnd_roller, "_refill_lock", dnd_roller._RefillLock(tmp_path / "refill.lock"))
+    monkeypatch.setattr(dnd_roller, "_refiller", refiller)
     yield
-    dnd_roller._number_cache.clear()
-    dnd_roller._source_cache.clear()
+    refiller.stop()
+    pool.close()
 
 
 def _seed_cache(numbers: list[int], source: str = "quantumnumbers") -> None:
     """Helper: pre-populate the cache with deterministic numbers."""
-    dnd_roller._number_cache.extend(numbers)
-    dnd_roller._source_cache.extend([source] * len(numbers))
+    dnd_roller._pool.push(numbers, source)
+
+
+def test_ring_pops_in_order_and_persists_the_cursor(tmp_path):
+    path = tmp_path / "pool.bin"
+    ring = dnd_roller._EntropyRing(path, capacity=8)
+    size = path.stat().st_size
+    assert ring.push([1, 2, 3, 4], "quantumnumbers") == 4
+    assert ring.push([5, 6], "random_org") == 2
+    assert ring.pop(3) == ([1, 2, 3], ["quantumnumbers"] * 3)
+    assert ring.pop(4) is None  # all or nothing
+    ring.close()
+
+    reopened = dnd_roller._EntropyRing(path, capacity=8)
+    assert len(reopened) == 3
+    assert reopened.pop(3) == ([4, 5, 6], ["quantumnumbers", "random_org", "random_org"])
+    # Wraps around; overflow beyond capacity is dropped, never overwrites unread slots.
+    assert reopened.push(list(range(100, 110)), "quantumnumbers") == 8
+    assert reopened.pop(8)[0] == list(range(100, 108))
+    assert path.stat().st_size == size
+    reopened.close()
+
+
+def test_ring_never_reissues_numbers_after_a_crash(tmp_path):
+    path = tmp_path / "pool.bin"
+    ring = dnd_roller._EntropyRing(path, capacity=16)
+    ring.push(list(range(10)), "quantumnumbers")
+    ring.close()
+    crash = (
+        "import os, sys; from pathlib import Path; "
+        "from scripts import dnd_roller; "
+        f"ring = dnd_roller._EntropyRing(Path({str(path)!r})); "
+        "print(ring.pop(4)[0], flush=True); os._exit(1)"
+    )
+    out = subprocess.run([sys.executable, "-c", crash], cwd=_REPO_ROOT,
+                         capture_output=True, text=True, check=False)
+    assert out.stdout.strip() == "[0, 1, 2, 3]"
+    survivor = dnd_roller._EntropyRing(path)
+    assert survivor.pop(6)[0] == [4, 5, 6, 7, 8, 9]
+    survivor.close()
+
+
+def test_ring_migrates_the_legacy_cache_and_replaces_a_corrupt_file(tmp_path):
+    legacy = tmp_path / "quant_numbers.bin"
+    legacy.write_bytes(struct.pack("H", 7) + b"\x00" + struct.pack("H", 9) + b"\x01")
+    path = tmp_path / "pool.bin"
+    ring = dnd_roller._EntropyRing(path, capacity=4, legacy_path=legacy)
+    assert not legacy.exists()
+    assert ring.pop(2) == ([7, 9], ["quantumnumbers", "random_org"])
+    ring.close()
+
+    path.write_bytes(b"garbage")
+    fresh = dnd_roller._EntropyRing(path, capacity=4)
+    assert len(fresh) == 0 and fresh.capacity == 4
+    fresh.close()
+
+
+def _run_workers(source: str, count: int) -> list[subprocess.CompletedProcess]:
+    procs = [subprocess.Popen([sys.executable, "-c", source], cwd=_REPO_ROOT,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+             for _ in range(count)]
+    results = []
+    for proc in procs:
+        stdout, stderr = proc.communicate(timeout=60)
+        results.append(subprocess.CompletedProcess(proc.args, proc.returncode, stdout, stderr))
+    return results
+
+
+def test_ring_hands_each_number_to_one_process(tmp_path):
+    path = tmp_path / "pool.bin"
+    ring = dnd_roller._EntropyRing(path, capacity=4096)
+    ring.push(list(range(4000)), "quantumnumbers")
+    ring.close()
+    worker = (
+        "import json; from pathlib import Path; from scripts import dnd_roller; "
+        f"ring = dnd_roller._EntropyRing(Path({str(path)!r})); got = []\n"
+        "while (taken := ring.pop(3)) is not None: got += taken[0]\n"
+        "print(json.dumps(got))"
+    )
+    results = _run_workers(worker, 4)
+    assert all(r.returncode == 0 for r in results), [r.stderr for r in results]
+    handed_out = [n for r in results for n in json.loads(r.stdout)]
+    assert sorted(handed_out) == list(range(3999))  # 4000 // 3 pops of 3, none twice
+
+
+def test_refill_is_fetched_by_one_process_at_a_time(tmp_path):
+    log = tmp_path / "fetches.log"
+    worker = (
+        "import asyncio, os, time; from pathlib import Path; from scripts import dnd_roller\n"
+        f"dnd_roller._pool = dnd_roller._EntropyRing(Path({str(tmp_path / 'pool.bin')!r}), capacity=2048)\n"
+        f"dnd_roller._refill_lock = dnd_roller._RefillLock(Path({str(tmp_path / 'refill.lock')!r}))\n"
+        "async def fetch(count):\n"
+        f"    with open({str(log)!r}, 'a') as f: f.write(f'{{os.getpid()}} {{time.time()}}\\n')\n"
+        "    await asyncio.sleep(0.3)\n"
+        "    return list(range(count))\n"
+        "dnd_roller._fetch_from_quantumnumbers = fetch\n"
+        "print(asyncio.run(dnd_roller._refill_once(10)))"
+    )
+    results = _run_workers(worker, 3)
+    outcomes = sorted(r.stdout.strip() for r in results)
+    assert outcomes == ["pool", "pool", "quantumnumbers"], [r.stderr for r in results]
+    # The first process refilled; the others waited on the lock and found the pool full.
+    assert len(log.read_text().splitlines()) == 1
+    assert float((tmp_path / "refill.lock").read_text()) > 0
+
+
+def _daemon(monkeypatch, **kwargs) -> dnd_roller._RefillDaemon:
+    daemon = dnd_roller._RefillDaemon(**kwargs)
+    monkeypatch.setattr(dnd_roller, "_refiller", daemon)
+    return daemon
+
+
+def test_refill_daemon_keeps_the_pool_between_watermarks(monkeypatch):
+    fetched: list[float] = []
+
+    async def fetch(count):
+        fetched.append(time.monotonic())
+        return list(range(32))
+
+    monkeypatch.setattr(dnd_roller, "_fetch_from_quantumnumbers", fetch)
+    daemon = _daemon(monkeypatch, low=8, high=30, idle_check=0.05)
+    try:
+        assert daemon.fill(timeout=10) == 32
+        dnd_roller._pool.pop(28)
+        # This roll leaves 3 (< low): it pokes the daemon, and never fetches itself.
+        assert json.loads(dnd_roller.roll_dice(1, 20))["source"] == "quantumnumbers"
+        assert len(fetched) == 1
+        deadline = time.monotonic() + 10
+        while len(dnd_roller._pool) < 30 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert len(dnd_roller._pool) == 35
+        assert fetched[1] - fetched[0] >= 0.95  # the 1 request/second rule
+        stats = json.loads(dnd_roller.dice_pool_stats())
+    finally:
+        daemon.stop()
+    assert stats["pool_depth"] == 35 and stats["running"] and not stats["down"]
+    assert (stats["refills"], stats["quantumnumbers"], stats["failed"]) == (2, 2, 0)
+    assert stats["refill_ms"]["count"] == 2
+    assert stats["roll_waits"] == 1  # fill()'s wait; the roll itself didn't wait
+
+
+def test_reload_teardown_stops_the_daemon_and_releases_the_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(dnd_roller, "_fetch_from_quantumnumbers", lambda count: asyncio.sleep(0, list(range(count))))
+    ring = dnd_roller._EntropyRing(tmp_path / "own.bin", capacity=64)
+    monkeypatch.setattr(dnd_roller, "_pool", ring)
+    daemon = _daemon(monkeypatch, low=8, high=30)
+    assert daemon.fill(timeout=10) >= 30
+    thread = daemon._thread
+    dnd_roller._mcp_reload_teardown()
+    assert not thread.is_alive()
+    assert dnd_roller._refiller is None and dnd_roller._pool is None
+    # A roll that already holds the ring keeps working; the ring closes once
+    # nobody holds it. A roll waiting on the stopped daemon gives up at once.
+    assert ring.pop(3)[1] == ["quantumnumbers"] * 3
+    started = time.monotonic()
+    assert daemon.wait_for(64, timeout=10) is False
+    assert time.monotonic() - started < 1
+    release = ring._release
+    del ring
+    gc.collect()
+    assert not release.alive
+
+
+def test_circuit_breaker_opens_backs_off_and_probes():
+    breaker = dnd_roller._CircuitBreaker("quantumnumbers", base=0.05, max_backoff=0.1)
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open" and not breaker.allow() and not breaker.available()
+    time.sleep(0.08)  # past 0.05s * jitter (at most 1.5x)
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()  # one probe at a time
+    breaker.record(False)
+    assert (breaker.state, breaker.failures, breaker.opened) == ("open", 2, 2)
+    assert 0.05 <= breaker.retry_at - time.monotonic() <= 0.15  # doubled, capped at 0.1 * 1.5
+    time.sleep(0.16)
+    assert breaker.allow()
+    breaker.record(True)
+    assert (breaker.state, breaker.failures) == ("closed", 0)
+
+    # Jittered: breakers that fail together don't all probe at the same moment.
+    herd = [dnd_roller._CircuitBreaker("random_org") for _ in range(5)]
+    for b in herd:
+        b.record(False)
+    assert len({round(b.retry_at, 4) for b in herd}) > 1
+
+
+def test_rolls_go_local_at_once_when_both_circuits_are_open(monkeypatch):
+    calls: list[str] = []
+
+    async def quantum(count):
+        calls.append("quantum")
+        return None
+
+    def random_org(count):
+        calls.append("random_org")
+        return []
+
+    monkeypatch.setattr(dnd_roller, "_fetch_from_quantumnumbers", quantum)
+    monkeypatch.setattr(dnd_roller, "_fetch_from_random_org_sync", random_org)
+    daemon = _daemon(monkeypatch, low=8, high=30)
+    try:
+        first = json.loads(dnd_roller.roll_dice(2, 20))  # one refill attempt opens both circuits
+        started = time.monotonic()
+        second = json.loads(dnd_roller.roll_dice(3, 6))
+        second_took = time.monotonic() - started
+        status = dnd_roller._entropy_status()
+    finally:
+        daemon.stop()
+    assert calls == ["quantum", "random_org"]  # no retries while the circuits are open
+    for result in (first, second):
+        assert result["source"] == "local"
+        assert not result["narrative"].startswith(dnd_roller._QUANTUM_MARKER)
+    assert second_took < 0.5
+    assert status["mode"] == "local" and status["down"]
+    assert {b["state"] for b in status["breakers"].values()} == {"open"}
+    assert status["local_numbers"] == 5 and status["failed"] == 1
+
+
+def test_roll_keeps_waiting_through_pop_races_until_one_deadline(monkeypatch):
+    _seed_cache([7, 8, 9])
+    pool, refiller = dnd_roller._pool, dnd_roller._refiller
+    real_pop = pool.pop
+    lost = {"races": 5}
+    timeouts: list[float] = []
+
+    def racy_pop(count):
+        if lost["races"]:
+            lost["races"] -= 1
+            return None  # another roll got there first
+        return real_pop(count)
+
+    def wait_for(count, timeout):
+        timeouts.append(timeout)
+        return True
+
+    monkeypatch.setattr(pool, "pop", racy_pop)
+    monkeypatch.setattr(refiller, "wait_for", wait_for)
+    numbers, sources = asyncio.run(dnd_roller._take_numbers(3))
+    assert numbers == [7, 8, 9] and sources == ["quantumnumbers"] * 3
+    assert len(timeouts) == 5 and timeouts == sorted(timeouts, reverse=True)
+    assert timeouts[0] <= dnd_roller._REFILL_WAIT_SEC
+
+    # Losing every race ends at the shared deadline, then rolls locally.
+    monkeypatch.setattr(dnd_roller, "_REFILL_WAIT_SEC", 0.2)
+    monkeypatch.setattr(pool, "pop", lambda count: None)
+    monkeypatch.setattr(refiller, "wait_for", lambda count, timeout: time.sleep(min(timeout, 0.05)) or True)
+    started = time.monotonic()
+    numbers, sources = asyncio.run(dnd_roller._take_numbers(2))
+    assert time.monotonic() - started < 0.5
+    assert sources == ["local", "local"] and refiller.snapshot()["local_numbers"] == 2
+
+
+def test_unconfigured_quantum_is_skipped_without_tripping(monkeypatch):
+    monkeypatch.delenv("QUANT_API_KEY")
+    monkeypatch.setattr(dnd_roller, "_fetch_from_random_org_sync", lambda count: list(range(count)))
+    assert asyncio.run(dnd_roller._refill_once(10)) == "random_org"
+    status = dnd_roller._entropy_status()
+    assert status["breakers"]["quantumnumbers"] == {"state": "unconfigured"}
+    assert status["mode"] == "random_org"
+
+
+def test_dominant_source_is_the_weakest():
+    assert dnd_roller._dominant_source(["quantumnumbers"] * 2) == "quantumnumbers"
+    assert dnd_roller._dominant_source(["quantumnumbers", "random_org"]) == "random_org"
+    assert dnd_roller._dominant_source(["random_org", "local", "quantumnumbers"]) == "local"
+
+
+def test_dice_bench_reports_pops_per_second():
+    from scripts import dice_bench
+
+    report = dice_bench.run_benchmark(pops=200, sizes=(1, 3))
+    for row in report["sizes"].values():
+        assert row["ring_pops_per_s"] > 0 and row["flat_file_pops_per_s"] > 0
+    assert "ring pops/s" in dice_bench.format_report(report)
 
 
 def test_roll_dice_returns_required_json_fields():
@@ -202,6 +494,59 @@ def test_combat_action_upsert_non_dict_spec_returns_ok_false():
     assert "error" in result
 
 
+# ───────────────────────── roll_batch ────────────────────────────
+
+def _count_pops(monkeypatch) -> list[int]:
+    pops: list[int] = []
+    real_pop = dnd_roller._pool.pop
+
+    def pop(count):
+        pops.append(count)
+        return real_pop(count)
+
+    monkeypatch.setattr(dnd_roller._pool, "pop", pop)
+    return pops
+
+
+def test_roll_batch_draws_once_and_logs_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(dnd_roller, "_REPO_ROOT", tmp_path)
+    _seed_cache([19, 4], source="quantumnumbers")
+    _seed_cache([0, 5, 7], source="random_org")
+    pops = _count_pops(monkeypatch)
+    writes: list[int] = []
+    real_write = dnd_roller._append_log_entries
+    monkeypatch.setattr(dnd_roller, "_append_log_entries",
+                        lambda path, entries: (writes.append(len(entries)), real_write(path, entries)))
+
+    out = json.loads(dnd_roller.roll_batch([
+        {"num_dice": 2, "dice_size": 20, "bonuses": [1, 2], "description": "Goblin initiative"},
+        {"num_dice": 3, "dice_size": 6, "modifier": -1, "description": "Wolf bite"},
+    ], log_path="log.md"))
+
+    assert pops == [5] and writes == [2]
+    first, second = out["results"]
+    assert out["count"] == 2
+    assert first["rolls"] == [20, 5] and first["rolls_with_bonuses"] == [21, 7]
+    assert first["source"] == "quantumnumbers" and first["narrative"].startswith(dnd_roller._QUANTUM_MARKER)
+    assert second["rolls"] == [1, 6, 2] and second["total_with_bonuses"] == 8
+    assert second["source"] == "random_org" and second["logged"]
+    log = (tmp_path / "log.md").read_text(encoding="utf-8").splitlines()
+    assert [line.split("**")[1] for line in log if line.startswith("- ")] == ["Goblin initiative", "Wolf bite"]
+
+
+@pytest.mark.parametrize("groups, message", [
+    ([], "non-empty"),
+    ([{"num_dice": 1, "dice_size": 20}, {"num_dice": 1, "dice_size": 7}], "groups[1]: dice_size"),
+    ([{"num_dice": 1, "dice_size": 20, "sides": 20}], "unknown keys ['sides']"),
+    ([{"num_dice": 100, "dice_size": 6}] * 11, "at most 1000 dice"),
+])
+def test_roll_batch_rejects_bad_groups_before_drawing(groups, message):
+    _seed_cache([1, 2, 3])
+    with pytest.raises(ValueError, match=re.escape(message)):
+        dnd_roller.roll_batch(groups)
+    assert len(dnd_roller._pool) == 3
+
+
 # ───────────────────────── combat action runner ────────────────────────────
 
 def _run_action(monkeypatch, tmp_path, npc, action, spec):
@@ -285,6 +630,29 @@ def test_extra_damage_folded_into_total(monkeypatch, tmp_path):
     assert "fire" in result["output"]
 
 
+def test_multiattack_is_one_pool_pop(monkeypatch, tmp_path):
+    """Every to-hit, damage and extra_damage roll of a multiattack comes from one pop."""
+    _seed_cache(list(range(20)))
+    pops = _count_pops(monkeypatch)
+    claw = {"name": "Claw", "to_hit_bonus": 4, "damage": "1d6", "damage_type": "slashing"}
+    result = _run_action(
+        monkeypatch, tmp_path, "owlbear", "multiattack",
+        {
+            "type": "multiattack",
+            "narration": "rend",
+            "attacks": [
+                {**claw, "extra_damage": {"dice": "1d4", "type": "cold"}},
+                {**claw, "name": "Beak", "damage": "1d10"},
+            ],
+        },
+    )
+    assert "error" not in result
+    assert pops == [2 + 1 + 1 + 1]
+    # Numbers are dealt in group order: to-hits, then each attack's damage and rider.
+    assert "Claw       to-hit   5 / dmg   7 slashing  (incl +4 cold extra_damage)" in result["output"]
+    assert "Beak       to-hit   6 / dmg   5 slashing" in result["output"]
+
+
 def test_area_action_emits_save_rolls_sidecar(monkeypatch, tmp_path):
     """An area/save action returns a structured `rolls` sidecar for the GUI's
     didn't-land lifecycle, alongside the unchanged Markdown `output`."""
@@ -0,0 +1,157 @@
+"""JSON-RPC batch and result encoding tests for scripts/mcp/server.py.
+
+Covers:
+- a batch's members dispatch concurrently and come back as one array in
+  request order; notifications and cancelled calls are left out, and an
+  all-notification batch gets no reply.
+- invalid batches / members get -32600.
+- tool results are encoded compactly.
+- a result over the page size comes back as its first page plus resource
+  links, readable through resources/read until evicted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from _server_helpers import server, tool_runner
+
+
+@pytest.fixture
+def frames(monkeypatch):
+    written = []
+
+    def write_frame(body):
+        written.append(json.loads(body))
+        return len(body)
+
+    monkeypatch.setattr(server, "_write_frame", write_frame)
+    return written
+
+
+def _serve(executor, monkeypatch, messages, runners):
+    incoming = iter([*messages, None])
+    monkeypatch.setattr(server, "_read_message", lambda: next(incoming))
+    return server._serve_loop(runners, executor)
+
+
+def _call(msg_id, name, **arguments):
+    return {"jsonrpc": "2.0", "id": msg_id, "method": "tools/call", "params": {"name": name, "arguments": arguments}}
+
+
+def test_batch_members_run_concurrently_and_reply_in_order(frames, executor, monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(**arguments):
+        barrier.wait()  # only returns once both calls are running at once
+        return arguments["who"]
+
+    async def quick(**arguments):
+        return {"quick": True}
+
+    runners = {"meet": tool_runner("meet", meet), "quick": tool_runner("quick", async_handler=quick)}
+    batch = [
+        _call("a", "meet", who="first"),
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        _call("b", "quick"),
+        _call("c", "meet", who="second"),
+        _call("d", "missing"),
+        7,
+    ]
+    started = time.monotonic()
+    assert _serve(executor, monkeypatch, [batch], runners) == 0
+    assert time.monotonic() - started < 5
+
+    [reply] = frames
+    assert [m["id"] for m in reply] == ["a", "b", "c", "d", None]
+    assert reply[0]["result"]["content"][0]["text"] == "first"
+    assert reply[1]["result"]["content"][0]["text"] == '{"quick":true}'
+    assert reply[2]["result"]["content"][0]["text"] == "second"
+    assert reply[3]["error"]["message"] == "Unknown tool: missing"
+    assert reply[4]["error"]["code"] == -32600
+
+
+def test_batch_without_responses_and_empty_batch(frames, executor, monkeypatch):
+    notes = [{"jsonrpc": "2.0", "method": "notifications/initialized"},
+             {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 9}}]
+    _serve(executor, monkeypatch, [notes, []], {})
+    assert frames == [{"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}}]
+
+
+def test_cancelled_batch_member_is_left_out(frames, executor, monkeypatch):
+    started = threading.Event()
+
+    async def hang(**arguments):
+        started.set()
+        await asyncio.sleep(30)
+
+    incoming = iter([
+        [_call(1, "hang"), _call(2, "quick")],
+        "wait",
+        {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1}},
+        None,
+    ])
+
+    def read_message():
+        frame = next(incoming)
+        if frame == "wait":
+            started.wait(5)
+            frame = next(incoming)
+        return frame
+
+    monkeypatch.setattr(server, "_read_message", read_message)
+    runners = {"hang": tool_runner("hang", async_handler=hang), "quick": tool_runner("quick", lambda **_: "ok")}
+    server._serve_loop(runners, executor)
+    assert [[m["id"] for m in frame] for frame in frames] == [[2]]
+
+
+def test_results_are_compact():
+    assert server._format_result({"a": [1, 2], "b": "é"}) == '{"a":[1,2],"b":"é"}'
+    assert server._encode_message({"id": 1, "x": None}) == b'{"id":1,"x":null}'
+
+
+def test_split_pages_prefers_line_breaks():
+    text = "".join(f"line {n:03d}\n" for n in range(30))  # 9 chars per line
+    pages = server._split_pages(text, 40)
+    assert "".join(pages) == text
+    assert all(len(page) <= 40 and page.endswith("\n") for page in pages)
+    assert server._split_pages("x" * 25, 10) == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_oversized_result_is_paged(frames, executor, monkeypatch):
+    monkeypatch.setattr(server, "_RESULT_PAGE_CHARS", 1000)
+    monkeypatch.setattr(server, "_result_pages", server._ResultPages(keep=1))
+    report = "".join(f"row {n:04d} {'x' * 40}\n" for n in range(70))
+    runners = {"report": tool_runner("report", lambda **_: report), "small": tool_runner("small", lambda **_: "tiny")}
+    _serve(executor, monkeypatch, [_call(1, "report"), _call(2, "small")], runners)
+
+    content = {m["id"]: m["result"]["content"] for m in frames}
+    assert content[2] == [{"type": "text", "text": "tiny"}]
+    first, *links = content[1]
+    assert first["text"].startswith("row 0000") and "[page 1 of 4;" in first["text"]
+    assert [link["name"] for link in links] == [f"report result, page {n} of 4" for n in (2, 3, 4)]
+
+    frames.clear()
+    reads = [{"jsonrpc": "2.0", "id": n, "method": "resources/read", "params": {"uri": link["uri"]}}
+             for n, link in enumerate(links)]
+    stale = links[0]["uri"].rsplit("/", 1)[0] + "/9"
+    _serve(executor, monkeypatch, [
+        {"jsonrpc": "2.0", "id": "list", "method": "resources/list"},
+        *reads,
+        {"jsonrpc": "2.0", "id": "stale", "method": "resources/read", "params": {"uri": stale}},
+    ], runners)
+    by_id = {m["id"]: m for m in frames}
+    assert [r["uri"] for r in by_id["list"]["result"]["resources"]] == [link["uri"] for link in links]
+    pages = [by_id[n]["result"]["contents"][0]["text"] for n in range(len(links))]
+    assert first["text"].split("\n[page")[0] + "".join(pages) == report
+    assert by_id["stale"]["error"]["code"] == -32002
+
+    # Only the newest result stays readable.
+    pager = server._result_pages
+    pager.store("other", ["one", "two"])
+    assert pager.read(links[0]["uri"]) is None
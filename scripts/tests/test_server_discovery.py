@@ -8,11 +8,18 @@ Covers:
   (the A2-L7 / A4-L3 fix).
 - _extract_mcp_tool_literal returns a literal for a well-formed module and
   None for a module without an MCP_TOOL.
+- The discovery cache: a warm run parses nothing and finds the same tools; a
+  touched file is re-scanned alone; deleted files drop out of the cache.
+- Lazy import: with a warm cache, MCP_HANDLERS modules are advertised from the
+  cached schemas and imported on first call (or by the warm-up); a changed
+  sibling dependency forces the eager import again.
 """
 
 from __future__ import annotations
 
 import importlib.util
+import json
+import os
 import sys
 from pathlib import Path
 
@@ -175,3 +182,118 @@ def test_extract_mcp_tool_literal_none_without_tool(tmp_path):
         _NO_TOOL_MODULE, path=tmp_path / "plain.py"
     )
     assert literal is None
+
+
+def test_warm_discovery_reads_cache_and_skips_parsing(tmp_path):
+    repo = _make_repo(tmp_path)
+    (repo / "scripts" / "beta_subproc.py").write_text(_AST_ONLY_MODULE, encoding="utf-8")
+    (repo / "scripts" / "plain.py").write_text(_NO_TOOL_MODULE, encoding="utf-8")
+
+    cold = server.discover_tools(repo_root=repo)
+    assert (cold.stats["parsed"], cold.stats["cached"]) == (2, 0)
+    assert (repo / ".cache" / "mcp_discovery.json").exists()
+
+    warm = server.discover_tools(repo_root=repo)
+    assert (warm.stats["parsed"], warm.stats["cached"]) == (0, 2)
+    assert [r.tool for r in warm.tools] == [r.tool for r in cold.tools]
+    assert [reason for _, reason in warm.skipped] == ["no MCP_TOOL"]
+
+
+def test_discovery_cache_invalidates_per_file(tmp_path):
+    repo = _make_repo(tmp_path)
+    beta = repo / "scripts" / "beta_subproc.py"
+    beta.write_text(_AST_ONLY_MODULE, encoding="utf-8")
+    plain = repo / "scripts" / "plain.py"
+    plain.write_text(_NO_TOOL_MODULE, encoding="utf-8")
+    server.discover_tools(repo_root=repo)
+
+    beta.write_text(_AST_ONLY_MODULE.replace("sample_subproc", "renamed"), encoding="utf-8")
+    st = beta.stat()
+    os.utime(beta, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    plain.unlink()
+    result = server.discover_tools(repo_root=repo)
+
+    assert (result.stats["parsed"], result.stats["cached"]) == (1, 0)
+    assert [r.tool.name for r in result.tools] == ["renamed"]
+    files = json.loads((repo / ".cache" / "mcp_discovery.json").read_text())["files"]
+    assert list(files) == ["beta_subproc.py"]
+
+
+def test_discovery_cache_can_be_disabled(tmp_path, monkeypatch):
+    repo = _make_repo(tmp_path)
+    (repo / "scripts" / "beta_subproc.py").write_text(_AST_ONLY_MODULE, encoding="utf-8")
+    monkeypatch.setenv("DND_MCP_DISCOVERY_CACHE", "off")
+
+    server.discover_tools(repo_root=repo)
+    result = server.discover_tools(repo_root=repo)
+    assert result.stats["parsed"] == 1 and result.stats["cache"] is None
+    assert not (repo / ".cache").exists()
+
+
+_COUNTING_INPROC_MODULE = '''\
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import {dep}  # noqa: E402
+
+with open(__file__ + ".imports", "a") as fh:
+    fh.write("x")
+
+MCP_TOOLS = [{{
+    "name": "counted",
+    "description": {dep}.DESCRIPTION,
+    "input_schema": {{"type": "object", "properties": {{"n": {{"type": "integer"}}}}}},
+}}]
+
+MCP_HANDLERS = {{"counted": lambda n=0: {{"n": n}}}}
+'''
+
+
+def _counting_repo(tmp_path, monkeypatch, dep):
+    repo = _make_repo(tmp_path)
+    (repo / "scripts" / f"{dep}.py").write_text('DESCRIPTION = "Counts imports."\n', encoding="utf-8")
+    module = repo / "scripts" / "counting.py"
+    module.write_text(_COUNTING_INPROC_MODULE.format(dep=dep), encoding="utf-8")
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.delitem(sys.modules, dep, raising=False)
+    return repo, module
+
+
+def _imports(module):
+    path = Path(f"{module}.imports")
+    return len(path.read_text()) if path.exists() else 0
+
+
+def test_handler_modules_import_lazily_on_warm_start(tmp_path, monkeypatch):
+    repo, module = _counting_repo(tmp_path, monkeypatch, "lazy_dep_a")
+    cold = server.discover_tools(repo_root=repo)
+    assert (cold.stats["imported"], _imports(module)) == (1, 1)
+
+    warm = server.discover_tools(repo_root=repo)
+    assert (warm.stats["imported"], warm.stats["deferred"]) == (0, 1)
+    (runner,) = [r for r in warm.tools if r.tool.name == "counted"]
+    assert runner.tool.description == "Counts imports."
+    assert _imports(module) == 1
+
+    assert json.loads(runner.run(arguments={"n": 3})) == {"n": 3}
+    runner.run(arguments={})
+    assert _imports(module) == 2
+
+    again = server.discover_tools(repo_root=repo)
+    server._warm_modules(server._lazy_modules(again.tools))
+    assert _imports(module) == 3
+
+
+def test_changed_dependency_forces_eager_import(tmp_path, monkeypatch):
+    repo, module = _counting_repo(tmp_path, monkeypatch, "lazy_dep_b")
+    server.discover_tools(repo_root=repo)
+    dep = repo / "scripts" / "lazy_dep_b.py"
+    dep.write_text('DESCRIPTION = "Counts imports, again."\n', encoding="utf-8")
+    monkeypatch.delitem(sys.modules, "lazy_dep_b")
+
+    result = server.discover_tools(repo_root=repo)
+    assert (result.stats["imported"], result.stats["deferred"]) == (1, 0)
+    assert [r.tool.description for r in result.tools if r.tool.name == "counted"] == [
+        "Counts imports, again.",
+    ]
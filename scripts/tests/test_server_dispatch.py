@@ -0,0 +1,356 @@
+"""asyncio dispatch tests for scripts/mcp/server.py (_Dispatcher / _serve).
+
+Covers:
+- coroutine handlers are awaited on the serve loop; sync ones run on the pool.
+- per-tool and per-group concurrency caps.
+- latency lanes: batch calls can't take the interactive reserve, and a freed
+  thread goes to a waiting interactive call first. A lazy tool's first-call
+  import waits for its lane too; coroutine handlers are counted per lane.
+- notifications/cancelled: the call's task is cancelled, no response is sent,
+  and a subprocess tool's process is killed.
+- backpressure: a call past the in-flight cap waits briefly for a slot, then
+  is rejected with "Server busy".
+- dnd_roller exposes coroutine twins of its rolling tools.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+
+from _server_helpers import SCRIPTS_DIR, SERVER_PATH, server, tool_runner
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    messages = []
+    monkeypatch.setattr(server, "_write_message", messages.append)
+    return messages
+
+
+def _by_id(messages):
+    return {m["id"]: m for m in messages if "id" in m}
+
+
+def _text(message):
+    return message["result"]["content"][0]["text"]
+
+
+def test_async_handlers_run_on_the_loop(sent, executor):
+    threads = []
+
+    async def roll(**arguments):
+        threads.append(threading.current_thread())
+        await asyncio.sleep(0)
+        return {"rolled": arguments["n"]}
+
+    def lookup(**arguments):
+        threads.append(threading.current_thread())
+        return "looked up"
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor)
+        dispatcher.submit(1, tool_runner("roll", async_handler=roll), {"n": 3})
+        dispatcher.submit(2, tool_runner("lookup", lookup), {})
+        await dispatcher.drain()
+
+    asyncio.run(scenario())
+    replies = _by_id(sent)
+    assert '"rolled":3' in _text(replies[1])
+    assert _text(replies[2]) == "looked up"
+    assert threads[0] is threading.main_thread() and threads[1] is not threading.main_thread()
+
+
+def _tracking_handler(active, peak, lock, delay=0.1):
+    def handler(**arguments):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(delay)
+        with lock:
+            active[0] -= 1
+        return "ok"
+
+    return handler
+
+
+def test_tool_and_group_caps(sent, executor):
+    lock = threading.Lock()
+    slow_active, slow_peak = [0], [0]
+    group_active, group_peak = [0], [0]
+    slow = tool_runner("slow", _tracking_handler(slow_active, slow_peak, lock), concurrency=2)
+    grouped = [
+        tool_runner(f"combat_{i}", _tracking_handler(group_active, group_peak, lock), groups=("combat",))
+        for i in range(3)
+    ]
+    quick = tool_runner("quick", lambda **_: "quick")
+    finished = {}
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor, tool_limit=8, group_limits={"combat": 1})
+        for i in range(6):
+            dispatcher.submit(f"slow{i}", slow, {})
+        for i, runner in enumerate(grouped):
+            dispatcher.submit(f"combat{i}", runner, {})
+        started = time.monotonic()
+        dispatcher.submit("quick", quick, {})
+        while not any(m.get("id") == "quick" for m in sent):
+            await asyncio.sleep(0.005)
+        finished["quick"] = time.monotonic() - started
+        await dispatcher.drain()
+
+    asyncio.run(scenario())
+    assert slow_peak[0] == 2 and group_peak[0] == 1
+    assert len(_by_id(sent)) == 10
+    assert finished["quick"] < 0.1  # didn't wait behind the slow tool's backlog
+
+
+def test_lane_derivation():
+    assert tool_runner("roll", groups=("combat", "all")).lane == "interactive"
+    assert tool_runner("report", groups=("all",)).lane == "batch"
+    assert tool_runner("export").lane == "batch"
+    assert tool_runner("roll", groups=("combat",), lane="batch").lane == "batch"
+    entry = {"name": "x", "lane": "urgent"}
+    with pytest.raises(ValueError, match="lane"):
+        server._tools_from_mcp_tool(path=SERVER_PATH, mcp_tool=entry)
+
+
+def test_batch_calls_leave_the_interactive_reserve(sent, executor):
+    lock = threading.Lock()
+    active, peak = [0], [0]
+    gate = threading.Event()
+
+    def report(**arguments):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        gate.wait(5)
+        with lock:
+            active[0] -= 1
+        return "report"
+
+    batch = tool_runner("report", report)
+    interactive = tool_runner("lookup", lambda **_: "lookup", groups=("combat",))
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor, tool_limit=8, threads=3, interactive_reserved=1)
+        for i in range(4):
+            dispatcher.submit(f"b{i}", batch, {})
+        await asyncio.sleep(0.1)
+        dispatcher.submit("i", interactive, {})
+        while not any(m.get("id") == "i" for m in sent):
+            await asyncio.sleep(0.005)
+        gate.set()
+        await dispatcher.drain()
+        return dispatcher.lane_stats()
+
+    lanes = asyncio.run(scenario())
+    assert peak[0] == 2
+    assert [m["id"] for m in sent][0] == "i"
+    assert lanes["interactive"]["queue_wait_ms"]["count"] == 1
+    assert lanes["batch"]["queue_wait_ms"]["count"] == 4
+    assert lanes["batch"]["queue_wait_ms"]["max"] >= 100
+
+
+def test_freed_thread_goes_to_interactive_first(sent, executor):
+    gate = threading.Event()
+    order = []
+
+    def first(**arguments):
+        gate.wait(5)
+        order.append("first")
+        return "first"
+
+    def record(name):
+        def handler(**arguments):
+            order.append(name)
+            return name
+        return handler
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor, tool_limit=8, threads=1, interactive_reserved=0)
+        dispatcher.submit(1, tool_runner("first", first, lane="interactive"), {})
+        await asyncio.sleep(0.05)
+        dispatcher.submit(2, tool_runner("batch", record("batch")), {})
+        dispatcher.submit(3, tool_runner("roll", record("roll"), lane="interactive"), {})
+        await asyncio.sleep(0.05)
+        gate.set()
+        await dispatcher.drain()
+
+    asyncio.run(scenario())
+    assert order == ["first", "roll", "batch"]
+
+
+_SLOW_IMPORT = '''
+import time
+import {probe} as probe
+
+probe.importing(+1)
+time.sleep(0.1)
+probe.importing(-1)
+
+async def roll(**arguments):
+    return probe.on_loop()
+
+def report(**arguments):
+    return "report"
+
+MCP_HANDLERS = {{"roll": roll, "report": report}}
+'''
+
+
+def test_lazy_imports_take_a_lane_thread(sent, executor, tmp_path, monkeypatch):
+    lock = threading.Lock()
+    importing, peak = [0], [0]
+    dispatchers = []
+
+    def track(delta):
+        with lock:
+            importing[0] += delta
+            peak[0] = max(peak[0], importing[0])
+
+    probe = type(sys)("_dispatch_lane_probe")
+    probe.importing = track
+    probe.on_loop = lambda: dispatchers[0].lane_stats()["batch"]["on_loop"]
+    monkeypatch.setitem(sys.modules, probe.__name__, probe)
+    runners = []
+    for i in range(4):
+        path = tmp_path / f"lazy_{i}.py"
+        path.write_text(_SLOW_IMPORT.format(probe=probe.__name__), encoding="utf-8")
+        monkeypatch.delitem(sys.modules, f"_mcp_script_lazy_{i}", raising=False)
+        module = server._LazyModule(path)
+        name = "roll" if i == 0 else "report"
+        runners.append(tool_runner(f"{name}_{i}", server._LazyHandler(module, name), lane="batch"))
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor, tool_limit=8, threads=3, interactive_reserved=1)
+        dispatchers.append(dispatcher)
+        for i, runner in enumerate(runners):
+            dispatcher.submit(i, runner, {})
+        await dispatcher.drain()
+        return dispatcher.lane_stats()
+
+    lanes = asyncio.run(scenario())
+    assert peak[0] == 2  # the batch lane's two threads, not all eight
+    assert _text(_by_id(sent)[0]) == "1"  # counted against its lane while running
+    assert lanes["batch"]["on_loop"] == 0 and lanes["batch"]["queue_wait_ms"]["count"] == 4
+
+
+def test_cancelled_call_gets_no_response(sent, executor):
+    started = asyncio.Event()
+
+    async def hang(**arguments):
+        started.set()
+        await asyncio.sleep(30)
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor)
+        dispatcher.submit(1, tool_runner("hang", async_handler=hang), {})
+        dispatcher.submit(2, tool_runner("hang", async_handler=hang), {})
+        await started.wait()
+        assert dispatcher.cancel(1) and dispatcher.cancel(2)
+        assert not dispatcher.cancel(99)
+        await dispatcher.drain()
+        return dispatcher.stats
+
+    stats = asyncio.run(scenario())
+    assert sent == []
+    assert stats["cancelled"] == 2
+
+
+def test_cancel_kills_a_subprocess_tool(sent, executor, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "_script_pool", None)
+    marker = tmp_path / "finished"
+    script = tmp_path / "slow.py"
+    script.write_text(
+        f"import time, pathlib\ntime.sleep(5)\npathlib.Path({str(marker)!r}).write_text('x')\n",
+        encoding="utf-8",
+    )
+    runner = server.ToolRunner(
+        tool=server.Tool(name="slow", description="", input_schema={}),
+        script_path=script, argv_template=(), bool_flags={}, value_flags={},
+    )
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor)
+        dispatcher.submit(7, runner, {})
+        await asyncio.sleep(0.5)
+        started = time.monotonic()
+        dispatcher.cancel(7)
+        await dispatcher.drain()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed < 2
+    assert sent == []
+    time.sleep(0.2)
+    assert not marker.exists()
+
+
+def test_backpressure_queues_then_rejects(sent, executor):
+    release = asyncio.Event()
+
+    async def blocker(**arguments):
+        await release.wait()
+        return "done"
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor, inflight_limit=1, queue_wait=0.2)
+        runner = tool_runner("blocker", async_handler=blocker)
+        dispatcher.submit(1, runner, {})
+        dispatcher.submit(2, runner, {})  # waits 0.2s, then busy
+        await asyncio.sleep(0.4)
+        dispatcher.submit(3, runner, {})  # gets the slot once 1 finishes
+        await asyncio.sleep(0.05)
+        release.set()
+        await dispatcher.drain()
+        return dispatcher.stats
+
+    stats = asyncio.run(scenario())
+    replies = _by_id(sent)
+    assert _text(replies[1]) == "done" and _text(replies[3]) == "done"
+    assert replies[2]["error"]["message"].startswith("Server busy")
+    assert (stats["queued"], stats["rejected"]) == (2, 1)
+
+
+def test_serve_loop_handles_cancel_notifications(sent, executor, monkeypatch):
+    started = threading.Event()
+
+    async def hang(**arguments):
+        started.set()
+        await asyncio.sleep(30)
+
+    frames = iter([
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "hang", "arguments": {}}},
+        "wait",
+        {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1}},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "quick", "arguments": {}}},
+        None,
+    ])
+
+    def read_message():
+        frame = next(frames)
+        if frame == "wait":
+            started.wait(5)
+            frame = next(frames)
+        return frame
+
+    monkeypatch.setattr(server, "_read_message", read_message)
+    runners = {"hang": tool_runner("hang", async_handler=hang), "quick": tool_runner("quick", lambda **_: "quick")}
+    assert server._serve_loop(runners, executor) == 0
+    assert [m["id"] for m in sent] == [2]
+
+
+def test_dnd_roller_exposes_async_twins():
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    import dnd_roller
+
+    assert set(dnd_roller.MCP_ASYNC_HANDLERS) <= set(dnd_roller.MCP_HANDLERS)
+    for name, handler in dnd_roller.MCP_ASYNC_HANDLERS.items():
+        assert server._async_handler_for(dnd_roller, name) is handler
+    assert server._async_handler_for(dnd_roller, "log_combat_event") is None
@@ -0,0 +1,129 @@
+"""Per-tool latency metrics and trace log tests for scripts/mcp/server.py.
+
+Covers:
+- every call records queue wait, handler time, serialization time and response
+  size; server_stats reports rolling percentiles per tool, plus error counts.
+- DND_MCP_TRACE's JSONL log: one nestable async span per call with queue /
+  handler / serialize children, and `--trace-to-chrome` wraps it for viewers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from _server_helpers import server, tool_runner
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    messages = []
+
+    def write(payload):
+        messages.append(payload)
+        time.sleep(0.01)
+        return len(json.dumps(payload).encode("utf-8"))
+
+    monkeypatch.setattr(server, "_write_message", write)
+    return messages
+
+
+def _dispatch(executor, calls, **kwargs):
+    async def scenario():
+        dispatcher = server._Dispatcher(executor, **kwargs)
+        for msg_id, runner in calls:
+            dispatcher.submit(msg_id, runner, {})
+        await dispatcher.drain()
+        return dispatcher
+
+    return asyncio.run(scenario())
+
+
+def test_rolling_percentiles():
+    stats = server._RollingStats(window=100)
+    for value in range(1, 201):
+        stats.add(value)
+    assert stats.summary() == {"count": 200, "p50": 151, "p95": 196, "p99": 200, "max": 200}
+
+
+def test_per_tool_histograms(sent, executor):
+    def slow(**arguments):
+        time.sleep(0.05)
+        return "x" * 500
+
+    async def quick(**arguments):
+        return "ok"
+
+    def broken(**arguments):
+        raise RuntimeError("boom")
+
+    calls = [(i, tool_runner("slow", slow)) for i in range(3)]
+    calls += [(10 + i, tool_runner("quick", async_handler=quick)) for i in range(2)]
+    calls += [(20, tool_runner("broken", broken))]
+    tools = _dispatch(executor, calls).tool_stats()
+
+    assert list(tools) == ["broken", "quick", "slow"]
+    slow_stats = tools["slow"]
+    assert (slow_stats["calls"], slow_stats["errors"]) == (3, 0)
+    assert slow_stats["handler_ms"]["count"] == 3 and slow_stats["handler_ms"]["p50"] >= 45
+    assert slow_stats["serialize_ms"]["p50"] >= 9
+    assert slow_stats["payload_bytes"]["max"] > 500
+    assert slow_stats["queue_ms"]["count"] == 3
+    assert tools["quick"]["handler_ms"]["p99"] < 45
+    assert (tools["broken"]["calls"], tools["broken"]["errors"]) == (1, 1)
+    assert tools["broken"]["payload_bytes"]["count"] == 1  # the error reply is still sent
+
+
+def test_server_stats_includes_tools(sent, executor, monkeypatch):
+    dispatcher = _dispatch(executor, [(1, tool_runner("lookup", lambda **_: "found"))])
+    monkeypatch.setattr(server, "_dispatcher", dispatcher)
+    monkeypatch.setattr(server, "_result_cache", None)
+    monkeypatch.setattr(server, "_script_pool", None)
+    discovery = server.DiscoveryResult(tools=(), skipped=(), stats={})
+    stats = json.loads(server._server_stats_runner(discovery).run(arguments={}))
+    assert set(stats["tools"]["lookup"]) == {
+        "calls", "errors", "queue_ms", "handler_ms", "serialize_ms", "payload_bytes",
+    }
+
+
+def test_trace_log_spans(sent, executor, tmp_path, monkeypatch):
+    path = tmp_path / "traces" / "mcp.jsonl"
+    trace = server._TraceLog(path)
+
+    async def hang(**arguments):
+        await asyncio.sleep(30)
+
+    async def scenario():
+        dispatcher = server._Dispatcher(executor, trace=trace)
+        dispatcher.submit("a", tool_runner("lookup", lambda **_: "found"), {})
+        dispatcher.submit("b", tool_runner("hang", async_handler=hang), {})
+        await asyncio.sleep(0.05)
+        dispatcher.cancel("b")
+        await dispatcher.drain()
+
+    asyncio.run(scenario())
+    trace.close()
+    events = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    by_id: dict[int, list[dict]] = {}
+    for event in events:
+        by_id.setdefault(event["id"], []).append(event)
+    spans = {group[0]["name"]: group for group in by_id.values()}
+
+    lookup = spans["lookup"]
+    assert [(e["name"], e["ph"]) for e in lookup] == [
+        ("lookup", "b"), ("queue", "b"), ("queue", "e"), ("handler", "b"), ("handler", "e"),
+        ("serialize", "b"), ("serialize", "e"), ("lookup", "e"),
+    ]
+    assert lookup[0]["args"]["request_id"] == "a" and lookup[0]["args"]["payload_bytes"] > 0
+    assert [e["ts"] for e in lookup] == sorted(e["ts"] for e in lookup)
+    assert {e["cat"] for e in lookup} == {"batch"}
+
+    hung = spans["hang"]
+    assert hung[0]["args"]["outcome"] == "cancelled"
+    assert "serialize" not in {e["name"] for e in hung}
+
+    chrome = server._trace_to_chrome(path)
+    assert chrome["traceEvents"] == events and chrome["displayTimeUnit"] == "ms"
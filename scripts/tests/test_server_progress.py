@@ -0,0 +1,96 @@
+"""Progress protocol tests for scripts/mcp/server.py + scripts/mcp_progress.py.
+
+Covers:
+- progress lines are parsed, stripped from the reported stderr and handed to the
+  relay while the child runs; ordinary stderr still comes back as warnings.
+- DND_MCP_TOOL_TIMEOUT is an inactivity timeout: a child that keeps reporting
+  outlives it, a silent one is killed.
+- notifications/progress values always increase, even for message-only updates.
+- report_progress is a no-op outside the server.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from _server_helpers import SCRIPTS_DIR, server
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import mcp_progress
+
+
+def _child(tmp_path: Path, body: str) -> Path:
+    script = tmp_path / "child.py"
+    script.write_text(
+        "import sys, time\n"
+        f"sys.path.insert(0, {str(SCRIPTS_DIR)!r})\n"
+        "from mcp_progress import report_progress\n" + body,
+        encoding="utf-8",
+    )
+    return script
+
+
+def test_parse_progress_line():
+    assert server._parse_progress_line(
+        '@@mcp-progress {"progress": 2, "total": 5, "message": "two"}'
+    ) == {"progress": 2, "total": 5, "message": "two"}
+    assert server._parse_progress_line('@@mcp-progress {"progress": true, "message": ""}') == {}
+    assert server._parse_progress_line("@@mcp-progress not json") is None
+    assert server._parse_progress_line("plain warning") is None
+    assert server._PROGRESS_PREFIX == mcp_progress.PREFIX
+
+
+def test_progress_is_streamed_and_stripped_from_stderr(tmp_path):
+    script = _child(tmp_path, (
+        "for i in range(3):\n"
+        "    report_progress(i, 3, f'step {i}')\n"
+        "print('warning: skipped a row', file=sys.stderr)\n"
+        "print('done')\n"
+    ))
+    events = []
+    out = server._run_script(script, [], progress=events.append)
+    assert events == [{"progress": i, "total": 3, "message": f"step {i}"} for i in range(3)]
+    assert out == "done\n\n[warnings from child.py]\nwarning: skipped a row"
+
+
+def test_timeout_counts_from_latest_progress(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "_TOOL_TIMEOUT_SEC", 1)
+    chatty = _child(tmp_path, (
+        "for i in range(6):\n"
+        "    report_progress(message=f'tick {i}')\n"
+        "    time.sleep(0.3)\n"
+        "print('finished')\n"
+    ))
+    assert server._run_script(chatty, []) == "finished"
+
+    silent = _child(tmp_path, "time.sleep(5)\n")
+    with pytest.raises(RuntimeError, match="without reporting progress"):
+        server._run_script(silent, [])
+
+
+def test_relay_keeps_progress_increasing(monkeypatch):
+    sent = []
+    monkeypatch.setattr(server, "_write_message", sent.append)
+    relay = server._progress_relay("tok")
+    for event in ({"message": "starting"}, {"progress": 1, "total": 3}, {"message": "still 1"},
+                  {"progress": 1}, {"progress": 2, "total": 3, "message": "two"}):
+        relay(event)
+    values = [m["params"]["progress"] for m in sent]
+    assert all(a < b for a, b in zip(values, values[1:]))
+    assert values[0] == 0 and values[1] == 1 and values[-1] == 2
+    assert {m["method"] for m in sent} == {"notifications/progress"}
+    assert sent[-1]["params"] == {"progressToken": "tok", "progress": 2, "total": 3, "message": "two"}
+
+
+def test_report_progress_is_silent_outside_the_server(monkeypatch, capsys):
+    monkeypatch.delenv(mcp_progress.ENV_VAR, raising=False)
+    mcp_progress.report_progress(1, 2, "hidden")
+    assert capsys.readouterr().err == ""
+    monkeypatch.setenv(mcp_progress.ENV_VAR, "1")
+    mcp_progress.report_progress(1, 2, "shown")
+    assert capsys.readouterr().err == '@@mcp-progress {"progress": 1, "total": 2, "message": "shown"}\n'
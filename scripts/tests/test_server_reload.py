@@ -0,0 +1,258 @@
+"""Hot reload tests for scripts/mcp/server.py.
+
+Covers:
+- the watcher reports edited, added and deleted scripts (inotify and polling).
+- an edited helper module is reloaded in place: tools that reach it through
+  the module object keep their runner and module state, tools that imported
+  names from it are re-imported, unrelated tools are untouched.
+- an edited tool script is re-imported on its own.
+- a module's `_mcp_reload_teardown()` runs before it is reloaded or re-imported.
+- the serve loop advertises listChanged and sends notifications/tools/list_changed
+  only when the advertised tool list actually changed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import queue
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from _server_helpers import server
+
+
+_HELPER = '''\
+VALUE = {value}
+
+def describe(name):
+    return "{prefix} " + name
+'''
+
+# Reaches the helper through the module object; keeps per-process state.
+_DICE = '''\
+import {helper}
+
+ROLLS = []
+
+def roll():
+    ROLLS.append(1)
+    return {{"value": {helper}.VALUE, "rolls": len(ROLLS)}}
+
+MCP_TOOLS = [{{"name": "roll_{tag}", "description": "{description}", "input_schema": {{"type": "object", "properties": {{}}}}}}]
+MCP_HANDLERS = {{"roll_{tag}": roll}}
+'''
+
+# Took a function out of the helper, so only a re-import sees the new one.
+_LOOKUP = '''\
+from {helper} import describe
+
+def lookup():
+    return describe("Vela")
+
+MCP_TOOLS = [{{"name": "lookup_{tag}", "description": "lookup", "input_schema": {{"type": "object", "properties": {{}}}}}}]
+MCP_HANDLERS = {{"lookup_{tag}": lookup}}
+'''
+
+_REPORT = '''\
+MCP_TOOL = {{
+    "name": "report_{tag}",
+    "description": "{description}",
+    "input_schema": {{"type": "object", "properties": {{}}}},
+    "argv": [],
+}}
+'''
+
+
+class _Repo:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.scripts = root / "scripts"
+        self.scripts.mkdir()
+        self.tag = uuid.uuid4().hex[:8]
+        self.helper = f"hr_helper_{self.tag}"
+
+    def write(self, stem: str, source: str) -> Path:
+        path = self.scripts / f"{stem}_{self.tag}.py"
+        existed = path.exists()
+        path.write_text(source, encoding="utf-8")
+        if existed:
+            # Same-second rewrites must still look new to the stat() snapshots.
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        return path
+
+    def rel(self, stem: str) -> str:
+        return f"{stem}_{self.tag}.py"
+
+    def helper_source(self, value: int, prefix: str) -> str:
+        return _HELPER.format(value=value, prefix=prefix)
+
+    def dice_source(self, description: str = "roll") -> str:
+        return _DICE.format(helper=self.helper, tag=self.tag, description=description)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setenv("DND_MCP_DISCOVERY_CACHE", "0")
+    repo = _Repo(tmp_path)
+    monkeypatch.syspath_prepend(str(repo.scripts))
+    repo.write("hr_helper", repo.helper_source(1, "Hello"))
+    repo.write("hr_dice", repo.dice_source())
+    repo.write("hr_lookup", _LOOKUP.format(helper=repo.helper, tag=repo.tag))
+    repo.write("hr_report", _REPORT.format(tag=repo.tag, description="report"))
+    yield repo
+    for name in [n for n in sys.modules if repo.tag in n]:
+        del sys.modules[name]
+
+
+def _runners(repo):
+    result = server.discover_tools(repo_root=repo.root, lazy=False)
+    return {r.tool.name: r for r in result.tools}
+
+
+def _run(runner):
+    return json.loads(runner.run(arguments={})) if runner.handler is not None else None
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_reports_changes(tmp_path, use_inotify):
+    if use_inotify and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+    scripts = tmp_path / "scripts"
+    (scripts / "pkg").mkdir(parents=True)
+    (scripts / "a.py").write_text("A = 1\n", encoding="utf-8")
+    (scripts / "mcp").mkdir()
+    events: queue.Queue = queue.Queue()
+    watcher = server._ScriptWatcher(scripts, events.put, poll_sec=0.05, use_inotify=use_inotify)
+    assert watcher.mode == ("inotify" if use_inotify else "poll")
+    watcher.start()
+    try:
+        (scripts / "a.py").write_text("A = 22\n", encoding="utf-8")
+        assert events.get(timeout=5) == {"a.py"}
+        (scripts / "pkg" / "b.py").write_text("", encoding="utf-8")
+        assert events.get(timeout=5) == {"pkg/b.py"}
+        (scripts / "a.py").unlink()
+        assert events.get(timeout=5) == {"a.py"}
+        (scripts / "mcp" / "server.py").write_text("", encoding="utf-8")
+        (scripts / "notes.txt").write_text("", encoding="utf-8")
+        with pytest.raises(queue.Empty):
+            events.get(timeout=0.6)
+    finally:
+        watcher.stop()
+
+
+def test_helper_edit_reloads_in_place(repo):
+    runner_by_name = _runners(repo)
+    dice = runner_by_name[f"roll_{repo.tag}"]
+    report = runner_by_name[f"report_{repo.tag}"]
+    lookup = runner_by_name[f"lookup_{repo.tag}"]
+    assert _run(dice) == {"value": 1, "rolls": 1}
+    assert lookup.run(arguments={}) == "Hello Vela"
+
+    repo.write("hr_helper", repo.helper_source(22, "Greetings"))
+    reloader = server._ScriptReloader(repo.root, lazy=False)
+    scripts, result = reloader.rediscover(frozenset({repo.rel("hr_helper")}), tuple(runner_by_name.values()))
+    server._swap_runners(runner_by_name, scripts, result)
+
+    # The helper itself is rescanned too, in case it gained an MCP_TOOL.
+    assert scripts == {(repo.scripts / repo.rel(stem)).resolve() for stem in ("hr_helper", "hr_lookup")}
+    assert runner_by_name[f"roll_{repo.tag}"] is dice
+    assert runner_by_name[f"report_{repo.tag}"] is report
+    assert _run(dice) == {"value": 22, "rolls": 2}  # new helper code, same dice state
+    assert runner_by_name[f"lookup_{repo.tag}"] is not lookup
+    assert runner_by_name[f"lookup_{repo.tag}"].run(arguments={}) == "Greetings Vela"
+    assert reloader.stats == {"reloads": 1, "modules_reloaded": 1, "scripts_rediscovered": 2, "errors": 0}
+
+
+def test_tool_script_edit_reimports_only_that_script(repo):
+    runner_by_name = _runners(repo)
+    dice = runner_by_name[f"roll_{repo.tag}"]
+    lookup = runner_by_name[f"lookup_{repo.tag}"]
+    _run(dice)
+
+    repo.write("hr_dice", repo.dice_source("roll some dice"))
+    reloader = server._ScriptReloader(repo.root, lazy=False)
+    scripts, result = reloader.rediscover(frozenset({repo.rel("hr_dice")}), tuple(runner_by_name.values()))
+    server._swap_runners(runner_by_name, scripts, result)
+
+    fresh = runner_by_name[f"roll_{repo.tag}"]
+    assert fresh.tool.description == "roll some dice"
+    assert _run(fresh) == {"value": 1, "rolls": 1}
+    assert runner_by_name[f"lookup_{repo.tag}"] is lookup
+    assert reloader.stats["modules_reloaded"] == 0
+
+
+_TEARDOWN = '''
+
+def _mcp_reload_teardown():
+    from pathlib import Path
+    with open(Path(__file__).with_name("torn.log"), "a") as log:
+        log.write(__name__ + "\\n")
+'''
+
+
+def test_teardown_runs_before_reload_and_reimport(repo):
+    repo.write("hr_helper", repo.helper_source(1, "Hello") + _TEARDOWN)
+    repo.write("hr_dice", repo.dice_source() + _TEARDOWN)
+    runner_by_name = _runners(repo)
+    torn = repo.scripts / "torn.log"
+    reloader = server._ScriptReloader(repo.root, lazy=False)
+
+    repo.write("hr_helper", repo.helper_source(2, "Hello") + _TEARDOWN)
+    scripts, result = reloader.rediscover(frozenset({repo.rel("hr_helper")}), tuple(runner_by_name.values()))
+    server._swap_runners(runner_by_name, scripts, result)
+    assert torn.read_text().split() == [repo.helper]
+
+    repo.write("hr_dice", repo.dice_source("roll again") + _TEARDOWN)
+    scripts, result = reloader.rediscover(frozenset({repo.rel("hr_dice")}), tuple(runner_by_name.values()))
+    server._swap_runners(runner_by_name, scripts, result)
+    assert torn.read_text().split() == [repo.helper, f"_mcp_script_hr_dice_{repo.tag}"]
+    assert reloader.stats["errors"] == 0
+
+
+def test_serve_loop_notifies_when_the_list_changes(repo, monkeypatch):
+    sent = []
+    monkeypatch.setattr(server, "_write_message", sent.append)
+    monkeypatch.setattr(server, "_result_cache", None)
+    runner_by_name = _runners(repo)
+    reloader = server._ScriptReloader(repo.root, lazy=False)
+
+    async def wait_for(predicate):
+        for _ in range(500):
+            if predicate():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("timed out")
+
+    async def scenario():
+        inbox = asyncio.Queue()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dispatcher = server._Dispatcher(executor)
+            serving = asyncio.create_task(
+                server._serve_messages(inbox, runner_by_name, dispatcher, reloader=reloader)
+            )
+            inbox.put_nowait({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+            # A body-only edit: reloaded, but the advertised list is the same.
+            repo.write("hr_helper", repo.helper_source(3, "Hi"))
+            inbox.put_nowait(server._ScriptsChanged(frozenset({repo.rel("hr_helper")})))
+            await wait_for(lambda: runner_by_name[f"lookup_{repo.tag}"].run(arguments={}) == "Hi Vela")
+            repo.write("hr_report", _REPORT.format(tag=repo.tag, description="a better report"))
+            (repo.scripts / repo.rel("hr_lookup")).unlink()
+            inbox.put_nowait(server._ScriptsChanged(frozenset({repo.rel("hr_report"), repo.rel("hr_lookup")})))
+            await wait_for(lambda: any(m.get("method") == "notifications/tools/list_changed" for m in sent))
+            inbox.put_nowait({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+            inbox.put_nowait(None)
+            await serving
+            await dispatcher.drain()
+
+    asyncio.run(scenario())
+    assert sent[0]["result"]["capabilities"]["tools"]["listChanged"] is True
+    assert [m.get("method") for m in sent[1:]] == ["notifications/tools/list_changed", None]
+    listed = {t["name"]: t["description"] for t in sent[-1]["result"]["tools"]}
+    assert listed == {f"roll_{repo.tag}": "roll", f"report_{repo.tag}": "a better report"}
@@ -0,0 +1,146 @@
+"""Read-only result cache tests for scripts/mcp/server.py.
+
+Covers:
+- which tools are cached: read-only open-world tools by TTL, local ones only
+  with declared `depends_on`, never writers or `"cache": False`.
+- hits key on canonical arguments (order and schema defaults don't matter).
+- entries expire by TTL and are dropped when a dependency changes.
+- failures are not cached; a write through the server re-checks dependencies.
+- server_stats reports per-tool hit rates.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import replace
+
+import pytest
+
+from _server_helpers import SERVER_PATH, server
+
+
+_RO = {"readOnlyHint": True, "idempotentHint": True}
+
+
+def _runner(name="lookup", *, annotations=None, cache=None, schema=None):
+    entry = {"name": name, "annotations": {**_RO, "openWorldHint": True} if annotations is None else annotations}
+    if cache is not None:
+        entry["cache"] = cache
+    if schema is not None:
+        entry["input_schema"] = schema
+    [runner] = server._tools_from_mcp_tool(path=SERVER_PATH, mcp_tool=entry)
+    calls = []
+
+    def handler(**arguments):
+        calls.append(arguments)
+        return f"result {len(calls)}"
+
+    return replace(runner, handler=handler), calls
+
+
+def _call(cache, runner, **arguments):
+    return cache.call(runner, arguments, lambda: runner.run(arguments=arguments))
+
+
+def test_cache_policy():
+    assert _runner()[0].cache_ttl == server._RESULT_CACHE_TTL
+    assert _runner(cache={"ttl": 5})[0].cache_ttl == 5
+    assert _runner(cache=False)[0].cache_ttl is None
+    local = {**_RO, "openWorldHint": False}
+    assert _runner(annotations=local)[0].cache_ttl is None
+    declared = _runner(annotations=local, cache={"depends_on": ["world/", "notes.md"]})[0]
+    assert declared.cache_ttl is not None and declared.cache_deps == ("world", "notes.md")
+    writer = {"readOnlyHint": False, "openWorldHint": True}
+    assert _runner(annotations=writer, cache={"depends_on": ["world"]})[0].cache_ttl is None
+    assert _runner(annotations={**_RO, "idempotentHint": False, "openWorldHint": True})[0].cache_ttl is None
+    with pytest.raises(ValueError, match="depends_on"):
+        _runner(cache={"depends_on": [1]})
+
+
+def test_hits_key_on_canonical_arguments():
+    schema = {"type": "object", "properties": {"name": {"type": "string"}, "limit": {"type": "integer", "default": 10}}}
+    runner, calls = _runner(schema=schema)
+    cache = server._ResultCache()
+    assert _call(cache, runner, name="x", limit=10) == "result 1"
+    assert _call(cache, runner, limit=10, name="x") == "result 1"
+    assert _call(cache, runner, name="x") == "result 1"
+    assert _call(cache, runner, name="x", limit=3) == "result 2"
+    assert len(calls) == 2
+    assert (cache.stats["hits"], cache.stats["misses"]) == (2, 2)
+
+
+def test_ttl_expiry(monkeypatch):
+    runner, calls = _runner(cache={"ttl": 30})
+    cache = server._ResultCache()
+    clock = [1000.0]
+    monkeypatch.setattr(server.time, "monotonic", lambda: clock[0])
+    _call(cache, runner)
+    clock[0] += 29
+    assert _call(cache, runner) == "result 1"
+    clock[0] += 2
+    assert _call(cache, runner) == "result 2"
+    assert cache.stats["expired"] == 1
+
+
+def test_dependency_change_invalidates(tmp_path):
+    notes = tmp_path / "world" / "npc.md"
+    notes.parent.mkdir()
+    notes.write_text("v1", encoding="utf-8")
+    runner, calls = _runner(annotations={**_RO, "openWorldHint": False}, cache={"depends_on": ["world"]})
+    cache = server._ResultCache(repo_root=tmp_path, recheck_sec=0)
+    _call(cache, runner)
+    assert _call(cache, runner) == "result 1"
+
+    notes.write_text("v2", encoding="utf-8")
+    os.utime(notes, ns=(notes.stat().st_atime_ns, notes.stat().st_mtime_ns + 10**9))
+    assert _call(cache, runner) == "result 2"
+    (tmp_path / "world" / "new.md").write_text("", encoding="utf-8")
+    assert _call(cache, runner) == "result 3"
+    assert cache.stats["invalidated"] == 2
+
+
+def test_write_resets_fingerprints_and_failures_are_not_cached(tmp_path):
+    dep = tmp_path / "registry.tsv"
+    dep.write_text("a", encoding="utf-8")
+    runner, calls = _runner(annotations={**_RO, "openWorldHint": False}, cache={"depends_on": ["registry.tsv"]})
+    cache = server._ResultCache(repo_root=tmp_path, recheck_sec=3600)
+    _call(cache, runner)
+    os.utime(dep, ns=(dep.stat().st_atime_ns, dep.stat().st_mtime_ns + 10**9))
+    assert _call(cache, runner) == "result 1"  # fingerprint still fresh
+    cache.note_write()
+    assert _call(cache, runner) == "result 2"
+
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.call(runner, {"q": 1}, boom)
+    assert _call(cache, runner, q=1) == "result 3"
+
+
+def test_lru_bound():
+    runner, calls = _runner()
+    cache = server._ResultCache(2)
+    for key in ("a", "b", "a", "c"):
+        _call(cache, runner, key=key)
+    assert _call(cache, runner, key="a") == "result 1"
+    assert _call(cache, runner, key="b") == "result 4"
+    assert cache.stats["evicted"] == 2
+
+
+def test_server_stats_reports_hit_rates(monkeypatch):
+    cache = server._ResultCache()
+    monkeypatch.setattr(server, "_result_cache", cache)
+    monkeypatch.setattr(server, "_script_pool", None)
+    runner, _ = _runner("get_npc")
+    for _ in range(3):
+        _call(cache, runner, name="Vela")
+    discovery = server.DiscoveryResult(tools=(), skipped=(), stats={"elapsed_ms": 1.0})
+    stats_runner = server._server_stats_runner(discovery)
+    assert stats_runner.cache_ttl is None
+    stats = json.loads(stats_runner.run(arguments={}))
+    assert stats["result_cache"]["tools"] == {"get_npc": {"hits": 2, "misses": 1, "hit_rate": 0.667}}
+    assert stats["result_cache"]["entries"] == 1
+    assert stats["discovery"] == {"elapsed_ms": 1.0}
+    assert stats["worker_pool"] is None
@@ -0,0 +1,145 @@
+"""Warm worker pool tests for scripts/mcp/server.py + scripts/mcp/worker.py.
+
+Covers:
+- calls reuse one warm process, yet each gets its own argv, stdout and stderr
+  (including output from a child process the script spawns).
+- non-zero exits surface as errors; progress lines are relayed.
+- a worker recycles after max_calls; a timed-out call kills its worker and the
+  pool recovers with a fresh one; an idle worker that died is replaced
+  without failing the call.
+- environment, root-logger and signal changes don't leak into the next call;
+  a call that leaves a thread running recycles its worker.
+- tools with `"worker": False` bypass the pool.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from _server_helpers import SCRIPTS_DIR, server
+
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="the worker pool is POSIX-only")
+
+
+_ECHO = f"""\
+import os, sys
+sys.path.insert(0, {str(SCRIPTS_DIR)!r})
+from mcp_progress import report_progress
+
+report_progress(1, 1, "echoing")
+print(os.getpid(), *sys.argv[1:])
+print("note for " + sys.argv[1], file=sys.stderr)
+os.system("echo child-" + sys.argv[1])
+if sys.argv[1] == "fail":
+    sys.exit("failed on purpose")
+"""
+
+
+@pytest.fixture
+def echo(tmp_path):
+    script = tmp_path / "echo.py"
+    script.write_text(_ECHO, encoding="utf-8")
+    return script
+
+
+@pytest.fixture
+def pool():
+    pool = server._ScriptWorkerPool(1)
+    yield pool
+    pool.close()
+
+
+def _pid(out: str) -> str:
+    return out.split()[0]
+
+
+def test_calls_reuse_a_warm_worker_with_isolated_output(pool, echo):
+    first = pool.run(echo, ["one"])
+    second = pool.run(echo, ["two"])
+    assert _pid(first) == _pid(second) != str(os.getpid())
+    assert first.splitlines()[:2] == [f"{_pid(first)} one", "child-one"]
+    assert first.endswith("[warnings from echo.py]\nnote for one")
+    assert "one" not in second
+    assert pool.stats["started"] == 1
+
+
+def test_failures_and_progress(pool, echo):
+    events = []
+    with pytest.raises(RuntimeError, match="failed on purpose"):
+        pool.run(echo, ["fail"], progress=events.append)
+    assert events == [{"progress": 1, "total": 1, "message": "echoing"}]
+    assert pool.run(echo, ["after"]).split()[1] == "after"
+
+
+def test_worker_recycles_after_max_calls(echo):
+    pool = server._ScriptWorkerPool(1, max_calls=2)
+    try:
+        pids = [_pid(pool.run(echo, [str(n)])) for n in range(3)]
+    finally:
+        pool.close()
+    assert pids[0] == pids[1] != pids[2]
+    assert pool.stats["started"] == 2
+
+
+_LEAKY = """\
+import logging, os, signal, sys, threading, time
+
+print(os.getpid(), os.environ.get("LEAKY_MARK"), len(logging.getLogger().handlers),
+      signal.getsignal(signal.SIGUSR1) is signal.SIG_DFL)
+os.environ["LEAKY_MARK"] = "set"
+logging.getLogger().addHandler(logging.StreamHandler())
+signal.signal(signal.SIGUSR1, lambda *args: None)
+if sys.argv[1:] == ["thread"]:
+    threading.Thread(target=time.sleep, args=(30,), daemon=True).start()
+"""
+
+
+def test_calls_dont_leak_process_state(pool, tmp_path):
+    leaky = tmp_path / "leaky.py"
+    leaky.write_text(_LEAKY, encoding="utf-8")
+    first = pool.run(leaky, []).split()
+    second = pool.run(leaky, ["thread"]).split()
+    third = pool.run(leaky, []).split()
+    assert first[0] == second[0] != third[0]  # the leftover thread recycled the worker
+    assert first[1:] == second[1:] == ["None", "0", "True"]
+    assert pool.stats["started"] == 2
+
+
+def test_timeout_kills_worker_and_pool_recovers(pool, echo, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "_TOOL_TIMEOUT_SEC", 1)
+    hang = tmp_path / "hang.py"
+    hang.write_text("import time\ntime.sleep(30)\n", encoding="utf-8")
+    with pytest.raises(RuntimeError, match="exceeded 1s timeout"):
+        pool.run(hang, [])
+    assert pool.run(echo, ["again"]).split()[1] == "again"
+    assert (pool.stats["timeouts"], pool.stats["started"]) == (1, 2)
+
+
+def test_dead_idle_worker_is_replaced_without_failing_the_call(pool, echo):
+    first = pool.run(echo, ["one"])
+    idle = pool._idle[0]
+    idle.proc.kill()
+    idle.proc.wait(timeout=5)
+    second = pool.run(echo, ["two"])
+    assert second.split()[1] == "two" and _pid(second) != _pid(first)
+    assert (pool.stats["dead_retries"], pool.stats["crashes"], pool.stats["started"]) == (1, 0, 2)
+
+
+def test_worker_false_bypasses_the_pool(echo, monkeypatch):
+    calls = []
+
+    class _Pool:
+        def run(self, *args, **kwargs):
+            calls.append(args)
+            return "pooled"
+
+    monkeypatch.setattr(server, "_script_pool", _Pool())
+    tool = server.Tool(name="echo", description="", input_schema={})
+    pooled = server.ToolRunner(tool, echo, ("{word}",), {}, {})
+    fresh = server.ToolRunner(tool, echo, ("{word}",), {}, {}, use_worker=False)
+    assert pooled.run(arguments={"word": "x"}) == "pooled"
+    assert fresh.run(arguments={"word": "y"}).split()[1] == "y"
+    assert len(calls) == 1
@@ -12,6 +12,8 @@ schema/handler symmetry, and parameter validation — these always run.
 from __future__ import annotations
 
 import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -54,6 +56,22 @@ from scripts.srd5_2 import (
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _isolated_mirror(monkeypatch, tmp_path):
+    """Point the offline mirror and local search index at an empty tmp dir, so
+    a developer's synced .cache/ mirror can't reroute these tests' mocked
+    `_api_get` calls through the local engine; start every test with an empty
+    in-memory response LRU so fake sessions aren't shadowed by earlier tests."""
+    monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "mirror.sqlite"))
+    monkeypatch.setenv("DND_SRD_INDEX_PATH", str(tmp_path / "index.pickle"))
+    monkeypatch.delenv("DND_SRD_OFFLINE", raising=False)
+    srd5_2.srd_search.reset()
+    srd5_2._response_lru.clear()
+    yield
+    srd5_2.srd_search.reset()
+    srd5_2._response_lru.clear()
+
+
 class TestResolveSource:
     def test_none_returns_default_priority_no_filter(self):
         filt, spec = _resolve_source(None, DEFAULT_PRIORITY_SRD)
@@ -346,12 +364,13 @@ class TestClientSideNameFilter:
         result = MCP_HANDLERS["search_weapons"](name="SWORD")
         assert self._names(result) == {"Longsword", "Shortsword", "Greatsword"}
 
-    def test_overfetches_so_limit_does_not_hide_matches(self, monkeypatch):
-        # The endpoint can't filter server-side, so the fetch must request the
-        # whole list — truncation to the caller's `limit` happens after filtering.
+    def test_streams_pages_so_limit_does_not_hide_matches(self, monkeypatch):
+        # The endpoint can't filter server-side, so the fetch streams the whole
+        # list in pages — truncation to the caller's `limit` happens after
+        # filtering, never at the request.
         calls = self._fake_api(monkeypatch, self._WEAPONS)
         result = MCP_HANDLERS["search_weapons"](name="sword", limit=2)
-        assert calls[0]["params"]["limit"] == srd5_2._CLIENT_FILTER_FETCH_LIMIT
+        assert calls[0]["params"]["limit"] == srd5_2._CLIENT_FILTER_PAGE_SIZE
         assert len(result["results"]) == 2
         # A2-L4: after the [:limit] slice, `count` is clamped to match the
         # truncated result set so `len(results) == count` holds (was a stale 3).
@@ -370,7 +389,7 @@ class TestClientSideNameFilter:
         calls = self._fake_api(monkeypatch, self._WEAPONS)
         MCP_HANDLERS["search_weapons"](name="Longsword", match="exact")
         assert calls[0]["params"].get("name__iexact") == "Longsword"
-        assert calls[0]["params"]["limit"] != srd5_2._CLIENT_FILTER_FETCH_LIMIT
+        assert calls[0]["params"]["limit"] != srd5_2._CLIENT_FILTER_PAGE_SIZE
 
     def test_generic_list_partial_name_filtered_client_side(self, monkeypatch):
         skills = [
@@ -383,6 +402,85 @@ class TestClientSideNameFilter:
         assert self._names(result) == {"Athletics"}
 
 
+class TestPagination:
+    """iter_* generators follow Open5e `next` links with the next page
+    prefetched; MCP callers continue via `next_cursor` / srd_next_page."""
+
+    def _paged_api(self, monkeypatch, rows, page_size):
+        calls: list = []
+
+        def fake_api_get(endpoint, params=None):
+            params = dict(params or {})
+            calls.append({"endpoint": endpoint, "params": params})
+            size = int(params.get("limit", page_size))
+            page = int(params.get("page", 1))
+            start = (page - 1) * size
+            nxt = None
+            if start + size < len(rows):
+                nxt = f"{srd5_2.BASE_URL}{endpoint}?limit={size}&page={page + 1}"
+            return {"count": len(rows), "next": nxt, "results": rows[start:start + size]}
+
+        monkeypatch.setattr(srd5_2, "_api_get", fake_api_get)
+        return calls
+
+    _ROWS = [
+        {"key": f"srd-2024_m{i}", "name": f"Monster {i}", "document": {"key": "srd-2024"}}
+        for i in range(7)
+    ]
+
+    def test_iter_follows_every_next_link(self, monkeypatch):
+        calls = self._paged_api(monkeypatch, self._ROWS, 3)
+        keys = [r["key"] for r in srd5_2.iter_monsters(cr_min=1, cr_max=5, page_size=3)]
+        assert keys == [r["key"] for r in self._ROWS]
+        assert len(calls) == 3
+        assert calls[0]["params"]["challenge_rating__gte"] == 1
+        assert calls[0]["params"]["limit"] == 3
+
+    def test_iter_limit_stops_early(self, monkeypatch):
+        calls = self._paged_api(monkeypatch, self._ROWS, 3)
+        got = list(srd5_2.iter_monsters(limit=2, page_size=3))
+        assert len(got) == 2
+        # Page 1 plus at most the one page prefetched behind it.
+        assert len(calls) <= 2
+
+    def test_iter_client_side_name_filter(self, monkeypatch):
+        self._paged_api(monkeypatch, [
+            {"key": "a", "name": "Longsword"}, {"key": "b", "name": "Dagger"},
+            {"key": "c", "name": "Greatsword"},
+        ], 1)
+        assert [r["key"] for r in srd5_2.iter_weapons(name="sword", page_size=1)] == ["a", "c"]
+
+    def test_client_filter_streams_across_pages(self, monkeypatch):
+        rows = [{"key": f"k{i}", "name": f"Sword {i}" if i % 2 else f"Axe {i}"} for i in range(250)]
+        calls = self._paged_api(monkeypatch, rows, srd5_2._CLIENT_FILTER_PAGE_SIZE)
+        result = srd5_2.search_weapons(name="sword", limit=500, source="")
+        assert len(result["results"]) == 125
+        assert len(calls) == 3
+
+    def test_next_cursor_continues_server_paged_search(self, monkeypatch):
+        self._paged_api(monkeypatch, self._ROWS, 3)
+        first = MCP_HANDLERS["search_monsters"](limit=3)
+        assert "next_cursor" in first
+        second = MCP_HANDLERS["srd_next_page"](cursor=first["next_cursor"])
+        assert [r["key"] for r in second["results"]] == ["srd-2024_m3", "srd-2024_m4", "srd-2024_m5"]
+        third = MCP_HANDLERS["srd_next_page"](cursor=second["next_cursor"])
+        assert "next_cursor" not in third
+
+    def test_next_cursor_continues_client_filtered_search(self, monkeypatch):
+        rows = [{"key": f"k{i}", "name": f"Sword {i}"} for i in range(5)]
+        self._paged_api(monkeypatch, rows, 100)
+        first = srd5_2.search_weapons(name="sword", limit=2, source="")
+        second = srd5_2.srd_next_page(first["next_cursor"])
+        assert [r["key"] for r in second["results"]] == ["k2", "k3"]
+        last = srd5_2.srd_next_page(second["next_cursor"])
+        assert [r["key"] for r in last["results"]] == ["k4"]
+        assert "next_cursor" not in last
+
+    def test_garbage_cursor_is_a_clean_valueerror(self):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            srd5_2.srd_next_page("not-a-cursor!")
+
+
 class TestApiGetErrorHandling:
     """`_api_get` must convert raw transport faults into clean, actionable
     `ValueError`s — a bare `requests` exception (which leaks the upstream URL
@@ -500,6 +598,231 @@ class TestApiGetErrorHandling:
         assert out == {"count": 1, "results": [{"x": 1}]}
 
 
+class TestSingleFlight:
+    """Identical concurrent `_api_get` calls share one HTTP request (and one
+    SQLite cache write); distinct params still go out separately."""
+
+    class _BlockingSession:
+        def __init__(self, release, status=200):
+            self.release = release
+            self.status = status
+            self.calls = []
+            self._lock = threading.Lock()
+
+        def get(self, url, params=None, timeout=None):
+            with self._lock:
+                self.calls.append((url, dict(params or {})))
+            self.release.wait(5)
+            status = self.status
+
+            class _Resp:
+                status_code = status
+
+                def json(self_inner):
+                    return {"url": url, "params": dict(params or {})}
+
+            return _Resp()
+
+    def _run_concurrently(self, monkeypatch, n, params_for, status=200):
+        release = threading.Event()
+        session = self._BlockingSession(release, status)
+        monkeypatch.setattr(srd5_2, "_get_session", lambda: session)
+        results, errors = [None] * n, [None] * n
+
+        def worker(i):
+            try:
+                results[i] = srd5_2._api_get("/v2/conditions/", params_for(i))
+            except ValueError as exc:
+                errors[i] = exc
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        # Let every thread reach the flight table before the leader returns.
+        deadline = time.monotonic() + 2
+        while len(srd5_2._inflight) < len({repr(params_for(i)) for i in range(n)}):
+            assert time.monotonic() < deadline
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join(5)
+        return session, results, errors
+
+    def test_identical_calls_share_one_request(self, monkeypatch):
+        session, results, errors = self._run_concurrently(
+            monkeypatch, 6, lambda i: {"limit": 25},
+        )
+        assert len(session.calls) == 1
+        assert all(r is results[0] for r in results)
+        assert errors == [None] * 6
+        assert srd5_2._inflight == {}
+
+    def test_distinct_params_are_not_merged(self, monkeypatch):
+        session, results, _ = self._run_concurrently(
+            monkeypatch, 4, lambda i: {"limit": 25, "name__contains": f"c{i % 2}"},
+        )
+        assert len(session.calls) == 2
+
+    def test_waiters_share_the_leaders_error(self, monkeypatch):
+        session, results, errors = self._run_concurrently(
+            monkeypatch, 3, lambda i: {"limit": 25}, status=503,
+        )
+        assert len(session.calls) == 1
+        assert all(e is not None and "503" in str(e) for e in errors)
+
+    def test_pool_size_env_override(self, monkeypatch):
+        monkeypatch.setenv("DND_SRD_POOL_SIZE", "32")
+        assert srd5_2._env_int("DND_SRD_POOL_SIZE", 16) == 32
+        monkeypatch.setenv("DND_SRD_POOL_SIZE", "zero")
+        assert srd5_2._env_int("DND_SRD_POOL_SIZE", 16) == 16
+
+
+class TestResponseLRU:
+    """Decoded responses are served from memory after the first fetch, with
+    per-endpoint TTLs and a bounded size."""
+
+    class _CountingSession:
+        def __init__(self):
+            self.calls = 0
+
+        def get(self, url, params=None, timeout=None):
+            self.calls += 1
+            n = self.calls
+
+            class _Resp:
+                status_code = 200
+
+                def json(self_inner):
+                    return {"n": n}
+
+            return _Resp()
+
+    def _install(self, monkeypatch):
+        session = self._CountingSession()
+        monkeypatch.setattr(srd5_2, "_get_session", lambda: session)
+        return session
+
+    def test_warm_call_skips_session(self, monkeypatch):
+        session = self._install(monkeypatch)
+        first = srd5_2._api_get("/v2/spells/", {"limit": 5})
+        second = srd5_2._api_get("/v2/spells/", {"limit": "5"})  # same URL
+        assert session.calls == 1
+        assert second is first
+
+    def test_ttl_policy_per_endpoint(self):
+        assert srd5_2._lru_ttl("/v2/sizes/") is None
+        assert srd5_2._lru_ttl("/v2/creatures/srd-2024_ogre/") == 30 * srd5_2._DAY
+        assert srd5_2._lru_ttl("/v2/feats/") == srd5_2._DEFAULT_LRU_TTL
+
+    def test_expired_entry_refetched(self, monkeypatch):
+        session = self._install(monkeypatch)
+        now = [1000.0]
+        monkeypatch.setattr(srd5_2.time, "monotonic", lambda: now[0])
+        srd5_2._api_get("/v2/spells/", {"limit": 5})
+        now[0] += 31 * srd5_2._DAY
+        assert srd5_2._api_get("/v2/spells/", {"limit": 5}) == {"n": 2}
+        assert session.calls == 2
+        assert srd5_2._response_lru.expirations >= 1
+
+    def test_bounded_with_lru_eviction(self, monkeypatch):
+        self._install(monkeypatch)
+        monkeypatch.setattr(srd5_2, "_response_lru", srd5_2._ResponseLRU(2))
+        for n in range(3):
+            srd5_2._api_get("/v2/feats/", {"limit": n + 1})
+        stats = srd5_2.srd_cache_stats()["lru"]
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+
+    def test_errors_are_not_cached(self, monkeypatch):
+        class _Fail:
+            status_code = 500
+
+        monkeypatch.setattr(
+            srd5_2, "_get_session",
+            lambda: type("S", (), {"get": lambda self, *a, **k: _Fail()})(),
+        )
+        with pytest.raises(ValueError):
+            srd5_2._api_get("/v2/feats/", {"limit": 1})
+        session = self._install(monkeypatch)
+        srd5_2._api_get("/v2/feats/", {"limit": 1})
+        assert session.calls == 1
+
+    def test_stats_tool_is_registered_read_only(self):
+        tool = next(t for t in MCP_TOOLS if t["name"] == "srd_cache_stats")
+        assert tool["annotations"]["readOnlyHint"] is True
+        assert set(MCP_HANDLERS["srd_cache_stats"]()) == {"lru", "single_flight"}
+
+
+
+class TestFanoutSearch:
+    """search_srd(fanout=True) asks every kind concurrently, yields batches as
+    sources answer, and bounds latency by per-source deadlines."""
+
+    @staticmethod
+    def _source(results, delay=0.0, error=None):
+        def fetch(query, limit, source):
+            time.sleep(delay)
+            if error:
+                raise ValueError(error)
+            return {"count": len(results), "results": [dict(r) for r in results]}
+        return fetch
+
+    def _install(self, monkeypatch, **sources):
+        monkeypatch.setattr(srd5_2, "_FANOUT_SOURCES", sources)
+        monkeypatch.setattr(srd5_2, "_FANOUT_DEADLINES", {k: 1.0 for k in sources})
+
+    def test_batches_arrive_fastest_first(self, monkeypatch):
+        self._install(
+            monkeypatch,
+            rule=self._source([{"name": "Flying", "document": "srd-2024"}], delay=0.2),
+            spell=self._source([{"name": "Fly", "document": {"key": "srd-2024"}}]),
+        )
+        batches = list(srd5_2.iter_search_fanout("fly"))
+        assert [b["kind"] for b in batches] == ["spell", "rule"]
+        assert batches[0]["results"][0]["kind"] == "spell"
+
+    def test_slow_source_times_out_without_holding_the_rest(self, monkeypatch):
+        self._install(
+            monkeypatch,
+            spell=self._source([{"name": "Shield"}]),
+            creature=self._source([{"name": "Shield Guardian"}], delay=1.5),
+        )
+        start = time.monotonic()
+        out = srd5_2.search_fanout("shield", deadline=0.3)
+        assert time.monotonic() - start < 1.0
+        assert out["sources"]["creature"]["status"] == "timeout"
+        assert [r["name"] for r in out["results"]] == ["Shield"]
+
+    def test_merge_ranks_by_unified_score_and_dedupes_per_kind(self, monkeypatch):
+        self._install(
+            monkeypatch,
+            magicitem=self._source([{"name": "Potion of Invisibility", "key": "p"}]),
+            condition=self._source([{"name": "Invisible", "key": "c", "document": {"key": "core"}}]),
+            spell=self._source([
+                {"name": "Invisibility", "key": "old", "document": {"key": "srd-2014"}},
+                {"name": "Invisibility", "key": "new", "document": {"key": "srd-2024"}},
+                {"name": "Greater Invisibility", "key": "gi", "document": {"key": "srd-2024"}},
+            ], delay=0.05),  # ties with the condition keep arrival order
+            rule=self._source([{"name": "Hiding", "key": "r"}], error="503"),
+        )
+        out = srd5_2.search_fanout("invisib")
+        assert [r["key"] for r in out["results"]] == ["c", "new", "gi", "p"]
+        assert out["dropped_variants"] == ["old"]
+        assert out["sources"]["rule"] == {"status": "error", "ms": out["sources"]["rule"]["ms"],
+                                          "error": "503", "count": 0}
+
+    def test_search_srd_fanout_narrows_to_object_model(self, monkeypatch):
+        self._install(
+            monkeypatch,
+            spell=self._source([{"name": "Fly"}]),
+            condition=self._source([{"name": "Flying"}]),
+        )
+        out = srd5_2.search_srd("fly", fanout=True, object_model="condition")
+        assert set(out["sources"]) == {"condition"}
+        with pytest.raises(ValueError, match="can't query background"):
+            srd5_2.search_srd("fly", fanout=True, object_model="background")
+
+
 class TestSearchRulesTwoStep:
     """`search_rules` is a two-step tool (/v2/search/ for relevance, /v2/rules/
     for full records). Pins: multi-source no longer drops 2nd-source rules in
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent requests_cache backend (scripts/srd_cache.py): write-
+behind visibility and persistence, endpoint sharding, and a stress run of the
+real client over the local stand-in showing throughput scaling with the MCP
+worker count.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from requests_cache import CachedSession
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import srd5_2
+import srd_bench
+import srd_cache
+import srd_standin
+
+
+@pytest.fixture(scope="module")
+def fixture():
+    return srd_standin.load_fixture(srd_standin.DEFAULT_FIXTURE)
+
+
+@pytest.fixture
+def server(fixture):
+    with srd_standin.StandinServer(fixture) as srv:
+        yield srv
+
+
+def _rows(path: Path) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class TestConcurrentSQLiteDict:
+    def test_pending_writes_are_visible_before_flush(self, tmp_path):
+        store = srd_cache.ConcurrentSQLiteDict(tmp_path / "c.sqlite", serializer=None, flush_interval=60)
+        try:
+            store["a"] = b"one"
+            assert store["a"] == b"one" and "a" in store
+            seen = []
+            t = threading.Thread(target=lambda: seen.append(store["a"]))
+            t.start()
+            t.join()
+            assert seen == [b"one"]
+            del store["a"]
+            assert "a" not in store
+            with pytest.raises(KeyError):
+                store["a"]
+        finally:
+            store.close()
+
+    def test_thread_connections_close_when_thread_exits(self, tmp_path):
+        store = srd_cache.ConcurrentSQLiteDict(tmp_path / "c.sqlite", serializer=None, flush_interval=60)
+        try:
+            conns = []
+            for _ in range(5):
+                t = threading.Thread(target=lambda: conns.append(store._connection()))
+                t.start()
+                t.join()
+            assert store.stats()["connections"] == 1  # only this thread's
+            for conn in conns:
+                with pytest.raises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
+        finally:
+            store.close()
+        assert store.stats()["connections"] == 0
+
+    def test_batches_persist_and_survive_reopen(self, tmp_path):
+        path = tmp_path / "c.sqlite"
+        store = srd_cache.ConcurrentSQLiteDict(path, serializer=None, flush_interval=60)
+        for n in range(10):
+            store[f"k{n}"] = str(n).encode()
+        store.flush()
+        assert store.stats()["batches_written"] == 1 and _rows(path) == 10
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.bulk_delete(["k0", "k1"])
+        store.close()
+        reopened = srd_cache.ConcurrentSQLiteDict(path, serializer=None)
+        try:
+            assert sorted(reopened) == [f"k{n}" for n in range(2, 10)]
+            assert reopened["k9"] == b"9"
+        finally:
+            reopened.close()
+
+
+class TestSessionBackend:
+    def test_sharded_session_splits_files_by_endpoint(self, tmp_path, server):
+        shards = ("creatures",)
+        session = CachedSession(
+            backend=srd_cache.ConcurrentSQLiteCache(tmp_path / "srd", shards=shards),
+            key_fn=srd_cache.shard_key_fn(shards),
+        )
+        try:
+            creature = f"{server.url}/v2/creatures/srd-2024_ogre/"
+            spell = f"{server.url}/v2/spells/"
+            assert not session.get(creature).from_cache
+            session.get(spell)
+            assert session.get(creature).from_cache
+            session.cache.flush()
+            assert _rows(tmp_path / "srd.creatures.sqlite") == 1
+            assert _rows(tmp_path / "srd.sqlite") == 1
+            assert srd_cache.endpoint_shard(creature) == "creatures"
+        finally:
+            session.close()
+        assert server.stats()["/v2/creatures/"]["requests"] == 1
+
+    def test_reads_files_written_by_the_stock_backend(self, tmp_path, server):
+        url = f"{server.url}/v2/conditions/"
+        stock = CachedSession(str(tmp_path / "srd"), backend="sqlite")
+        stock.get(url)
+        stock.close()
+        session = CachedSession(backend=srd_cache.ConcurrentSQLiteCache(tmp_path / "srd"))
+        try:
+            assert session.get(url).from_cache
+        finally:
+            session.close()
+
+    def test_reload_teardown_closes_the_session_and_pools(self, tmp_path, monkeypatch):
+        session = CachedSession(backend=srd_cache.ConcurrentSQLiteCache(tmp_path / "srd"))
+        monkeypatch.setattr(srd5_2, "_session", session)
+        monkeypatch.setattr(srd5_2, "_prefetch_pool", None)
+        monkeypatch.setattr(srd5_2, "_fanout_pool", None)
+        pools = [srd5_2._get_prefetch_pool(), srd5_2._get_fanout_pool()]
+        session.cache.responses["k"] = b"v"
+        srd5_2._mcp_reload_teardown()
+        assert srd5_2._session is None
+        assert srd5_2._prefetch_pool is None and srd5_2._fanout_pool is None
+        for pool in pools:
+            with pytest.raises(RuntimeError):
+                pool.submit(print)
+        assert _rows(tmp_path / "srd.sqlite") == 1  # write-behind flushed on close
+
+
+class TestStress:
+    def test_throughput_scales_with_mcp_workers(self, fixture, monkeypatch):
+        monkeypatch.setenv("DND_MCP_MAX_WORKERS", "8")
+        assert srd_bench.default_stress_workers() == (1, 2, 4, 8)
+        with srd_standin.StandinServer(fixture, latency_ms=15) as srv:
+            report = srd_bench.run_stress(
+                srv, fixture, srd=srd5_2, worker_counts=(1, 8),
+                backends=("concurrent",), rounds=2,
+            )
+        runs = report["backends"]["concurrent"]
+        assert all(run["errors"] == 0 for run in runs.values())
+        # Single-flight + the cache mean each distinct request reaches the server once.
+        assert runs[1]["requests"] == runs[8]["requests"]
+        assert runs[8]["speedup"] >= 2
+        assert "calls/s" in srd_bench.format_stress_report(report)
+
+    def test_bench_never_touches_the_users_search_index(self, server, tmp_path, monkeypatch):
+        user_index = tmp_path / "user" / "srd_search_index.pickle"
+        monkeypatch.setenv("DND_SRD_INDEX_PATH", str(user_index))
+        srd5_2.srd_search.reset()
+        with srd_bench.pointed_at(srd5_2, server.url, tmp_path / "bench"):
+            assert srd5_2.srd_search.index_path().parent == tmp_path / "bench"
+            srd5_2.srd_search.get_index()
+        assert os.environ["DND_SRD_INDEX_PATH"] == str(user_index)
+        assert not user_index.exists()
+        assert srd5_2.srd_search._index is None  # the stand-in's index isn't left behind
+
+    def test_session_is_restored_after_stress(self, server, fixture):
+        backend, session = srd5_2._CACHE_BACKEND, srd5_2._session
+        srd_bench.run_stress(server, fixture, srd=srd5_2, worker_counts=(2,),
+                             backends=("sqlite",), rounds=1)
+        assert srd5_2._CACHE_BACKEND == backend and srd5_2._session is session
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar creature index (scripts/srd_creatures.py) and the
+encounter_budget tool built on it. No network: creatures come from a mirror
+synced from an in-memory fixture, or from a stubbed live stream.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import scripts.srd5_2 as srd5_2
+import srd_creatures
+import srd_mirror
+
+
+def _creature(key, name, cr, doc="srd-2024", type_="humanoid", size="medium", **extra):
+    return {
+        "key": key, "name": name, "document": {"key": doc, "name": doc},
+        "challenge_rating_decimal": f"{cr:.3f}",
+        "type": {"key": type_, "name": type_.title()},
+        "size": {"key": size, "name": size.title()},
+        **extra,
+    }
+
+
+_CREATURES = [
+    _creature("srd-2024_goblin-warrior", "Goblin Warrior", 0.25, armor_class=15, hit_points=10,
+              ability_scores={"strength": 8, "dexterity": 15}, speed={"walk": 30}),
+    _creature("srd-2014_goblin", "Goblin Warrior", 0.25, doc="srd-2014"),
+    _creature("srd-2024_zombie", "Zombie", 0.25, type_="undead", hit_points=15),
+    _creature("srd-2024_ghoul", "Ghoul", 1, type_="undead", hit_points=22),
+    _creature("srd-2024_ogre", "Ogre", 2, type_="giant", size="large", armor_class=11,
+              ability_scores={"strength": 19}, speed={"walk": 40}),
+    _creature("srd-2024_wight", "Wight", 3, type_="undead"),
+    _creature("srd-2024_young-dragon", "Young Green Dragon", 8, type_="dragon", size="large",
+              speed={"walk": 40, "fly": 80, "swim": 40}),
+]
+
+
+@pytest.fixture
+def mirror(monkeypatch, tmp_path):
+    monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "mirror.sqlite"))
+    srd_creatures.reset()
+    srd_mirror.sync(
+        lambda ep, params: {"count": len(_CREATURES), "next": None, "results": list(_CREATURES)},
+        ["/v2/creatures/"], details=False,
+    )
+
+    def no_network():
+        raise AssertionError("the creature index must not touch the network")
+
+    monkeypatch.setattr(srd5_2, "_get_session", no_network)
+    yield
+    srd_creatures.reset()
+
+
+@pytest.fixture
+def index(mirror):
+    return srd_creatures.get_index()
+
+
+def _names(index, rows):
+    return [index.names[r] for r in rows]
+
+
+class TestCreatureIndex:
+    def test_columns_parse_fk_objects_and_fractions(self, index):
+        assert len(index) == len(_CREATURES)
+        assert index.cr.tolist()[:3] == [0.25, 0.25, 0.25]
+        assert index.xp.tolist()[:5] == [50, 50, 50, 200, 450]
+        assert "undead" in index.type_labels
+
+    def test_vectorized_filters(self, index):
+        undead = index.mask(types=["undead"], cr_max=1)
+        assert _names(index, index.ranked(undead)) == ["Zombie", "Ghoul"]
+        large = index.mask(sizes=["large"], speed_min={"fly": 30})
+        assert _names(index, index.ranked(large)) == ["Young Green Dragon"]
+
+    def test_missing_ability_score_never_matches_a_range(self, index):
+        strong = index.mask(abilities={"strength": (15, None)})
+        assert _names(index, index.ranked(strong)) == ["Ogre"]
+
+    def test_name_substring_is_case_insensitive(self, index):
+        assert _names(index, index.ranked(index.mask(name="GOBLIN"))) == ["Goblin Warrior"]
+
+    def test_priority_then_dedupe_keeps_preferred_source(self, index):
+        rows = index.ranked(index.mask(name="goblin"), prefer=("srd-2014",), demote=("srd-2024",))
+        assert [index.keys[r] for r in rows] == ["srd-2014_goblin"]
+        rows = index.ranked(index.mask(name="goblin"), dedupe=False)
+        assert len(rows) == 2
+
+    def test_rebuilt_only_when_mirror_resynced(self, mirror):
+        first = srd_creatures.get_index()
+        assert srd_creatures.get_index() is first
+        srd_mirror.sync(
+            lambda ep, params: {"count": 1, "next": None, "results": _CREATURES[:1]},
+            ["/v2/creatures/"], details=False,
+        )
+        rebuilt = srd_creatures.get_index()
+        assert rebuilt is not first and len(rebuilt) == 1
+
+
+class TestCompositions:
+    def test_single_and_mixed_groups_in_window(self):
+        combos = srd_creatures.compositions([50, 200, 450], 400, 500, max_groups=2, limit=50)
+        totals = {c["total_xp"] for c in combos}
+        assert totals <= set(range(400, 501))
+        assert {"total_xp": 450, "creature_count": 1, "groups": [(450, 1)]} in combos
+        assert any(c["groups"] == [(50, 1), (200, 2)] for c in combos)
+
+    def test_closest_to_budget_first_then_fewest_creatures(self):
+        combos = srd_creatures.compositions([50, 100, 200], 300, 400, max_groups=2)
+        assert combos[0]["total_xp"] == 400
+        assert combos[0]["creature_count"] == 2  # 2x200 beats 4x100 / 8x50
+
+    def test_respects_max_creatures(self):
+        combos = srd_creatures.compositions([10], 0, 1000, max_creatures=5, limit=100)
+        assert max(c["creature_count"] for c in combos) == 5
+
+    def test_full_cr_sweep_is_milliseconds(self):
+        start = time.perf_counter()
+        srd_creatures.compositions(srd_creatures.CR_XP.values(), 20000, 22000,
+                                   max_groups=3, max_creatures=12)
+        assert time.perf_counter() - start < 0.25
+
+
+class TestEncounterBudget:
+    def test_budget_matches_2024_table(self, mirror):
+        result = srd5_2.encounter_budget(party_level=1, party_size=4)
+        assert result["budget"] == {"low": 200, "moderate": 300, "high": 400}
+        assert result["xp_range"] == [201, 300]
+        for combo in result["combinations"]:
+            assert 201 <= combo["total_xp"] <= 300
+
+    def test_groups_carry_cr_and_examples(self, mirror):
+        result = srd5_2.encounter_budget(party_level=1, party_size=4, type="undead", max_groups=1)
+        top = result["combinations"][0]
+        assert top["total_xp"] == 300
+        assert top["groups"] == [{
+            "cr": "1/4", "xp": 50, "count": 6,
+            "examples": [{"key": "srd-2024_zombie", "name": "Zombie"}],
+        }]
+
+    def test_dedupe_hides_2014_variant_from_examples(self, mirror):
+        result = srd5_2.encounter_budget(party_level=1, type="humanoid", max_groups=1)
+        keys = {e["key"] for c in result["combinations"] for g in c["groups"] for e in g["examples"]}
+        assert keys == {"srd-2024_goblin-warrior"}
+
+    def test_bad_difficulty_and_level_raise(self, mirror):
+        with pytest.raises(ValueError, match="difficulty"):
+            srd5_2.encounter_budget(party_level=3, difficulty="deadly")
+        with pytest.raises(ValueError, match="1-20"):
+            srd5_2.encounter_budget(party_level=21)
+
+    def test_offline_without_mirrored_creatures_raises_clean_error(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "empty.sqlite"))
+        monkeypatch.setattr(srd5_2, "_offline_override", True)
+        srd_creatures.reset()
+        with pytest.raises(ValueError, match="mirror sync"):
+            srd5_2.encounter_budget(party_level=3)
+
+    def test_online_builds_once_in_the_background(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "empty.sqlite"))
+        monkeypatch.setattr(srd5_2, "_offline_override", False)
+        srd_creatures.reset()
+        calls = []
+        gate = threading.Event()
+
+        def fake_records(endpoint, params):
+            calls.append(endpoint)
+            gate.wait(5)
+            if len(calls) == 1:
+                raise RuntimeError("SRD API: connection reset")
+            return iter(_CREATURES)
+
+        def wait_for_build():
+            gate.set()
+            deadline = time.monotonic() + 5
+            while srd_creatures.build_status()["building"] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            gate.clear()
+
+        monkeypatch.setattr(srd5_2, "_iter_records", fake_records)
+        try:
+            # The handler never pages the list itself: it starts the build and asks for a retry.
+            with pytest.raises(ValueError, match="background.*mirror sync"):
+                srd5_2.encounter_budget(party_level=2)
+            wait_for_build()
+            with pytest.raises(ValueError, match="last build failed: SRD API: connection reset"):
+                srd5_2.encounter_budget(party_level=2)
+            wait_for_build()
+            srd5_2.encounter_budget(party_level=2)
+            srd5_2.encounter_budget(party_level=3)
+            assert calls == ["/v2/creatures/"] * 2
+            assert srd5_2.get_creature_index(fetch_live=False) is not None
+        finally:
+            gate.set()
+            srd_creatures.reset()
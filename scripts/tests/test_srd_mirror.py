@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline Open5e mirror (scripts/srd_mirror.py) and srd5_2's
+offline mode on top of it. No network: the mirror is synced from a fake
+paginated fetcher, and the live session is booby-trapped so any HTTP attempt
+fails the test.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from urllib.parse import urlencode
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import scripts.srd5_2 as srd5_2
+import srd_mirror  # importable: srd5_2 puts scripts/ on sys.path
+
+
+def _doc(key):
+    return {"key": key, "name": key}
+
+
+_FIXTURE = {
+    "/v2/weapons/": [
+        {"key": "srd-2024_longsword", "name": "Longsword", "document": _doc("srd-2024")},
+        {"key": "srd-2024_shortsword", "name": "Shortsword", "document": _doc("srd-2024")},
+        {"key": "srd-2014_longsword", "name": "Longsword", "document": _doc("srd-2014")},
+        {"key": "srd-2024_dagger", "name": "Dagger", "document": _doc("srd-2024")},
+    ],
+    "/v2/conditions/": [
+        {"key": "srd-2024_blinded", "name": "Blinded", "document": _doc("srd-2024")},
+        {"key": "core_blinded", "name": "Blinded", "document": _doc("core")},
+        {"key": "core_grappled", "name": "Grappled", "document": _doc("core")},
+    ],
+    "/v2/creatures/": [
+        {
+            "key": "srd-2024_goblin-warrior", "name": "Goblin Warrior",
+            "document": _doc("srd-2024"), "type": {"key": "humanoid", "name": "Humanoid"},
+            "challenge_rating_decimal": "0.250", "armor_class": 15,
+        },
+        {
+            "key": "srd-2024_ogre", "name": "Ogre",
+            "document": _doc("srd-2024"), "type": {"key": "giant", "name": "Giant"},
+            "challenge_rating_decimal": "2.000", "armor_class": 11,
+        },
+        {
+            "key": "srd-2014_goblin", "name": "Goblin",
+            "document": _doc("srd-2014"), "type": {"key": "humanoid", "name": "Humanoid"},
+            "challenge_rating_decimal": "0.250", "armor_class": 15,
+        },
+    ],
+}
+
+# Detail-only fields (quirk #4): stripped from list pages, present on /<key>/.
+_DETAILS = {
+    "srd-2024_goblin-warrior": {"ability_scores": {"strength": 8}},
+    "srd-2024_ogre": {"ability_scores": {"strength": 19}},
+    "srd-2014_goblin": {"ability_scores": {"strength": 8}},
+}
+
+
+def _fake_fetch(page_size=2):
+    """Paginated Open5e stand-in: `page_size` rows per page with absolute
+    `next` links, plus detail records for creatures."""
+    calls: list = []
+
+    def fetch(endpoint, params):
+        calls.append((endpoint, dict(params)))
+        if endpoint.startswith("/v2/creatures/") and endpoint != "/v2/creatures/":
+            key = endpoint.rstrip("/").rsplit("/", 1)[-1]
+            base = next(r for r in _FIXTURE["/v2/creatures/"] if r["key"] == key)
+            return {**base, **_DETAILS[key]}
+        rows = _FIXTURE.get(endpoint)
+        if rows is None:
+            raise ValueError(f"SRD API: no record at {endpoint} (HTTP 404).")
+        page = int(params.get("page", 1))
+        start = (page - 1) * page_size
+        nxt = None
+        if start + page_size < len(rows):
+            nxt = f"https://api.open5e.com{endpoint}?{urlencode({'limit': page_size, 'page': page + 1})}"
+        return {"count": len(rows), "next": nxt, "results": rows[start:start + page_size]}
+
+    return fetch, calls
+
+
+@pytest.fixture
+def mirror(monkeypatch, tmp_path):
+    """A synced mirror in tmp_path with offline mode on and the network cut."""
+    monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "mirror.sqlite"))
+    monkeypatch.setenv("DND_SRD_INDEX_PATH", str(tmp_path / "index.pickle"))
+    srd5_2.srd_search.reset()
+    fetch, _ = _fake_fetch()
+    srd_mirror.sync(fetch, list(_FIXTURE))
+
+    def no_network():
+        raise AssertionError("offline mode must not touch the network")
+
+    monkeypatch.setattr(srd5_2, "_get_session", no_network)
+    monkeypatch.setenv("DND_SRD_OFFLINE", "1")
+    monkeypatch.setattr(srd5_2, "_offline_override", None)
+    return tmp_path
+
+
+class TestSync:
+    def test_follows_next_links_and_stores_every_page(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "m.sqlite"))
+        fetch, calls = _fake_fetch(page_size=2)
+        synced = srd_mirror.sync(fetch, ["/v2/weapons/", "/v2/conditions/"])
+        assert synced == {"/v2/weapons/": 4, "/v2/conditions/": 3}
+        weapon_pages = [c for c in calls if c[0] == "/v2/weapons/"]
+        assert len(weapon_pages) == 2  # page 1 + the `next` page
+        status = srd_mirror.status()
+        assert status["endpoints"]["/v2/weapons/"]["count"] == 4
+
+    def test_failing_endpoint_is_skipped_not_fatal(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "m.sqlite"))
+        fetch, _ = _fake_fetch()
+        log: list[str] = []
+        synced = srd_mirror.sync(fetch, ["/v2/nope/", "/v2/weapons/"], log=log.append)
+        assert synced == {"/v2/weapons/": 4}
+        assert any("/v2/nope/" in line for line in log)
+
+    def test_detail_endpoints_store_detail_records(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "m.sqlite"))
+        fetch, _ = _fake_fetch()
+        srd_mirror.sync(fetch, ["/v2/creatures/"])
+        assert srd_mirror.status()["endpoints"]["/v2/creatures/"]["detailed"] is True
+
+
+class TestOfflineSrd:
+    def test_client_side_name_filter_identical_offline(self, mirror):
+        # /v2/weapons/ has no partial name form: the mirror drops the filter
+        # exactly like the live API, and _search_endpoint filters in Python.
+        result = srd5_2.search_weapons(name="sword")
+        assert [r["key"] for r in result["results"]] == [
+            "srd-2024_longsword", "srd-2024_shortsword",
+        ]
+        assert result["dropped_variants"] == ["srd-2014_longsword"]
+
+    def test_case_sensitive_name_form_is_preserved(self, mirror):
+        # /v2/conditions/ only honors case-sensitive name__contains (quirk #2).
+        assert srd5_2.list_conditions(name="Blind")["results"]
+        assert srd5_2.list_conditions(name="blind")["results"] == []
+
+    def test_priority_and_dedupe_applied(self, mirror):
+        result = srd5_2.list_conditions(name="Blinded")
+        assert [r["key"] for r in result["results"]] == ["core_blinded"]
+
+    def test_fk_and_range_filters(self, mirror):
+        result = srd5_2.search_monsters(type="humanoid", cr="1/4", source="")
+        assert {r["key"] for r in result["results"]} == {
+            "srd-2024_goblin-warrior", "srd-2014_goblin",
+        }
+        strong = srd5_2.search_monsters(strength_min=15)
+        assert [r["key"] for r in strong["results"]] == ["srd-2024_ogre"]
+
+    def test_limit_and_next_link(self, mirror):
+        result = srd5_2.search_monsters(limit=1, source="")
+        assert result["count"] == 3
+        assert len(result["results"]) == 1
+        assert "page=2" in result["next"]
+
+    def test_ordering_and_fields(self, mirror):
+        result = srd5_2.search_monsters(ordering="-armor_class,name", fields="key,name", source="")
+        assert [r["name"] for r in result["results"]] == ["Goblin", "Goblin Warrior", "Ogre"]
+        assert set(result["results"][0]) == {"key", "name"}
+
+    def test_get_details_by_key(self, mirror):
+        record = srd5_2.get_monster_details("srd-2024_ogre")
+        assert record["name"] == "Ogre"
+
+    def test_missing_key_raises_clean_valueerror(self, mirror):
+        with pytest.raises(ValueError, match="offline mirror"):
+            srd5_2.get_monster_details("srd-2024_tarrasque")
+
+    def test_unsynced_endpoint_raises_clean_valueerror(self, mirror):
+        with pytest.raises(ValueError, match="mirror sync"):
+            srd5_2.search_spells(name="fire")
+
+    def test_override_beats_env(self, mirror, monkeypatch):
+        srd5_2.set_offline_mode(False)
+        try:
+            assert srd5_2.srd_mirror_status()["offline"] is False
+        finally:
+            srd5_2.set_offline_mode(None)
+        assert srd5_2.srd_mirror_status()["offline"] is True
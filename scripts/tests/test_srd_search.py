@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests for the local SRD full-text index (scripts/srd_search.py) and the
+search_srd / search_rules paths that use it. No network: the index is built
+from a mirror synced from an in-memory fixture.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import scripts.srd5_2 as srd5_2
+import srd_mirror
+import srd_search
+
+
+def _doc(key):
+    return {"key": key, "name": key}
+
+
+_FIXTURE = {
+    "/v2/rules/": [
+        {"key": "srd-2024_grappling", "name": "Grappling", "document": "srd-2024",
+         "desc": "When you want to grab a creature, you can use the Unarmed Strike to grapple."},
+        {"key": "srd-2024_cover", "name": "Cover", "document": "srd-2024",
+         "desc": "Walls, trees, creatures, and other obstacles can provide cover during combat."},
+        {"key": "srd-2014_cover", "name": "Cover", "document": "srd-2014",
+         "desc": "Cover makes a target more difficult to harm. Half cover grants +2 AC."},
+    ],
+    "/v2/spells/": [
+        {"key": "srd-2024_fireball", "name": "Fireball", "document": _doc("srd-2024"),
+         "desc": "A bright streak flashes from you to a point you choose and then blossoms "
+                 "with a low roar into a fiery explosion."},
+        {"key": "srd-2024_fire-bolt", "name": "Fire Bolt", "document": _doc("srd-2024"),
+         "desc": "You hurl a mote of fire at a creature or an object within range."},
+    ],
+    "/v2/creatures/": [
+        {"key": "srd-2024_red-dragon-wyrmling", "name": "Red Dragon Wyrmling",
+         "document": _doc("srd-2024"),
+         "actions": [{"name": "Fire Breath", "desc": "The dragon exhales fire in a cone."}]},
+    ],
+    "/v2/conditions/": [
+        {"key": "srd-2024_grappled", "name": "Grappled", "document": _doc("srd-2024"),
+         "descriptions": [{"desc": "A grappled creature's speed is 0."}]},
+    ],
+    "/v2/magicitems/": [
+        {"key": "srd-2024_flame-tongue", "name": "Flame Tongue", "document": _doc("srd-2024"),
+         "desc": "While the sword is ablaze, it deals an extra 2d6 fire damage."},
+    ],
+}
+
+
+def _fetch_from(fixture):
+    def fetch(endpoint, params):
+        return {"count": len(fixture[endpoint]), "next": None, "results": list(fixture[endpoint])}
+    return fetch
+
+
+@pytest.fixture
+def index(monkeypatch, tmp_path):
+    monkeypatch.setenv("DND_SRD_MIRROR_PATH", str(tmp_path / "mirror.sqlite"))
+    monkeypatch.setenv("DND_SRD_INDEX_PATH", str(tmp_path / "index.pickle"))
+    monkeypatch.delenv("DND_SRD_OFFLINE", raising=False)
+    srd_search.reset()
+    srd_mirror.sync(_fetch_from(_FIXTURE), list(_FIXTURE), details=False)
+
+    def no_network():
+        raise AssertionError("local search must not touch the network")
+
+    monkeypatch.setattr(srd5_2, "_get_session", no_network)
+    yield srd_search.get_index()
+    srd_search.reset()
+
+
+def _keys(hits):
+    return [h["key"] for h in hits]
+
+
+class TestRanking:
+    def test_name_match_outranks_body_mention(self, index):
+        hits = index.search("grappled")
+        assert hits[0]["key"] == "srd-2024_grappled"
+        assert hits[0]["match_type"] == "exact"
+
+    def test_prefix_on_last_term(self, index):
+        hits = index.search("firebal")
+        assert _keys(hits)[0] == "srd-2024_fireball"
+        assert hits[0]["match_type"] == "prefix"
+
+    def test_single_typo_tolerated(self, index):
+        for typo in ("grapled", "fierball", "cvoer"):
+            assert index.search(typo), typo
+        assert _keys(index.search("fierball"))[0] == "srd-2024_fireball"
+
+    def test_kind_and_document_filters(self, index):
+        hits = index.search("fire", kinds=["creature"])
+        assert _keys(hits) == ["srd-2024_red-dragon-wyrmling"]
+        hits = index.search("cover", kinds=["rule"], document_keys={"srd-2014"})
+        assert _keys(hits) == ["srd-2014_cover"]
+
+    def test_stopword_only_query_is_empty(self, index):
+        assert index.search("the of and") == []
+
+    def test_query_under_10ms(self, index):
+        index.search("fire")  # build lazy typo/prefix tables
+        start = time.perf_counter()
+        for _ in range(50):
+            index.search("fierball dragon")
+        assert (time.perf_counter() - start) / 50 < 0.010
+
+
+class TestIncrementalRefresh:
+    def test_unchanged_mirror_is_a_noop(self, index):
+        assert index.refresh() == 0
+
+    def test_only_changed_records_reindexed(self, index):
+        changed = {**_FIXTURE, "/v2/spells/": [
+            _FIXTURE["/v2/spells/"][0],
+            {**_FIXTURE["/v2/spells/"][1], "desc": "You hurl a mote of searing flame."},
+        ]}
+        srd_mirror.sync(_fetch_from(changed), ["/v2/spells/"], details=False)
+        assert index.refresh() == 1
+        assert _keys(index.search("searing")) == ["srd-2024_fire-bolt"]
+
+    def test_removed_records_dropped(self, index):
+        srd_mirror.sync(_fetch_from({"/v2/conditions/": []}), ["/v2/conditions/"], details=False)
+        index.refresh()
+        assert "srd-2024_grappled" not in _keys(index.search("grappled"))
+
+    def test_pickle_round_trip_starts_warm(self, index):
+        srd_search.reset()
+        warm = srd_search.get_index()
+        assert warm is not index
+        assert warm.refresh() == 0
+        assert _keys(warm.search("grappled"))[0] == "srd-2024_grappled"
+
+
+class TestSrdIntegration:
+    def test_search_srd_answers_locally_in_v2_shape(self, index):
+        result = srd5_2.search_srd(query="fireball", limit=3, object_model="spell")
+        top = result["results"][0]
+        assert top["object_pk"] == "srd-2024_fireball"
+        assert top["object_model"] == "spell"
+        assert '<span class="highlighted">' in top["highlighted"]
+        assert "coverage" not in result
+
+    def test_unfiltered_search_goes_remote_when_online(self, index, monkeypatch):
+        calls = []
+        monkeypatch.setattr(srd5_2, "_api_get", lambda ep, p=None: calls.append(ep) or {"results": []})
+        srd5_2.search_srd(query="fireball")
+        assert calls == ["/v2/search/"]  # backgrounds, feats, … aren't in the local index
+
+    def test_unfiltered_search_offline_reports_its_coverage(self, index, monkeypatch):
+        monkeypatch.setattr(srd5_2, "_offline_override", True)
+        result = srd5_2.search_srd(query="fire")
+        assert {r["object_model"] for r in result["results"]} <= set(srd_search.KINDS)
+        assert result["coverage"].startswith("Offline: searched rule, spell")
+
+    def test_search_srd_uncovered_model_goes_remote(self, index, monkeypatch):
+        calls = []
+        monkeypatch.setattr(srd5_2, "_api_get", lambda ep, p=None: calls.append(ep) or {"results": []})
+        srd5_2.search_srd(query="acolyte", object_model="background")
+        assert calls == ["/v2/search/"]
+
+    def test_vector_query_goes_remote_when_online(self, index, monkeypatch):
+        calls = []
+        monkeypatch.setattr(srd5_2, "_api_get", lambda ep, p=None: calls.append(ep) or {"results": []})
+        srd5_2.search_srd(query="creatures that breathe fire", vector=True)
+        assert calls == ["/v2/search/"]
+
+    def test_search_rules_two_step_is_local(self, index):
+        result = srd5_2.search_rules(query="cover", source="srd-2024,srd-2014")
+        assert {r["key"] for r in result["results"]} == {"srd-2024_cover", "srd-2014_cover"}
+        assert result["count"] == 2
+        assert result["results"][0]["desc"]  # full records, not search stubs
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the local Open5e stand-in (scripts/srd_standin.py) and the client
+benchmark built on it (scripts/srd_bench.py). Everything runs against
+127.0.0.1 with the shipped sample fixture — no network.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import srd5_2
+import srd_bench
+import srd_standin
+
+
+@pytest.fixture(scope="module")
+def fixture():
+    return srd_standin.load_fixture(srd_standin.DEFAULT_FIXTURE)
+
+
+@pytest.fixture
+def server(fixture):
+    with srd_standin.StandinServer(fixture) as srv:
+        yield srv
+
+
+class TestStandinServer:
+    def test_list_filters_follow_open5e_name_forms(self, server):
+        body = requests.get(f"{server.url}/v2/spells/",
+                            params={"name__icontains": "fire", "limit": 10}).json()
+        assert sorted(r["key"] for r in body["results"]) == [
+            "srd-2014_fireball", "srd-2024_fire-bolt", "srd-2024_fireball",
+        ]
+        # Conditions only honor case-sensitive name__contains — icontains is dropped.
+        body = requests.get(f"{server.url}/v2/conditions/",
+                            params={"name__icontains": "zzz", "limit": 50}).json()
+        assert body["count"] == 6
+
+    def test_detail_replay_and_404(self, server):
+        ok = requests.get(f"{server.url}/v2/creatures/srd-2024_ogre/")
+        assert ok.status_code == 200 and ok.json()["name"] == "Ogre"
+        assert requests.get(f"{server.url}/v2/creatures/nope/").status_code == 404
+        search = requests.get(f"{server.url}/v2/search/",
+                              params={"query": "cover", "object_model": "rule", "limit": 5}).json()
+        assert [r["object_pk"] for r in search["results"]] == ["srd-2024_cover", "srd-2014_cover"]
+
+    def test_latency_and_failure_injection(self, fixture):
+        with srd_standin.StandinServer(fixture, latency_ms=60, fail_rate=1.0) as srv:
+            start = time.perf_counter()
+            resp = requests.get(f"{srv.url}/v2/spells/")
+            assert time.perf_counter() - start >= 0.06
+            assert resp.status_code == 503
+            assert srv.stats()["/v2/spells/"]["failures"] == 1
+
+    def test_counts_bytes_per_endpoint(self, server):
+        size = len(requests.get(f"{server.url}/v2/magicitems/srd-2024_bag-of-holding/").content)
+        assert server.stats() == {
+            "/v2/magicitems/": {"requests": 1, "bytes": size, "failures": 0, "not_found": 0},
+        }
+
+    def test_record_pages_and_captures_rule_searches(self):
+        pages = {
+            "/v2/rules/": {"next": "https://api.open5e.com/v2/rules/?limit=100&page=2",
+                           "results": [{"key": "a"}]},
+            "/v2/rules/?page=2": {"next": None, "results": [{"key": "b"}]},
+        }
+
+        def fetch(endpoint, params):
+            if endpoint == "/v2/search/":
+                return {"results": [{"object_pk": "a"}]}
+            return pages[endpoint + ("?page=2" if params.get("page") == "2" else "")]
+
+        out = srd_standin.record(fetch, ("/v2/rules/",), ("cover",))
+        assert out["endpoints"]["/v2/rules/"] == [{"key": "a"}, {"key": "b"}]
+        assert out["responses"][0]["query"] == {"query": "cover", "object_model": "rule", "limit": "5"}
+
+
+class TestBenchmark:
+    def test_percentile_is_nearest_rank(self):
+        samples = [float(n) for n in range(1, 101)]
+        assert srd_bench.percentile(samples, 50) == 50
+        assert srd_bench.percentile(samples, 99) == 99
+        assert srd_bench.percentile([], 95) is None
+
+    def test_scenarios_report_latency_hits_and_bytes(self, server, fixture):
+        report = srd_bench.run_benchmark(server, fixture, srd=srd5_2, workers=4, rounds=2)
+        cold, warm = report["scenarios"]["cold"], report["scenarios"]["warm"]
+        assert cold["errors"] == 0 and cold["calls"] == report["workload_calls"]
+        assert cold["totals"]["hit_ratio"] == 0 and cold["totals"]["bytes"] > 0
+        assert set(cold["latency_ms"]) >= {"p50", "p95", "p99"}
+        assert "search_rules" in cold["by_tool"]
+        assert report["scenarios"]["disk_warm"]["totals"]["requests"] == 0
+        assert warm["totals"]["hit_ratio"] == 1
+        concurrent = report["scenarios"]["concurrent"]
+        # Every distinct request reaches the server once, however many threads ask.
+        assert concurrent["totals"]["requests"] == cold["totals"]["requests"]
+
+    def test_client_is_restored_afterwards(self, server, fixture):
+        base_url, session = srd5_2.BASE_URL, srd5_2._session
+        srd_bench.run_benchmark(server, fixture, srd=srd5_2, scenarios=("cold",))
+        assert srd5_2.BASE_URL == base_url and srd5_2._session is session
@@ -10,6 +10,8 @@ from dataclasses import replace
 from pathlib import Path
 from typing import Sequence
 
+from scripts.mcp_progress import report_progress
+
 from .history_config import HistoryConfig, HistoryView, load_history_config
 from .model import ParsedDate
 from .model import BuildConfig, FontPaths, MeasureConfig, RendererConfig
@@ -570,8 +572,9 @@ def render_history_scopes(
 
         return base_dir / rendered
 
-    for config_path in configs:
+    for scope_index, config_path in enumerate(configs):
         scope_root = config_path.parent
+        report_progress(scope_index, len(configs), f"rendering history scope {scope_root.name}")
         cfg = load_history_config(config_path)
         sources = _scope_sources(scope_root)
         if not sources: